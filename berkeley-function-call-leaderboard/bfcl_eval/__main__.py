@@ -7,15 +7,28 @@ from typing import List, Optional
 import typer
 from importlib.metadata import version as _version
 from bfcl_eval._llm_response_generation import main as generation_main
+from bfcl_eval._sampling import DEFAULT_SAMPLE_SEED
+from bfcl_eval.mock_server import (
+    DEFAULT_RESPONSE_TEXT,
+    LATENCY_DISTRIBUTIONS,
+    RATE_LIMIT_MODES,
+)
+from bfcl_eval.mock_server import main as mock_server_main
 from bfcl_eval.constants.category_mapping import TEST_COLLECTION_MAPPING
 from bfcl_eval.constants.eval_config import (
+    BENCHMARK_NAMES,
     DOTENV_PATH,
+    LOCAL_SERVER_PORT,
     PROJECT_ROOT,
     RESULT_PATH,
     SCORE_PATH,
 )
 from bfcl_eval.constants.model_config import MODEL_CONFIG_MAPPING
 from bfcl_eval.eval_checker.eval_runner import main as evaluation_main
+from bfcl_eval.model_handler.local_inference.server_manager import (
+    list_local_servers,
+    stop_local_server,
+)
 from dotenv import load_dotenv
 from tabulate import tabulate
 
@@ -29,6 +42,9 @@ class ExecutionOrderGroup(typer.core.TyperGroup):
             "results",
             "evaluate",
             "scores",
+            "bench",
+            "mock-server",
+            "local-servers",
             "version",
         ]
 
@@ -127,6 +143,11 @@ def generate(
         "--skip-server-setup",
         help="Skip vLLM/SGLang server setup and use existing endpoint specified by the LOCAL_SERVER_ENDPOINT and LOCAL_SERVER_PORT environment variables.",
     ),
+    server_idle_timeout: Optional[float] = typer.Option(
+        None,
+        "--server-idle-timeout",
+        help="Keep the launched vLLM/SGLang server alive for reuse by later runs, and shut it down after this many seconds of inactivity. Later runs with the same model and server settings attach to it instead of loading the model again.",
+    ),
     local_model_path: Optional[str] = typer.Option(
         None,
         "--local-model-path",
@@ -148,6 +169,36 @@ def generate(
         "--run-ids",
         help="If true, also run the test entry mentioned in the test_case_ids_to_generate.json file, in addition to the --test_category argument.",
     ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Record per-stage timings (pre-query processing, query, parsing, decoding, execution, writing, etc.) and export them as a Chrome trace and a per-category summary under `profile/`.",
+    ),
+    fifo_dispatch: bool = typer.Option(
+        False,
+        "--fifo-dispatch",
+        help="Dispatch the ready test entries in the order they become ready (first in, first out), instead of longest-critical-path-first. The critical-path order helps latency-bound runs with expensive multi-turn entries, but not CPU-bound ones.",
+    ),
+    batch: bool = typer.Option(
+        False,
+        "--batch",
+        help="Send the single-turn queries of each test category as one offline batch job through the provider's batch API (OpenAI, Anthropic, Gemini), which is cheaper and not rate-limited like the regular API, at the cost of a turnaround of up to 24 hours. The multi-turn entries are still queried directly.",
+    ),
+    sample: Optional[float] = typer.Option(
+        None,
+        "--sample",
+        help="Only generate a stratified sample of each test category: a fraction of the category if at most 1 (eg. 0.1), a number of entries per category otherwise (eg. 20). Evaluate it with `bfcl evaluate --sample`.",
+    ),
+    seed: int = typer.Option(
+        DEFAULT_SAMPLE_SEED,
+        "--seed",
+        help="The seed of the `--sample` sample. Growing a sample with the same seed keeps the entries already generated.",
+    ),
+    target_ci_width: Optional[float] = typer.Option(
+        None,
+        "--target-ci-width",
+        help="With `--sample`, evaluate the sample and keep adding entries to it until the confidence interval of the overall accuracy is narrower than this width (eg. 0.04 for ±2%).",
+    ),
 ):
     """
     Generate the LLM response for one or more models on a test-category (same as openfunctions_evaluation.py).
@@ -164,10 +215,17 @@ def generate(
         gpu_memory_utilization=gpu_memory_utilization,
         backend=backend,
         skip_server_setup=skip_server_setup,
+        server_idle_timeout=server_idle_timeout,
         local_model_path=local_model_path,
         result_dir=result_dir,
         allow_overwrite=allow_overwrite,
         run_ids=run_ids,
+        profile=profile,
+        fifo_dispatch=fifo_dispatch,
+        batch=batch,
+        sample=sample,
+        seed=seed,
+        target_ci_width=target_ci_width,
     )
     load_dotenv(dotenv_path=DOTENV_PATH, verbose=True, override=True)  # Load the .env file
     generation_main(args)
@@ -256,13 +314,23 @@ def evaluate(
         "--partial-eval",
         help="Run evaluation on a partial set of benchmark entries (eg. entries present in the model result files) without raising for missing IDs.",
     ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Record per-stage timings (decoding, checking, execution, writing, etc.) and export them as a Chrome trace and a per-category summary under `profile/`.",
+    ),
+    sample: bool = typer.Option(
+        False,
+        "--sample",
+        help="Only evaluate the entries sampled by `bfcl generate --sample`, and report the category and overall accuracies with confidence intervals.",
+    ),
 ):
     """
     Evaluate results from run of one or more models on a test-category (same as eval_runner.py).
     """
 
     load_dotenv(dotenv_path=DOTENV_PATH, verbose=True, override=True)  # Load the .env file
-    evaluation_main(model, test_category, result_dir, score_dir, partial_eval)
+    evaluation_main(model, test_category, result_dir, score_dir, partial_eval, profile, sample)
 
 
 @cli.command()
@@ -316,5 +384,182 @@ def scores(
         print(f"\nFile {file} not found.\n")
 
 
+@cli.command()
+def bench(
+    benchmark: List[str] = typer.Option(
+        None,
+        help=f"A list of benchmarks to run; all of them by default. Available benchmarks: {', '.join(BENCHMARK_NAMES)}. Use commas to separate multiple benchmarks.",
+        callback=handle_multiple_input,
+    ),
+    rounds: int = typer.Option(
+        5, help="The number of timed rounds per benchmark, after one untimed cold round."
+    ),
+    max_entries: Optional[int] = typer.Option(
+        None,
+        "--max-entries",
+        help="Only use the first N entries of each test category, for a quicker run.",
+    ),
+    output: str = typer.Option(
+        None,
+        "--output",
+        help="Path to the JSON report file; Path should be relative to the `berkeley-function-call-leaderboard` root folder. Defaults to `benchmark/<commit>_<timestamp>.json`.",
+    ),
+    compare: str = typer.Option(
+        None,
+        "--compare",
+        help="Path to a previous JSON report to compare against; Path should be relative to the `berkeley-function-call-leaderboard` root folder. Exits with a non-zero code if any benchmark regressed.",
+    ),
+    regression_threshold: float = typer.Option(
+        0.1,
+        "--regression-threshold",
+        help="The relative slowdown of the median timing that counts as a regression when using --compare.",
+    ),
+):
+    """
+    Time the hot paths of the pipeline (data loading, decoding, checking, result writing and CSV generation) offline, on fixture model results.
+    """
+
+    args = SimpleNamespace(
+        benchmark=benchmark,
+        rounds=rounds,
+        max_entries=max_entries,
+        output=output,
+        compare=compare,
+        regression_threshold=regression_threshold,
+    )
+    # Imported here so that the other commands don't pay for loading the benchmark suite
+    from bfcl_eval._benchmark import main as benchmark_main
+
+    regressions = benchmark_main(args)
+    if regressions:
+        raise typer.Exit(code=1)
+
+
+@cli.command("mock-server")
+def mock_server(
+    host: str = typer.Option("localhost", help="The host to bind the server to."),
+    port: int = typer.Option(
+        LOCAL_SERVER_PORT,
+        help="The port to listen on. Should match LOCAL_SERVER_PORT when used with `bfcl generate --skip-server-setup`.",
+    ),
+    model: str = typer.Option(
+        "mock-model", help="The model ID reported by the `/v1/models` endpoint."
+    ),
+    latency_distribution: str = typer.Option(
+        "constant",
+        "--latency-distribution",
+        help=f"The distribution of the per-request latency. Available distributions: {', '.join(LATENCY_DISTRIBUTIONS)}.",
+    ),
+    latency_mean_ms: float = typer.Option(
+        0.0, "--latency-mean-ms", help="The mean per-request latency, in milliseconds."
+    ),
+    latency_stddev_ms: float = typer.Option(
+        0.0,
+        "--latency-stddev-ms",
+        help="The standard deviation of the per-request latency, in milliseconds. Ignored by the constant and exponential distributions.",
+    ),
+    error_rate: float = typer.Option(
+        0.0, "--error-rate", help="The fraction of requests that fail on purpose."
+    ),
+    error_status_code: int = typer.Option(
+        500, "--error-status-code", help="The HTTP status code of the failed requests."
+    ),
+    max_requests_per_minute: Optional[float] = typer.Option(
+        None,
+        "--max-requests-per-minute",
+        help="Cap the throughput of the server. No cap by default.",
+    ),
+    rate_limit_mode: str = typer.Option(
+        "delay",
+        "--rate-limit-mode",
+        help=f"What to do with the requests over the throughput cap: `delay` them, or `reject` them with a 429. Available modes: {', '.join(RATE_LIMIT_MODES)}.",
+    ),
+    replay: str = typer.Option(
+        None,
+        "--replay",
+        help="A result file, or a directory of result files, whose model responses are replayed in order. Responses are synthesized otherwise.",
+    ),
+    response_text: str = typer.Option(
+        DEFAULT_RESPONSE_TEXT,
+        "--response-text",
+        help="The response text returned when not replaying recorded responses.",
+    ),
+    seed: Optional[int] = typer.Option(
+        None, "--seed", help="Seed for the latency and error sampling."
+    ),
+    batch_latency_s: float = typer.Option(
+        1.0,
+        "--batch-latency-s",
+        help="Seconds between the creation of a batch on the emulated Batch API and its completion.",
+    ),
+):
+    """
+    Run a fake OpenAI-compatible inference server with configurable latency, error rate and throughput, for load-testing the generation pipeline.
+    """
+    args = SimpleNamespace(
+        host=host,
+        port=port,
+        model=model,
+        latency_distribution=latency_distribution,
+        latency_mean_ms=latency_mean_ms,
+        latency_stddev_ms=latency_stddev_ms,
+        error_rate=error_rate,
+        error_status_code=error_status_code,
+        max_requests_per_minute=max_requests_per_minute,
+        rate_limit_mode=rate_limit_mode,
+        replay=replay,
+        response_text=response_text,
+        seed=seed,
+        batch_latency_s=batch_latency_s,
+    )
+    mock_server_main(args)
+
+
+@cli.command("local-servers")
+def local_servers(
+    stop: Optional[int] = typer.Option(
+        None,
+        "--stop",
+        help="Shut down the persistent server registered on this port.",
+    ),
+    stop_all: bool = typer.Option(
+        False, "--stop-all", help="Shut down all the persistent servers."
+    ),
+):
+    """
+    List (or shut down) the persistent vLLM/SGLang servers kept alive by `bfcl generate --server-idle-timeout`.
+    """
+    servers = list_local_servers()
+    if stop_all or stop is not None:
+        ports = servers.keys() if stop_all else [str(stop)]
+        for port in list(ports):
+            if stop_local_server(int(port)):
+                print(f"Shut down the server on port {port}.")
+            else:
+                print(f"No persistent server registered on port {port}.")
+        return
+
+    if not servers:
+        print("No persistent servers running.")
+        return
+    table = tabulate(
+        [
+            (
+                port,
+                entry["pid"],
+                entry["spec"]["backend"],
+                entry["spec"]["model_path_or_id"],
+                len(entry["clients"]),
+                datetime.fromtimestamp(entry["last_used_at"]).strftime("%Y-%m-%d %H:%M:%S"),
+                f"{entry['idle_timeout']:g}",
+            )
+            for port, entry in sorted(servers.items())
+        ],
+        headers=["Port", "PID", "Backend", "Model", "Clients", "Last Used", "Idle Timeout (s)"],
+        tablefmt="github",
+    )
+    print(table)
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,708 @@
+"""
+Offline benchmark suite for the hot paths of the BFCL pipeline.
+
+The fixture model results are synthesized from the bundled possible answers, and decoded by a fake prompting handler,
+so no network access, API key or GPU is needed. Every benchmark is timed over a few rounds, and the timings are written
+to a JSON report that can be compared against the report of another commit (`bfcl bench --compare OLD_REPORT`).
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as _version
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+from bfcl_eval.constants.category_mapping import VERSION_PREFIX
+from bfcl_eval.constants.enums import Language, ReturnFormat
+from bfcl_eval.constants.eval_config import BENCHMARK_NAMES, PROJECT_ROOT
+from bfcl_eval.constants.type_mappings import JAVA_TYPE_CONVERSION, JS_TYPE_CONVERSION
+from bfcl_eval.eval_checker.ast_eval.ast_checker import (
+    NESTED_CONVERSION_TYPE_LIST,
+    ast_checker,
+)
+from bfcl_eval.eval_checker.ast_eval.type_convertor.java_type_converter import (
+    java_type_converter,
+)
+from bfcl_eval.eval_checker.ast_eval.type_convertor.js_type_converter import (
+    js_type_converter,
+)
+from bfcl_eval.eval_checker.eval_runner import (
+    _evaluate_single_multi_turn_entry,
+    evaluate_task,
+)
+from bfcl_eval.eval_checker.eval_runner_helper import generate_leaderboard_csv
+from bfcl_eval.model_handler.base_handler import BaseHandler
+from bfcl_eval.model_handler.utils import (
+    ast_parse,
+    default_decode_ast_prompting,
+    default_decode_execute_prompting,
+)
+from bfcl_eval.utils import (
+    is_java,
+    is_js,
+    is_multi_turn,
+    load_dataset_entry,
+    load_ground_truth_entry,
+    sort_file_content_by_id,
+)
+from tabulate import tabulate
+
+BENCHMARK_REPORT_VERSION = 1
+BENCHMARK_PATH = PROJECT_ROOT / "benchmark"
+# Any registered model works here; it only decides the result directory name and the leaderboard metadata
+BENCHMARK_MODEL_NAME = "gorilla-openfunctions-v2"
+
+AST_BENCHMARK_CATEGORIES = [
+    "simple_python",
+    "multiple",
+    "parallel",
+    "parallel_multiple",
+    "simple_java",
+    "simple_javascript",
+    "live_simple",
+    "live_multiple",
+]
+MULTI_TURN_BENCHMARK_CATEGORIES = ["multi_turn_base"]
+BENCHMARK_CATEGORIES = AST_BENCHMARK_CATEGORIES + MULTI_TURN_BENCHMARK_CATEGORIES
+
+_FREE_TEXT_PATTERN = re.compile(r"^[^\w\[{'\"-]|\s(?![^(\[{]*[)\]}])")
+
+# The XML parameter type attribute, by Python type of the value
+_XML_PARAM_TYPES = {
+    bool: "boolean",
+    int: "integer",
+    float: "float",
+    list: "array",
+    dict: "dict",
+    type(None): "null",
+}
+
+
+class BenchmarkHandler(BaseHandler):
+    """
+    A prompting handler that never queries a model. Only the decoding methods are used by the benchmarks.
+    """
+
+    def decode_ast(self, result, language: ReturnFormat, has_tool_call_tag: bool):
+        return default_decode_ast_prompting(result, language, has_tool_call_tag)
+
+    def decode_execute(self, result, has_tool_call_tag: bool):
+        return default_decode_execute_prompting(result, has_tool_call_tag)
+
+
+#### Fixtures ####
+
+
+def _first_possible_answer(value):
+    """
+    Pick the first possible answer of a (possibly nested) ground truth parameter value.
+    """
+    if not isinstance(value, dict):
+        return value
+    picked = {}
+    for key, possible_values in value.items():
+        if not isinstance(possible_values, list):
+            # A plain value rather than a list of possible answers
+            picked[key] = possible_values
+        elif possible_values and possible_values[0] != "":
+            picked[key] = _first_possible_answer(possible_values[0])
+    return picked
+
+
+def _pick_ground_truth_calls(ground_truth: list[dict]) -> list[tuple[str, dict]]:
+    calls = []
+    for function_call in ground_truth:
+        for function_name, params in function_call.items():
+            # An empty string as the first possible answer means the (optional) parameter can be omitted
+            calls.append(
+                (
+                    function_name,
+                    {
+                        param: _first_possible_answer(possible_values[0])
+                        for param, possible_values in params.items()
+                        if possible_values and possible_values[0] != ""
+                    },
+                )
+            )
+    return calls
+
+
+def _render_python_calls(calls: list[tuple[str, dict]]) -> str:
+    return (
+        "["
+        + ", ".join(
+            f"{name}({', '.join(f'{param}={value!r}' for param, value in params.items())})"
+            for name, params in calls
+        )
+        + "]"
+    )
+
+
+def _render_literal(value) -> str:
+    # Most Java/JavaScript ground truth values are already source literals (eg. variable names, `new int[]{1, 2}`);
+    # free text is quoted as a string literal
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str) and (
+        _FREE_TEXT_PATTERN.search(value) or value.count(".") > 1 and value[0].isdigit()
+    ):
+        return json.dumps(value)
+    return str(value)
+
+
+def _render_literal_calls(calls: list[tuple[str, dict]], is_java_call: bool) -> str:
+    def render_value(value):
+        if isinstance(value, list):
+            elements = ", ".join(_render_literal(element) for element in value)
+            return f"new Object[]{{{elements}}}" if is_java_call else f"[{elements}]"
+        return _render_literal(value)
+
+    return (
+        "["
+        + ", ".join(
+            f"{name}({', '.join(f'{param}={render_value(value)}' for param, value in params.items())})"
+            for name, params in calls
+        )
+        + "]"
+    )
+
+
+def _render_verbose_xml_calls(calls: list[tuple[str, dict]]) -> str:
+    functions = []
+    for name, params in calls:
+        rendered_params = "".join(
+            f"<param name={quoteattr(param)} value={quoteattr(value if isinstance(value, str) else repr(value))} "
+            f"type=\"{_XML_PARAM_TYPES.get(type(value), 'string')}\"/>"
+            for param, value in params.items()
+        )
+        functions.append(
+            f"<function name={quoteattr(name)}><params>{rendered_params}</params></function>"
+        )
+    return f"<functions>{''.join(functions)}</functions>"
+
+
+def _render_concise_xml_calls(calls: list[tuple[str, dict]]) -> str:
+    functions = []
+    for name, params in calls:
+        rendered_params = "".join(
+            f"<param name={quoteattr(param)} type=\"{_XML_PARAM_TYPES.get(type(value), 'string')}\">"
+            f"{escape(value if isinstance(value, str) else repr(value))}</param>"
+            for param, value in params.items()
+        )
+        functions.append(f"<function name={quoteattr(name)}>{rendered_params}</function>")
+    return f"<functions>{''.join(functions)}</functions>"
+
+
+def _render_json_calls(calls: list[tuple[str, dict]]) -> str:
+    return json.dumps(
+        [{"function": name, "parameters": params} for name, params in calls]
+    )
+
+
+def _render_model_result(test_category: str, ground_truth: list[dict]) -> str:
+    calls = _pick_ground_truth_calls(ground_truth)
+    if is_java(test_category) or is_js(test_category):
+        return _render_literal_calls(calls, is_java(test_category))
+    return _render_python_calls(calls)
+
+
+def _render_multi_turn_model_result(ground_truth: list[list[str]]) -> list[list[str]]:
+    # One step per turn, containing all the ground truth calls of that turn
+    return [[f"[{', '.join(turn_calls)}]"] for turn_calls in ground_truth]
+
+
+def build_fixtures(max_entries: Optional[int] = None) -> dict:
+    """
+    Build the fixture model results for all benchmark categories from the bundled possible answers.
+    If `max_entries` is given, only the first `max_entries` entries of each category are used.
+    """
+    fixtures = {"model_result": {}, "decode": {return_format: [] for return_format in ReturnFormat}}
+    for test_category in BENCHMARK_CATEGORIES:
+        ground_truth_entries = load_ground_truth_entry(test_category)[:max_entries]
+        model_result = []
+        for entry in ground_truth_entries:
+            if is_multi_turn(test_category):
+                result = _render_multi_turn_model_result(entry["ground_truth"])
+            else:
+                result = _render_model_result(test_category, entry["ground_truth"])
+            model_result.append(
+                {
+                    "id": entry["id"],
+                    "result": result,
+                    "input_token_count": 1000,
+                    "output_token_count": 100,
+                    "latency": 1.0,
+                }
+            )
+        fixtures["model_result"][test_category] = model_result
+
+        if is_multi_turn(test_category):
+            continue
+        if is_java(test_category):
+            fixtures["decode"][ReturnFormat.JAVA].extend(
+                entry["result"] for entry in model_result
+            )
+        elif is_js(test_category):
+            fixtures["decode"][ReturnFormat.JAVASCRIPT].extend(
+                entry["result"] for entry in model_result
+            )
+        else:
+            fixtures["decode"][ReturnFormat.PYTHON].extend(
+                entry["result"] for entry in model_result
+            )
+            for entry in ground_truth_entries:
+                calls = _pick_ground_truth_calls(entry["ground_truth"])
+                fixtures["decode"][ReturnFormat.VERBOSE_XML].append(
+                    _render_verbose_xml_calls(calls)
+                )
+                fixtures["decode"][ReturnFormat.CONCISE_XML].append(
+                    _render_concise_xml_calls(calls)
+                )
+                fixtures["decode"][ReturnFormat.JSON].append(_render_json_calls(calls))
+    return fixtures
+
+
+def _get_benchmark_handler() -> BenchmarkHandler:
+    return BenchmarkHandler(
+        model_name=BENCHMARK_MODEL_NAME,
+        temperature=0,
+        registry_name=BENCHMARK_MODEL_NAME,
+        is_fc_model=False,
+    )
+
+
+#### Benchmarks ####
+# Each benchmark yields `(name, group, function, item_count)` tuples; `function` is the timed unit of work.
+
+
+def _bench_import(fixtures: dict) -> Iterator[tuple[str, str, Callable, int]]:
+    def import_cli():
+        subprocess.run(
+            [sys.executable, "-c", "import bfcl_eval.__main__"],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    yield "import:bfcl_eval.__main__", "import", import_cli, 1
+
+
+def _bench_load_dataset_entry(fixtures: dict) -> Iterator[tuple[str, str, Callable, int]]:
+    for test_category in BENCHMARK_CATEGORIES:
+        item_count = len(load_dataset_entry(test_category))
+        yield (
+            f"load_dataset_entry:{test_category}",
+            "load",
+            lambda test_category=test_category: load_dataset_entry(test_category),
+            item_count,
+        )
+
+
+def _bench_ast_parse(fixtures: dict) -> Iterator[tuple[str, str, Callable, int]]:
+    for return_format, raw_outputs in fixtures["decode"].items():
+        if not raw_outputs:
+            continue
+
+        def decode_all(return_format=return_format, raw_outputs=raw_outputs):
+            for raw_output in raw_outputs:
+                try:
+                    ast_parse(raw_output, return_format)
+                except Exception:
+                    # Same as in the evaluation, a decoding failure is a valid outcome
+                    pass
+
+        yield f"ast_parse:{return_format.value}", "decode", decode_all, len(raw_outputs)
+
+
+def _bench_ast_checker(fixtures: dict) -> Iterator[tuple[str, str, Callable, int]]:
+    for test_category in AST_BENCHMARK_CATEGORIES:
+        model_result = fixtures["model_result"][test_category]
+        prompt_entries = load_dataset_entry(
+            test_category, include_prereq=False, include_language_specific_hint=False
+        )[: len(model_result)]
+        ground_truth_entries = load_ground_truth_entry(test_category)[: len(model_result)]
+        if is_java(test_category):
+            language, return_format = Language.JAVA, ReturnFormat.JAVA
+        elif is_js(test_category):
+            language, return_format = Language.JAVASCRIPT, ReturnFormat.JAVASCRIPT
+        else:
+            language, return_format = Language.PYTHON, ReturnFormat.PYTHON
+        # Decoding is timed separately, so the checker gets the decoded outputs
+        checker_inputs = []
+        for prompt_entry, result_entry, ground_truth_entry in zip(
+            prompt_entries, model_result, ground_truth_entries
+        ):
+            try:
+                decoded_output = ast_parse(result_entry["result"], return_format)
+            except Exception:
+                continue
+            checker_inputs.append(
+                (prompt_entry["function"], decoded_output, ground_truth_entry["ground_truth"])
+            )
+
+        def check_all(
+            checker_inputs=checker_inputs, language=language, test_category=test_category
+        ):
+            for functions, decoded_output, possible_answer in checker_inputs:
+                ast_checker(
+                    functions,
+                    decoded_output,
+                    possible_answer,
+                    language,
+                    test_category,
+                    BENCHMARK_MODEL_NAME,
+                )
+
+        yield f"ast_checker:{test_category}", "check", check_all, len(checker_inputs)
+
+
+def _bench_type_converter(fixtures: dict) -> Iterator[tuple[str, str, Callable, int]]:
+    for test_category, return_format, type_converter, type_conversion in [
+        ("simple_java", ReturnFormat.JAVA, java_type_converter, JAVA_TYPE_CONVERSION),
+        ("simple_javascript", ReturnFormat.JAVASCRIPT, js_type_converter, JS_TYPE_CONVERSION),
+    ]:
+        model_result = fixtures["model_result"][test_category]
+        prompt_entries = load_dataset_entry(
+            test_category, include_prereq=False, include_language_specific_hint=False
+        )[: len(model_result)]
+        # The `(value, expected_type, nested_type)` arguments the checker converts, for every parameter of every call
+        converter_inputs = []
+        for prompt_entry, result_entry in zip(prompt_entries, model_result):
+            try:
+                decoded_output = ast_parse(result_entry["result"], return_format)
+            except Exception:
+                continue
+            function_params = {
+                function["name"]: function["parameters"]["properties"]
+                for function in prompt_entry["function"]
+            }
+            for function_call in decoded_output:
+                for function_name, params in function_call.items():
+                    param_details = function_params.get(function_name, {})
+                    for param, value in params.items():
+                        if param not in param_details or type(value) is not str:
+                            continue
+                        expected_type = param_details[param]["type"]
+                        if expected_type not in type_conversion:
+                            continue
+                        nested_type = None
+                        if expected_type in NESTED_CONVERSION_TYPE_LIST:
+                            nested_type = param_details[param]["items"]["type"]
+                        converter_inputs.append((value, expected_type, nested_type))
+
+        def convert_all(converter_inputs=converter_inputs, type_converter=type_converter):
+            for value, expected_type, nested_type in converter_inputs:
+                type_converter(value, expected_type, nested_type)
+
+        yield f"type_converter:{test_category}", "check", convert_all, len(converter_inputs)
+
+
+def _bench_multi_turn(fixtures: dict) -> Iterator[tuple[str, str, Callable, int]]:
+    handler = _get_benchmark_handler()
+    for test_category in MULTI_TURN_BENCHMARK_CATEGORIES:
+        model_result = fixtures["model_result"][test_category]
+        ground_truth_entries = load_ground_truth_entry(test_category)[: len(model_result)]
+        prompt_entries = load_dataset_entry(
+            test_category, include_prereq=False, include_language_specific_hint=False
+        )[: len(model_result)]
+
+        def execute_and_check_all(
+            model_result=model_result,
+            ground_truth_entries=ground_truth_entries,
+            prompt_entries=prompt_entries,
+            test_category=test_category,
+        ):
+            for result_entry, ground_truth_entry, prompt_entry in zip(
+                model_result, ground_truth_entries, prompt_entries
+            ):
+                _evaluate_single_multi_turn_entry(
+                    handler,
+                    result_entry["id"],
+                    result_entry["result"],
+                    ground_truth_entry["ground_truth"],
+                    # The evaluation removes the function doc from the prompt entry, so it gets a shallow copy
+                    dict(prompt_entry),
+                    BENCHMARK_MODEL_NAME,
+                    test_category,
+                )
+
+        yield (
+            f"multi_turn_execute_and_check:{test_category}",
+            "check",
+            execute_and_check_all,
+            len(model_result),
+        )
+
+
+def _bench_write_results(fixtures: dict) -> Iterator[tuple[str, str, Callable, int]]:
+    handler = _get_benchmark_handler()
+    all_results = [
+        entry for model_result in fixtures["model_result"].values() for entry in model_result
+    ]
+
+    def write_all():
+        with tempfile.TemporaryDirectory() as result_dir:
+            result_dir = Path(result_dir)
+            handler.write(all_results, result_dir)
+            # The generation pipeline sorts every result file once it is done
+            for result_file in result_dir.rglob(f"{VERSION_PREFIX}_*_result.json"):
+                sort_file_content_by_id(result_file)
+
+    yield "write_results", "write", write_all, len(all_results)
+
+
+def _bench_leaderboard_csv(fixtures: dict) -> Iterator[tuple[str, str, Callable, int]]:
+    handler = _get_benchmark_handler()
+    with tempfile.TemporaryDirectory() as score_dir:
+        leaderboard_table = {}
+        # Build the leaderboard table (and the score files) once; only the CSV generation is timed
+        with contextlib.redirect_stdout(io.StringIO()):
+            for test_category, model_result in fixtures["model_result"].items():
+                evaluate_task(
+                    test_category,
+                    None,
+                    Path(score_dir),
+                    model_result,
+                    BENCHMARK_MODEL_NAME,
+                    handler,
+                    leaderboard_table,
+                    allow_missing=True,
+                )
+
+    def generate_csv():
+        with tempfile.TemporaryDirectory() as output_dir, contextlib.redirect_stdout(
+            io.StringIO()
+        ):
+            generate_leaderboard_csv(leaderboard_table, Path(output_dir))
+
+    yield "generate_leaderboard_csv", "write", generate_csv, len(leaderboard_table)
+
+
+BENCHMARKS = {
+    "import": _bench_import,
+    "load": _bench_load_dataset_entry,
+    "decode": _bench_ast_parse,
+    "ast_check": _bench_ast_checker,
+    "type_convert": _bench_type_converter,
+    "multi_turn": _bench_multi_turn,
+    "write": _bench_write_results,
+    "csv": _bench_leaderboard_csv,
+}
+assert list(BENCHMARKS) == BENCHMARK_NAMES, "BENCHMARK_NAMES should list the benchmarks in the same order"
+
+
+#### Runner ####
+
+
+def _time_function(function: Callable, rounds: int) -> dict:
+    """
+    Time `function` once cold, then `rounds` more times. Only the later rounds are used for the summary statistics;
+    the cold run is reported separately, as many hot paths are memoized after the first call.
+    """
+    start = time.perf_counter()
+    function()
+    cold = time.perf_counter() - start
+
+    durations = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+
+    return {
+        "cold": cold,
+        "min": min(durations),
+        "max": max(durations),
+        "mean": statistics.mean(durations),
+        "median": statistics.median(durations),
+        "stddev": statistics.stdev(durations) if len(durations) > 1 else 0.0,
+        "rounds": rounds,
+    }
+
+
+def _get_commit_info() -> dict:
+    def git(*args):
+        return subprocess.run(
+            ["git", *args],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+
+    try:
+        return {
+            "id": git("rev-parse", "HEAD"),
+            "branch": git("rev-parse", "--abbrev-ref", "HEAD"),
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        }
+    except (OSError, subprocess.CalledProcessError):
+        # Not installed from a git checkout
+        return {"id": None, "branch": None, "dirty": None}
+
+
+def _get_machine_info() -> dict:
+    return {
+        "python_version": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmarks(
+    benchmark_groups: Optional[list[str]] = None,
+    rounds: int = 5,
+    max_entries: Optional[int] = None,
+) -> dict:
+    """
+    Run the selected benchmark groups (all of them by default) and return the report.
+    """
+    if not benchmark_groups:
+        benchmark_groups = list(BENCHMARKS.keys())
+    for benchmark_group in benchmark_groups:
+        if benchmark_group not in BENCHMARKS:
+            raise ValueError(
+                f"Invalid benchmark '{benchmark_group}'. Available benchmarks: {', '.join(BENCHMARKS.keys())}."
+            )
+
+    fixtures = build_fixtures(max_entries)
+
+    benchmark_results = []
+    for benchmark_group in benchmark_groups:
+        for name, group, function, item_count in BENCHMARKS[benchmark_group](fixtures):
+            print(f"⏱️  Running benchmark: {name}")
+            stats = _time_function(function, rounds)
+            benchmark_results.append(
+                {
+                    "name": name,
+                    "group": group,
+                    "items": item_count,
+                    "stats": stats,
+                    "median_per_item_us": stats["median"] / max(item_count, 1) * 1e6,
+                }
+            )
+
+    try:
+        bfcl_version = _version("bfcl")
+    except PackageNotFoundError:
+        bfcl_version = None
+
+    return {
+        "version": BENCHMARK_REPORT_VERSION,
+        "datetime": datetime.now().isoformat(timespec="seconds"),
+        "bfcl_version": bfcl_version,
+        "commit_info": _get_commit_info(),
+        "machine_info": _get_machine_info(),
+        "options": {
+            "benchmarks": benchmark_groups,
+            "rounds": rounds,
+            "max_entries": max_entries,
+        },
+        "benchmarks": benchmark_results,
+    }
+
+
+def compare_reports(
+    baseline_report: dict, report: dict, regression_threshold: float = 0.1
+) -> list[str]:
+    """
+    Print the median timings of `report` against `baseline_report`.
+    Return the names of the benchmarks that got slower by more than `regression_threshold` (relative).
+    """
+    baseline_stats = {
+        benchmark["name"]: benchmark["stats"] for benchmark in baseline_report["benchmarks"]
+    }
+
+    rows = []
+    regressions = []
+    for benchmark in report["benchmarks"]:
+        name = benchmark["name"]
+        median = benchmark["stats"]["median"]
+        if name not in baseline_stats:
+            rows.append((name, "N/A", f"{median * 1000:.2f}", "N/A", ""))
+            continue
+
+        baseline_median = baseline_stats[name]["median"]
+        change = (median - baseline_median) / baseline_median if baseline_median else 0.0
+        is_regression = change > regression_threshold
+        if is_regression:
+            regressions.append(name)
+        rows.append(
+            (
+                name,
+                f"{baseline_median * 1000:.2f}",
+                f"{median * 1000:.2f}",
+                f"{change:+.1%}",
+                "⚠️ slower" if is_regression else "",
+            )
+        )
+
+    print(
+        tabulate(
+            rows,
+            headers=["Benchmark", "Baseline (ms)", "Current (ms)", "Change", ""],
+            tablefmt="github",
+        )
+    )
+    return regressions
+
+
+def main(args) -> list[str]:
+    """
+    Run the benchmarks, write the report, and compare it against the baseline report if one is given.
+    Return the names of the regressed benchmarks (always empty without a baseline).
+    """
+    report = run_benchmarks(args.benchmark, args.rounds, args.max_entries)
+
+    if args.output is None:
+        commit_id = report["commit_info"]["id"]
+        file_name = f"{commit_id[:12] if commit_id else 'unknown'}_{datetime.now():%Y%m%d_%H%M%S}.json"
+        output_path = BENCHMARK_PATH / file_name
+    else:
+        output_path = (PROJECT_ROOT / args.output).resolve()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(
+        tabulate(
+            [
+                (
+                    benchmark["name"],
+                    benchmark["items"],
+                    f"{benchmark['stats']['cold'] * 1000:.2f}",
+                    f"{benchmark['stats']['median'] * 1000:.2f}",
+                    f"{benchmark['median_per_item_us']:.1f}",
+                )
+                for benchmark in report["benchmarks"]
+            ],
+            headers=["Benchmark", "Items", "Cold (ms)", "Median (ms)", "Median/item (µs)"],
+            tablefmt="github",
+        )
+    )
+    print(f"📊 Benchmark report saved to {output_path}")
+
+    if args.compare is None:
+        return []
+    with open((PROJECT_ROOT / args.compare).resolve(), encoding="utf-8") as f:
+        baseline_report = json.load(f)
+    regressions = compare_reports(baseline_report, report, args.regression_threshold)
+    if regressions:
+        print(
+            f"⚠️ Warning: {len(regressions)} benchmark(s) regressed by more than {args.regression_threshold:.0%}: {', '.join(regressions)}"
+        )
+    return regressions
@@ -7,9 +7,25 @@ from collections import defaultdict, deque
 from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import threading
 import queue
-from copy import deepcopy
+from copy import copy, deepcopy
 from typing import TYPE_CHECKING
 
+from bfcl_eval._sampling import (
+    DEFAULT_SAMPLE_SEED,
+    MAX_ADAPTIVE_SAMPLING_ROUNDS,
+    compute_initial_sample_size,
+    filter_test_entries_by_sample,
+    grow_sample_sizes,
+    is_sampled_entry,
+    load_sample_manifest,
+    save_sample_manifest,
+)
+from bfcl_eval._task_scheduling import (
+    CriticalPathReadyQueue,
+    compute_critical_path_priorities,
+    estimate_task_costs,
+    load_historical_costs,
+)
 from bfcl_eval.constants.eval_config import (
     PROJECT_ROOT,
     RESULT_PATH,
@@ -19,11 +35,21 @@ from bfcl_eval.constants.eval_config import (
 from bfcl_eval.constants.model_config import MODEL_CONFIG_MAPPING
 from bfcl_eval.eval_checker.eval_runner_helper import load_file
 from bfcl_eval.constants.enums import ModelStyle
+from bfcl_eval.model_handler.batch_inference import (
+    BatchInferenceRunner,
+    get_batch_backend,
+)
+from bfcl_eval.profiler import (
+    enable_profiling,
+    export_profile,
+    profile_counter,
+    profile_span,
+)
 from bfcl_eval.utils import *
 from tqdm import tqdm
 
-from bfcl_eval.model_handler.base_handler import BaseHandler
-from bfcl_eval.model_handler.local_inference.base_oss_handler import OSSHandler
+if TYPE_CHECKING:
+    from bfcl_eval.model_handler.base_handler import BaseHandler
 
 
 def get_args():
@@ -50,6 +76,12 @@ def get_args():
         default=False,
         help="Skip vLLM/SGLang server setup and use existing endpoint specified by the LOCAL_SERVER_ENDPOINT and LOCAL_SERVER_PORT environment variables.",
     )
+    parser.add_argument(
+        "--server-idle-timeout",
+        type=float,
+        default=None,
+        help="Keep the launched vLLM/SGLang server alive for reuse by later runs, and shut it down after this many seconds of inactivity.",
+    )
     # Optional local model path
     parser.add_argument(
         "--local-model-path",
@@ -57,6 +89,42 @@ def get_args():
         default=None,
         help="Specify the path to a local directory containing the model's config/tokenizer/weights for fully offline inference. Use this only if the model weights are stored in a location other than the default HF_HOME directory.",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=False,
+        help="Record per-stage timings and export them as a Chrome trace and a per-category summary.",
+    )
+    parser.add_argument(
+        "--fifo-dispatch",
+        action="store_true",
+        default=False,
+        help="Dispatch the ready test entries in the order they become ready, instead of longest-critical-path-first.",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        default=False,
+        help="Send the single-turn queries of each test category as one offline batch job, for the providers with a batch API (OpenAI, Anthropic, Gemini).",
+    )
+    parser.add_argument(
+        "--sample",
+        type=float,
+        default=None,
+        help="Only generate a stratified sample of each test category: a fraction of the category if at most 1, a number of entries per category otherwise.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=DEFAULT_SAMPLE_SEED,
+        help="The seed of the `--sample` sample.",
+    )
+    parser.add_argument(
+        "--target-ci-width",
+        type=float,
+        default=None,
+        help="With `--sample`, evaluate the sample and keep adding entries to it until the confidence interval of the overall accuracy is narrower than this width.",
+    )
     args = parser.parse_args()
 
     return args
@@ -64,7 +132,7 @@ def get_args():
 
 def build_handler(model_name, temperature):
     config = MODEL_CONFIG_MAPPING[model_name]
-    handler = config.model_handler(
+    handler = config.get_model_handler()(
         model_name=config.model_name,
         temperature=temperature,
         registry_name=model_name,
@@ -170,28 +238,37 @@ def collect_test_cases(args, model_name, all_test_categories, all_test_entries_i
 
 def multi_threaded_inference(handler, test_case, include_input_log, exclude_state_log):
 
+    # The handler modifies the test case in place, so format sensitivity entries (which share their content) are copied here
+    test_case = materialize_test_entry(test_case)
+
     assert type(test_case["function"]) is list
 
-    try:
-        result, metadata = handler.inference(
-            test_case, include_input_log, exclude_state_log
-        )
-    except Exception as e:
-        # This is usually the case when the model getting stuck on one particular test case.
-        # For example, timeout error or FC model returning invalid JSON response.
-        # Since temperature is already set to 0.001, retrying the same test case will not help.
-        # So we continue the generation process and record the error message as the model response
-        error_block = (
-            "-" * 100
-            + "\n❗️❗️ Error occurred during inference. Continuing to next test case.\n"
-            + f"❗️❗️ Test case ID: {test_case['id']}, Error: {str(e)}\n"
-            + traceback.format_exc(limit=10)
-            + "-" * 100
-        )
-        tqdm.write(error_block)
+    with profile_span(
+        "inference",
+        test_category=extract_test_category_from_id(test_case["id"]),
+        test_entry_id=test_case["id"],
+    ):
+        try:
+            result, metadata = handler.inference(
+                test_case, include_input_log, exclude_state_log
+            )
+        except Exception as e:
+            # This is usually the case when the model getting stuck on one particular test case.
+            # For example, timeout error or FC model returning invalid JSON response.
+            # Since temperature is already set to 0.001, retrying the same test case will not help.
+            # So we continue the generation process and record the error message as the model response
+            error_block = (
+                "-" * 100
+                + "\n❗️❗️ Error occurred during inference. Continuing to next test case.\n"
+                + f"❗️❗️ Test case ID: {test_case['id']}, Error: {str(e)}\n"
+                + traceback.format_exc(limit=10)
+                + "-" * 100
+            )
+            tqdm.write(error_block)
+            profile_counter("inference_error")
 
-        result = f"Error during inference: {str(e)}"
-        metadata = {"traceback": traceback.format_exc()}
+            result = f"Error during inference: {str(e)}"
+            metadata = {"traceback": traceback.format_exc()}
 
     result_to_write = {
         "id": test_case["id"],
@@ -202,7 +279,10 @@ def multi_threaded_inference(handler, test_case, include_input_log, exclude_stat
     return result_to_write
 
 
-def generate_results(args, model_name, test_cases_total):
+def generate_results(args, model_name, test_cases_total, historical_costs=None):
+    # Imported here so that loading this module doesn't pull in the OSS handler dependencies
+    from bfcl_eval.model_handler.local_inference.base_oss_handler import OSSHandler
+
     handler = build_handler(model_name, args.temperature)
 
     if isinstance(handler, OSSHandler):
@@ -216,7 +296,7 @@ def generate_results(args, model_name, test_cases_total):
             else LOCAL_SERVER_MAX_CONCURRENT_REQUEST
         )
     else:
-        handler: BaseHandler
+        handler: "BaseHandler"
         is_oss_model = False
         num_threads = args.num_threads if args.num_threads is not None else 1
 
@@ -227,7 +307,8 @@ def generate_results(args, model_name, test_cases_total):
             item = write_queue.get()
             if item is None:
                 break
-            handler.write(item, result_dir=args.result_dir, update_mode=args.run_ids)
+            with profile_span("write"):
+                handler.write(item, result_dir=args.result_dir, update_mode=args.run_ids)
             write_queue.task_done()
 
     write_queue: queue.Queue = queue.Queue()
@@ -243,6 +324,7 @@ def generate_results(args, model_name, test_cases_total):
                 backend=args.backend,
                 skip_server_setup=args.skip_server_setup,
                 local_model_path=args.local_model_path,
+                server_idle_timeout=getattr(args, "server_idle_timeout", None),
             )
 
         # ───── dependency bookkeeping ──────────────────────────────
@@ -257,14 +339,41 @@ def generate_results(args, model_name, test_cases_total):
 
         id_to_test_case = {test_case["id"]: test_case for test_case in test_cases_total}
 
-        ready_queue = deque(
-            [
-                test_case_id
-                for test_case_id, dependency_ids in dependencies.items()
-                if not dependency_ids
-            ]
-        )
+        # In batch mode, the single-turn entries are sent through the provider's batch API instead of the thread pool
+        batch_test_cases = defaultdict(list)
+        if getattr(args, "batch", False):
+            batch_backend = get_batch_backend(handler)
+            if batch_backend is None:
+                tqdm.write(
+                    f"⚠️ Warning: {model_name} doesn't support batch submission. Sending its queries directly instead."
+                )
+            else:
+                for test_case in test_cases_total:
+                    if not test_case.get("depends_on") and not contain_multi_turn_interaction(
+                        test_case["id"]
+                    ):
+                        batch_test_cases[extract_test_category_from_id(test_case["id"])].append(
+                            test_case
+                        )
+        batch_test_case_ids = {
+            test_case["id"]
+            for test_cases in batch_test_cases.values()
+            for test_case in test_cases
+        }
+
+        # Dispatch the ready entries longest-critical-path-first, so that expensive entries and the heads of long
+        # dependency chains don't end up dominating the tail of the run
+        if getattr(args, "fifo_dispatch", False):
+            ready_queue = deque()
+        else:
+            task_costs = estimate_task_costs(test_cases_total, historical_costs or {})
+            priorities = compute_critical_path_priorities(test_cases_total, task_costs)
+            ready_queue = CriticalPathReadyQueue(test_cases_total, priorities)
+        for test_case_id, dependency_ids in dependencies.items():
+            if not dependency_ids and test_case_id not in batch_test_case_ids:
+                ready_queue.append(test_case_id)
         in_flight: dict[Future, str] = {}  # future -> test_case_id
+        batch_in_flight: dict[Future, str] = {}  # run on the same pool, through the batch runner
         completed = set()
 
         with ThreadPoolExecutor(max_workers=num_threads) as pool, tqdm(
@@ -278,6 +387,16 @@ def generate_results(args, model_name, test_cases_total):
             bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]",
         ) as pbar:
 
+            if batch_test_cases:
+                batch_in_flight = BatchInferenceRunner(
+                    handler, batch_backend, pool
+                ).submit(
+                    batch_test_cases,
+                    multi_threaded_inference,
+                    args.include_input_log,
+                    args.exclude_state_log,
+                )
+
             # seed initial ready tasks
             while ready_queue and len(in_flight) < num_threads:
                 test_case_id = ready_queue.popleft()
@@ -292,10 +411,16 @@ def generate_results(args, model_name, test_cases_total):
                 in_flight[future] = test_case_id
 
             # main scheduler loop
-            while in_flight:
-                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            while in_flight or batch_in_flight:
+                done, _ = wait(
+                    [*in_flight, *batch_in_flight], return_when=FIRST_COMPLETED
+                )
                 for future in done:
-                    test_case_id = in_flight.pop(future)
+                    test_case_id = (
+                        in_flight.pop(future)
+                        if future in in_flight
+                        else batch_in_flight.pop(future)
+                    )
                     result_dict = future.result()
 
                     # Enqueue the result for the writer thread to handle file IO
@@ -333,6 +458,112 @@ def generate_results(args, model_name, test_cases_total):
             handler.shutdown_local_server()
 
 
+def generate_test_entries(
+    args, model_name, all_test_categories, all_test_entries_involved, historical_costs
+):
+    test_cases_total = collect_test_cases(
+        args,
+        model_name,
+        all_test_categories,
+        deepcopy(all_test_entries_involved),
+    )
+
+    if len(test_cases_total) == 0:
+        tqdm.write(
+            f"✅ All selected test cases have been previously generated for {model_name}. No new test cases to generate."
+        )
+    else:
+        generate_results(args, model_name, test_cases_total, historical_costs)
+
+        # Remove reasoning_content from the result files
+        
+        # Sort the result files by id at the end
+        with profile_span("sort_result_files"):
+            for model_result_json in args.result_dir.rglob(RESULT_FILE_PATTERN):
+                sort_file_content_by_id(model_result_json)
+
+
+def generate_sample(
+    args, model_name, all_test_categories, all_test_entries_involved, historical_costs
+):
+    """
+    Generate a stratified sample of each test category (`--sample`).
+    With `--target-ci-width`, evaluate the sample after each round, and grow it until the confidence interval of the
+    overall accuracy is narrow enough.
+    """
+    model_result_dir = args.result_dir / model_name.replace("/", "_")
+    seed = getattr(args, "seed", DEFAULT_SAMPLE_SEED)
+    target_ci_width = getattr(args, "target_ci_width", None)
+
+    manifest = load_sample_manifest(model_result_dir)
+    if manifest is not None and manifest["seed"] != seed and not args.allow_overwrite:
+        raise ValueError(
+            f"The existing results of {model_name} were sampled with seed {manifest['seed']}. "
+            "Use the same `--seed`, or pass `--allow-overwrite` to regenerate the sample."
+        )
+
+    # The memory pre-requisite entries are grouped with the category they belong to
+    test_entries_by_category = defaultdict(list)
+    for test_entry in all_test_entries_involved:
+        test_category = extract_test_category_from_id(test_entry["id"])
+        test_entries_by_category[test_category.replace("_prereq", "")].append(test_entry)
+    population_sizes = {
+        test_category: sum(1 for entry in test_entries if is_sampled_entry(entry))
+        for test_category, test_entries in test_entries_by_category.items()
+    }
+    sample_sizes = {
+        test_category: compute_initial_sample_size(args.sample, population_size)
+        for test_category, population_size in population_sizes.items()
+    }
+    if manifest is not None and manifest["seed"] == seed and not args.allow_overwrite:
+        # Keep the entries sampled by previous runs, eg. grown by `--target-ci-width`
+        for test_category, sample_info in manifest["categories"].items():
+            if test_category in sample_sizes:
+                sample_sizes[test_category] = max(
+                    sample_sizes[test_category], sample_info["sample_size"]
+                )
+
+    round_args = copy(args)
+    for sampling_round in range(1, MAX_ADAPTIVE_SAMPLING_ROUNDS + 1):
+        save_sample_manifest(model_result_dir, seed, sample_sizes, population_sizes)
+        tqdm.write(
+            f"🎲 Sampled {sum(sample_sizes.values())} out of {sum(population_sizes.values())} test entries for {model_name} (seed {seed})."
+        )
+        generate_test_entries(
+            round_args,
+            model_name,
+            all_test_categories,
+            filter_test_entries_by_sample(test_entries_by_category, seed, sample_sizes),
+            historical_costs,
+        )
+        if target_ci_width is None:
+            return
+
+        # Imported here, as the evaluation pulls in the checker dependencies
+        from bfcl_eval.eval_checker.eval_runner import main as evaluation_main
+
+        sample_summary = evaluation_main(
+            [model_name], all_test_categories, args.result_dir, None, sample=True
+        )[model_name]
+        overall = sample_summary["overall"]
+        if overall is None or overall["ci_width"] <= target_ci_width:
+            return
+
+        new_sample_sizes = grow_sample_sizes(sample_summary, sample_sizes, target_ci_width)
+        if new_sample_sizes == sample_sizes:
+            return
+        tqdm.write(
+            f"🔁 Round {sampling_round}: the confidence interval of the overall accuracy is {overall['ci_width']:.2%} wide (target: {target_ci_width:.2%}). Growing the sample."
+        )
+        sample_sizes = new_sample_sizes
+        # The entries generated in the previous rounds are part of the grown sample
+        round_args.allow_overwrite = False
+
+    tqdm.write(
+        f"⚠️ Warning: The confidence interval of the overall accuracy of {model_name} is still wider than {target_ci_width:.2%} after {MAX_ADAPTIVE_SAMPLING_ROUNDS} sampling rounds."
+    )
+
+
 def main(args):
 
     # Note: The following environment variables are needed for the memory vector store implementation
@@ -345,11 +576,20 @@ def main(args):
     # use spawn method for multiprocessing
     mp.set_start_method("spawn", force=True)
 
+    profile = getattr(args, "profile", False)
+    if profile:
+        enable_profiling()
+
     if type(args.model) is not list:
         args.model = [args.model]
     if type(args.test_category) is not list:
         args.test_category = [args.test_category]
 
+    if getattr(args, "sample", None) is not None and args.run_ids:
+        raise ValueError("`--sample` cannot be combined with `--run-ids`.")
+    if getattr(args, "target_ci_width", None) is not None and getattr(args, "sample", None) is None:
+        raise ValueError("`--target-ci-width` requires `--sample`.")
+
     (
         all_test_categories,
         all_test_entries_involved,
@@ -365,6 +605,8 @@ def main(args):
     tqdm.write(f"Generating results for {args.model}")
     if args.run_ids:
         tqdm.write("Running specific test cases. Ignoring `--test-category` argument.")
+    elif getattr(args, "sample", None) is not None:
+        tqdm.write(f"Running a stratified sample of the test cases for categories: {all_test_categories}.")
     else:
         tqdm.write(f"Running full test cases for categories: {all_test_categories}.")
 
@@ -381,23 +623,32 @@ def main(args):
     else:
         args.result_dir = RESULT_PATH
 
-    for model_name in args.model:
-        test_cases_total = collect_test_cases(
-            args,
-            model_name,
-            all_test_categories,
-            deepcopy(all_test_entries_involved),
+    # Read before `collect_test_cases`, which deletes the result files that are going to be overwritten
+    historical_costs = (
+        {}
+        if getattr(args, "fifo_dispatch", False)
+        else load_historical_costs(
+            args.result_dir, all_test_categories, all_test_entries_involved
         )
+    )
 
-        if len(test_cases_total) == 0:
-            tqdm.write(
-                f"✅ All selected test cases have been previously generated for {model_name}. No new test cases to generate."
+    for model_name in args.model:
+        if getattr(args, "sample", None) is None:
+            generate_test_entries(
+                args,
+                model_name,
+                all_test_categories,
+                all_test_entries_involved,
+                historical_costs,
             )
         else:
-            generate_results(args, model_name, test_cases_total)
+            generate_sample(
+                args,
+                model_name,
+                all_test_categories,
+                all_test_entries_involved,
+                historical_costs,
+            )
 
-            # Remove reasoning_content from the result files
-            
-            # Sort the result files by id at the end
-            for model_result_json in args.result_dir.rglob(RESULT_FILE_PATTERN):
-                sort_file_content_by_id(model_result_json)
+    if profile:
+        export_profile("generate")
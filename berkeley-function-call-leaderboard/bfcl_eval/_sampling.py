@@ -0,0 +1,421 @@
+"""
+Stratified subsampling of the benchmark, for fast approximate leaderboard runs.
+
+`bfcl generate --sample` draws a sample of every test category (the strata) and generates only those entries; `bfcl
+evaluate --sample` evaluates only the sampled entries and reports the category and overall accuracies with confidence
+intervals.
+
+The sample of a category is a prefix of a permutation of its entry IDs that only depends on the seed, so growing a
+sample (eg. with `--target-ci-width`) keeps the entries that have already been generated. The sample sizes and the seed
+are recorded in a manifest in the model's result folder, from which the evaluation recovers the sampled entry IDs.
+
+The overall accuracy is estimated with the same hierarchy and weights as the leaderboard (`generate_leaderboard_csv`),
+the count-weighted averages being weighted by the full size of each category rather than by its sample size.
+"""
+
+import hashlib
+import json
+import math
+import statistics
+from pathlib import Path
+from typing import Optional
+
+from bfcl_eval.eval_checker.eval_runner_helper import (
+    calculate_percentage_weighted_accuracy,
+    calculate_unweighted_accuracy,
+    calculate_weighted_accuracy,
+)
+from bfcl_eval.utils import extract_test_category_from_id, is_memory_prereq
+from tabulate import tabulate
+
+SAMPLE_MANIFEST_FILE_NAME = "sample_manifest.json"
+SAMPLE_SUMMARY_FILE_NAME = "sample_summary.json"
+DEFAULT_SAMPLE_SEED = 0
+DEFAULT_CONFIDENCE_LEVEL = 0.95
+# Sampled categories get at least this many entries (or all of them, for smaller categories)
+MIN_SAMPLE_SIZE_PER_CATEGORY = 5
+# With `--target-ci-width`, the sample grows at most this many times, and at most doubles each time
+MAX_ADAPTIVE_SAMPLING_ROUNDS = 10
+MAX_ADAPTIVE_SAMPLING_GROWTH = 2
+
+# The overall accuracy of the leaderboard, as a tree of (aggregation, children) nodes mirroring `generate_leaderboard_csv`
+OVERALL_ACCURACY_TREE = (
+    "percentage_weighted",
+    [10, 10, 10, 30, 40],
+    [
+        (
+            "unweighted",
+            [
+                ("unweighted", ["simple_python", "simple_java", "simple_javascript"]),
+                "multiple",
+                "parallel",
+                "parallel_multiple",
+            ],
+        ),
+        (
+            "weighted",
+            ["live_simple", "live_multiple", "live_parallel", "live_parallel_multiple"],
+        ),
+        ("unweighted", ["irrelevance", "live_irrelevance"]),
+        (
+            "unweighted",
+            [
+                "multi_turn_base",
+                "multi_turn_miss_func",
+                "multi_turn_miss_param",
+                "multi_turn_long_context",
+            ],
+        ),
+        (
+            "unweighted",
+            [
+                ("unweighted", ["web_search_base", "web_search_no_snippet"]),
+                ("unweighted", ["memory_kv", "memory_vector", "memory_rec_sum"]),
+            ],
+        ),
+    ],
+)
+
+
+#### Sample selection ####
+
+
+def _sample_order_key(seed: int, test_entry_id: str) -> bytes:
+    return hashlib.sha256(f"{seed}:{test_entry_id}".encode()).digest()
+
+
+def select_sample_ids(test_entry_ids: list[str], seed: int, sample_size: int) -> set[str]:
+    """
+    Return the `sample_size` first IDs of the seeded permutation of `test_entry_ids`.
+    """
+    ordered_ids = sorted(test_entry_ids, key=lambda test_entry_id: _sample_order_key(seed, test_entry_id))
+    return set(ordered_ids[:sample_size])
+
+
+def compute_initial_sample_size(sample: float, population_size: int) -> int:
+    """
+    Interpret `--sample`: a value in (0, 1] is the fraction of each category to sample, a larger value is the number
+    of entries to sample from each category.
+    """
+    if sample <= 0:
+        raise ValueError(f"The sample size must be positive, got {sample}.")
+    if sample <= 1:
+        sample_size = math.ceil(sample * population_size)
+    else:
+        sample_size = int(sample)
+    sample_size = max(sample_size, MIN_SAMPLE_SIZE_PER_CATEGORY)
+    return min(sample_size, population_size)
+
+
+def is_sampled_entry(test_entry: dict) -> bool:
+    # Memory pre-requisite entries build up the memory state used by all the entries of their category, so they are
+    # always generated in full
+    return not is_memory_prereq(extract_test_category_from_id(test_entry["id"]))
+
+
+def filter_test_entries_by_sample(
+    test_entries_by_category: dict[str, list[dict]], seed: int, sample_sizes: dict[str, int]
+) -> list[dict]:
+    filtered_test_entries = []
+    for test_category, test_entries in test_entries_by_category.items():
+        sample_ids = select_sample_ids(
+            [entry["id"] for entry in test_entries if is_sampled_entry(entry)],
+            seed,
+            sample_sizes[test_category],
+        )
+        filtered_test_entries.extend(
+            entry
+            for entry in test_entries
+            if not is_sampled_entry(entry) or entry["id"] in sample_ids
+        )
+    return filtered_test_entries
+
+
+#### Sample manifest ####
+
+
+def load_sample_manifest(model_result_dir: Path) -> Optional[dict]:
+    manifest_path = model_result_dir / SAMPLE_MANIFEST_FILE_NAME
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_sample_manifest(
+    model_result_dir: Path,
+    seed: int,
+    sample_sizes: dict[str, int],
+    population_sizes: dict[str, int],
+) -> None:
+    """
+    Record the sample of the given categories, on top of the categories already in the manifest (if sampled with the
+    same seed).
+    """
+    manifest = load_sample_manifest(model_result_dir)
+    if manifest is None or manifest["seed"] != seed:
+        manifest = {"seed": seed, "categories": {}}
+    for test_category, sample_size in sample_sizes.items():
+        manifest["categories"][test_category] = {
+            "sample_size": sample_size,
+            "population_size": population_sizes[test_category],
+        }
+    model_result_dir.mkdir(parents=True, exist_ok=True)
+    with open(model_result_dir / SAMPLE_MANIFEST_FILE_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+#### Confidence intervals ####
+
+
+def _z_score(confidence_level: float) -> float:
+    return statistics.NormalDist().inv_cdf(0.5 + confidence_level / 2)
+
+
+def _finite_population_correction(sample_size: int, population_size: int) -> float:
+    if population_size <= 1:
+        return 0.0
+    return max(population_size - sample_size, 0) / (population_size - 1)
+
+
+def wilson_interval(
+    correct_count: int,
+    sample_size: int,
+    population_size: int,
+    confidence_level: float = DEFAULT_CONFIDENCE_LEVEL,
+) -> tuple[float, float]:
+    """
+    Wilson score interval of a category accuracy, with the finite population correction (the interval is empty once the
+    whole category is sampled).
+    """
+    if sample_size == 0:
+        return 0.0, 1.0
+    accuracy = correct_count / sample_size
+    correction = _finite_population_correction(sample_size, population_size)
+    if correction == 0:
+        return accuracy, accuracy
+    effective_size = sample_size / correction
+    z = _z_score(confidence_level)
+    denominator = 1 + z**2 / effective_size
+    center = (accuracy + z**2 / (2 * effective_size)) / denominator
+    half_width = (
+        z
+        * math.sqrt(accuracy * (1 - accuracy) / effective_size + z**2 / (4 * effective_size**2))
+        / denominator
+    )
+    return max(center - half_width, 0.0), min(center + half_width, 1.0)
+
+
+def _aggregate(node, accuracy_dicts: dict[str, dict]) -> dict:
+    if isinstance(node, str):
+        return accuracy_dicts[node]
+    if node[0] == "percentage_weighted":
+        _, weights, children = node
+        return calculate_percentage_weighted_accuracy(
+            [_aggregate(child, accuracy_dicts) for child in children],
+            weights,
+            display_na_if_category_missing=False,
+        )
+    aggregation, children = node
+    calculate = (
+        calculate_weighted_accuracy if aggregation == "weighted" else calculate_unweighted_accuracy
+    )
+    return calculate(
+        [_aggregate(child, accuracy_dicts) for child in children],
+        display_na_if_category_missing=False,
+    )
+
+
+def _iter_leaf_categories(node):
+    if isinstance(node, str):
+        yield node
+    else:
+        for child in node[-1]:
+            yield from _iter_leaf_categories(child)
+
+
+def get_overall_accuracy_coefficients(population_sizes: dict[str, int]) -> dict[str, float]:
+    """
+    Return the coefficient of each category accuracy in the (linear) overall accuracy of the leaderboard.
+    """
+    leaf_categories = list(_iter_leaf_categories(OVERALL_ACCURACY_TREE))
+    coefficients = {}
+    for test_category in leaf_categories:
+        accuracy_dicts = {
+            leaf_category: {
+                "accuracy": 1.0 if leaf_category == test_category else 0.0,
+                "total_count": population_sizes.get(leaf_category, 1),
+                "display_accuracy": 0.0,
+            }
+            for leaf_category in leaf_categories
+        }
+        coefficients[test_category] = _aggregate(OVERALL_ACCURACY_TREE, accuracy_dicts)["accuracy"]
+    return coefficients
+
+
+def compute_sample_summary(
+    model_scores: dict,
+    manifest: dict,
+    confidence_level: float = DEFAULT_CONFIDENCE_LEVEL,
+) -> dict:
+    """
+    Estimate the category and overall accuracies of a model from its sampled evaluation scores.
+
+    The overall accuracy is the stratified estimate over the sampled categories that count towards the leaderboard
+    overall accuracy; if some of them were not sampled, the estimate is renormalized over the sampled ones, and
+    `overall_is_complete` is False.
+    """
+    z = _z_score(confidence_level)
+    categories = {}
+    for test_category, sample_info in manifest["categories"].items():
+        if test_category not in model_scores:
+            continue
+        sample_size = model_scores[test_category]["total_count"]
+        correct_count = round(model_scores[test_category]["accuracy"] * sample_size)
+        population_size = sample_info["population_size"]
+        lower, upper = wilson_interval(correct_count, sample_size, population_size, confidence_level)
+        categories[test_category] = {
+            "accuracy": correct_count / sample_size if sample_size else 0.0,
+            "ci_lower": lower,
+            "ci_upper": upper,
+            "correct_count": correct_count,
+            "sample_size": sample_size,
+            "population_size": population_size,
+        }
+
+    coefficients = get_overall_accuracy_coefficients(
+        {
+            test_category: sample_info["population_size"]
+            for test_category, sample_info in manifest["categories"].items()
+        }
+    )
+    sampled_coefficients = {
+        test_category: coefficient
+        for test_category, coefficient in coefficients.items()
+        if test_category in categories and categories[test_category]["sample_size"] > 0
+    }
+    overall = None
+    if sampled_coefficients:
+        coefficient_sum = sum(sampled_coefficients.values())
+        estimate = 0.0
+        variance = 0.0
+        for test_category, coefficient in sampled_coefficients.items():
+            weight = coefficient / coefficient_sum
+            category = categories[test_category]
+            estimate += weight * category["accuracy"]
+            # Smoothed proportion, so that a category with all entries right (or wrong) still contributes to the variance
+            smoothed_accuracy = (category["correct_count"] + 1) / (category["sample_size"] + 2)
+            variance += (
+                weight**2
+                * smoothed_accuracy
+                * (1 - smoothed_accuracy)
+                / category["sample_size"]
+                * _finite_population_correction(category["sample_size"], category["population_size"])
+            )
+        half_width = z * math.sqrt(variance)
+        overall = {
+            "accuracy": estimate,
+            "ci_lower": max(estimate - half_width, 0.0),
+            "ci_upper": min(estimate + half_width, 1.0),
+            "ci_width": 2 * half_width,
+            "overall_is_complete": len(sampled_coefficients) == len(coefficients),
+        }
+
+    return {
+        "seed": manifest["seed"],
+        "confidence_level": confidence_level,
+        "overall": overall,
+        "categories": categories,
+    }
+
+
+#### Adaptive sampling ####
+
+
+def grow_sample_sizes(
+    sample_summary: dict, sample_sizes: dict[str, int], target_ci_width: float
+) -> dict[str, int]:
+    """
+    Return larger sample sizes expected to bring the width of the overall confidence interval down to
+    `target_ci_width`, allocated across the categories by Neyman allocation (proportionally to the coefficient of the
+    category in the overall accuracy times its standard deviation). Each sample at most doubles per round, since the
+    standard deviations are themselves estimated from the sample.
+    """
+    categories = sample_summary["categories"]
+    coefficients = get_overall_accuracy_coefficients(
+        {test_category: category["population_size"] for test_category, category in categories.items()}
+    )
+    allocation_weights = {}
+    for test_category, category in categories.items():
+        if test_category not in coefficients:
+            continue
+        smoothed_accuracy = (category["correct_count"] + 1) / (category["sample_size"] + 2)
+        allocation_weights[test_category] = coefficients[test_category] * math.sqrt(
+            smoothed_accuracy * (1 - smoothed_accuracy)
+        )
+    weight_sum = sum(allocation_weights.values())
+    if weight_sum == 0:
+        return dict(sample_sizes)
+
+    coefficient_sum = sum(coefficients[test_category] for test_category in allocation_weights)
+    target_variance = (target_ci_width / (2 * _z_score(sample_summary["confidence_level"]))) ** 2
+    # Total sample size needed under Neyman allocation, ignoring the finite population correction
+    required_total_size = (weight_sum / coefficient_sum) ** 2 / target_variance
+
+    new_sample_sizes = dict(sample_sizes)
+    for test_category, allocation_weight in allocation_weights.items():
+        current_size = sample_sizes[test_category]
+        target_size = math.ceil(required_total_size * allocation_weight / weight_sum)
+        new_sample_sizes[test_category] = min(
+            max(target_size, current_size),
+            current_size * MAX_ADAPTIVE_SAMPLING_GROWTH,
+            categories[test_category]["population_size"],
+        )
+    return new_sample_sizes
+
+
+#### Report ####
+
+
+def save_sample_summaries(score_dir: Path, sample_summaries: dict[str, dict]) -> None:
+    """
+    Write the sample summaries to the score folder, keeping the summaries of the models not evaluated this time.
+    """
+    summary_path = score_dir / SAMPLE_SUMMARY_FILE_NAME
+    all_sample_summaries = {}
+    if summary_path.exists():
+        with open(summary_path, encoding="utf-8") as f:
+            all_sample_summaries = json.load(f)
+    all_sample_summaries.update(sample_summaries)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(all_sample_summaries, f, indent=2)
+
+
+def print_sample_summary(model_name: str, sample_summary: dict) -> None:
+    confidence = f"{sample_summary['confidence_level']:.0%} CI"
+    rows = [
+        (
+            test_category,
+            f"{category['accuracy']:.2%}",
+            f"{category['ci_lower']:.2%} – {category['ci_upper']:.2%}",
+            f"{category['sample_size']}/{category['population_size']}",
+        )
+        for test_category, category in sorted(sample_summary["categories"].items())
+    ]
+    print(f"🎲 Sampled evaluation of {model_name} (seed {sample_summary['seed']}):")
+    print(
+        tabulate(
+            rows,
+            headers=["Category", "Accuracy", confidence, "Sampled"],
+            tablefmt="github",
+        )
+    )
+    overall = sample_summary["overall"]
+    if overall is not None:
+        print(
+            f"🎯 Estimated overall accuracy: {overall['accuracy']:.2%} ({confidence}: {overall['ci_lower']:.2%} – {overall['ci_upper']:.2%})"
+        )
+        if not overall["overall_is_complete"]:
+            print(
+                "⚠️ Warning: Not all the categories of the overall accuracy were sampled. The estimate is renormalized over the sampled categories."
+            )
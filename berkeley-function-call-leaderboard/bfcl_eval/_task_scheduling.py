@@ -0,0 +1,203 @@
+"""
+Cost estimates and critical-path priorities for the generation scheduler.
+
+`generate_results` dispatches the ready test entries longest-critical-path-first: the priority of an entry is its own
+estimated cost plus the largest priority among the entries that depend on it. Expensive entries (multi-turn,
+long-context, agentic) and the heads of long `depends_on` chains (memory pre-requisites) therefore start first instead
+of dominating the tail of the run.
+
+Costs are in "single-turn entry" units, the unit of the per-category priors. They come from the latencies recorded in
+previous result files (of any model) when available, and from the priors otherwise. Each model's latencies are converted
+to the same unit by dividing them by the model's median latency per prior unit, so that the entries with and without
+history are ranked on the same scale whatever the categories of the run.
+
+`generate --fifo-dispatch` turns the critical-path ordering off, and dispatches the ready entries in the order they
+become ready.
+"""
+
+import heapq
+import statistics
+from collections import defaultdict
+from pathlib import Path
+
+from bfcl_eval.utils import (
+    extract_test_category_from_id,
+    get_file_name_by_category,
+    is_agentic,
+    is_memory,
+    is_memory_prereq,
+    is_multi_turn,
+    iter_file_entries,
+)
+
+# Only the most recently updated model folders are read for the historical latencies
+HISTORY_MAX_MODELS = 5
+# Estimated number of model queries per turn, relative to a single-turn entry
+MULTI_TURN_STEPS_PER_TURN_PRIOR = 3
+AGENTIC_STEPS_PER_TURN_PRIOR = 5
+MEMORY_PREREQ_STEPS_PER_TURN_PRIOR = 2
+# Long-context entries have much longer prompts than the other multi-turn entries
+LONG_CONTEXT_COST_MULTIPLIER = 2
+
+
+def _total_latency(latency) -> float:
+    # Latency is a list of lists (in multi-turn), or a single value (in single-turn)
+    if isinstance(latency, (int, float)):
+        return float(latency)
+    if isinstance(latency, list):
+        return float(
+            sum(
+                item
+                for turn_latency in latency
+                if isinstance(turn_latency, list)
+                for item in turn_latency
+                if isinstance(item, (int, float))
+            )
+        )
+    return 0.0
+
+
+def load_historical_costs(
+    result_dir: Path, test_categories: list[str], test_entries: list[dict]
+) -> dict[str, float]:
+    """
+    Read the latencies of the given test categories from the existing result files of the most recently updated models,
+    and return the relative cost of each test entry ID, in the unit of `estimate_prior_cost`: its total latency
+    divided by the median latency per prior unit of the same model's entries among `test_entries`, averaged over the
+    models.
+    """
+    if not result_dir.exists():
+        return {}
+    file_names = set()
+    for test_category in test_categories:
+        file_names.add(get_file_name_by_category(test_category, is_result_file=True))
+        if is_memory(test_category):
+            file_names.add(
+                get_file_name_by_category(f"{test_category}_prereq", is_result_file=True)
+            )
+    prior_costs = {test_entry["id"]: estimate_prior_cost(test_entry) for test_entry in test_entries}
+
+    model_dirs = sorted(
+        (path for path in result_dir.iterdir() if path.is_dir()),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )[:HISTORY_MAX_MODELS]
+
+    relative_costs = defaultdict(list)
+    for model_dir in model_dirs:
+        model_latencies = {}
+        for file_name in file_names:
+            for file_path in model_dir.rglob(file_name):
+                try:
+                    for entry in iter_file_entries(file_path):
+                        latency = _total_latency(entry.get("latency"))
+                        if latency > 0:
+                            model_latencies[entry["id"]] = latency
+                except Exception:
+                    # A partially-written or malformed result file only means less history
+                    continue
+        latencies_per_prior_unit = [
+            latency / prior_costs[test_entry_id]
+            for test_entry_id, latency in model_latencies.items()
+            if test_entry_id in prior_costs
+        ]
+        if not latencies_per_prior_unit:
+            continue
+        latency_per_prior_unit = statistics.median(latencies_per_prior_unit)
+        for test_entry_id, latency in model_latencies.items():
+            relative_costs[test_entry_id].append(latency / latency_per_prior_unit)
+
+    return {
+        test_entry_id: statistics.fmean(costs) for test_entry_id, costs in relative_costs.items()
+    }
+
+
+def estimate_prior_cost(test_case: dict) -> float:
+    """
+    Estimate the relative cost of a test entry from its category and its number of turns, with a single-turn entry
+    costing 1.
+    """
+    test_category = extract_test_category_from_id(test_case["id"])
+    num_turns = max(len(test_case.get("question", [])), 1)
+
+    if is_memory_prereq(test_category):
+        return num_turns * MEMORY_PREREQ_STEPS_PER_TURN_PRIOR
+    if is_agentic(test_category):
+        return num_turns * AGENTIC_STEPS_PER_TURN_PRIOR
+    if is_multi_turn(test_category):
+        cost = num_turns * MULTI_TURN_STEPS_PER_TURN_PRIOR
+        if "long_context" in test_category:
+            cost *= LONG_CONTEXT_COST_MULTIPLIER
+        return cost
+    return 1.0
+
+
+def estimate_task_costs(
+    test_cases: list[dict], historical_costs: dict[str, float]
+) -> dict[str, float]:
+    return {
+        test_case["id"]: historical_costs.get(test_case["id"]) or estimate_prior_cost(test_case)
+        for test_case in test_cases
+    }
+
+
+def compute_critical_path_priorities(
+    test_cases: list[dict], task_costs: dict[str, float]
+) -> dict[str, float]:
+    """
+    Return, for each test entry, the estimated cost of the longest chain of entries starting with it
+    (the entry itself, followed by the entries that transitively depend on it).
+    """
+    children_of = defaultdict(list)
+    remaining_children = {test_case["id"]: 0 for test_case in test_cases}
+    for test_case in test_cases:
+        for dependency_id in test_case.get("depends_on", []):
+            if dependency_id in remaining_children:
+                children_of[dependency_id].append(test_case["id"])
+                remaining_children[dependency_id] += 1
+
+    # Reverse topological order: an entry is processed once all the entries depending on it have been
+    priorities = {}
+    stack = [test_case_id for test_case_id, count in remaining_children.items() if count == 0]
+    parents_of = defaultdict(list)
+    for parent_id, child_ids in children_of.items():
+        for child_id in child_ids:
+            parents_of[child_id].append(parent_id)
+    while stack:
+        test_case_id = stack.pop()
+        priorities[test_case_id] = task_costs[test_case_id] + max(
+            (priorities[child_id] for child_id in children_of[test_case_id]), default=0.0
+        )
+        for parent_id in parents_of[test_case_id]:
+            remaining_children[parent_id] -= 1
+            if remaining_children[parent_id] == 0:
+                stack.append(parent_id)
+
+    # Entries in a dependency cycle never become ready anyway; give them their own cost
+    for test_case_id in remaining_children:
+        priorities.setdefault(test_case_id, task_costs[test_case_id])
+    return priorities
+
+
+class CriticalPathReadyQueue:
+    """
+    The ready test entries, popped by decreasing critical-path priority.
+    Ties are broken by the original order of the entries, ie. by test entry ID.
+    """
+
+    def __init__(self, test_cases: list[dict], priorities: dict[str, float]):
+        self._priorities = priorities
+        self._order = {test_case["id"]: index for index, test_case in enumerate(test_cases)}
+        self._heap = []
+
+    def append(self, test_case_id: str) -> None:
+        heapq.heappush(
+            self._heap,
+            (-self._priorities[test_case_id], self._order[test_case_id], test_case_id),
+        )
+
+    def popleft(self) -> str:
+        return heapq.heappop(self._heap)[2]
+
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -25,6 +25,9 @@ DOTENV_PATH = PROJECT_ROOT / ".env"
 TEST_IDS_TO_GENERATE_PATH = PROJECT_ROOT / "test_case_ids_to_generate.json"
 # Directory that stores all lock files (kept out of the results tree)
 LOCK_DIR = PROJECT_ROOT / ".file_locks"
+# Registry and logs of the persistent local vLLM/SGLang servers
+LOCAL_SERVER_STATE_PATH = PROJECT_ROOT / ".local_servers" / "state.json"
+LOCAL_SERVER_LOG_PATH = PROJECT_ROOT / ".local_servers" / "logs"
 
 PROMPT_PATH = PACKAGE_ROOT / "data"
 MULTI_TURN_FUNC_DOC_PATH = PROMPT_PATH / "multi_turn_func_doc"
@@ -34,6 +37,8 @@ UTILS_PATH = PACKAGE_ROOT / "scripts"
 FORMAT_SENSITIVITY_IDS_PATH = PROMPT_PATH / f"{VERSION_PREFIX}_format_sensitivity.json"
 
 RESULT_FILE_PATTERN = f"{VERSION_PREFIX}_*_result.json"
+# The benchmark groups of `bfcl bench` (see `bfcl_eval/_benchmark.py`), listed here so that the CLI doesn't import them
+BENCHMARK_NAMES = ["import", "load", "decode", "ast_check", "type_convert", "multi_turn", "write", "csv"]
 
 RED_FONT = "\033[91m"
 RESET = "\033[0m"
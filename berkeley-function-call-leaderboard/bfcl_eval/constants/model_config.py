@@ -1,71 +1,83 @@
+import importlib
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Type, Union
+
+if TYPE_CHECKING:
+    from bfcl_eval.model_handler.base_handler import BaseHandler
+
+# -----------------------------------------------------------------------------
+# A mapping of handler class names to the module that defines them.
+# Handler modules pull in heavy vendor SDKs (anthropic, cohere, google-genai, transformers, ...),
+# so they are only imported when a handler is actually built, via `ModelConfig.get_model_handler`.
+# Make sure to add an entry here when adding a new handler class.
+# -----------------------------------------------------------------------------
+HANDLER_MODULE_MAPPING = {
+    # Inference through API calls
+    "ClaudeHandler": "bfcl_eval.model_handler.api_inference.claude",
+    "CohereHandler": "bfcl_eval.model_handler.api_inference.cohere",
+    "DeepSeekAPIHandler": "bfcl_eval.model_handler.api_inference.deepseek",
+    "DMCitoHandler": "bfcl_eval.model_handler.api_inference.dm_cito",
+    "FireworksHandler": "bfcl_eval.model_handler.api_inference.fireworks",
+    "FunctionaryHandler": "bfcl_eval.model_handler.api_inference.functionary",
+    "GeminiHandler": "bfcl_eval.model_handler.api_inference.gemini",
+    "GLMAPIHandler": "bfcl_eval.model_handler.api_inference.glm",
+    "GoGoAgentHandler": "bfcl_eval.model_handler.api_inference.gogoagent",
+    "GorillaHandler": "bfcl_eval.model_handler.api_inference.gorilla",
+    "GrokHandler": "bfcl_eval.model_handler.api_inference.grok",
+    "KimiHandler": "bfcl_eval.model_handler.api_inference.kimi",
+    "LingAPIHandler": "bfcl_eval.model_handler.api_inference.ling",
+    "MiningHandler": "bfcl_eval.model_handler.api_inference.mining",
+    "MistralHandler": "bfcl_eval.model_handler.api_inference.mistral",
+    "NemotronHandler": "bfcl_eval.model_handler.api_inference.nemotron",
+    "NovaHandler": "bfcl_eval.model_handler.api_inference.nova",
+    "NovitaHandler": "bfcl_eval.model_handler.api_inference.novita",
+    "NvidiaHandler": "bfcl_eval.model_handler.api_inference.nvidia",
+    "OpenAICompletionsHandler": "bfcl_eval.model_handler.api_inference.openai_completion",
+    "OpenAIResponsesHandler": "bfcl_eval.model_handler.api_inference.openai_response",
+    "QwenAPIHandler": "bfcl_eval.model_handler.api_inference.qwen",
+    "QwenAgentNoThinkHandler": "bfcl_eval.model_handler.api_inference.qwen",
+    "QwenAgentThinkHandler": "bfcl_eval.model_handler.api_inference.qwen",
+    "WriterHandler": "bfcl_eval.model_handler.api_inference.writer",
+    # Inference through local hosting
+    "ArchHandler": "bfcl_eval.model_handler.local_inference.arch",
+    "BielikHandler": "bfcl_eval.model_handler.local_inference.bielik",
+    "BitAgentHandler": "bfcl_eval.model_handler.local_inference.bitagent",
+    "DeepseekReasoningHandler": "bfcl_eval.model_handler.local_inference.deepseek_reasoning",
+    "Falcon3FCHandler": "bfcl_eval.model_handler.local_inference.falcon_fc",
+    "GemmaHandler": "bfcl_eval.model_handler.local_inference.gemma",
+    "GLMHandler": "bfcl_eval.model_handler.local_inference.glm",
+    "GraniteFunctionCallingHandler": "bfcl_eval.model_handler.local_inference.granite",
+    "Granite3FCHandler": "bfcl_eval.model_handler.local_inference.granite_3",
+    "HammerHandler": "bfcl_eval.model_handler.local_inference.hammer",
+    "K2Handler": "bfcl_eval.model_handler.local_inference.k2",
+    "K2OSSHandler": "bfcl_eval.model_handler.local_inference.k2_oss",
+    "LlamaHandler": "bfcl_eval.model_handler.local_inference.llama",
+    "LlamaHandler_3_1": "bfcl_eval.model_handler.local_inference.llama_3_1",
+    "MiniCPMHandler": "bfcl_eval.model_handler.local_inference.minicpm",
+    "MiniCPMFCHandler": "bfcl_eval.model_handler.local_inference.minicpm_fc",
+    "MistralFCHandler": "bfcl_eval.model_handler.local_inference.mistral_fc",
+    "Olmo3Handler": "bfcl_eval.model_handler.local_inference.olmo_3",
+    "PhiHandler": "bfcl_eval.model_handler.local_inference.phi",
+    "PhiFCHandler": "bfcl_eval.model_handler.local_inference.phi_fc",
+    "QuickTestingOSSHandler": "bfcl_eval.model_handler.local_inference.quick_testing_oss",
+    "QwenHandler": "bfcl_eval.model_handler.local_inference.qwen",
+    "QwenFCHandler": "bfcl_eval.model_handler.local_inference.qwen_fc",
+    "SalesforceLlamaHandler": "bfcl_eval.model_handler.local_inference.salesforce_llama",
+    "SalesforceQwenHandler": "bfcl_eval.model_handler.local_inference.salesforce_qwen",
+    "ThinkAgentHandler": "bfcl_eval.model_handler.local_inference.think_agent",
+}
+
+
+@lru_cache(maxsize=None)
+def _import_handler_class(handler_name: str) -> Type["BaseHandler"]:
+    if handler_name not in HANDLER_MODULE_MAPPING:
+        raise ValueError(
+            f"Unknown model handler '{handler_name}'. Please add it to `HANDLER_MODULE_MAPPING` in `bfcl_eval/constants/model_config.py`."
+        )
+    module = importlib.import_module(HANDLER_MODULE_MAPPING[handler_name])
+    return getattr(module, handler_name)
 
-from bfcl_eval.model_handler.api_inference.claude import ClaudeHandler
-from bfcl_eval.model_handler.api_inference.cohere import CohereHandler
-from bfcl_eval.model_handler.api_inference.deepseek import DeepSeekAPIHandler
-from bfcl_eval.model_handler.api_inference.dm_cito import DMCitoHandler
-from bfcl_eval.model_handler.api_inference.fireworks import FireworksHandler
-from bfcl_eval.model_handler.api_inference.functionary import FunctionaryHandler
-from bfcl_eval.model_handler.api_inference.gemini import GeminiHandler
-from bfcl_eval.model_handler.api_inference.glm import GLMAPIHandler
-from bfcl_eval.model_handler.api_inference.gogoagent import GoGoAgentHandler
-from bfcl_eval.model_handler.api_inference.gorilla import GorillaHandler
-from bfcl_eval.model_handler.api_inference.grok import GrokHandler
-from bfcl_eval.model_handler.api_inference.kimi import KimiHandler
-from bfcl_eval.model_handler.api_inference.ling import LingAPIHandler
-from bfcl_eval.model_handler.api_inference.mining import MiningHandler
-from bfcl_eval.model_handler.api_inference.mistral import MistralHandler
-from bfcl_eval.model_handler.api_inference.nemotron import NemotronHandler
-from bfcl_eval.model_handler.api_inference.nova import NovaHandler
-from bfcl_eval.model_handler.api_inference.novita import NovitaHandler
-from bfcl_eval.model_handler.api_inference.nvidia import NvidiaHandler
-from bfcl_eval.model_handler.api_inference.openai_completion import (
-    OpenAICompletionsHandler,
-)
-from bfcl_eval.model_handler.api_inference.openai_response import OpenAIResponsesHandler
-from bfcl_eval.model_handler.api_inference.qwen import (
-    QwenAgentNoThinkHandler,
-    QwenAgentThinkHandler,
-    QwenAPIHandler,
-)
-from bfcl_eval.model_handler.api_inference.writer import WriterHandler
-from bfcl_eval.model_handler.local_inference.arch import ArchHandler
-from bfcl_eval.model_handler.local_inference.bielik import BielikHandler
-from bfcl_eval.model_handler.local_inference.bitagent import BitAgentHandler
-from bfcl_eval.model_handler.local_inference.deepseek_reasoning import (
-    DeepseekReasoningHandler,
-)
-from bfcl_eval.model_handler.local_inference.falcon_fc import Falcon3FCHandler
-from bfcl_eval.model_handler.local_inference.gemma import GemmaHandler
-from bfcl_eval.model_handler.local_inference.glm import GLMHandler
-from bfcl_eval.model_handler.local_inference.granite import (
-    GraniteFunctionCallingHandler,
-)
-from bfcl_eval.model_handler.local_inference.olmo_3 import Olmo3Handler
-from bfcl_eval.model_handler.local_inference.granite_3 import Granite3FCHandler
-from bfcl_eval.model_handler.local_inference.hammer import HammerHandler
-from bfcl_eval.model_handler.local_inference.llama import LlamaHandler
-from bfcl_eval.model_handler.local_inference.llama_3_1 import LlamaHandler_3_1
-from bfcl_eval.model_handler.local_inference.minicpm import MiniCPMHandler
-from bfcl_eval.model_handler.local_inference.minicpm_fc import MiniCPMFCHandler
-from bfcl_eval.model_handler.local_inference.mistral_fc import MistralFCHandler
-from bfcl_eval.model_handler.local_inference.phi import PhiHandler
-from bfcl_eval.model_handler.local_inference.phi_fc import PhiFCHandler
-from bfcl_eval.model_handler.local_inference.quick_testing_oss import (
-    QuickTestingOSSHandler,
-)
-from bfcl_eval.model_handler.local_inference.qwen import QwenHandler
-from bfcl_eval.model_handler.local_inference.qwen_fc import QwenFCHandler
-from bfcl_eval.model_handler.local_inference.salesforce_llama import (
-    SalesforceLlamaHandler,
-)
-from bfcl_eval.model_handler.local_inference.salesforce_qwen import (
-    SalesforceQwenHandler,
-)
-from bfcl_eval.model_handler.local_inference.think_agent import ThinkAgentHandler
-from bfcl_eval.model_handler.local_inference.k2 import K2Handler
-from bfcl_eval.model_handler.local_inference.k2_oss import K2OSSHandler
 
 # -----------------------------------------------------------------------------
 # A mapping of model identifiers to their respective model configurations.
@@ -86,9 +98,11 @@ class ModelConfig:
         url (str): Reference URL for the model or hosting service.
         org (str): Organization providing the model.
         license (str): License under which the model is released.
-        model_handler (str): Handler name for invoking the model.
+        model_handler (str): Handler class name for invoking the model; must be a key of `HANDLER_MODULE_MAPPING`. The handler class itself is also accepted.
         input_price (Optional[float]): USD per million input tokens (None for open source models).
         output_price (Optional[float]): USD per million output tokens (None for open source models).
+        cached_input_price (Optional[float]): USD per million input tokens read from the prompt cache (None if the same as `input_price`).
+        cache_write_price (Optional[float]): USD per million input tokens written to the prompt cache (None if the same as `input_price`).
         is_fc_model (bool): True if this model is used in Function-Calling mode, otherwise False for Prompt-based mode.
         underscore_to_dot (bool): True if model does not support '.' in function names, in which case we will replace '.' with '_'. Currently this only matters for checker.  TODO: We should let the tool compilation step also take this into account.
 
@@ -100,11 +114,13 @@ class ModelConfig:
     org: str
     license: str
 
-    model_handler: str
+    model_handler: Union[str, Type["BaseHandler"]]
 
     # Prices are in USD per million tokens; open source models have None
     input_price: Optional[float] = None
     output_price: Optional[float] = None
+    cached_input_price: Optional[float] = None
+    cache_write_price: Optional[float] = None
 
     # True if the model is in function-calling mode, False if in prompt mode
     is_fc_model: bool = True
@@ -115,6 +131,14 @@ class ModelConfig:
     # Reasoning effort for thinking models (e.g., high, medium, low)
     reasoning_effort: Optional[str] = None
 
+    def get_model_handler(self) -> Type["BaseHandler"]:
+        """
+        Resolve the handler class, importing its module on first use.
+        """
+        if isinstance(self.model_handler, str):
+            return _import_handler_class(self.model_handler)
+        return self.model_handler
+
 
 # Inference through API calls
 api_inference_model_map = {
@@ -124,7 +148,7 @@ api_inference_model_map = {
         url="https://gorilla.cs.berkeley.edu/blogs/7_open_functions_v2.html",
         org="Gorilla LLM",
         license="Apache 2.0",
-        model_handler=GorillaHandler,
+        model_handler="GorillaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -136,7 +160,7 @@ api_inference_model_map = {
         url="https://api-docs.deepseek.com/news/news250528",
         org="DeepSeek",
         license="MIT",
-        model_handler=DeepSeekAPIHandler,
+        model_handler="DeepSeekAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -148,7 +172,7 @@ api_inference_model_map = {
         url="https://api-docs.deepseek.com/news/news250528",
         org="DeepSeek",
         license="MIT",
-        model_handler=DeepSeekAPIHandler,
+        model_handler="DeepSeekAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -160,7 +184,7 @@ api_inference_model_map = {
         url="https://api-docs.deepseek.com/news/news250528",
         org="DeepSeek",
         license="MIT",
-        model_handler=DeepSeekAPIHandler,
+        model_handler="DeepSeekAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -172,7 +196,7 @@ api_inference_model_map = {
         url="https://huggingface.co/openai/gpt-oss-120b",
         org="OpenAI",
         license="apache-2.0",
-        model_handler=OpenAICompletionsHandler,
+        model_handler="OpenAICompletionsHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -185,7 +209,7 @@ api_inference_model_map = {
         url="https://huggingface.co/openai/gpt-oss-120b",
         org="OpenAI",
         license="apache-2.0",
-        model_handler=OpenAICompletionsHandler,
+        model_handler="OpenAICompletionsHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -198,7 +222,7 @@ api_inference_model_map = {
         url="https://huggingface.co/openai/gpt-oss-120b",
         org="OpenAI",
         license="apache-2.0",
-        model_handler=OpenAICompletionsHandler,
+        model_handler="OpenAICompletionsHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -211,9 +235,10 @@ api_inference_model_map = {
         url="https://openai.com/index/introducing-gpt-5/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=1.25,
         output_price=10,
+        cached_input_price=0.125,
         is_fc_model=True,
         underscore_to_dot=True,
     ),
@@ -223,9 +248,10 @@ api_inference_model_map = {
         url="https://openai.com/index/introducing-gpt-5/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=1.25,
         output_price=10,
+        cached_input_price=0.125,
         is_fc_model=False,
         underscore_to_dot=False,
     ),
@@ -235,9 +261,10 @@ api_inference_model_map = {
         url="https://openai.com/index/introducing-gpt-5/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=0.25,
         output_price=2,
+        cached_input_price=0.025,
         is_fc_model=True,
         underscore_to_dot=True,
     ),
@@ -247,9 +274,10 @@ api_inference_model_map = {
         url="https://openai.com/index/introducing-gpt-5/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=0.25,
         output_price=2,
+        cached_input_price=0.025,
         is_fc_model=False,
         underscore_to_dot=False,
     ),
@@ -259,9 +287,10 @@ api_inference_model_map = {
         url="https://openai.com/index/introducing-gpt-5/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=0.05,
         output_price=0.4,
+        cached_input_price=0.005,
         is_fc_model=True,
         underscore_to_dot=True,
     ),
@@ -271,9 +300,10 @@ api_inference_model_map = {
         url="https://openai.com/index/introducing-gpt-5/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=0.05,
         output_price=0.4,
+        cached_input_price=0.005,
         is_fc_model=False,
         underscore_to_dot=False,
     ),
@@ -283,9 +313,10 @@ api_inference_model_map = {
         url="https://openai.com/index/gpt-4-1/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=2,
         output_price=8,
+        cached_input_price=0.5,
         is_fc_model=True,
         underscore_to_dot=True,
     ),
@@ -295,9 +326,10 @@ api_inference_model_map = {
         url="https://openai.com/index/gpt-4-1/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=2,
         output_price=8,
+        cached_input_price=0.5,
         is_fc_model=False,
         underscore_to_dot=False,
     ),
@@ -307,9 +339,10 @@ api_inference_model_map = {
         url="https://openai.com/index/gpt-4-1/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=0.4,
         output_price=1.6,
+        cached_input_price=0.1,
         is_fc_model=True,
         underscore_to_dot=True,
     ),
@@ -319,9 +352,10 @@ api_inference_model_map = {
         url="https://openai.com/index/gpt-4-1/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=0.4,
         output_price=1.6,
+        cached_input_price=0.1,
         is_fc_model=False,
         underscore_to_dot=False,
     ),
@@ -331,9 +365,10 @@ api_inference_model_map = {
         url="https://openai.com/index/gpt-4-1/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=0.1,
         output_price=0.4,
+        cached_input_price=0.025,
         is_fc_model=True,
         underscore_to_dot=True,
     ),
@@ -343,9 +378,10 @@ api_inference_model_map = {
         url="https://openai.com/index/gpt-4-1/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=0.1,
         output_price=0.4,
+        cached_input_price=0.025,
         is_fc_model=False,
         underscore_to_dot=False,
     ),
@@ -355,9 +391,10 @@ api_inference_model_map = {
         url="https://openai.com/index/hello-gpt-4o/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=2.5,
         output_price=10,
+        cached_input_price=1.25,
         is_fc_model=False,
         underscore_to_dot=False,
     ),
@@ -367,9 +404,10 @@ api_inference_model_map = {
         url="https://openai.com/index/hello-gpt-4o/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=2.5,
         output_price=10,
+        cached_input_price=1.25,
         is_fc_model=True,
         underscore_to_dot=True,
     ),
@@ -379,9 +417,10 @@ api_inference_model_map = {
         url="https://openai.com/index/gpt-4o-mini-advancing-cost-efficient-intelligence/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=0.15,
         output_price=0.6,
+        cached_input_price=0.075,
         is_fc_model=False,
         underscore_to_dot=False,
     ),
@@ -391,9 +430,10 @@ api_inference_model_map = {
         url="https://openai.com/index/gpt-4o-mini-advancing-cost-efficient-intelligence/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=0.15,
         output_price=0.6,
+        cached_input_price=0.075,
         is_fc_model=True,
         underscore_to_dot=True,
     ),
@@ -403,9 +443,10 @@ api_inference_model_map = {
         url="https://openai.com/index/introducing-o3-and-o4-mini/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=2,
         output_price=8,
+        cached_input_price=0.5,
         is_fc_model=False,
         underscore_to_dot=False,
     ),
@@ -415,9 +456,10 @@ api_inference_model_map = {
         url="https://openai.com/index/introducing-o3-and-o4-mini/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=2,
         output_price=8,
+        cached_input_price=0.5,
         is_fc_model=True,
         underscore_to_dot=True,
     ),
@@ -427,9 +469,10 @@ api_inference_model_map = {
         url="https://openai.com/index/introducing-o3-and-o4-mini/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=1.10,
         output_price=4.40,
+        cached_input_price=0.275,
         is_fc_model=False,
         underscore_to_dot=False,
     ),
@@ -439,9 +482,10 @@ api_inference_model_map = {
         url="https://openai.com/index/introducing-o3-and-o4-mini/",
         org="OpenAI",
         license="Proprietary",
-        model_handler=OpenAIResponsesHandler,
+        model_handler="OpenAIResponsesHandler",
         input_price=1.10,
         output_price=4.40,
+        cached_input_price=0.275,
         is_fc_model=True,
         underscore_to_dot=True,
     ),
@@ -451,9 +495,11 @@ api_inference_model_map = {
         url="https://www.anthropic.com/news/claude-4",
         org="Anthropic",
         license="Proprietary",
-        model_handler=ClaudeHandler,
+        model_handler="ClaudeHandler",
         input_price=15,
         output_price=75,
+        cached_input_price=1.5,
+        cache_write_price=18.75,
         is_fc_model=False,
         underscore_to_dot=False,
     ),
@@ -463,9 +509,11 @@ api_inference_model_map = {
         url="https://www.anthropic.com/news/claude-4",
         org="Anthropic",
         license="Proprietary",
-        model_handler=ClaudeHandler,
+        model_handler="ClaudeHandler",
         input_price=15,
         output_price=75,
+        cached_input_price=1.5,
+        cache_write_price=18.75,
         is_fc_model=True,
         underscore_to_dot=True,
     ),
@@ -475,9 +523,11 @@ api_inference_model_map = {
         url="https://www.anthropic.com/news/claude-sonnet-4-5",
         org="Anthropic",
         license="Proprietary",
-        model_handler=ClaudeHandler,
+        model_handler="ClaudeHandler",
         input_price=3,
         output_price=15,
+        cached_input_price=0.3,
+        cache_write_price=3.75,
         is_fc_model=False,
         underscore_to_dot=False,
     ),
@@ -487,9 +537,11 @@ api_inference_model_map = {
         url="https://www.anthropic.com/news/claude-sonnet-4-5",
         org="Anthropic",
         license="Proprietary",
-        model_handler=ClaudeHandler,
+        model_handler="ClaudeHandler",
         input_price=3,
         output_price=15,
+        cached_input_price=0.3,
+        cache_write_price=3.75,
         is_fc_model=True,
         underscore_to_dot=True,
     ),
@@ -499,9 +551,11 @@ api_inference_model_map = {
         url="https://www.anthropic.com/news/claude-haiku-4-5",
         org="Anthropic",
         license="Proprietary",
-        model_handler=ClaudeHandler,
+        model_handler="ClaudeHandler",
         input_price=0.8,
         output_price=4,
+        cached_input_price=0.08,
+        cache_write_price=1,
         is_fc_model=False,
         underscore_to_dot=False,
     ),
@@ -511,9 +565,11 @@ api_inference_model_map = {
         url="https://www.anthropic.com/news/claude-haiku-4-5",
         org="Anthropic",
         license="Proprietary",
-        model_handler=ClaudeHandler,
+        model_handler="ClaudeHandler",
         input_price=0.8,
         output_price=4,
+        cached_input_price=0.08,
+        cache_write_price=1,
         is_fc_model=True,
         underscore_to_dot=True,
     ),
@@ -523,7 +579,7 @@ api_inference_model_map = {
         url="https://aws.amazon.com/cn/ai/generative-ai/nova/",
         org="Amazon",
         license="Proprietary",
-        model_handler=NovaHandler,
+        model_handler="NovaHandler",
         input_price=0.8,
         output_price=3.2,
         is_fc_model=True,
@@ -535,7 +591,7 @@ api_inference_model_map = {
         url="https://aws.amazon.com/cn/ai/generative-ai/nova/",
         org="Amazon",
         license="Proprietary",
-        model_handler=NovaHandler,
+        model_handler="NovaHandler",
         input_price=0.06,
         output_price=0.24,
         is_fc_model=True,
@@ -547,7 +603,7 @@ api_inference_model_map = {
         url="https://aws.amazon.com/cn/ai/generative-ai/nova/",
         org="Amazon",
         license="Proprietary",
-        model_handler=NovaHandler,
+        model_handler="NovaHandler",
         input_price=0.035,
         output_price=0.14,
         is_fc_model=True,
@@ -559,7 +615,7 @@ api_inference_model_map = {
         url="https://mistral.ai/news/mistral-nemo/",
         org="Mistral AI",
         license="Proprietary",
-        model_handler=MistralHandler,
+        model_handler="MistralHandler",
         input_price=0.15,
         output_price=0.15,
         is_fc_model=False,
@@ -571,7 +627,7 @@ api_inference_model_map = {
         url="https://mistral.ai/news/mistral-nemo/",
         org="Mistral AI",
         license="Proprietary",
-        model_handler=MistralHandler,
+        model_handler="MistralHandler",
         input_price=0.15,
         output_price=0.15,
         is_fc_model=True,
@@ -583,7 +639,7 @@ api_inference_model_map = {
         url="https://docs.mistral.ai/guides/model-selection/",
         org="Mistral AI",
         license="Proprietary",
-        model_handler=MistralHandler,
+        model_handler="MistralHandler",
         input_price=2,
         output_price=6,
         is_fc_model=False,
@@ -595,7 +651,7 @@ api_inference_model_map = {
         url="https://docs.mistral.ai/guides/model-selection/",
         org="Mistral AI",
         license="Proprietary",
-        model_handler=MistralHandler,
+        model_handler="MistralHandler",
         input_price=2,
         output_price=6,
         is_fc_model=True,
@@ -607,7 +663,7 @@ api_inference_model_map = {
         url="https://docs.mistral.ai/guides/model-selection/",
         org="Mistral AI",
         license="Proprietary",
-        model_handler=MistralHandler,
+        model_handler="MistralHandler",
         input_price=0.1,
         output_price=0.3,
         is_fc_model=False,
@@ -619,7 +675,7 @@ api_inference_model_map = {
         url="https://docs.mistral.ai/guides/model-selection/",
         org="Mistral AI",
         license="Proprietary",
-        model_handler=MistralHandler,
+        model_handler="MistralHandler",
         input_price=0.1,
         output_price=0.3,
         is_fc_model=True,
@@ -631,7 +687,7 @@ api_inference_model_map = {
         url="https://docs.mistral.ai/guides/model-selection/",
         org="Mistral AI",
         license="Proprietary",
-        model_handler=MistralHandler,
+        model_handler="MistralHandler",
         input_price=0.4,
         output_price=2,
         is_fc_model=False,
@@ -643,7 +699,7 @@ api_inference_model_map = {
         url="https://docs.mistral.ai/guides/model-selection/",
         org="Mistral AI",
         license="Proprietary",
-        model_handler=MistralHandler,
+        model_handler="MistralHandler",
         input_price=0.4,
         output_price=2,
         is_fc_model=True,
@@ -655,7 +711,7 @@ api_inference_model_map = {
         url="https://huggingface.co/fireworks-ai/firefunction-v2",
         org="Fireworks",
         license="Apache 2.0",
-        model_handler=FireworksHandler,
+        model_handler="FireworksHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -667,7 +723,7 @@ api_inference_model_map = {
         url="https://deepmind.google/technologies/gemini/flash-lite/",
         org="Google",
         license="Proprietary",
-        model_handler=GeminiHandler,
+        model_handler="GeminiHandler",
         input_price=0.1,
         output_price=0.4,
         is_fc_model=True,
@@ -679,7 +735,7 @@ api_inference_model_map = {
         url="https://deepmind.google/technologies/gemini/flash-lite/",
         org="Google",
         license="Proprietary",
-        model_handler=GeminiHandler,
+        model_handler="GeminiHandler",
         input_price=0.1,
         output_price=0.4,
         is_fc_model=False,
@@ -691,7 +747,7 @@ api_inference_model_map = {
         url="https://deepmind.google/technologies/gemini/flash/",
         org="Google",
         license="Proprietary",
-        model_handler=GeminiHandler,
+        model_handler="GeminiHandler",
         input_price=0.3,
         output_price=2.5,
         is_fc_model=True,
@@ -703,7 +759,7 @@ api_inference_model_map = {
         url="https://deepmind.google/technologies/gemini/flash/",
         org="Google",
         license="Proprietary",
-        model_handler=GeminiHandler,
+        model_handler="GeminiHandler",
         input_price=0.3,
         output_price=2.5,
         is_fc_model=False,
@@ -715,7 +771,7 @@ api_inference_model_map = {
         url="https://deepmind.google/technologies/gemini/pro/",
         org="Google",
         license="Proprietary",
-        model_handler=GeminiHandler,
+        model_handler="GeminiHandler",
         input_price=1.5,
         output_price=10,
         is_fc_model=True,
@@ -727,7 +783,7 @@ api_inference_model_map = {
         url="https://deepmind.google/technologies/gemini/pro/",
         org="Google",
         license="Proprietary",
-        model_handler=GeminiHandler,
+        model_handler="GeminiHandler",
         input_price=1.5,
         output_price=10,
         is_fc_model=False,
@@ -739,7 +795,7 @@ api_inference_model_map = {
         url="https://huggingface.co/meetkai/functionary-small-v3.1",
         org="MeetKai",
         license="MIT",
-        model_handler=FunctionaryHandler,
+        model_handler="FunctionaryHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -751,7 +807,7 @@ api_inference_model_map = {
         url="https://huggingface.co/meetkai/functionary-medium-v3.1",
         org="MeetKai",
         license="MIT",
-        model_handler=FunctionaryHandler,
+        model_handler="FunctionaryHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -763,7 +819,7 @@ api_inference_model_map = {
         url="https://cohere.com/blog/command-r7b",
         org="Cohere",
         license="cc-by-nc-4.0",
-        model_handler=CohereHandler,
+        model_handler="CohereHandler",
         input_price=0.0375,
         output_price=0.15,
         is_fc_model=True,
@@ -775,7 +831,7 @@ api_inference_model_map = {
         url="https://cohere.com/blog/command-a",
         org="Cohere",
         license="CC-BY-NC 4.0 License (w/ Acceptable Use Addendum)",
-        model_handler=CohereHandler,
+        model_handler="CohereHandler",
         input_price=2.5,
         output_price=10,
         is_fc_model=True,
@@ -787,7 +843,7 @@ api_inference_model_map = {
         url="https://cohere.com/blog/command-a-reasoning",
         org="Cohere",
         license="CC-BY-NC 4.0 License (w/ Acceptable Use Addendum)",
-        model_handler=CohereHandler,
+        model_handler="CohereHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -799,7 +855,7 @@ api_inference_model_map = {
         url="https://huggingface.co/nvidia/Llama-3_1-Nemotron-Ultra-253B-v1",
         org="NVIDIA",
         license="nvidia-open-model-license",
-        model_handler=NemotronHandler,
+        model_handler="NemotronHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -811,7 +867,7 @@ api_inference_model_map = {
         url="https://huggingface.co/nvidia/nemotron-4-340b-instruct",
         org="NVIDIA",
         license="nvidia-open-model-license",
-        model_handler=NvidiaHandler,
+        model_handler="NvidiaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -823,7 +879,7 @@ api_inference_model_map = {
         url="https://gogoagent.ai",
         org="BitAgent",
         license="Proprietary",
-        model_handler=GoGoAgentHandler,
+        model_handler="GoGoAgentHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -835,7 +891,7 @@ api_inference_model_map = {
         url="https://writer.com/engineering/actions-with-palmyra-x-004/",
         org="Writer",
         license="Proprietary",
-        model_handler=WriterHandler,
+        model_handler="WriterHandler",
         input_price=5,
         output_price=12,
         is_fc_model=True,
@@ -847,7 +903,7 @@ api_inference_model_map = {
         url="https://docs.x.ai/docs/models",
         org="xAI",
         license="Proprietary",
-        model_handler=GrokHandler,
+        model_handler="GrokHandler",
         input_price=3,
         output_price=15,
         is_fc_model=True,
@@ -859,7 +915,7 @@ api_inference_model_map = {
         url="https://docs.x.ai/docs/models",
         org="xAI",
         license="Proprietary",
-        model_handler=GrokHandler,
+        model_handler="GrokHandler",
         input_price=3,
         output_price=15,
         is_fc_model=False,
@@ -871,7 +927,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-0.6B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -883,7 +939,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-0.6B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -895,7 +951,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-1.7B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -907,7 +963,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-1.7B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -919,7 +975,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-4B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -931,7 +987,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-4B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -943,7 +999,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-8B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -955,7 +1011,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-8B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -967,7 +1023,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-14B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -979,7 +1035,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-14B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -991,7 +1047,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-32B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1003,7 +1059,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-32B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1015,7 +1071,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-30B-A3B-Instruct-2507",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1027,7 +1083,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-30B-A3B-Instruct-2507",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1039,7 +1095,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-235B-A22B-Instruct-2507",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1051,7 +1107,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-235B-A22B-Instruct-2507",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1063,7 +1119,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/QwQ-32B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1075,7 +1131,7 @@ api_inference_model_map = {
         url="https://huggingface.co/Qwen/QwQ-32B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAPIHandler,
+        model_handler="QwenAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1087,7 +1143,7 @@ api_inference_model_map = {
         url="https://www.mininglamp.com/",
         org="Mininglamp",
         license="Proprietary",
-        model_handler=MiningHandler,
+        model_handler="MiningHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1099,7 +1155,7 @@ api_inference_model_map = {
         url="https://www.mininglamp.com/",
         org="Mininglamp",
         license="Proprietary",
-        model_handler=DMCitoHandler,
+        model_handler="DMCitoHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1111,7 +1167,7 @@ api_inference_model_map = {
         url="https://huggingface.co/inclusionAI/Ling-lite-1.5",
         org="Ling",
         license="MIT",
-        model_handler=LingAPIHandler,
+        model_handler="LingAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1123,7 +1179,7 @@ api_inference_model_map = {
         url="https://huggingface.co/zai-org/GLM-4.5",
         org="Zhipu AI",
         license="MIT",
-        model_handler=GLMAPIHandler,
+        model_handler="GLMAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1135,7 +1191,7 @@ api_inference_model_map = {
         url="https://huggingface.co/zai-org/GLM-4.5-Air",
         org="Zhipu AI",
         license="MIT",
-        model_handler=GLMAPIHandler,
+        model_handler="GLMAPIHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1147,7 +1203,7 @@ api_inference_model_map = {
         url="https://huggingface.co/moonshotai/Kimi-K2-Instruct",
         org="MoonshotAI",
         license="modified-mit",
-        model_handler=KimiHandler,
+        model_handler="KimiHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1159,7 +1215,7 @@ api_inference_model_map = {
         url="https://huggingface.co/moonshotai/Kimi-K2-Instruct",
         org="MoonshotAI",
         license="modified-mit",
-        model_handler=KimiHandler,
+        model_handler="KimiHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1175,7 +1231,7 @@ local_inference_model_map = {
         url="https://huggingface.co/deepseek-ai/DeepSeek-R1",
         org="DeepSeek",
         license="MIT",
-        model_handler=DeepseekReasoningHandler,
+        model_handler="DeepseekReasoningHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1187,7 +1243,7 @@ local_inference_model_map = {
         url="https://huggingface.co/allenai/Olmo-3-7B-Think",
         org="AllenAI",
         license="MIT",
-        model_handler=Olmo3Handler,
+        model_handler="Olmo3Handler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1199,7 +1255,7 @@ local_inference_model_map = {
         url="https://huggingface.co/allenai/Olmo-3-32B-Think",
         org="AllenAI",
         license="MIT",
-        model_handler=Olmo3Handler,
+        model_handler="Olmo3Handler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1211,7 +1267,7 @@ local_inference_model_map = {
         url="",
         org="MBZUAI-IFM",
         license="Proprietary",
-        model_handler=K2OSSHandler,
+        model_handler="K2OSSHandler",
         is_fc_model=True,
         reasoning_effort="high",
     ),
@@ -1221,7 +1277,7 @@ local_inference_model_map = {
         url="",
         org="MBZUAI-IFM",
         license="Proprietary",
-        model_handler=K2OSSHandler,
+        model_handler="K2OSSHandler",
         is_fc_model=True,
         reasoning_effort="medium",
     ),
@@ -1231,7 +1287,7 @@ local_inference_model_map = {
         url="",
         org="MBZUAI-IFM",
         license="Proprietary",
-        model_handler=K2OSSHandler,
+        model_handler="K2OSSHandler",
         is_fc_model=True,
         reasoning_effort="low",
     ),
@@ -1241,7 +1297,7 @@ local_inference_model_map = {
         url="",
         org="MBZUAI-IFM",
         license="Proprietary",
-        model_handler=K2Handler,
+        model_handler="K2Handler",
         is_fc_model=True,
         reasoning_effort="high",
     ),
@@ -1251,7 +1307,7 @@ local_inference_model_map = {
         url="",
         org="MBZUAI-IFM",
         license="Proprietary",
-        model_handler=K2Handler,
+        model_handler="K2Handler",
         is_fc_model=True,
         reasoning_effort="medium",
     ),
@@ -1261,7 +1317,7 @@ local_inference_model_map = {
         url="",
         org="MBZUAI-IFM",
         license="Proprietary",
-        model_handler=K2Handler,
+        model_handler="K2Handler",
         is_fc_model=True,
         reasoning_effort="low",
     ),
@@ -1271,7 +1327,7 @@ local_inference_model_map = {
         url="https://blog.google/technology/developers/gemma-3/",
         org="Google",
         license="gemma-terms-of-use",
-        model_handler=GemmaHandler,
+        model_handler="GemmaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1283,7 +1339,7 @@ local_inference_model_map = {
         url="https://blog.google/technology/developers/gemma-3/",
         org="Google",
         license="gemma-terms-of-use",
-        model_handler=GemmaHandler,
+        model_handler="GemmaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1295,7 +1351,7 @@ local_inference_model_map = {
         url="https://blog.google/technology/developers/gemma-3/",
         org="Google",
         license="gemma-terms-of-use",
-        model_handler=GemmaHandler,
+        model_handler="GemmaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1307,7 +1363,7 @@ local_inference_model_map = {
         url="https://blog.google/technology/developers/gemma-3/",
         org="Google",
         license="gemma-terms-of-use",
-        model_handler=GemmaHandler,
+        model_handler="GemmaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1319,7 +1375,7 @@ local_inference_model_map = {
         url="https://llama.meta.com/llama3",
         org="Meta",
         license="Meta Llama 3 Community",
-        model_handler=LlamaHandler_3_1,
+        model_handler="LlamaHandler_3_1",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1331,7 +1387,7 @@ local_inference_model_map = {
         url="https://llama.meta.com/llama3",
         org="Meta",
         license="Meta Llama 3 Community",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1343,7 +1399,7 @@ local_inference_model_map = {
         url="https://llama.meta.com/llama3",
         org="Meta",
         license="Meta Llama 3 Community",
-        model_handler=LlamaHandler_3_1,
+        model_handler="LlamaHandler_3_1",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1355,7 +1411,7 @@ local_inference_model_map = {
         url="https://llama.meta.com/llama3",
         org="Meta",
         license="Meta Llama 3 Community",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1367,7 +1423,7 @@ local_inference_model_map = {
         url="https://llama.meta.com/llama3",
         org="Meta",
         license="Meta Llama 3 Community",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1379,7 +1435,7 @@ local_inference_model_map = {
         url="https://llama.meta.com/llama3",
         org="Meta",
         license="Meta Llama 3 Community",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1391,7 +1447,7 @@ local_inference_model_map = {
         url="https://llama.meta.com/llama3",
         org="Meta",
         license="Meta Llama 3 Community",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1403,7 +1459,7 @@ local_inference_model_map = {
         url="https://huggingface.co/meta-llama/Llama-4-Scout-17B-16E-Instruct",
         org="Meta",
         license="Meta Llama 4 Community",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1415,7 +1471,7 @@ local_inference_model_map = {
         url="https://huggingface.co/meta-llama/Llama-4-Maverick-17B-128E-Instruct-FP8",
         org="Meta",
         license="Meta Llama 4 Community",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1427,7 +1483,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Salesforce/Llama-xLAM-2-70b-fc-r",
         org="Salesforce",
         license="cc-by-nc-4.0",
-        model_handler=SalesforceLlamaHandler,
+        model_handler="SalesforceLlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1439,7 +1495,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Salesforce/Llama-xLAM-2-8b-fc-r",
         org="Salesforce",
         license="cc-by-nc-4.0",
-        model_handler=SalesforceLlamaHandler,
+        model_handler="SalesforceLlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1451,7 +1507,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Salesforce/xLAM-2-32b-fc-r",
         org="Salesforce",
         license="cc-by-nc-4.0",
-        model_handler=SalesforceQwenHandler,
+        model_handler="SalesforceQwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1463,7 +1519,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Salesforce/xLAM-2-3b-fc-r",
         org="Salesforce",
         license="cc-by-nc-4.0",
-        model_handler=SalesforceQwenHandler,
+        model_handler="SalesforceQwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1475,7 +1531,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Salesforce/xLAM-2-1b-fc-r",
         org="Salesforce",
         license="cc-by-nc-4.0",
-        model_handler=SalesforceQwenHandler,
+        model_handler="SalesforceQwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1487,7 +1543,7 @@ local_inference_model_map = {
         url="https://huggingface.co/mistralai/Ministral-8B-Instruct-2410",
         org="Mistral AI",
         license="Mistral AI Research License",
-        model_handler=MistralFCHandler,
+        model_handler="MistralFCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1499,7 +1555,7 @@ local_inference_model_map = {
         url="https://huggingface.co/microsoft/phi-4",
         org="Microsoft",
         license="MIT",
-        model_handler=PhiHandler,
+        model_handler="PhiHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1511,7 +1567,7 @@ local_inference_model_map = {
         url="https://huggingface.co/microsoft/Phi-4-mini-instruct",
         org="Microsoft",
         license="MIT",
-        model_handler=PhiHandler,
+        model_handler="PhiHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1523,7 +1579,7 @@ local_inference_model_map = {
         url="https://huggingface.co/microsoft/Phi-4-mini-instruct",
         org="Microsoft",
         license="MIT",
-        model_handler=PhiFCHandler,
+        model_handler="PhiFCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1535,7 +1591,7 @@ local_inference_model_map = {
         url="https://huggingface.co/ibm-granite/granite-3.2-8b-instruct",
         org="IBM",
         license="Apache-2.0",
-        model_handler=Granite3FCHandler,
+        model_handler="Granite3FCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1547,7 +1603,7 @@ local_inference_model_map = {
         url="https://huggingface.co/ibm-granite/granite-3.1-8b-instruct",
         org="IBM",
         license="Apache-2.0",
-        model_handler=Granite3FCHandler,
+        model_handler="Granite3FCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1559,7 +1615,7 @@ local_inference_model_map = {
         url="https://huggingface.co/ibm-granite/granite-20b-functioncalling",
         org="IBM",
         license="Apache-2.0",
-        model_handler=GraniteFunctionCallingHandler,
+        model_handler="GraniteFunctionCallingHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1571,7 +1627,7 @@ local_inference_model_map = {
         url="https://huggingface.co/MadeAgents/Hammer2.1-7b",
         org="MadeAgents",
         license="cc-by-nc-4.0",
-        model_handler=HammerHandler,
+        model_handler="HammerHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1583,7 +1639,7 @@ local_inference_model_map = {
         url="https://huggingface.co/MadeAgents/Hammer2.1-3b",
         org="MadeAgents",
         license="qwen-research",
-        model_handler=HammerHandler,
+        model_handler="HammerHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1595,7 +1651,7 @@ local_inference_model_map = {
         url="https://huggingface.co/MadeAgents/Hammer2.1-1.5b",
         org="MadeAgents",
         license="cc-by-nc-4.0",
-        model_handler=HammerHandler,
+        model_handler="HammerHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1607,7 +1663,7 @@ local_inference_model_map = {
         url="https://huggingface.co/MadeAgents/Hammer2.1-0.5b",
         org="MadeAgents",
         license="cc-by-nc-4.0",
-        model_handler=HammerHandler,
+        model_handler="HammerHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1619,7 +1675,7 @@ local_inference_model_map = {
         url="https://huggingface.co/THUDM/glm-4-9b-chat",
         org="THUDM",
         license="glm-4",
-        model_handler=GLMHandler,
+        model_handler="GLMHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1631,7 +1687,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen2.5-72B-Instruct",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenFCHandler,
+        model_handler="QwenFCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1643,7 +1699,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-0.6B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenFCHandler,
+        model_handler="QwenFCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1655,7 +1711,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-0.6B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenHandler,
+        model_handler="QwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1667,7 +1723,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-1.7B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenFCHandler,
+        model_handler="QwenFCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1679,7 +1735,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-1.7B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenHandler,
+        model_handler="QwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1691,7 +1747,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-4B-Instruct-2507",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenFCHandler,
+        model_handler="QwenFCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1703,7 +1759,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-4B-Instruct-2507",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenHandler,
+        model_handler="QwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1715,7 +1771,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-8B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenFCHandler,
+        model_handler="QwenFCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1727,7 +1783,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-8B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenHandler,
+        model_handler="QwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1739,7 +1795,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-14B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenFCHandler,
+        model_handler="QwenFCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1751,7 +1807,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-14B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenHandler,
+        model_handler="QwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1763,7 +1819,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-32B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenFCHandler,
+        model_handler="QwenFCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1775,7 +1831,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-32B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenHandler,
+        model_handler="QwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1787,7 +1843,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-30B-A3B-Instruct-2507",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenFCHandler,
+        model_handler="QwenFCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1799,7 +1855,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-30B-A3B-Instruct-2507",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenHandler,
+        model_handler="QwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1811,7 +1867,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-235B-A22B-Instruct-2507",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenFCHandler,
+        model_handler="QwenFCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1823,7 +1879,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-235B-A22B-Instruct-2507",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenHandler,
+        model_handler="QwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1835,7 +1891,7 @@ local_inference_model_map = {
         url="https://huggingface.co/Team-ACE/ToolACE-2-8B",
         org="Huawei Noah & USTC",
         license="Apache-2.0",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1847,7 +1903,7 @@ local_inference_model_map = {
         url="https://huggingface.co/openbmb/MiniCPM3-4B",
         org="openbmb",
         license="Apache-2.0",
-        model_handler=MiniCPMHandler,
+        model_handler="MiniCPMHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1859,7 +1915,7 @@ local_inference_model_map = {
         url="https://huggingface.co/openbmb/MiniCPM3-4B",
         org="openbmb",
         license="Apache-2.0",
-        model_handler=MiniCPMFCHandler,
+        model_handler="MiniCPMFCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1871,7 +1927,7 @@ local_inference_model_map = {
         url="https://huggingface.co/watt-ai/watt-tool-8B/",
         org="Watt AI Lab",
         license="Apache-2.0",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1883,7 +1939,7 @@ local_inference_model_map = {
         url="https://huggingface.co/watt-ai/watt-tool-70B/",
         org="Watt AI Lab",
         license="Apache-2.0",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1895,7 +1951,7 @@ local_inference_model_map = {
         url="https://huggingface.co/ZJared/Haha-7B",
         org="TeleAI",
         license="Apache 2.0",
-        model_handler=QwenHandler,
+        model_handler="QwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1907,7 +1963,7 @@ local_inference_model_map = {
         url="https://huggingface.co/speakleash/Bielik-11B-v2.3-Instruct",
         org="SpeakLeash & ACK Cyfronet AGH",
         license="Apache 2.0",
-        model_handler=BielikHandler,
+        model_handler="BielikHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1919,7 +1975,7 @@ local_inference_model_map = {
         url="https://huggingface.co/NovaSky-AI/Sky-T1-32B-Preview",
         org="NovaSky-AI",
         license="apache-2.0",
-        model_handler=QwenHandler,
+        model_handler="QwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1931,7 +1987,7 @@ local_inference_model_map = {
         url="https://huggingface.co/tiiuae/Falcon3-10B-Instruct",
         org="TII UAE",
         license="falcon-llm-license",
-        model_handler=Falcon3FCHandler,
+        model_handler="Falcon3FCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1943,7 +1999,7 @@ local_inference_model_map = {
         url="https://huggingface.co/tiiuae/Falcon3-7B-Instruct",
         org="TII UAE",
         license="falcon-llm-license",
-        model_handler=Falcon3FCHandler,
+        model_handler="Falcon3FCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1955,7 +2011,7 @@ local_inference_model_map = {
         url="https://huggingface.co/tiiuae/Falcon3-3B-Instruct",
         org="TII UAE",
         license="falcon-llm-license",
-        model_handler=Falcon3FCHandler,
+        model_handler="Falcon3FCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1967,7 +2023,7 @@ local_inference_model_map = {
         url="https://huggingface.co/tiiuae/Falcon3-1B-Instruct",
         org="TII UAE",
         license="falcon-llm-license",
-        model_handler=Falcon3FCHandler,
+        model_handler="Falcon3FCHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1979,7 +2035,7 @@ local_inference_model_map = {
         url="https://huggingface.co/uiuc-convai/CoALM-8B",
         org="UIUC + Oumi",
         license="Meta Llama 3 Community",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -1991,7 +2047,7 @@ local_inference_model_map = {
         url="https://huggingface.co/uiuc-convai/CoALM-70B",
         org="UIUC + Oumi",
         license="Meta Llama 3 Community",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -2003,7 +2059,7 @@ local_inference_model_map = {
         url="https://huggingface.co/uiuc-convai/CoALM-405B",
         org="UIUC + Oumi",
         license="Meta Llama 3 Community",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -2015,7 +2071,7 @@ local_inference_model_map = {
         url="https://huggingface.co/katanemo/Arch-Agent-1.5B",
         org="katanemo",
         license="katanemo-research",
-        model_handler=ArchHandler,
+        model_handler="ArchHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -2027,7 +2083,7 @@ local_inference_model_map = {
         url="https://huggingface.co/katanemo/Arch-Agent-3B",
         org="katanemo",
         license="katanemo-research",
-        model_handler=ArchHandler,
+        model_handler="ArchHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -2039,7 +2095,7 @@ local_inference_model_map = {
         url="https://huggingface.co/katanemo/Arch-Agent-7B",
         org="katanemo",
         license="katanemo-research",
-        model_handler=ArchHandler,
+        model_handler="ArchHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -2051,7 +2107,7 @@ local_inference_model_map = {
         url="https://huggingface.co/katanemo/Arch-Agent-32B",
         org="katanemo",
         license="katanemo-research",
-        model_handler=ArchHandler,
+        model_handler="ArchHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -2063,7 +2119,7 @@ local_inference_model_map = {
         url="https://huggingface.co/BitAgent/BitAgent-8B/",
         org="Bittensor",
         license="Apache-2.0",
-        model_handler=LlamaHandler,
+        model_handler="LlamaHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -2075,7 +2131,7 @@ local_inference_model_map = {
         url="https://huggingface.co/BitAgent/BitAgent-Bounty-8B",
         org="Bittensor",
         license="Apache-2.0",
-        model_handler=BitAgentHandler,
+        model_handler="BitAgentHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -2087,7 +2143,7 @@ local_inference_model_map = {
         url="https://huggingface.co/ThinkAgents/ThinkAgent-1B",
         org="ThinkAgents",
         license="apache-2.0",
-        model_handler=ThinkAgentHandler,
+        model_handler="ThinkAgentHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -2099,7 +2155,7 @@ local_inference_model_map = {
         url="https://huggingface.co/phronetic-ai/RZN-T",
         org="Phronetic AI",
         license="apache-2.0",
-        model_handler=QwenHandler,
+        model_handler="QwenHandler",
         input_price=None,
         output_price=None,
         is_fc_model=False,
@@ -2116,7 +2172,7 @@ third_party_inference_model_map = {
         url="https://huggingface.co/meta-llama/Llama-4-Maverick-17B-128E-Instruct-FP8",
         org="Meta",
         license="Meta Llama 4 Community",
-        model_handler=NovitaHandler,
+        model_handler="NovitaHandler",
         input_price=0.2,
         output_price=0.85,
         is_fc_model=False,
@@ -2128,7 +2184,7 @@ third_party_inference_model_map = {
         url="https://huggingface.co/meta-llama/Llama-4-Maverick-17B-128E-Instruct-FP8",
         org="Meta",
         license="Meta Llama 4 Community",
-        model_handler=NovitaHandler,
+        model_handler="NovitaHandler",
         input_price=0.2,
         output_price=0.85,
         is_fc_model=True,
@@ -2140,7 +2196,7 @@ third_party_inference_model_map = {
         url="https://huggingface.co/meta-llama/Llama-4-Scout-17B-16E-Instruct",
         org="Meta",
         license="Meta Llama 4 Community",
-        model_handler=NovitaHandler,
+        model_handler="NovitaHandler",
         input_price=0.1,
         output_price=0.5,
         is_fc_model=False,
@@ -2152,7 +2208,7 @@ third_party_inference_model_map = {
         url="https://huggingface.co/meta-llama/Llama-4-Scout-17B-16E-Instruct",
         org="Meta",
         license="Meta Llama 4 Community",
-        model_handler=NovitaHandler,
+        model_handler="NovitaHandler",
         input_price=0.1,
         output_price=0.5,
         is_fc_model=True,
@@ -2164,7 +2220,7 @@ third_party_inference_model_map = {
         url="https://huggingface.co/Qwen/QwQ-32B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=NovitaHandler,
+        model_handler="NovitaHandler",
         input_price=0.18,
         output_price=0.2,
         is_fc_model=True,
@@ -2176,7 +2232,7 @@ third_party_inference_model_map = {
         url="https://huggingface.co/Qwen/QwQ-32B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=NovitaHandler,
+        model_handler="NovitaHandler",
         input_price=0.18,
         output_price=0.2,
         is_fc_model=False,
@@ -2189,7 +2245,7 @@ third_party_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-4B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAgentThinkHandler,
+        model_handler="QwenAgentThinkHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -2201,7 +2257,7 @@ third_party_inference_model_map = {
         url="https://huggingface.co/Qwen/Qwen3-4B",
         org="Qwen",
         license="apache-2.0",
-        model_handler=QwenAgentNoThinkHandler,
+        model_handler="QwenAgentNoThinkHandler",
         input_price=None,
         output_price=None,
         is_fc_model=True,
@@ -1,167 +1,346 @@
 import re
-from typing import List, Dict, Union
+from typing import Callable, Dict, List, Optional, Set, Union
+
 from bfcl_eval.constants.type_mappings import JAVA_TYPE_CONVERSION
+from bfcl_eval.eval_checker.ast_eval.type_convertor.literal_parser import (
+    find_closing_bracket,
+    might_be_number,
+    split_bracket_body,
+    split_top_level,
+)
+
+#### Precompiled patterns ####
+
+_INTEGER_PATTERN = re.compile(r"^-?\d+$")
+_FLOAT_PATTERN = re.compile(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?[fF]$")
+_DOUBLE_PATTERN = re.compile(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?$")
+_LONG_PATTERN = re.compile(r"^-?\d+[lL]$")
+_FLOAT_SUFFIX_PATTERN = re.compile(r"[fF]$")
+_LONG_SUFFIX_PATTERN = re.compile(r"[lL]$")
+
+# Array, ArrayList and HashMap literals are matched as they have always been, so that their grading does not change
+_ARRAY_PATTERN = re.compile(r"new\s+\w+\[\]\s*\{(.*?)\}")
+_ARRAYLIST_AS_LIST_PATTERN = re.compile(r"new\s+ArrayList<\w*>\(Arrays\.asList\((.+?)\)\)")
+_ARRAYLIST_ADD_PATTERN = re.compile(
+    r"new\s+ArrayList<\w*>\(\)\s*\{\{\s*(.+?)\s*\}\}", re.DOTALL
+)
+_ARRAYLIST_ADD_CALL_PATTERN = re.compile(r"add\((.+?)\)")
+_EMPTY_ARRAYLIST_PATTERN = re.compile(r"new\s+ArrayList<\w*>\(\)")
+_HASHMAP_PATTERN = re.compile(
+    r"new\s+HashMap<.*?>\s*\(\)\s*\{\s*\{?\s*(.*?)\s*\}?\s*\}", re.DOTALL
+)
+_HASHMAP_PUT_CALL_PATTERN = re.compile(r"put\(\"(.*?)\",\s*(.*?)\)")
+_EMPTY_HASHMAP_PATTERN = re.compile(r"new\s+HashMap<.*?>\s*\(\)")
+
+# The start of the other collection literals, up to and including the opening bracket of the constructor arguments
+_SET_START_PATTERN = re.compile(
+    r"new\s+(?:HashSet|LinkedHashSet|TreeSet)\s*(?:<[^()]*>)?\s*\("
+)
+_QUEUE_START_PATTERN = re.compile(
+    r"new\s+(?:LinkedList|ArrayDeque|PriorityQueue)\s*(?:<[^()]*>)?\s*\("
+)
+_STACK_START_PATTERN = re.compile(r"new\s+Stack\s*(?:<[^()]*>)?\s*\(")
+_HASHTABLE_START_PATTERN = re.compile(r"new\s+Hashtable\s*(?:<[^()]*>)?\s*\(")
+
+# Factory methods whose arguments are the elements, eg. `Arrays.asList(1, 2)`
+_SEQUENCE_FACTORY_PATTERN = re.compile(r"\s*(?:Arrays\.asList|List\.of|Set\.of)\s*\(")
+_CLOSING_PARENTHESIS_PATTERN = re.compile(r"\s*\)")
+_BLOCK_START_PATTERN = re.compile(r"\s*\{")
+# Methods used in an initializer block, eg. `new ArrayList<>() {{ add(1); add(2); }}`
+_ADD_ELEMENT_CALL_PATTERN = re.compile(r"\b(?:add|addLast|offer|push)\s*\(")
+_PUT_ENTRY_CALL_PATTERN = re.compile(r"\bput\s*\(")
+
+
+#### Scalar converters ####
+
+
+def _convert_integer(value):
+    # Plain digits are the common case, and cheaper to check than the pattern
+    if not (value.isdecimal() or _INTEGER_PATTERN.match(value)):
+        return str(value)  # default to string
+    return int(value)
+
+
+def _convert_float(value):
+    if not _FLOAT_PATTERN.match(value):
+        return str(value)  # default to string
+    return float(_FLOAT_SUFFIX_PATTERN.sub("", value))
+
+
+def _convert_double(value):
+    if not (value.isdecimal() or _DOUBLE_PATTERN.match(value)):
+        return str(value)  # default to string
+    return float(value)
+
+
+def _convert_long(value):
+    if not _LONG_PATTERN.match(value):
+        return str(value)  # default to string
+    return int(_LONG_SUFFIX_PATTERN.sub("", value))
+
+
+def _convert_boolean(value):
+    if value == "true":
+        return True
+    if value == "false":
+        return False
+    return str(value)  # default to string
+
+
+_SCALAR_CONVERTERS: Dict[str, Callable] = {
+    "byte": _convert_integer,
+    "short": _convert_integer,
+    "integer": _convert_integer,
+    "float": _convert_float,
+    "double": _convert_double,
+    "long": _convert_long,
+    "boolean": _convert_boolean,
+    # char values are kept as is, including the single quotes
+    "char": str,
+    "String": str,
+    "any": str,  # we output as string for `any` type
+}
 
 
 def java_type_converter(value, expected_type, nested_type=None):
     if expected_type not in JAVA_TYPE_CONVERSION:
         raise ValueError(f"Unsupported type: {expected_type}")
-    if (
-        expected_type == "byte"
-        or expected_type == "short"
-        or expected_type == "integer"
-    ):
-        if not re.match(r"^-?\d+$", value):
-            return str(value)  # default to string
-        return int(value)
-    elif expected_type == "float":
-        if not re.match(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?[fF]$", value):
-            return str(value)  # default to string
-        return float(re.sub(r"[fF]$", "", value))
-    elif expected_type == "double":
-        if not re.match(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?$", value):
-            return str(value)  # default to string
-        return float(value)
-    elif expected_type == "long":
-        if not re.match(r"^-?\d+[lL]$", value):
-            return str(value)  # default to string
-        return int(re.sub(r"[lL]$", "", value))
-    elif expected_type == "boolean":
-        if value not in ["true", "false"]:
-            return str(value)  # default to string
-        return parse_java_boolean(value)
-    elif expected_type == "char":
-        if not re.match(r"^\'.$\'", value):
-            return str(value)  # default to string
-        return value  # Remove the single quotes
-    elif expected_type == "Array" or expected_type == "ArrayList":
-        return parse_java_collection(value, expected_type, nested_type)
-    elif expected_type == "Set":
-        raise NotImplementedError("Set conversion is not implemented")
-    elif expected_type == "HashMap":
-        return parse_java_collection(value, expected_type, nested_type)
-    elif expected_type == "Hashtable":
-        raise NotImplementedError("Set conversion is not implemented")
-    elif expected_type == "Queue" or expected_type == "Stack":
-        raise NotImplementedError(f"{expected_type} conversion is not implemented")
-    elif expected_type == "String" or expected_type == "any":
-        return str(value)  # we output as string for `any` type
-    else:
-        raise ValueError(f"Unsupported type: {expected_type}")
+
+    scalar_converter = _SCALAR_CONVERTERS.get(expected_type)
+    if scalar_converter is not None:
+        return scalar_converter(value)
+    return parse_java_collection(value, expected_type, nested_type)
 
 
 def parse_java_boolean(value):
     return value == "true"
 
 
+#### Collection converters ####
+
+
 def parse_java_collection(
     input_str: str, type_str: str, nested_type=None
-) -> Union[List, Dict]:
-    if type_str == "ArrayList":
-        return parse_arraylist(input_str, nested_type)
-    elif type_str == "Array":
-        return parse_array(input_str, nested_type)
-    elif type_str == "HashMap":
-        return parse_hashmap(input_str)
-    else:
+) -> Union[List, Set, Dict]:
+    collection_parser = _COLLECTION_PARSERS.get(type_str)
+    if collection_parser is None:
         raise ValueError(f"Unsupported type: {type_str}")
-
-
-def parse_arraylist(input_str: str, nested_type=None) -> List:
-    match_asList = re.search(
-        r"new\s+ArrayList<\w*>\(Arrays\.asList\((.+?)\)\)", input_str
-    )
-    if match_asList:
-        elements_str = match_asList.group(1)
-        elements = []
-        for element_str in elements_str.split(","):
-            element_str = element_str.strip()
-            if nested_type == "char":
-                element = element_str[1:-1]  # Remove the single quotes
-            elif nested_type == "String":
-                element = element_str[1:-1]  # Remove the double quotes
-            else:
-                element = (
-                    java_type_converter(element_str, nested_type)
-                    if nested_type
-                    else parse_java_value(element_str)
-                )
-            elements.append(element)
+    return collection_parser(input_str, nested_type)
+
+
+def _strip_quotes(element_str: str) -> str:
+    return element_str[1:-1]  # Remove the single/double quotes
+
+
+def _get_element_converter(nested_type=None) -> Callable:
+    if nested_type == "char" or nested_type == "String":
+        return _strip_quotes
+    if nested_type:
+        return _SCALAR_CONVERTERS.get(nested_type) or (
+            lambda element_str: java_type_converter(element_str, nested_type)
+        )
+    return parse_java_value
+
+
+def _parse_factory_call(input_str: str, position: int = 0) -> Optional[tuple[List[str], int]]:
+    """
+    Parse a factory call like `Arrays.asList(1, 2)` at `position`.
+    Return its element strings and the index right after the call, or None if there is no such call.
+    """
+    match = _SEQUENCE_FACTORY_PATTERN.match(input_str, position)
+    if not match:
+        return None
+    elements, end = split_bracket_body(input_str, match.end() - 1)
+    if elements is None:
+        return None
+    return elements, end + 1
+
+
+def _parse_initializer_block(
+    input_str: str, position: int, call_pattern: re.Pattern
+) -> List[str]:
+    """
+    Return the argument strings of each call (eg. `add(...)`) in the initializer block starting at `position`, if any.
+    Both the double-brace (`{{ add(1); }}`) and the single-brace (`{ add(1); }`) forms are accepted.
+    """
+    block_match = _BLOCK_START_PATTERN.match(input_str, position)
+    if not block_match:
+        return []
+    # The block ends at the last closing brace
+    block_end = input_str.rfind("}")
+
+    arguments = []
+    match = call_pattern.search(input_str, block_match.end(), block_end)
+    while match:
+        call_end = find_closing_bracket(input_str, match.end() - 1)
+        if call_end == -1 or call_end > block_end:
+            break
+        arguments.append(input_str[match.end() : call_end].strip())
+        match = call_pattern.search(input_str, call_end + 1, block_end)
+    return arguments
+
+
+def _parse_sequence(input_str: str, start_pattern: re.Pattern) -> Optional[List[str]]:
+    """
+    Return the element strings of a sequence collection literal, or None if `input_str` does not contain one. Supported forms:
+        - `new HashSet<>(Arrays.asList(1, 2))` (or `List.of`, `Set.of`)
+        - `new HashSet<>() {{ add(1); add(2); }}`
+        - `new HashSet<>()`
+        - `Set.of(1, 2)` (or `Arrays.asList`, `List.of`)
+    """
+    match = start_pattern.search(input_str)
+    if not match:
+        factory_call = _parse_factory_call(input_str)
+        if factory_call is None or input_str[factory_call[1] :].strip():
+            return None
+        return factory_call[0]
+
+    factory_call = _parse_factory_call(input_str, match.end())
+    if factory_call is not None:
+        elements, end = factory_call
+        if not _CLOSING_PARENTHESIS_PATTERN.match(input_str, end):
+            return None
         return elements
 
-    match_add = re.search(
-        r"new\s+ArrayList<\w*>\(\)\s*\{\{\s*(.+?)\s*\}\}", input_str, re.DOTALL
+    closing_match = _CLOSING_PARENTHESIS_PATTERN.match(input_str, match.end())
+    if not closing_match:
+        # Any other constructor argument (eg. the initial capacity) is not a literal
+        return None
+    return _parse_initializer_block(
+        input_str, closing_match.end(), _ADD_ELEMENT_CALL_PATTERN
     )
+
+
+def _parse_sequence_collection(
+    input_str: str, start_pattern: re.Pattern, nested_type=None
+) -> Union[List, str]:
+    elements = _parse_sequence(input_str, start_pattern)
+    if elements is None:
+        return input_str  # default to string
+    convert_element = _get_element_converter(nested_type)
+    return [convert_element(element) for element in elements]
+
+
+def _parse_map_collection(input_str: str, start_pattern: re.Pattern) -> Union[Dict, str]:
+    """
+    Parse `new Hashtable<>() {{ put("key", value); }}` or `new Hashtable<>()`.
+    """
+    match = start_pattern.search(input_str)
+    if not match:
+        return input_str  # default to string
+    closing_match = _CLOSING_PARENTHESIS_PATTERN.match(input_str, match.end())
+    if not closing_match:
+        return input_str  # default to string
+
+    elements = {}
+    for arguments in _parse_initializer_block(
+        input_str, closing_match.end(), _PUT_ENTRY_CALL_PATTERN
+    ):
+        key_and_value = split_top_level(arguments, maxsplit=1)
+        if len(key_and_value) != 2:
+            continue
+        key, value = key_and_value
+        elements[parse_java_value(key)] = parse_java_value(value)
+    return elements
+
+
+def _convert_arraylist_element(element_str: str, nested_type=None):
+    if nested_type == "char" or nested_type == "String":
+        return element_str[1:-1]  # Remove the single/double quotes
+    if nested_type:
+        return java_type_converter(element_str, nested_type)
+    return parse_java_value(element_str)
+
+
+def parse_arraylist(input_str: str, nested_type=None) -> List:
+    match_as_list = _ARRAYLIST_AS_LIST_PATTERN.search(input_str)
+    if match_as_list:
+        return [
+            _convert_arraylist_element(element_str.strip(), nested_type)
+            for element_str in match_as_list.group(1).split(",")
+        ]
+
+    match_add = _ARRAYLIST_ADD_PATTERN.search(input_str)
     if match_add:
-        adds_str = match_add.group(1)
-        elements = []
-        matches = re.findall(r"add\((.+?)\)", adds_str)
-        for match in matches:
-            value_str = match.strip()
-            if nested_type == "char":
-                value = value_str[1:-1]  # Remove the single quotes
-            elif nested_type == "String":
-                value = value_str[1:-1]  # Remove the double quotes
-            else:
-                value = (
-                    java_type_converter(value_str, nested_type)
-                    if nested_type
-                    else parse_java_value(value_str)
-                )
-            elements.append(value)
-        return elements
+        return [
+            _convert_arraylist_element(value_str.strip(), nested_type)
+            for value_str in _ARRAYLIST_ADD_CALL_PATTERN.findall(match_add.group(1))
+        ]
 
-    match_empty = re.search(r"new\s+ArrayList<\w*>\(\)", input_str)
-    if match_empty:
+    if _EMPTY_ARRAYLIST_PATTERN.search(input_str):
         return []  # Return an empty list for an empty ArrayList
 
     return input_str  # default to string
 
 
 def parse_array(input_str: str, nested_type=None) -> List:
-    match = re.search(r"new\s+\w+\[\]\s*\{(.*?)\}", input_str)
-    if match:
-        elements_str = match.group(1)
-        if nested_type:
-            elements = [
-                java_type_converter(x.strip(), nested_type)
-                for x in elements_str.split(",")
-                if x.strip()
-            ]
-        else:
-            elements = [
-                parse_java_value(x.strip())
-                for x in elements_str.split(",")
-                if x.strip()
-            ]
+    match = _ARRAY_PATTERN.search(input_str)
+    if not match:
+        return input_str  # default to string
 
-        return elements
+    if nested_type:
+        convert_element = _SCALAR_CONVERTERS.get(nested_type) or (
+            lambda element_str: java_type_converter(element_str, nested_type)
+        )
     else:
+        convert_element = parse_java_value
+    elements = []
+    for element_str in match.group(1).split(","):
+        element_str = element_str.strip()
+        if element_str:
+            elements.append(convert_element(element_str))
+    return elements
+
+
+def parse_set(input_str: str, nested_type=None) -> Set:
+    elements = _parse_sequence_collection(input_str, _SET_START_PATTERN, nested_type)
+    if isinstance(elements, str):
+        return elements
+    try:
+        return set(elements)
+    except TypeError:
+        # Unhashable elements (eg. nested collections)
         return input_str  # default to string
 
 
-def parse_hashmap(input_str: str) -> Dict:
-    elements = {}
-    match = re.search(
-        r"new\s+HashMap<.*?>\s*\(\)\s*\{\s*\{?\s*(.*?)\s*\}?\s*\}", input_str, re.DOTALL
-    )
+def parse_queue(input_str: str, nested_type=None) -> List:
+    return _parse_sequence_collection(input_str, _QUEUE_START_PATTERN, nested_type)
+
+
+def parse_stack(input_str: str, nested_type=None) -> List:
+    # Elements are ordered from the bottom to the top of the stack
+    return _parse_sequence_collection(input_str, _STACK_START_PATTERN, nested_type)
+
+
+def parse_hashmap(input_str: str, nested_type=None) -> Dict:
+    match = _HASHMAP_PATTERN.search(input_str)
     if match:
-        puts_str = match.group(1)
-        if puts_str.strip():
-            matches = re.findall(r"put\(\"(.*?)\",\s*(.*?)\)", puts_str)
-            for match in matches:
-                key = match[0]
-                value = parse_java_value(match[1].strip())
-                elements[key] = value
-        return elements
+        return {
+            key: parse_java_value(value_str.strip())
+            for key, value_str in _HASHMAP_PUT_CALL_PATTERN.findall(match.group(1))
+        }
 
-    match_empty = re.search(r"new\s+HashMap<.*?>\s*\(\)", input_str)
-    if match_empty:
+    if _EMPTY_HASHMAP_PATTERN.search(input_str):
         return {}  # Return an empty dictionary for an empty HashMap
 
     return input_str  # default to string
 
 
+def parse_hashtable(input_str: str, nested_type=None) -> Dict:
+    return _parse_map_collection(input_str, _HASHTABLE_START_PATTERN)
+
+
+_COLLECTION_PARSERS: Dict[str, Callable] = {
+    "Array": parse_array,
+    "ArrayList": parse_arraylist,
+    "Set": parse_set,
+    "HashMap": parse_hashmap,
+    "Hashtable": parse_hashtable,
+    "Queue": parse_queue,
+    "Stack": parse_stack,
+}
+
+
 # This method parses without the information of what each element type is, contrary of the previous
 def parse_java_value(value_str: str):
     # check if it's boolean
@@ -172,12 +351,15 @@ def parse_java_value(value_str: str):
     # check if it's a string
     elif value_str.startswith('"') and value_str.endswith('"'):
         return value_str[1:-1]
+    # check if it's not a number at all, without paying for the failed conversions below
+    elif not might_be_number(value_str):
+        return value_str
     # check if it's a long
-    elif re.match(r"^-?\d+[lL]$", value_str):
+    elif _LONG_PATTERN.match(value_str):
         return int(value_str[:-1])
     # check if it's a float
-    elif re.match(r"^-?\d+(\.\d+)?([eE][+-]?\d+)?[fF]$", value_str):
-        return float(re.sub(r"[fF]$", "", value_str))
+    elif _FLOAT_PATTERN.match(value_str):
+        return float(_FLOAT_SUFFIX_PATTERN.sub("", value_str))
     # check if it's a integer-like and float-like types (including byte, short, integer, double, etc)
     else:
         try:
@@ -291,26 +473,44 @@ def test_java_type_converter():
     except ValueError as e:
         assert str(e) == "Invalid char value: abc"
 
-    # Test unsupported types
-    try:
-        java_type_converter("abc", "Set")
-    except NotImplementedError as e:
-        assert str(e) == "Set conversion is not implemented"
-
-    try:
-        java_type_converter("abc", "Hashtable")
-    except NotImplementedError as e:
-        assert str(e) == "Set conversion is not implemented"
+    # Test the other collection types
+    assert java_type_converter('new HashSet<>(Arrays.asList("a", "b"))', "Set") == {"a", "b"}
+    assert java_type_converter("new TreeSet<Integer>() {{ add(1); add(2); }}", "Set") == {1, 2}
+    assert java_type_converter("Set.of(1, 2)", "Set") == {1, 2}
+    assert java_type_converter("new HashSet<>()", "Set") == set()
+    assert java_type_converter(
+        'new Hashtable<String, Integer>() {{ put("key", 1); }}', "Hashtable"
+    ) == {"key": 1}
+    assert java_type_converter("new Hashtable<>()", "Hashtable") == {}
+    assert java_type_converter(
+        "new LinkedList<>(Arrays.asList(1, 2, 3))", "Queue"
+    ) == [1, 2, 3]
+    assert java_type_converter(
+        'new ArrayDeque<String>() {{ offer("a"); offer("b"); }}', "Queue"
+    ) == ["a", "b"]
+    assert java_type_converter(
+        "new Stack<Integer>() {{ push(1); push(2); }}", "Stack"
+    ) == [1, 2]
+    assert java_type_converter("abc", "Set") == "abc"
+    assert java_type_converter("abc", "Stack") == "abc"
 
-    try:
-        java_type_converter("abc", "Queue")
-    except NotImplementedError as e:
-        assert str(e) == "Queue conversion is not implemented"
+    # Test elements that contain separators
+    assert java_type_converter(
+        'new LinkedList<>(Arrays.asList("a, b", "c)"))', "Queue"
+    ) == ["a, b", "c)"]
+    assert java_type_converter(
+        'new Hashtable<String, String>() {{ put("key", "value (1)"); }}', "Hashtable"
+    ) == {"key": "value (1)"}
 
-    try:
-        java_type_converter("abc", "Stack")
-    except NotImplementedError as e:
-        assert str(e) == "Stack conversion is not implemented"
+    # Array, ArrayList and HashMap literals are parsed as they have always been, so their grading does not change
+    assert java_type_converter("Arrays.asList(1, 2)", "ArrayList") == "Arrays.asList(1, 2)"
+    assert java_type_converter(
+        "new ArrayList<>(List.of(1,2))", "ArrayList"
+    ) == "new ArrayList<>(List.of(1,2))"
+    assert java_type_converter(
+        'new HashMap<String, int[]>() {{ put("a", new int[]{1}); }}', "HashMap"
+    ) == {}
+    assert java_type_converter("new int[]{1,\n2}", "Array") == "new int[]{1,\n2}"
 
     # extra array testing
     assert java_type_converter("new int[]{}", "Array") == []
@@ -1,118 +1,142 @@
 import re
+from typing import Callable, Dict
+
 from bfcl_eval.constants.type_mappings import JS_TYPE_CONVERSION
+from bfcl_eval.eval_checker.ast_eval.type_convertor.literal_parser import might_be_number
+
+#### Precompiled patterns ####
+
+_INTEGER_PATTERN = re.compile(r"^-?\d+$")
+_FLOAT_PATTERN = re.compile(r"^-?\d+(\.\d+)?$")
+_BIGINT_PATTERN = re.compile(r"^-?\d+n$")
+
+_ARRAY_2D_PATTERN = re.compile(
+    r"\[\s*\[.*?\]\s*(,\s*\[.*?\]\s*)*\]|\bnew\s+Array\(\s*\[.*?\]\s*(,\s*\[.*?\]\s*)*\)"
+)
+_ARRAY_PATTERN = re.compile(r"\[(.*?)\]|\bnew\s+Array\((.*?)\)")
+_INNER_ARRAY_PATTERN = re.compile(r"\[(.*?)\]")
+_DICT_PATTERN = re.compile(r"\{(.*?)\}")
+_DICT_PAIR_PATTERN = re.compile(r"([^:]+):\s*(.*?)(?:,\s*(?=[^,]+:)|$)")
+
+
+#### Scalar converters ####
+
+
+def _convert_string(value):
+    if not (value.startswith('"') and value.endswith('"')) and not (
+        value.startswith("'") and value.endswith("'")
+    ):
+        return str(value)
+    return value[1:-1]
+
+
+def _convert_integer(value):
+    # Plain digits are the common case, and cheaper to check than the pattern
+    if not (value.isdecimal() or _INTEGER_PATTERN.match(value)):
+        return str(value)  # default to string
+    return int(value)
+
+
+def _convert_float(value):
+    if not (value.isdecimal() or _FLOAT_PATTERN.match(value)):
+        return str(value)  # default to string
+    return float(value)
+
+
+def _convert_bigint(value):
+    if not _BIGINT_PATTERN.match(value):
+        return str(value)  # default to string
+    return int(value[:-1])
+
+
+def _convert_boolean(value):
+    if value == "true":
+        return True
+    if value == "false":
+        return False
+    return str(value)  # default to string
+
+
+_SCALAR_CONVERTERS: Dict[str, Callable] = {
+    "String": _convert_string,
+    "integer": _convert_integer,
+    "float": _convert_float,
+    "Bigint": _convert_bigint,
+    "Boolean": _convert_boolean,
+    "any": str,
+}
 
 
 def js_type_converter(value, expected_type, nested_type=None):
     if expected_type not in JS_TYPE_CONVERSION:
         raise ValueError(f"Unsupported type: {expected_type}")
 
-    if expected_type == "String":
-        if not (value.startswith('"') and value.endswith('"')) and not (
-            value.startswith("'") and value.endswith("'")
-        ):
-            return str(value)
-        return value[1:-1]
-
-    elif expected_type == "integer":
-        if not re.match(r"^-?\d+$", value):
-            return str(value)  # default to string
-        return int(value)
-    elif expected_type == "float":
-        if not re.match(r"^-?\d+(\.\d+)?$", value):
-            return str(value)  # default to string
-        return float(value)
-    elif expected_type == "Bigint":
-        if not re.match(r"^-?\d+n$", value):
-            return str(value)  # default to string
-        return int(value[:-1])
-    elif expected_type == "Boolean":
-        if value not in ["true", "false"]:
-            return str(value)  # default to string
-        return value == "true"
-    elif expected_type == "dict":
-        return parse_js_collection(value, "dict", nested_type)
-    elif expected_type == "array":
-        return parse_js_collection(value, "array", nested_type)
-    elif expected_type == "any":
-        return str(value)
+    scalar_converter = _SCALAR_CONVERTERS.get(expected_type)
+    if scalar_converter is not None:
+        return scalar_converter(value)
+    elif expected_type == "dict" or expected_type == "array":
+        return parse_js_collection(value, expected_type, nested_type)
     else:
         raise ValueError(f"Unsupported type: {expected_type}")
 
 
+#### Collection converters ####
+
+
+def _convert_array_element(element_str: str, nested_type: str):
+    if element_str.startswith("'") or element_str.startswith('"'):
+        return js_type_converter(element_str, nested_type, "String")
+    return js_type_converter(element_str, nested_type)
+
+
 def parse_js_collection(code, type_str, nested_type=None):
     code = code.strip()
     if type_str == "array":
-        # Regular expression patterns
-        array_2d_pattern = r"\[\s*\[.*?\]\s*(,\s*\[.*?\]\s*)*\]|\bnew\s+Array\(\s*\[.*?\]\s*(,\s*\[.*?\]\s*)*\)"
-        array_pattern = r"\[(.*?)\]|\bnew\s+Array\((.*?)\)"
-
         # Check if the code is a 2D array
-        array_2d_match = re.match(array_2d_pattern, code)
+        array_2d_match = _ARRAY_2D_PATTERN.match(code)
         try:
             if array_2d_match:
-                elements_str = array_2d_match.group(0)
-                inner_arrays = re.findall(r"\[(.*?)\]", elements_str)
                 elements = []
-                for idx, inner_array_str in enumerate(inner_arrays):
+                for idx, inner_array_str in enumerate(
+                    _INNER_ARRAY_PATTERN.findall(array_2d_match.group(0))
+                ):
                     inner_array_str = inner_array_str.strip()
                     if idx == 0 and inner_array_str.startswith("["):
                         inner_array_str = inner_array_str[1:]
-                    inner_array_elements = [
-                        e.strip() for e in inner_array_str.split(",")
-                    ]
-                    if nested_type:
-                        inner_array = [parse_js_value(e) for e in inner_array_elements]
-                    else:
-                        inner_array = [parse_js_value(e) for e in inner_array_elements]
-                    elements.append(inner_array)
+                    # The nested type is not used for 2D arrays; each element is parsed as a plain value
+                    elements.append(
+                        [parse_js_value(e.strip()) for e in inner_array_str.split(",")]
+                    )
                 return elements
 
             # Check if the code is a 1D array
-            array_match = re.match(array_pattern, code)
-            if array_match:
-                if array_match.group(1) is not None:
-                    elements_str = array_match.group(1).strip()
-                    if elements_str:
-                        elements = elements_str.split(",")
-                    else:
-                        elements = []
-                elif array_match.group(2) is not None:
-                    elements_str = array_match.group(2).strip()
-                    if elements_str:
-                        elements = elements_str.split(",")
-                    else:
-                        elements = []
-                else:
-                    elements = []
-                if nested_type:
-                    elements = [
-                        (
-                            js_type_converter(e.strip(), nested_type, "String")
-                            if (e.strip().startswith("'") or e.strip().startswith('"'))
-                            else js_type_converter(e.strip(), nested_type)
-                        )
-                        for e in elements
-                    ]
-                else:
-                    elements = [parse_js_value(e.strip()) for e in elements]
-                return elements
-            else:
+            array_match = _ARRAY_PATTERN.match(code)
+            if not array_match:
                 return code
+            elements_str = array_match.group(1)
+            if elements_str is None:
+                elements_str = array_match.group(2)
+            elements_str = elements_str.strip() if elements_str is not None else ""
+            elements = elements_str.split(",") if elements_str else []
+            if nested_type:
+                # Scalar elements are converted directly, whether they are quoted or not
+                convert_element = _SCALAR_CONVERTERS.get(nested_type)
+                if convert_element is not None:
+                    return [convert_element(e.strip()) for e in elements]
+                return [_convert_array_element(e.strip(), nested_type) for e in elements]
+            return [parse_js_value(e.strip()) for e in elements]
         except:
             return code
 
     elif type_str == "dict":
         if code == "{}":
             return {}  # Return an empty dictionary for an empty object
-        dict_pattern = r"\{(.*?)\}"
         # Check if the code is a dictionary
-        dict_match = re.match(dict_pattern, code)
+        dict_match = _DICT_PATTERN.match(code)
         if dict_match:
             try:
-                content = dict_match.group(1)
-                pairs = re.findall(r"([^:]+):\s*(.*?)(?:,\s*(?=[^,]+:)|$)", content)
                 dictionary = {}
-                for key, value in pairs:
+                for key, value in _DICT_PAIR_PATTERN.findall(dict_match.group(1)):
                     key = key.strip().strip("'\"")
                     value = value.strip()
                     if value.startswith("[") and value.endswith("]"):
@@ -143,6 +167,9 @@ def parse_js_value(value_str: str):
         value_str.startswith("'") and value_str.endswith("'")
     ):
         return value_str[1:-1]
+    # Not a number at all, without paying for the failed conversions below
+    elif not might_be_number(value_str):
+        return value_str
     else:
         try:
             return int(value_str)
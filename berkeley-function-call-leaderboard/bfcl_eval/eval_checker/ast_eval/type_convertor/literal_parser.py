@@ -0,0 +1,146 @@
+"""
+A small recursive-descent helper for the Java/JavaScript collection literals emitted by the models.
+
+The type converters locate the start of a literal with a precompiled pattern, and then use these helpers to find where
+it ends and to split its body into elements. String/char literals and nested brackets are skipped over, so commas and
+brackets inside them no longer break the element boundaries.
+"""
+
+import re
+from typing import Optional
+
+_MATCHING_BRACKETS = {"(": ")", "[": "]", "{": "}"}
+_OPENING_BRACKETS = frozenset("([{")
+_CLOSING_BRACKETS = frozenset(")]}")
+_QUOTES = frozenset("\"'`")
+
+# Text without these characters (and with balanced quotes) can be handled with a plain `str.find` or `str.split`
+_BRACKET_OR_ESCAPE_PATTERN = re.compile(r"[()\[\]{}\\]")
+_BRACKET_QUOTE_OR_ESCAPE_PATTERN = re.compile(r"[()\[\]{}\"'`\\]")
+_BRACKET_OR_QUOTE_PATTERN = re.compile(r"[()\[\]{}\"'`]")
+_SEPARATOR_PATTERNS = {
+    ",": re.compile(r"[()\[\]{}\"'`,]"),
+    ":": re.compile(r"[()\[\]{}\"'`:]"),
+}
+# The only values `float` accepts without any decimal digit, up to the case, the sign and the surrounding whitespace
+_NON_DIGIT_FLOATS = frozenset(("inf", "infinity", "nan"))
+_DIGIT_PATTERN = re.compile(r"\d")
+# The rest of a string literal after its opening quote (escapes included)
+_STRING_LITERAL_END_PATTERNS = {
+    '"': re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL),
+    "'": re.compile(r"(?:[^'\\]|\\.)*'", re.DOTALL),
+    "`": re.compile(r"(?:[^`\\]|\\.)*`", re.DOTALL),
+}
+
+
+def _has_balanced_quotes(text: str) -> bool:
+    return text.count('"') % 2 == 0 and text.count("'") % 2 == 0 and text.count("`") % 2 == 0
+
+
+def _skip_string_literal(text: str, quote_index: int) -> int:
+    """
+    Return the index right after the string literal starting at `quote_index`.
+    An unterminated quote is treated as a regular character.
+    """
+    match = _STRING_LITERAL_END_PATTERNS[text[quote_index]].match(text, quote_index + 1)
+    return match.end() if match else quote_index + 1
+
+
+def find_closing_bracket(text: str, open_index: int) -> int:
+    """
+    Return the index of the bracket that closes the one at `open_index`, or -1 if it is never closed.
+    """
+    # Fast path: no nested brackets, and the closing bracket is not inside a string literal
+    end = text.find(_MATCHING_BRACKETS[text[open_index]], open_index + 1)
+    if end != -1:
+        body = text[open_index + 1 : end]
+        if not _BRACKET_QUOTE_OR_ESCAPE_PATTERN.search(body) or (
+            not _BRACKET_OR_ESCAPE_PATTERN.search(body) and _has_balanced_quotes(body)
+        ):
+            return end
+
+    depth = 0
+    match = _BRACKET_OR_QUOTE_PATTERN.search(text, open_index)
+    while match:
+        token = match.group()
+        position = match.end()
+        if token in _QUOTES:
+            position = _skip_string_literal(text, match.start())
+        elif token in _OPENING_BRACKETS:
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return match.start()
+        match = _BRACKET_OR_QUOTE_PATTERN.search(text, position)
+    return -1
+
+
+def split_top_level(text: str, separator: str = ",", maxsplit: int = -1) -> list[str]:
+    """
+    Split `text` on the separator, ignoring the separators inside brackets or string literals. Pieces are stripped.
+    For text without any brackets or quotes, this is the same as `[piece.strip() for piece in text.split(separator, maxsplit)]`.
+    """
+    # Fast path: no brackets, and none of the separators is inside a string literal
+    if not _BRACKET_QUOTE_OR_ESCAPE_PATTERN.search(text):
+        return [piece.strip() for piece in text.split(separator, maxsplit)]
+    if not _BRACKET_OR_ESCAPE_PATTERN.search(text):
+        pieces = text.split(separator, maxsplit)
+        if all(_has_balanced_quotes(piece) for piece in pieces):
+            return [piece.strip() for piece in pieces]
+
+    token_pattern = _SEPARATOR_PATTERNS[separator]
+    pieces = []
+    depth = 0
+    start = 0
+    match = token_pattern.search(text)
+    while match and len(pieces) != maxsplit:
+        token = match.group()
+        position = match.end()
+        if token in _QUOTES:
+            position = _skip_string_literal(text, match.start())
+        elif token in _OPENING_BRACKETS:
+            depth += 1
+        elif token in _CLOSING_BRACKETS:
+            depth -= 1
+        elif depth == 0:
+            pieces.append(text[start : match.start()].strip())
+            start = position
+        match = token_pattern.search(text, position)
+    pieces.append(text[start:].strip())
+    return pieces
+
+
+def split_bracket_body(text: str, open_index: int) -> tuple[Optional[list[str]], int]:
+    """
+    Split the text between the bracket at `open_index` and the one that closes it, as `split_top_level` does.
+    Return its pieces (none for a blank body) and the index of the closing bracket, or (None, -1) if it is never closed.
+    """
+    # Fast path: without brackets, and with none of the separators inside a string literal, the body ends at the first
+    # closing bracket
+    end = text.find(_MATCHING_BRACKETS[text[open_index]], open_index + 1)
+    pieces = None
+    if end != -1 and not _BRACKET_OR_ESCAPE_PATTERN.search(text, open_index + 1, end):
+        pieces = text[open_index + 1 : end].split(",")
+        if _BRACKET_QUOTE_OR_ESCAPE_PATTERN.search(text, open_index + 1, end) and not all(
+            _has_balanced_quotes(piece) for piece in pieces
+        ):
+            pieces = None
+    if pieces is None:
+        end = find_closing_bracket(text, open_index)
+        if end == -1:
+            return None, -1
+        pieces = split_top_level(text[open_index + 1 : end])
+    else:
+        pieces = [piece.strip() for piece in pieces]
+    return (pieces if pieces != [""] else []), end
+
+
+def might_be_number(text: str) -> bool:
+    """
+    Return False if neither `int(text)` nor `float(text)` can succeed, which is much cheaper than catching their ValueError.
+    Apart from infinity and NaN, both need at least one decimal digit.
+    """
+    return _DIGIT_PATTERN.search(text) is not None or (
+        text.strip().lstrip("+-").lower() in _NON_DIGIT_FLOATS
+    )
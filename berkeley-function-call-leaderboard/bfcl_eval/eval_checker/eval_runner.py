@@ -2,6 +2,14 @@ import argparse
 import statistics
 from collections import defaultdict
 
+from bfcl_eval._sampling import (
+    SAMPLE_SUMMARY_FILE_NAME,
+    compute_sample_summary,
+    load_sample_manifest,
+    print_sample_summary,
+    save_sample_summaries,
+    select_sample_ids,
+)
 from bfcl_eval.constants.enums import Language, ReturnFormat
 from bfcl_eval.constants.eval_config import *
 from bfcl_eval.constants.model_config import MODEL_CONFIG_MAPPING
@@ -17,6 +25,7 @@ from bfcl_eval.eval_checker.multi_turn_eval.multi_turn_utils import (
 )
 from bfcl_eval.model_handler.base_handler import BaseHandler
 from bfcl_eval.model_handler.utils import parse_prompt_variation_params
+from bfcl_eval.profiler import enable_profiling, export_profile, profile_span
 from bfcl_eval.utils import *
 from dotenv import load_dotenv
 from tqdm import tqdm
@@ -24,7 +33,7 @@ from tqdm import tqdm
 
 def get_handler(model_name: str) -> BaseHandler:
     config = MODEL_CONFIG_MAPPING[model_name]
-    handler: BaseHandler = config.model_handler(
+    handler: BaseHandler = config.get_model_handler()(
         model_name=config.model_name,
         temperature=0,
         registry_name=model_name,
@@ -115,9 +124,10 @@ def _evaluate_single_agentic_entry(
     for model_result_item in model_result_list[0]:
         # model_result_item is per step
         try:
-            decoded_result: list[str] = handler.decode_execute(
-                model_result_item, has_tool_call_tag=False
-            )
+            with profile_span("decode"):
+                decoded_result: list[str] = handler.decode_execute(
+                    model_result_item, has_tool_call_tag=False
+                )
             if is_empty_execute_response(decoded_result):
                 last_unsuccessful_decoding_message = model_result_item
                 continue
@@ -145,10 +155,11 @@ def _evaluate_single_agentic_entry(
         }
 
     # Check if the model output contains the expected answer
-    accuracy_checker_result = agentic_checker(
-        last_unsuccessful_decoding_message,
-        possible_answer_item,
-    )
+    with profile_span("checker"):
+        accuracy_checker_result = agentic_checker(
+            last_unsuccessful_decoding_message,
+            possible_answer_item,
+        )
 
     if not accuracy_checker_result["valid"]:
         return {
@@ -225,9 +236,10 @@ def _evaluate_single_multi_turn_entry(
         for model_result_item in single_turn_model_result_list:
             # model_result_item is per step
             try:
-                decoded_result: list[str] = handler.decode_execute(
-                    model_result_item, has_tool_call_tag=False
-                )
+                with profile_span("decode"):
+                    decoded_result: list[str] = handler.decode_execute(
+                        model_result_item, has_tool_call_tag=False
+                    )
                 if is_empty_execute_response(decoded_result):
                     # Empty output is not considered as a valid function call
                     continue
@@ -239,13 +251,14 @@ def _evaluate_single_multi_turn_entry(
         multi_turn_model_result_list_decoded.append(single_turn_model_result_list_decoded)
 
     # Check if the model output the correct function calls
-    accuracy_checker_result = multi_turn_checker(
-        multi_turn_model_result_list_decoded,
-        ground_truth_list,
-        prompt_entry,
-        test_category,
-        model_name,
-    )
+    with profile_span("checker"):
+        accuracy_checker_result = multi_turn_checker(
+            multi_turn_model_result_list_decoded,
+            ground_truth_list,
+            prompt_entry,
+            test_category,
+            model_name,
+        )
 
     if not accuracy_checker_result["valid"]:
         return {
@@ -277,9 +290,10 @@ def _evaluate_single_relevance_entry(
     decode_error = None
 
     try:
-        decoded_result = handler.decode_ast(
-            model_result_item, language=ReturnFormat.PYTHON, has_tool_call_tag=False
-        )
+        with profile_span("decode"):
+            decoded_result = handler.decode_ast(
+                model_result_item, language=ReturnFormat.PYTHON, has_tool_call_tag=False
+            )
         # Decode successfully, which means the model output is in valid function call format
         contain_func_call = True
         if is_empty_output(decoded_result):
@@ -336,9 +350,10 @@ def _evaluate_single_ast_entry(
 
     try:
         model_result_item_raw = model_result_item
-        model_result_item = handler.decode_ast(
-            model_result_item, return_format, has_tool_call_tag
-        )
+        with profile_span("decode"):
+            model_result_item = handler.decode_ast(
+                model_result_item, return_format, has_tool_call_tag
+            )
     except Exception as e:
         return {
             "id": index,
@@ -369,15 +384,16 @@ def _evaluate_single_ast_entry(
             "possible_answer": possible_answer_item,
         }
 
-    checker_result = ast_checker(
-        prompt_function,
-        model_result_item,
-        possible_answer_item,
-        language,
-        # format sensitivity has parallel, multiple cases which is encoded in index
-        test_category if test_category != 'format_sensitivity' else index.split(':')[-1],
-        model_name,
-    )
+    with profile_span("checker"):
+        checker_result = ast_checker(
+            prompt_function,
+            model_result_item,
+            possible_answer_item,
+            language,
+            # format sensitivity has parallel, multiple cases which is encoded in index
+            test_category if test_category != 'format_sensitivity' else index.split(':')[-1],
+            model_name,
+        )
 
     if not checker_result["valid"]:
         return {
@@ -677,15 +693,26 @@ def evaluate_task(
     handler,
     leaderboard_table,
     allow_missing: bool = False,
+    sample_manifest: dict = None,
 ):
     print(f"🔍 Running test: {test_category}")
 
-    record_cost_latency(leaderboard_table, model_name, model_result)
-
     # Find the corresponding prompt entries
-    prompt = load_dataset_entry(
-        test_category, include_prereq=False, include_language_specific_hint=False
-    )
+    with profile_span("load"):
+        prompt = load_dataset_entry(
+            test_category, include_prereq=False, include_language_specific_hint=False
+        )
+
+    if sample_manifest is not None:
+        # Only evaluate the entries sampled by `bfcl generate --sample`
+        sample_ids = select_sample_ids(
+            [entry["id"] for entry in prompt],
+            sample_manifest["seed"],
+            sample_manifest["categories"][test_category]["sample_size"],
+        )
+        model_result = [entry for entry in model_result if entry["id"] in sample_ids]
+
+    record_cost_latency(leaderboard_table, model_name, model_result)
 
     if is_relevance_or_irrelevance(test_category):
         prompt, _ = _subset_entries_by_model_ids(
@@ -698,7 +725,8 @@ def evaluate_task(
 
     else:
         # Find the corresponding possible answer entries
-        possible_answer = load_ground_truth_entry(test_category)
+        with profile_span("load"):
+            possible_answer = load_ground_truth_entry(test_category)
         # Sanity: prompt and ground truth should be 1:1
         assert len(prompt) == len(
             possible_answer
@@ -760,7 +788,12 @@ def evaluate_task(
 
 
 def runner(
-    model_names, test_categories, result_dir, score_dir, allow_missing: bool = False
+    model_names,
+    test_categories,
+    result_dir,
+    score_dir,
+    allow_missing: bool = False,
+    sample: bool = False,
 ):
 
     # A dictionary to store the evaluation scores.
@@ -775,6 +808,9 @@ def runner(
     # Filter out the subdirectories
     subdirs = [entry for entry in entries if entry.is_dir()]
 
+    # Sample manifests of the models evaluated in sample mode, keyed by the model name
+    sample_manifests = {}
+
     # Traverse each subdirectory
     for subdir in tqdm(subdirs, desc="Number of models evaluated"):
 
@@ -786,6 +822,16 @@ def runner(
 
         print(f"🦍 Model: {model_name}")
 
+        sample_manifest = None
+        if sample:
+            sample_manifest = load_sample_manifest(subdir)
+            if sample_manifest is None:
+                print(
+                    f"⚠️ Warning: No sample found for {model_name_escaped}. Use `bfcl generate --sample` to generate one. Skipping this model."
+                )
+                continue
+            sample_manifests[model_name] = sample_manifest
+
         # Find and process all result JSON files recursively in the subdirectory
         for model_result_json in subdir.rglob(RESULT_FILE_PATTERN):
             test_category = extract_test_category(model_result_json)
@@ -803,28 +849,63 @@ def runner(
             ):
                 continue
 
-            model_result = load_file(model_result_json, sort_by_id=True)
+            if sample and test_category not in sample_manifest["categories"]:
+                continue
 
-            leaderboard_table = evaluate_task(
-                test_category,
-                result_dir,
-                score_dir,
-                model_result,
-                model_name,
-                handler,
-                leaderboard_table,
-                allow_missing=allow_missing,
-            )
+            with profile_span("evaluate_task", test_category=test_category):
+                with profile_span("load"):
+                    model_result = load_file(model_result_json, sort_by_id=True)
+
+                leaderboard_table = evaluate_task(
+                    test_category,
+                    result_dir,
+                    score_dir,
+                    model_result,
+                    model_name,
+                    handler,
+                    leaderboard_table,
+                    allow_missing=allow_missing,
+                    sample_manifest=sample_manifest,
+                )
+
+    # Estimated from the categories evaluated in this run only, before the other score files are read
+    sample_summaries = {}
+    for model_name, sample_manifest in sample_manifests.items():
+        model_name_escaped = model_name.replace("_", "/")
+        sample_summaries[model_name_escaped] = compute_sample_summary(
+            leaderboard_table.get(model_name, {}), sample_manifest
+        )
+        print_sample_summary(model_name_escaped, sample_summaries[model_name_escaped])
+    if sample_summaries:
+        save_sample_summaries(score_dir, sample_summaries)
 
     # This function reads all the score files from local folder and updates the
     # leaderboard table. This is helpful when you only want to run the
     # evaluation for a subset of models and test categories.
     update_leaderboard_table_with_local_score_file(leaderboard_table, score_dir)
     # Write the leaderboard table to a file
-    generate_leaderboard_csv(leaderboard_table, score_dir)
+    with profile_span("generate_csv"):
+        generate_leaderboard_csv(leaderboard_table, score_dir)
+
+    return sample_summaries
 
 
-def main(model, test_categories, result_dir, score_dir, partial_eval: bool = False):
+def main(
+    model,
+    test_categories,
+    result_dir,
+    score_dir,
+    partial_eval: bool = False,
+    profile: bool = False,
+    sample: bool = False,
+):
+    """
+    Evaluate the model results. With `sample`, only the entries sampled by `bfcl generate --sample` are evaluated, and
+    the estimated accuracies with their confidence intervals are returned, keyed by model name.
+    """
+    if profile:
+        enable_profiling()
+
     if result_dir is None:
         result_dir = RESULT_PATH
     else:
@@ -852,14 +933,18 @@ def main(model, test_categories, result_dir, score_dir, partial_eval: bool = Fal
             model_names.append(model_name.replace("/", "_"))
 
     # Driver function to run the evaluation for all categories involved.
-    runner(
+    sample_summaries = runner(
         model_names,
         all_test_categories,
         result_dir,
         score_dir,
-        allow_missing=partial_eval,
+        allow_missing=partial_eval or sample,
+        sample=sample,
     )
 
+    if profile:
+        export_profile("evaluate")
+
     print(
         f"🏁 Evaluation completed. See {score_dir / 'data_overall.csv'} for overall evaluation results on BFCL V4."
     )
@@ -867,10 +952,16 @@ def main(model, test_categories, result_dir, score_dir, partial_eval: bool = Fal
         print(
             "⚠️  Partial evaluation for a single category is enabled (--partial-run flag is set). Accuracy scores are computed only on the subset of entries present in the model result files, which may differ from a full evaluation and from the official leaderboard score."
         )
+    if sample:
+        print(
+            f"🎲 Sampled evaluation is enabled (--sample flag is set). The leaderboard tables are computed on the sampled entries only; see {score_dir / SAMPLE_SUMMARY_FILE_NAME} for the estimated accuracies and their confidence intervals."
+        )
     print(
         f"See {score_dir / 'data_live.csv'}, {score_dir / 'data_non_live.csv'}, {score_dir / 'data_multi_turn.csv'}, {score_dir / 'data_agentic.csv'} and {score_dir / 'data_format_sensitivity.csv'} for detailed evaluation results on each sub-section categories respectively."
     )
 
+    return sample_summaries
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process two lists of strings.")
@@ -904,6 +995,18 @@ if __name__ == "__main__":
         action="store_true",
         help="Run evaluation on a partial set of benchmark entries (eg. entries present in the model result files) without raising for missing IDs.",
     )
+    parser.add_argument(
+        "--profile",
+        default=False,
+        action="store_true",
+        help="Record per-stage timings and export them as a Chrome trace and a per-category summary.",
+    )
+    parser.add_argument(
+        "--sample",
+        default=False,
+        action="store_true",
+        help="Only evaluate the entries sampled by `bfcl generate --sample`, and report the accuracies with confidence intervals.",
+    )
 
     args = parser.parse_args()
 
@@ -914,4 +1017,6 @@ if __name__ == "__main__":
         args.result_dir,
         args.score_dir,
         partial_eval=args.partial_eval,
+        profile=args.profile,
+        sample=args.sample,
     )
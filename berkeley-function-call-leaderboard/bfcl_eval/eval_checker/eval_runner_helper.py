@@ -1,3 +1,4 @@
+import json
 import os
 import statistics
 from datetime import datetime
@@ -9,6 +10,8 @@ from bfcl_eval.constants.category_mapping import VERSION_PREFIX
 from bfcl_eval.constants.column_headers import *
 from bfcl_eval.constants.eval_config import *
 from bfcl_eval.constants.model_config import MODEL_CONFIG_MAPPING
+from bfcl_eval.model_handler.utils import USAGE_TIME_FIELDS, USAGE_TOKEN_FIELDS
+from bfcl_eval.profiler import profile_span
 from bfcl_eval.utils import *
 
 
@@ -124,41 +127,66 @@ def record_result(leaderboard_table, model_name, test_category, accuracy, total_
     }
 
 
-def record_cost_latency(leaderboard_table, model_name, model_output_data):
-    def process_data(key, data, output_list):
-        # All entries are either a list of list (in multi-turn), or a single value (in single-turn)
-        if key in data:
-            if isinstance(data[key], list) and all(
-                isinstance(inner_item, list) for inner_item in data[key]
-            ):
-                flattened_list = sum(data[key], [])
-                output_list.extend(
-                    [
-                        item
-                        for item in flattened_list
-                        if isinstance(item, (int, float)) and item != 0
-                    ]
-                )
-            else:
-                if isinstance(data[key], (int, float)) and data[key] != 0:
-                    output_list.append(data[key])
+def _iter_numeric_values(value):
+    """
+    Yield the numbers of a metadata field, which is either a list of lists (in multi-turn) or a single value (in single-turn).
+    """
+    if isinstance(value, list):
+        if all(isinstance(inner_item, list) for inner_item in value):
+            for inner_list in value:
+                for item in inner_list:
+                    if isinstance(item, (int, float)):
+                        yield item
+    elif isinstance(value, (int, float)):
+        yield value
+
+
+def _iter_usage_records(usage):
+    # Usage records are a list of lists of records (in multi-turn), or a single record (in single-turn)
+    if isinstance(usage, dict):
+        yield usage
+    elif isinstance(usage, list):
+        for turn_usage in usage:
+            if isinstance(turn_usage, list):
+                yield from turn_usage
+
+
+def _empty_cost_data() -> dict:
+    return {
+        **{field: 0 for field in USAGE_TOKEN_FIELDS},
+        **{field: 0.0 for field in USAGE_TIME_FIELDS},
+    }
 
-    if model_name not in leaderboard_table:
-        leaderboard_table[model_name] = {}
-        leaderboard_table[model_name]["cost"] = {"input_data": [], "output_data": []}
-        leaderboard_table[model_name]["latency"] = {"data": []}
 
-    input_token = []
-    output_token = []
+def record_cost_latency(leaderboard_table, model_name, model_output_data):
+    """
+    Accumulate the token usage and the latency of the model results into the leaderboard table.
+    Token counts and times are summed on the fly; only the latencies are kept individually, for the latency statistics.
+    """
+    model_entry = leaderboard_table.setdefault(model_name, {})
+    cost_data = model_entry.setdefault("cost", _empty_cost_data())
+    latency_data = model_entry.setdefault("latency", {"data": []})
+
     latency = []
     for data in model_output_data:
-        process_data("latency", data, latency)
-        process_data("input_token_count", data, input_token)
-        process_data("output_token_count", data, output_token)
+        latency.extend(
+            item for item in _iter_numeric_values(data.get("latency")) if item != 0
+        )
+
+        if "usage" in data:
+            for record in _iter_usage_records(data["usage"]):
+                for field in (*USAGE_TOKEN_FIELDS, *USAGE_TIME_FIELDS):
+                    cost_data[field] += record.get(field) or 0
+        else:
+            # Results generated before the usage records were added only have the input/output token counts
+            cost_data["input_token"] += sum(
+                _iter_numeric_values(data.get("input_token_count"))
+            )
+            cost_data["output_token"] += sum(
+                _iter_numeric_values(data.get("output_token_count"))
+            )
 
-    leaderboard_table[model_name]["cost"]["input_data"].extend(input_token)
-    leaderboard_table[model_name]["cost"]["output_data"].extend(output_token)
-    leaderboard_table[model_name]["latency"]["data"].extend(latency)
+    latency_data["data"].extend(latency)
 
 
 def save_eval_results(
@@ -188,26 +216,48 @@ def save_eval_results(
     output_file_dir = (
         score_dir / model_name / get_directory_structure_by_category(test_category)
     )
-    write_list_of_dicts_to_file(output_file_name, result, output_file_dir)
+    with profile_span("write"):
+        write_list_of_dicts_to_file(output_file_name, result, output_file_dir)
 
     return accuracy, len(model_result)
 
 
+def compute_api_cost(model_config, cost_data, apply_cache_discount: bool = True) -> float:
+    """
+    Return the API cost in USD of the accumulated token usage.
+    Input tokens read from or written to the prompt cache are charged at the model's cache prices, if it has any.
+    Without `apply_cache_discount`, every input token is charged at the regular input price.
+    """
+    cached_input_price = model_config.input_price
+    cache_write_price = model_config.input_price
+    if apply_cache_discount:
+        if model_config.cached_input_price is not None:
+            cached_input_price = model_config.cached_input_price
+        if model_config.cache_write_price is not None:
+            cache_write_price = model_config.cache_write_price
+
+    uncached_input_tokens = (
+        cost_data["input_token"]
+        - cost_data["cached_input_token"]
+        - cost_data["cache_write_input_token"]
+    )
+    # price is in USD per million tokens
+    return (
+        uncached_input_tokens * model_config.input_price
+        + cost_data["cached_input_token"] * cached_input_price
+        + cost_data["cache_write_input_token"] * cache_write_price
+        + cost_data["output_token"] * model_config.output_price
+    ) / 1000000
+
+
 def get_cost_latency_info(model_name, cost_data, latency_data):
     cost, mean_latency, std_latency, percentile_95_latency = "N/A", "N/A", "N/A", "N/A"
     model_config = MODEL_CONFIG_MAPPING[model_name]
 
     # For API models, we use the input and output token counts to calculate the cost
     if model_config.input_price is not None and model_config.output_price is not None:
-        if len(cost_data["input_data"]) > 0 and len(cost_data["output_data"]) > 0:
-            total_input_tokens = sum(cost_data["input_data"])
-            total_output_tokens = sum(cost_data["output_data"])
-            # price is in USD per million tokens
-            cost = (
-                total_input_tokens * model_config.input_price / 1000000
-                + total_output_tokens * model_config.output_price / 1000000
-            )
-            cost = round(cost, 2)
+        if cost_data["input_token"] > 0 and cost_data["output_token"] > 0:
+            cost = round(compute_api_cost(model_config, cost_data), 2)
 
     # For local-hosted models, we calculate the total GPU cost by summing all latencies and multiplying by the hourly GPU price.
     elif len(latency_data["data"]) > 0:
@@ -230,6 +280,33 @@ def get_cost_latency_info(model_name, cost_data, latency_data):
     return cost, mean_latency, std_latency, percentile_95_latency
 
 
+def get_usage_summary(model_name, cost_data, latency_data) -> dict:
+    """
+    Summarize the token usage, the time split between queueing and generation, and, for API models, the savings from
+    prompt caching.
+    """
+    model_config = MODEL_CONFIG_MAPPING[model_name]
+    summary = {
+        **{field: cost_data[field] for field in USAGE_TOKEN_FIELDS},
+        "cached_input_ratio": (
+            cost_data["cached_input_token"] / cost_data["input_token"]
+            if cost_data["input_token"] > 0
+            else 0.0
+        ),
+        **{field: cost_data[field] for field in USAGE_TIME_FIELDS},
+        "query_count": len(latency_data["data"]),
+    }
+    if model_config.input_price is not None and model_config.output_price is not None:
+        cost = compute_api_cost(model_config, cost_data)
+        cost_without_cache_discount = compute_api_cost(
+            model_config, cost_data, apply_cache_discount=False
+        )
+        summary["cost"] = cost
+        summary["cost_without_cache_discount"] = cost_without_cache_discount
+        summary["cache_savings"] = cost_without_cache_discount - cost
+    return summary
+
+
 def get_category_score(score_dict: dict, test_category: str) -> dict:
     if test_category in score_dict:
         score = score_dict[test_category]
@@ -296,15 +373,19 @@ def generate_leaderboard_csv(leaderboard_table, output_path):
     data_agentic = []
     data_format_sensitivity = []
     data_combined = []
+    usage_summary = {}
     for model_name, value in leaderboard_table.items():
         model_name_escaped = model_name.replace("_", "/")
         model_config = MODEL_CONFIG_MAPPING[model_name_escaped]
 
-        cost_data = value.get("cost", {"input_data": [], "output_data": []})
+        cost_data = value.get("cost", _empty_cost_data())
         latency_data = value.get("latency", {"data": []})
         cost, latency_mean, latency_std, percentile_95_latency = get_cost_latency_info(
             model_name_escaped, cost_data, latency_data
         )
+        usage_summary[model_name_escaped] = get_usage_summary(
+            model_name_escaped, cost_data, latency_data
+        )
 
         # Non-Live Score
         python_simple_ast_non_live = get_category_score(value, "simple_python")
@@ -613,6 +694,16 @@ def generate_leaderboard_csv(leaderboard_table, output_path):
         no_conversion_numeric_column_index=[4, 5, 6, 7, 32, 33],
     )
 
+    # Write Usage Summary File
+    with open(output_path / "usage_summary.json", "w", encoding="utf-8") as f:
+        json.dump(usage_summary, f, indent=2)
+    for model_name, summary in usage_summary.items():
+        if summary["cached_input_token"] > 0 and "cache_savings" in summary:
+            print(
+                f"💰 {model_name}: {summary['cached_input_ratio']:.1%} of the input tokens were read from the prompt cache, "
+                f"saving ${summary['cache_savings']:.2f} (${summary['cost']:.2f} instead of ${summary['cost_without_cache_discount']:.2f})."
+            )
+
     wandb_project = os.getenv("WANDB_BFCL_PROJECT")
     if wandb_project and wandb_project != "ENTITY:PROJECT":
         import wandb
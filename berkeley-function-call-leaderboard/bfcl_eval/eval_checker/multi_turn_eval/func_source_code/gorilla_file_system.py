@@ -3,10 +3,10 @@ import subprocess
 from copy import deepcopy
 from typing import Dict, List, Optional, Union
 
-from bfcl_eval.eval_checker.multi_turn_eval.func_source_code.long_context import (
-    FILE_CONTENT_EXTENSION,
-    FILES_TAIL_USED,
-    POPULATE_FILE_EXTENSION,
+from bfcl_eval.eval_checker.multi_turn_eval.func_source_code.long_context_payload import (
+    get_extended_file_content,
+    get_files_tail_used,
+    get_populate_file_names,
 )
 
 
@@ -23,6 +23,12 @@ class File:
         self.name: str = name
         self.content: str = content
         self._last_modified: datetime.datetime = datetime.datetime.now()
+        # Data derived from `content`. Each value remembers the exact string it was computed from,
+        # so it is recomputed lazily whenever `content` is replaced.
+        self._size_source: Optional[str] = None
+        self._size_in_bytes: int = 0
+        self._lines_source: Optional[str] = None
+        self._lines: tuple[str, ...] = ()
 
     def _write(self, new_content: str) -> None:
         """
@@ -32,6 +38,8 @@ class File:
             new_content (str): The new content to write to the file.
         """
         self.content = new_content
+        self._size_in_bytes = len(new_content.encode("utf-8"))
+        self._size_source = new_content
         self._last_modified = datetime.datetime.now()
 
     def _read(self) -> str:
@@ -50,9 +58,37 @@ class File:
         Args:
             additional_content (str): The content to append to the file.
         """
+        size_is_current = self._size_source is self.content
         self.content += additional_content
+        if size_is_current:
+            self._size_in_bytes += len(additional_content.encode("utf-8"))
+            self._size_source = self.content
         self._last_modified = datetime.datetime.now()
 
+    def _get_size_in_bytes(self) -> int:
+        """
+        Get the size of the file content in bytes (UTF-8 encoded).
+
+        Returns:
+            size (int): The size of the file content in bytes.
+        """
+        if self._size_source is not self.content:
+            self._size_in_bytes = len(self.content.encode("utf-8"))
+            self._size_source = self.content
+        return self._size_in_bytes
+
+    def _get_lines(self) -> tuple[str, ...]:
+        """
+        Get the lines of the file content, as split by `str.splitlines`.
+
+        Returns:
+            lines (tuple[str, ...]): The lines of the file content.
+        """
+        if self._lines_source is not self.content:
+            self._lines = tuple(self.content.splitlines())
+            self._lines_source = self.content
+        return self._lines
+
     def __repr__(self):
         return f"<<File: {self.name}, Content: {self.content}>>"
 
@@ -74,6 +110,10 @@ class Directory:
         self.name: str = name
         self.parent: Optional["Directory"] = parent
         self.contents: Dict[str, Union["File", "Directory"]] = {}
+        # Lookup results (size, subtree listing, resolved paths) computed by the file system.
+        # They are only valid for the file system version they were built for.
+        self._index_version: int = -1
+        self._index: dict = {}
 
     def _add_file(self, file_name: str, content: str = "") -> None:
         """
@@ -127,6 +167,67 @@ class Directory:
         """
         return list(self.contents.keys())
 
+    def _get_index(self, version: int) -> dict:
+        """
+        Get the lookup cache of the directory, discarding it if the file system has been modified since it was built.
+
+        Args:
+            version (int): The current version of the file system.
+
+        Returns:
+            index (dict): The lookup cache for the given version.
+        """
+        if self._index_version != version:
+            self._index_version = version
+            self._index = {}
+        return self._index
+
+    def _get_size_in_bytes(self, version: int) -> int:
+        """
+        Get the total size of all files under the directory in bytes.
+
+        Args:
+            version (int): The current version of the file system.
+
+        Returns:
+            size (int): The total size in bytes.
+        """
+        index = self._get_index(version)
+        if "size" not in index:
+            total_size = 0
+            for child in self.contents.values():
+                if isinstance(child, File):
+                    total_size += child._get_size_in_bytes()
+                elif isinstance(child, Directory):
+                    total_size += child._get_size_in_bytes(version)
+            index["size"] = total_size
+        return index["size"]
+
+    def _get_subtree(self, version: int) -> tuple[tuple[str, str], ...]:
+        """
+        Get all the files and directories under the directory, in depth-first order.
+
+        Args:
+            version (int): The current version of the file system.
+
+        Returns:
+            subtree (tuple[tuple[str, str], ...]): Pairs of (path relative to this directory, item name).
+                The relative path starts with a slash, eg. "/subdir/file.txt".
+        """
+        index = self._get_index(version)
+        if "subtree" not in index:
+            subtree = []
+            for item_name, item in self.contents.items():
+                item_path = f"/{item_name}"
+                subtree.append((item_path, item_name))
+                if isinstance(item, Directory):
+                    subtree.extend(
+                        (item_path + child_path, child_name)
+                        for child_path, child_name in item._get_subtree(version)
+                    )
+            index["subtree"] = tuple(subtree)
+        return index["subtree"]
+
     def __repr__(self):
         return f"<Directory: {self.name}, Parent: {self.parent.name if self.parent else None}, Contents: {self.contents}>"
 
@@ -147,6 +248,8 @@ class GorillaFileSystem:
         """
         self.root: Directory
         self._current_dir: Directory
+        # Bumped on every modification of the tree; invalidates the lookup caches held by the directories
+        self._version: int = 0
         self._api_description = "This tool belongs to the Gorilla file system. It is a simple file system that allows users to perform basic file operations such as navigating directories, creating files and directories, reading and writing to files, etc."
 
     def __eq__(self, other: object) -> bool:
@@ -195,6 +298,7 @@ class GorillaFileSystem:
         }
         """
         DEFAULT_STATE_COPY = deepcopy(DEFAULT_STATE)
+        self._version = 0
         self.long_context = long_context
         self.root = DEFAULT_STATE_COPY["root"]
         if "root" in scenario:
@@ -228,8 +332,8 @@ class GorillaFileSystem:
 
             elif dir_data["type"] == "file":
                 content = dir_data["content"]
-                if self.long_context and dir_name not in FILES_TAIL_USED:
-                    content += FILE_CONTENT_EXTENSION
+                if self.long_context and dir_name not in get_files_tail_used():
+                    content = get_extended_file_content(content)
                 new_file = File(dir_name, content)
                 parent.contents[dir_name] = new_file
 
@@ -247,9 +351,7 @@ class GorillaFileSystem:
         Args:
             directory (Directory): The innermost directory to populate.
         """
-        for i in range(len(POPULATE_FILE_EXTENSION)):
-            name = POPULATE_FILE_EXTENSION[i]
-            file_name = f"{name}"
+        for file_name in get_populate_file_names():
             directory._add_file(file_name)
 
     def pwd(self):
@@ -333,6 +435,7 @@ class GorillaFileSystem:
         Args:
             dir_name (str): The name of the new directory at current directory. You can only create directory at current directory.
         """
+        self._invalidate_index()
         if not self._validate_file_or_directory_name(dir_name):
             return {
                 "error": f"mkdir: cannot create directory '{dir_name}': Invalid character"
@@ -350,6 +453,7 @@ class GorillaFileSystem:
         Args:
             file_name (str): The name of the new file in the current directory. file_name is local to the current directory and does not allow path.
         """
+        self._invalidate_index()
         if not self._validate_file_or_directory_name(file_name):
             return {"error": f"touch: cannot touch '{file_name}': Invalid character"}
 
@@ -372,6 +476,7 @@ class GorillaFileSystem:
         Returns:
             terminal_output (str): The content if no file name is provided, or None if written to file.
         """
+        self._invalidate_index()
         if file_name is None:
             return {"terminal_output": content}
         if not self._validate_file_or_directory_name(file_name):
@@ -435,15 +540,11 @@ class GorillaFileSystem:
                 return {"error": original_msg.replace("cd:", "find:", 1)}
             return target_dir
 
-        def recursive_search(directory: Directory, base_path: str) -> None:
-            for item_name, item in directory.contents.items():
-                item_path = f"{base_path}/{item_name}"
-                if name is None or name in item_name:
-                    matches.append(item_path)
-                if isinstance(item, Directory):
-                    recursive_search(item, item_path)
+        base_path = path.rstrip("/")
+        for relative_path, item_name in target_dir._get_subtree(self._version):
+            if name is None or name in item_name:
+                matches.append(base_path + relative_path)
 
-        recursive_search(target_dir, path.rstrip("/"))
         return {"matches": matches}
 
     def wc(self, file_name: str, mode: str = "l") -> Dict[str, Union[int, str]]:
@@ -467,7 +568,7 @@ class GorillaFileSystem:
                 content = file._read()
 
                 if mode == "l":
-                    line_count = len(content.splitlines())
+                    line_count = len(file._get_lines())
                     return {"count": line_count, "type": "lines"}
 
                 elif mode == "w":
@@ -493,9 +594,7 @@ class GorillaFileSystem:
         if file_name in self._current_dir.contents:
             file = self._current_dir._get_item(file_name)
             if isinstance(file, File):
-                content = file._read()
-
-                sorted_content = "\n".join(sorted(content.splitlines()))
+                sorted_content = "\n".join(sorted(file._get_lines()))
 
                 return {"sorted_content": sorted_content}
 
@@ -515,9 +614,7 @@ class GorillaFileSystem:
         if file_name in self._current_dir.contents:
             file = self._current_dir._get_item(file_name)
             if isinstance(file, File):
-                content = file._read()
-
-                matching_lines = [line for line in content.splitlines() if pattern in line]
+                matching_lines = [line for line in file._get_lines() if pattern in line]
 
                 return {"matching_lines": matching_lines}
 
@@ -533,19 +630,11 @@ class GorillaFileSystem:
         Returns:
             disk_usage (str): The estimated disk usage.
         """
-
-        def get_size(item: Union[File, Directory]) -> int:
-            if isinstance(item, File):
-                return len(item._read().encode("utf-8"))
-            elif isinstance(item, Directory):
-                return sum(get_size(child) for child in item.contents.values())
-            return 0
-
         target_dir = self._navigate_to_directory(None)
         if isinstance(target_dir, dict):  # Error condition check
             return target_dir
 
-        total_size = get_size(target_dir)
+        total_size = target_dir._get_size_in_bytes(self._version)
 
         if human_readable:
             for unit in ["B", "KB", "MB", "GB", "TB"]:
@@ -574,7 +663,7 @@ class GorillaFileSystem:
         if file_name in self._current_dir.contents:
             file = self._current_dir._get_item(file_name)
             if isinstance(file, File):
-                content = file._read().splitlines()
+                content = file._get_lines()
 
                 if lines > len(content):
                     lines = len(content)
@@ -603,8 +692,8 @@ class GorillaFileSystem:
             file2 = self._current_dir._get_item(file_name2)
 
             if isinstance(file1, File) and isinstance(file2, File):
-                content1 = file1._read().splitlines()
-                content2 = file2._read().splitlines()
+                content1 = file1._get_lines()
+                content2 = file2._get_lines()
 
                 diff_lines = [
                     f"- {line1}\n+ {line2}"
@@ -627,6 +716,7 @@ class GorillaFileSystem:
         Returns:
             result (str): The result of the move operation.
         """
+        self._invalidate_index()
         if source not in self._current_dir.contents:
             return {"error": f"mv: cannot move '{source}': No such file or directory"}
 
@@ -682,6 +772,7 @@ class GorillaFileSystem:
         Returns:
             result (str): The result of the remove operation.
         """
+        self._invalidate_index()
         if file_name in self._current_dir.contents:
             item = self._current_dir._get_item(file_name)
             if isinstance(item, File) or isinstance(item, Directory):
@@ -704,6 +795,7 @@ class GorillaFileSystem:
         Returns:
             result (str): The result of the remove operation.
         """
+        self._invalidate_index()
         if dir_name in self._current_dir.contents:
             item = self._current_dir._get_item(dir_name)
             if isinstance(item, Directory):
@@ -739,6 +831,7 @@ class GorillaFileSystem:
         Returns:
             result (str): The result of the copy operation or an error message if the operation fails.
         """
+        self._invalidate_index()
         if source not in self._current_dir.contents:
             return {"error": f"cp: cannot copy '{source}': No such file or directory"}
 
@@ -798,8 +891,13 @@ class GorillaFileSystem:
         elif path == "/":
             return self.root
 
+        start_dir = self._current_dir if not path.startswith("/") else self.root
+        resolved_paths = start_dir._get_index(self._version).setdefault("paths", {})
+        if path in resolved_paths:
+            return resolved_paths[path]
+
         dirs = path.strip("/").split("/")
-        temp_dir = self._current_dir if not path.startswith("/") else self.root
+        temp_dir = start_dir
 
         for dir_name in dirs:
             next_dir = temp_dir._get_item(dir_name)
@@ -808,8 +906,16 @@ class GorillaFileSystem:
             else:
                 return {"error": f"cd: '{path}': No such file or directory"}
 
+        resolved_paths[path] = temp_dir
         return temp_dir
 
+    def _invalidate_index(self) -> None:
+        """
+        Invalidate all cached lookups (directory sizes, subtree listings, resolved paths).
+        Must be called before any modification of the directory tree.
+        """
+        self._version += 1
+
     def _parse_positions(self, positions: str) -> List[int]:
         """
         Helper function to parse position strings, e.g., '1,3,5', '1-5', '-3', or '3-'.
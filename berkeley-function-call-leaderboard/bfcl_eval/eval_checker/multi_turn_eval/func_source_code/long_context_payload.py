@@ -0,0 +1,118 @@
+"""
+Shared, lazily materialized long-context payloads for the multi-turn simulators.
+
+`long_context.py` is a very large module that only the long-context categories need. It is imported on first use,
+and each derived payload is built once per process and then referenced (not copied) by every simulator instance.
+"""
+
+import importlib
+import sys
+from functools import lru_cache
+from types import ModuleType
+
+LONG_CONTEXT_MODULE_PATH = (
+    "bfcl_eval.eval_checker.multi_turn_eval.func_source_code.long_context"
+)
+
+
+@lru_cache(maxsize=None)
+def get_long_context_module() -> ModuleType:
+    return importlib.import_module(LONG_CONTEXT_MODULE_PATH)
+
+
+def get_long_context_constant(name: str):
+    """
+    Return a constant from `long_context.py` as is. Only use this for values that are never mutated.
+    """
+    return getattr(get_long_context_module(), name)
+
+
+#### GorillaFileSystem ####
+
+
+@lru_cache(maxsize=None)
+def get_files_tail_used() -> frozenset[str]:
+    return frozenset(get_long_context_module().FILES_TAIL_USED)
+
+
+@lru_cache(maxsize=None)
+def get_populate_file_names() -> tuple[str, ...]:
+    return tuple(
+        sys.intern(name) for name in get_long_context_module().POPULATE_FILE_EXTENSION
+    )
+
+
+@lru_cache(maxsize=4096)
+def get_extended_file_content(content: str) -> str:
+    """
+    Return the file content with the long-context extension appended.
+    The same scenario files are loaded for every entry and every step re-entry, so the (multi-KB) result is shared.
+    """
+    return content + get_long_context_module().FILE_CONTENT_EXTENSION
+
+
+#### TradingBot ####
+
+
+@lru_cache(maxsize=None)
+def get_watch_list_extension() -> tuple[str, ...]:
+    return tuple(get_long_context_module().WATCH_LIST_EXTENSION)
+
+
+@lru_cache(maxsize=None)
+def get_transaction_history_extension() -> tuple[dict, ...]:
+    return tuple(get_long_context_module().TRANSACTION_HISTORY_EXTENSION)
+
+
+@lru_cache(maxsize=None)
+def get_sector_extension(sector: str) -> tuple[str, ...]:
+    module = get_long_context_module()
+    sector_extension = {
+        "Technology": module.TECHNOLOGY_EXTENSION,
+        "Automobile": module.AUTOMOBILE_EXTENSION,
+    }
+    return tuple(sector_extension.get(sector, []))
+
+
+@lru_cache(maxsize=1024)
+def _format_order_detail_extension(symbol: str) -> tuple[tuple[str, str], ...]:
+    return tuple(
+        (key, value.format(symbol=symbol))
+        for key, value in get_long_context_module().ORDER_DETAIL_EXTENSION.items()
+    )
+
+
+def get_order_detail_extension(symbol: str) -> dict[str, str]:
+    """
+    Return the order metadata for the given symbol. The formatted strings are cached per symbol;
+    a fresh dict is returned every time since it ends up in the caller's response.
+
+    Raises:
+        KeyError: If the extension template contains a placeholder other than `symbol`.
+    """
+    return dict(_format_order_detail_extension(symbol))
+
+
+#### TravelAPI ####
+
+
+def get_credit_card_extension() -> dict[str, dict]:
+    """
+    Return a per-instance copy of the credit card extension.
+    The card records are mutated during the conversation (eg. balance changes), so they must not be shared.
+    """
+    return {
+        card_id: dict(card_info)
+        for card_id, card_info in get_long_context_module().CREDIT_CARD_EXTENSION.items()
+    }
+
+
+def get_booking_record_extension() -> dict[str, dict]:
+    """
+    Return a per-instance copy of the booking record extension.
+    The booking records are mutated during the conversation (eg. cancellation), so they must not be shared.
+    """
+    return {
+        booking_id: dict(booking_info)
+        for booking_id, booking_info in get_long_context_module().BOOKING_RECORD_EXTENSION.items()
+    }
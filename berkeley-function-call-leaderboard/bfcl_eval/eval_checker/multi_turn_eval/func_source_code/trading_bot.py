@@ -3,14 +3,12 @@ from copy import deepcopy
 from datetime import datetime, time, timedelta
 from typing import Dict, List, Optional, Union
 
-from bfcl_eval.eval_checker.multi_turn_eval.func_source_code.long_context import (
-    AUTOMOBILE_EXTENSION,
-    MA_5_EXTENSION,
-    MA_20_EXTENSION,
-    ORDER_DETAIL_EXTENSION,
-    TECHNOLOGY_EXTENSION,
-    TRANSACTION_HISTORY_EXTENSION,
-    WATCH_LIST_EXTENSION,
+from bfcl_eval.eval_checker.multi_turn_eval.func_source_code.long_context_payload import (
+    get_long_context_constant,
+    get_order_detail_extension,
+    get_sector_extension,
+    get_transaction_history_extension,
+    get_watch_list_extension,
 )
 
 CURRENT_TIME = datetime(2024, 9, 1, 10, 30)
@@ -267,8 +265,8 @@ class TradingBot:
             return {"error": f"Stock with symbol '{symbol}' not found."}
         if self.long_context:
             stock = self.stocks[symbol].copy()
-            stock["MA(5)"] = MA_5_EXTENSION
-            stock["MA(20)"] = MA_20_EXTENSION
+            stock["MA(5)"] = get_long_context_constant("MA_5_EXTENSION")
+            stock["MA(20)"] = get_long_context_constant("MA_20_EXTENSION")
             return stock
         return self.stocks[symbol]
 
@@ -298,12 +296,10 @@ class TradingBot:
             order = self.orders[order_id].copy()
             symbol = order["symbol"]
 
-            formatted_extension = {}
-            for key, value in ORDER_DETAIL_EXTENSION.items():
-                try:
-                    formatted_extension[key] = value.format(symbol=symbol)
-                except KeyError as e:
-                    return {"error": f"KeyError during formatting: {str(e)}"}
+            try:
+                formatted_extension = get_order_detail_extension(symbol)
+            except KeyError as e:
+                return {"error": f"KeyError during formatting: {str(e)}"}
 
             # Add formatted extension to the order metadata
             order["metadata"] = formatted_extension
@@ -535,7 +531,7 @@ class TradingBot:
 
         if self.long_context:
             watch_list = self.watch_list.copy()
-            watch_list.extend(WATCH_LIST_EXTENSION)
+            watch_list.extend(get_watch_list_extension())
             return watch_list
         return {"watchlist": self.watch_list}
 
@@ -595,7 +591,7 @@ class TradingBot:
         ]
 
         if self.long_context:
-            filtered_history.extend(TRANSACTION_HISTORY_EXTENSION)
+            filtered_history.extend(get_transaction_history_extension())
 
         return {"transaction_history": filtered_history}
 
@@ -616,8 +612,8 @@ class TradingBot:
         }
 
         if self.long_context:
-            sector_map["Technology"].extend(TECHNOLOGY_EXTENSION)
-            sector_map["Automobile"].extend(AUTOMOBILE_EXTENSION)
+            sector_map["Technology"].extend(get_sector_extension("Technology"))
+            sector_map["Automobile"].extend(get_sector_extension("Automobile"))
         return {"stock_list": sector_map.get(sector, [])}
 
     def filter_stocks_by_price(
@@ -3,9 +3,9 @@ from copy import deepcopy
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Union
 
-from bfcl_eval.eval_checker.multi_turn_eval.func_source_code.long_context import (
-    BOOKING_RECORD_EXTENSION,
-    CREDIT_CARD_EXTENSION,
+from bfcl_eval.eval_checker.multi_turn_eval.func_source_code.long_context_payload import (
+    get_booking_record_extension,
+    get_credit_card_extension,
 )
 
 DEFAULT_STATE = {
@@ -97,7 +97,7 @@ class TravelAPI:
         Merge the credit card list with predefined credit cards from long_context.py.
         Existing cards in the scenario won't be overwritten.
         """
-        for card_id, card_info in CREDIT_CARD_EXTENSION.items():
+        for card_id, card_info in get_credit_card_extension().items():
             if card_id not in self.credit_card_list:
                 self.credit_card_list[card_id] = card_info
 
@@ -106,7 +106,7 @@ class TravelAPI:
         Merge the booking record list with predefined booking records from long_context.py.
         Existing bookings in the scenario won't be overwritten.
         """
-        for booking_id, booking_info in BOOKING_RECORD_EXTENSION.items():
+        for booking_id, booking_info in get_booking_record_extension().items():
             if booking_id not in self.booking_record:
                 self.booking_record[booking_id] = booking_info
 
@@ -2,11 +2,8 @@ import random
 from copy import deepcopy
 from typing import Dict, List, Union
 
-from bfcl_eval.eval_checker.multi_turn_eval.func_source_code.long_context import (
-    CAR_STATUS_METADATA_EXTENSION,
-    INTERMEDIARY_CITIES,
-    LONG_WEATHER_EXTENSION,
-    PARKING_BRAKE_INSTRUCTION,
+from bfcl_eval.eval_checker.multi_turn_eval.func_source_code.long_context_payload import (
+    get_long_context_constant,
 )
 
 MAX_FUEL_LEVEL = 50
@@ -299,8 +296,11 @@ class VehicleControlAPI:
             outsideTemperature (float): The outside temperature in degree Celsius.
         """
         if self.long_context:
-            LONG_WEATHER_EXTENSION["outsideTemperature"] = self._random.uniform(-10.0, 40.0)
-            return LONG_WEATHER_EXTENSION
+            # Build a new dict instead of mutating the shared constant, which is used by all instances
+            return {
+                **get_long_context_constant("LONG_WEATHER_EXTENSION"),
+                "outsideTemperature": self._random.uniform(-10.0, 40.0),
+            }
         return {"outsideTemperature": self._random.uniform(-10.0, 40.0)}
 
     def get_outside_temperature_from_weather_com(self) -> Dict[str, float]:
@@ -357,7 +357,7 @@ class VehicleControlAPI:
         """
         status = {}
         if self.long_context:
-            status["metadata"] = CAR_STATUS_METADATA_EXTENSION
+            status["metadata"] = get_long_context_constant("CAR_STATUS_METADATA_EXTENSION")
         if option == "fuel":
             status["fuelLevel"] = self.fuelLevel
         elif option == "battery":
@@ -402,7 +402,7 @@ class VehicleControlAPI:
             self._slopeAngle = 10.0
             if self.long_context:
                 return {
-                    "parkingBrakeInstruction": PARKING_BRAKE_INSTRUCTION,
+                    "parkingBrakeInstruction": get_long_context_constant("PARKING_BRAKE_INSTRUCTION"),
                     "parkingBrakeStatus": "engaged",
                     "_parkingBrakeForce": 500.0,
                     "_slopeAngle": 10.0,
@@ -414,7 +414,7 @@ class VehicleControlAPI:
             self._slopeAngle = 10.0
             if self.long_context:
                 return {
-                    "parkingBrakeInstruction": PARKING_BRAKE_INSTRUCTION,
+                    "parkingBrakeInstruction": get_long_context_constant("PARKING_BRAKE_INSTRUCTION"),
                     "parkingBrakeStatus": "released",
                     "_parkingBrakeForce": 0.0,
                     "_slopeAngle": 10.0,
@@ -612,7 +612,7 @@ class VehicleControlAPI:
             distance = {"error": "distance not found in database."}
 
         if self.long_context:
-            distance["intermediaryCities"] = INTERMEDIARY_CITIES
+            distance["intermediaryCities"] = get_long_context_constant("INTERMEDIARY_CITIES")
         return distance
 
     def get_zipcode_based_on_city(self, city: str) -> Dict[str, str]:
@@ -691,7 +691,7 @@ class VehicleControlAPI:
         }
 
         if self.long_context:
-            tire_status["car_info"] = CAR_STATUS_METADATA_EXTENSION
+            tire_status["car_info"] = get_long_context_constant("CAR_STATUS_METADATA_EXTENSION")
         return tire_status
 
     def find_nearest_tire_shop(self) -> Dict[str, str]:
@@ -1,6 +1,12 @@
+import hashlib
+import multiprocessing
 import os
 import random
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Optional
 from urllib.parse import urlparse
 
@@ -26,6 +32,107 @@ ERROR_TEMPLATES = [
     ),
 ]
 
+# Pages larger than this (in characters) are truncated before being handed to the HTML parser.
+# Some pages are tens of MB of inline scripts and data blobs, and parsing them would stall the inference thread.
+MAX_HTML_SIZE_FOR_PARSING = 2_000_000
+# Maximum number of processed pages kept in memory
+PROCESSED_CONTENT_CACHE_MAX_SIZE = 1024
+# Number of worker processes used to convert HTML to text
+HTML_PROCESSING_NUM_WORKERS = min(4, os.cpu_count() or 1)
+
+# Processed content is shared across all WebSearchAPI instances (and therefore across models and test entries).
+# Key is (url, mode, sha256 of the raw HTML), so a page that changed upstream is re-processed.
+_PROCESSED_CONTENT_CACHE: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+_PROCESSED_CONTENT_CACHE_LOCK = threading.Lock()
+
+_HTML_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+_HTML_PROCESS_POOL_LOCK = threading.Lock()
+
+
+def _html_to_markdown(html: str) -> str:
+    converter = html2text.HTML2Text()
+    return converter.handle(html)
+
+
+def _html_to_truncated_text(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Remove scripts and styles
+    for script_or_style in soup(["script", "style"]):
+        script_or_style.extract()
+
+    # Extract and clean text
+    return soup.get_text(separator="\n", strip=True)
+
+
+_HTML_PROCESSORS = {
+    "markdown": _html_to_markdown,
+    "truncate": _html_to_truncated_text,
+}
+
+
+def _get_html_process_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Lazily create the process pool used for HTML conversion.
+    Parsing is CPU-bound and holds the GIL, so running it in the inference threads would serialize all of them.
+    The pool is created from the generation process while its inference threads are running, so the workers are
+    spawned rather than forked: a forked child would inherit locks held by those threads (eg, logging, SSL, the
+    content cache) and could deadlock on them.
+    """
+    global _HTML_PROCESS_POOL
+    with _HTML_PROCESS_POOL_LOCK:
+        if _HTML_PROCESS_POOL is None and HTML_PROCESSING_NUM_WORKERS > 1:
+            _HTML_PROCESS_POOL = ProcessPoolExecutor(
+                max_workers=HTML_PROCESSING_NUM_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _HTML_PROCESS_POOL
+
+
+def _process_html(html: str, mode: str) -> str:
+    """
+    Convert the raw HTML to the requested mode, running the conversion in the process pool when possible.
+    """
+    global _HTML_PROCESS_POOL
+    processor = _HTML_PROCESSORS[mode]
+    html = html[:MAX_HTML_SIZE_FOR_PARSING]
+
+    pool = _get_html_process_pool()
+    if pool is None:
+        return processor(html)
+
+    try:
+        return pool.submit(processor, html).result()
+    except BrokenProcessPool:
+        # A worker died (eg, OOM on a pathological page). Drop the pool so the next call gets a fresh one.
+        with _HTML_PROCESS_POOL_LOCK:
+            if _HTML_PROCESS_POOL is pool:
+                _HTML_PROCESS_POOL = None
+        return processor(html)
+
+
+def _get_processed_content(url: str, html: str, mode: str) -> str:
+    """
+    Return the processed content for the page, using the shared cache if the same page has already been processed.
+    """
+    content_hash = hashlib.sha256(html.encode("utf-8", errors="replace")).hexdigest()
+    cache_key = (url, mode, content_hash)
+
+    with _PROCESSED_CONTENT_CACHE_LOCK:
+        if cache_key in _PROCESSED_CONTENT_CACHE:
+            _PROCESSED_CONTENT_CACHE.move_to_end(cache_key)
+            return _PROCESSED_CONTENT_CACHE[cache_key]
+
+    processed_content = _process_html(html, mode)
+
+    with _PROCESSED_CONTENT_CACHE_LOCK:
+        _PROCESSED_CONTENT_CACHE[cache_key] = processed_content
+        _PROCESSED_CONTENT_CACHE.move_to_end(cache_key)
+        while len(_PROCESSED_CONTENT_CACHE) > PROCESSED_CONTENT_CACHE_MAX_SIZE:
+            _PROCESSED_CONTENT_CACHE.popitem(last=False)
+
+    return processed_content
+
 
 class WebSearchAPI:
     def __init__(self):
@@ -279,21 +386,9 @@ class WebSearchAPI:
             if mode == "raw":
                 return {"content": response.text}
 
-            elif mode == "markdown":
-                converter = html2text.HTML2Text()
-                markdown = converter.handle(response.text)
-                return {"content": markdown}
-
-            elif mode == "truncate":
-                soup = BeautifulSoup(response.text, "html.parser")
-
-                # Remove scripts and styles
-                for script_or_style in soup(["script", "style"]):
-                    script_or_style.extract()
+            elif mode in _HTML_PROCESSORS:
+                return {"content": _get_processed_content(url, response.text, mode)}
 
-                # Extract and clean text
-                text = soup.get_text(separator="\n", strip=True)
-                return {"content": text}
             else:
                 raise ValueError(f"Unsupported mode: {mode}")
 
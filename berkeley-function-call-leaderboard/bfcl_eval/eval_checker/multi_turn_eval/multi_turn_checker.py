@@ -2,6 +2,7 @@ from bfcl_eval.eval_checker.multi_turn_eval.multi_turn_utils import (
     execute_multi_turn_func_call,
     is_empty_execute_response,
 )
+from bfcl_eval.profiler import profile_span
 
 #### Main functions ####
 
@@ -38,12 +39,31 @@ def multi_turn_checker(
         single_step_model_execution_results = []  # Will be overwritten in the for loop
     
         for single_step_model_response in single_turn_model_response_list:
-            single_step_model_execution_results, model_instances = (
+            with profile_span("execute"):
+                single_step_model_execution_results, model_instances = (
+                    execute_multi_turn_func_call(
+                        func_call_list=single_step_model_response,
+                        initial_config=initial_config,
+                        involved_classes=involved_classes,
+                        model_name=model_name,
+                        test_entry_id=test_entry_id,
+                        long_context=(
+                            "long_context" in test_category or "composite" in test_category
+                        ),
+                        is_evaL_run=True,
+                    )
+                )
+            single_turn_model_execution_results.extend(single_step_model_execution_results)
+            single_turn_model_execution_results_uncombined.append(single_step_model_execution_results)
+
+        # Execute the ground truth function calls
+        with profile_span("execute"):
+            single_turn_ground_truth_execution_results, ground_truth_instances = (
                 execute_multi_turn_func_call(
-                    func_call_list=single_step_model_response,
+                    func_call_list=single_turn_ground_truth_list,
                     initial_config=initial_config,
                     involved_classes=involved_classes,
-                    model_name=model_name,
+                    model_name=model_name + "_ground_truth",
                     test_entry_id=test_entry_id,
                     long_context=(
                         "long_context" in test_category or "composite" in test_category
@@ -51,23 +71,6 @@ def multi_turn_checker(
                     is_evaL_run=True,
                 )
             )
-            single_turn_model_execution_results.extend(single_step_model_execution_results)
-            single_turn_model_execution_results_uncombined.append(single_step_model_execution_results)
-
-        # Execute the ground truth function calls
-        single_turn_ground_truth_execution_results, ground_truth_instances = (
-            execute_multi_turn_func_call(
-                func_call_list=single_turn_ground_truth_list,
-                initial_config=initial_config,
-                involved_classes=involved_classes,
-                model_name=model_name + "_ground_truth",
-                test_entry_id=test_entry_id,
-                long_context=(
-                    "long_context" in test_category or "composite" in test_category
-                ),
-                is_evaL_run=True,
-            )
-        )
 
         all_turn_model_execution_results.extend(single_turn_model_execution_results)
         execution_results.append(
@@ -0,0 +1,674 @@
+"""
+A fake OpenAI-compatible inference server for load-testing the generation harness without a GPU or API keys.
+
+It serves `GET /v1/models`, `POST /v1/completions` (used by the OSS handlers) and `POST /v1/chat/completions`
+(used by the OpenAI-compatible API handlers), and answers every request with either a recorded model response
+(replayed from existing result files) or a synthesized one. The per-request latency follows a configurable
+distribution, a fraction of the requests can fail on purpose, and the overall throughput can be capped, so that
+`--num-threads`, the result writer and the scheduler can be stress-tested at realistic request rates on a CPU-only box.
+
+Start it with `bfcl mock-server`, then point the harness at it with `bfcl generate --skip-server-setup` and the
+`LOCAL_SERVER_ENDPOINT`/`LOCAL_SERVER_PORT` environment variables (or `OPENAI_BASE_URL` for the OpenAI handlers).
+`GET /stats` returns the request counters.
+
+It also emulates the OpenAI Files and Batch APIs (`POST /v1/files`, `POST /v1/batches`, `GET /v1/batches/{id}`,
+`POST /v1/batches/{id}/cancel` and `GET /v1/files/{id}/content`) for `/v1/chat/completions` and `/v1/completions`
+batches, so that `bfcl generate --batch` can be tested locally. A batch completes `batch_latency_s` seconds after its
+creation; the injected errors apply to its requests, but not the per-request latency nor the throughput cap.
+"""
+
+import itertools
+import json
+import math
+import random
+import threading
+from email.parser import BytesParser
+from email.policy import HTTP
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+from bfcl_eval.constants.eval_config import LOCAL_SERVER_PORT
+from bfcl_eval.utils import load_file
+
+LATENCY_DISTRIBUTIONS = ("constant", "uniform", "normal", "lognormal", "exponential")
+RATE_LIMIT_MODES = ("delay", "reject")
+DEFAULT_RESPONSE_TEXT = "I cannot help with this request."
+# Rough characters-per-token ratio used for the reported token usage
+CHARACTERS_PER_TOKEN = 4
+
+# Placeholder argument values for the synthesized tool calls, by JSON schema type
+_PLACEHOLDER_VALUES = {
+    "string": "mock",
+    "integer": 1,
+    "number": 1.0,
+    "float": 1.0,
+    "boolean": True,
+    "array": [],
+    "tuple": [],
+    "object": {},
+    "dict": {},
+}
+
+
+@dataclass
+class MockServerConfig:
+    host: str = "localhost"
+    port: int = LOCAL_SERVER_PORT
+    # Model ID reported by `/v1/models` and echoed in the responses
+    model: str = "mock-model"
+    latency_distribution: str = "constant"
+    latency_mean_ms: float = 0.0
+    latency_stddev_ms: float = 0.0
+    # Fraction of the requests answered with `error_status_code` instead of a completion
+    error_rate: float = 0.0
+    error_status_code: int = 500
+    # None means no throughput cap
+    max_requests_per_minute: Optional[float] = None
+    # `delay` queues the requests over the cap, `reject` answers them with a 429
+    rate_limit_mode: str = "delay"
+    # Result file or directory of result files to replay the `result` field from
+    replay_path: Optional[str] = None
+    response_text: str = DEFAULT_RESPONSE_TEXT
+    seed: Optional[int] = None
+    # Time between the creation of a batch and its completion
+    batch_latency_s: float = 1.0
+
+    def __post_init__(self):
+        if self.latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{self.latency_distribution}'. Available distributions: {', '.join(LATENCY_DISTRIBUTIONS)}."
+            )
+        if self.rate_limit_mode not in RATE_LIMIT_MODES:
+            raise ValueError(
+                f"Unknown rate limit mode '{self.rate_limit_mode}'. Available modes: {', '.join(RATE_LIMIT_MODES)}."
+            )
+        if not 0.0 <= self.error_rate <= 1.0:
+            raise ValueError(f"The error rate must be between 0 and 1, got {self.error_rate}.")
+        if self.latency_mean_ms < 0 or self.latency_stddev_ms < 0:
+            raise ValueError("The latency mean and standard deviation must be non-negative.")
+        if self.batch_latency_s < 0:
+            raise ValueError("The batch latency must be non-negative.")
+        if self.max_requests_per_minute is not None and self.max_requests_per_minute <= 0:
+            raise ValueError("The maximum requests per minute must be positive.")
+
+
+#### Latency, errors and throughput ####
+
+
+def sample_latency(config: MockServerConfig, rng: random.Random) -> float:
+    """
+    Draw one request latency, in seconds, from the configured distribution.
+    `latency_mean_ms` is the mean of the distribution; `latency_stddev_ms` is ignored by `constant` and `exponential`.
+    """
+    mean = config.latency_mean_ms
+    stddev = config.latency_stddev_ms
+    distribution = config.latency_distribution
+
+    if mean == 0 or distribution == "constant":
+        latency_ms = mean
+    elif distribution == "uniform":
+        # A uniform distribution on [a, b] has a standard deviation of (b - a) / sqrt(12)
+        half_width = min(stddev * math.sqrt(3), mean)
+        latency_ms = rng.uniform(mean - half_width, mean + half_width)
+    elif distribution == "normal":
+        latency_ms = rng.gauss(mean, stddev)
+    elif distribution == "lognormal":
+        # Parameters of the underlying normal distribution that give the requested mean and standard deviation
+        sigma_squared = math.log(1 + (stddev / mean) ** 2)
+        latency_ms = rng.lognormvariate(math.log(mean) - sigma_squared / 2, math.sqrt(sigma_squared))
+    else:
+        latency_ms = rng.expovariate(1 / mean)
+
+    return max(latency_ms, 0.0) / 1000
+
+
+class _RateLimiter:
+    """
+    Token bucket allowing `requests_per_minute` on average, with bursts of up to one second worth of requests.
+    """
+
+    def __init__(self, requests_per_minute: float):
+        self.rate = requests_per_minute / 60
+        self.capacity = max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _reserve(self, block: bool) -> Optional[float]:
+        """
+        Take a token and return how long to wait before using it, or None if `block` is False and none is available.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            if not block:
+                return None
+            # Go into debt, so that the requests waiting for a token are served in arrival order
+            self.tokens -= 1
+            return -self.tokens / self.rate
+
+    def acquire(self, block: bool) -> bool:
+        wait_time = self._reserve(block)
+        if wait_time is None:
+            return False
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return True
+
+
+#### Responses ####
+
+
+def load_recorded_responses(replay_path: str) -> list[str]:
+    """
+    Collect the model responses from a result file, or from all the result files under a directory.
+    Only the string responses are kept; for multi-turn entries, every step of every turn is replayed.
+    """
+    replay_path = Path(replay_path)
+    files = sorted(replay_path.rglob("*.json")) if replay_path.is_dir() else [replay_path]
+
+    responses = []
+    for file in files:
+        for entry in load_file(file):
+            pending = [entry.get("result")]
+            while pending:
+                result = pending.pop()
+                if isinstance(result, str):
+                    responses.append(result)
+                elif isinstance(result, list):
+                    pending.extend(reversed(result))
+
+    if not responses:
+        raise ValueError(f"No string model responses found in {replay_path}.")
+    return responses
+
+
+def _estimate_token_count(text: str) -> int:
+    return max(1, len(text) // CHARACTERS_PER_TOKEN)
+
+
+def _synthesize_tool_call(tool: dict) -> dict:
+    """
+    Build a call to `tool` (an OpenAI tool spec) with a placeholder value for every required parameter.
+    """
+    function = tool.get("function", tool)
+    parameters = function.get("parameters", {})
+    properties = parameters.get("properties", {})
+    arguments = {
+        name: _PLACEHOLDER_VALUES.get(properties.get(name, {}).get("type"), "mock")
+        for name in parameters.get("required", [])
+    }
+    return {
+        "id": f"call_{uuid.uuid4().hex[:24]}",
+        "type": "function",
+        "function": {"name": function.get("name", "mock_function"), "arguments": json.dumps(arguments)},
+    }
+
+
+class MockServerState:
+    """
+    State shared by the request handler threads: the response source, the throughput cap and the counters.
+    """
+
+    def __init__(self, config: MockServerConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.rng_lock = threading.Lock()
+        self.rate_limiter = (
+            _RateLimiter(config.max_requests_per_minute)
+            if config.max_requests_per_minute is not None
+            else None
+        )
+
+        self.recorded_responses = (
+            load_recorded_responses(config.replay_path) if config.replay_path else None
+        )
+        self._response_cycle = (
+            itertools.cycle(self.recorded_responses) if self.recorded_responses else None
+        )
+        self._response_lock = threading.Lock()
+
+        self.start_time = time.monotonic()
+        self.stats_lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "completed": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "injected_errors": 0,
+            "rate_limited": 0,
+            "total_latency_s": 0.0,
+            "batches": 0,
+        }
+
+        # Uploaded files and batches of the emulated Batch API, by ID
+        self.files = {}
+        self.batches = {}
+        self.batch_lock = threading.Lock()
+
+    def increment(self, **deltas) -> None:
+        with self.stats_lock:
+            for key, delta in deltas.items():
+                self.stats[key] += delta
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+
+    def get_stats(self) -> dict:
+        with self.stats_lock:
+            stats = dict(self.stats)
+        elapsed = time.monotonic() - self.start_time
+        stats["uptime_s"] = elapsed
+        stats["requests_per_minute"] = stats["requests"] / elapsed * 60 if elapsed > 0 else 0.0
+        return stats
+
+    def draw_request_outcome(self) -> tuple[float, bool]:
+        """
+        Return the latency (in seconds) of the next request and whether it should fail.
+        """
+        with self.rng_lock:
+            latency = sample_latency(self.config, self.rng)
+            should_fail = self.rng.random() < self.config.error_rate
+        return latency, should_fail
+
+    def next_response_text(self) -> str:
+        if self._response_cycle is None:
+            return self.config.response_text
+        with self._response_lock:
+            return next(self._response_cycle)
+
+
+    def build_usage(self, prompt_text: str, completion_text: str) -> dict:
+        prompt_tokens = _estimate_token_count(prompt_text)
+        completion_tokens = _estimate_token_count(completion_text)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    def build_completion(self, request: dict) -> dict:
+        prompt = request.get("prompt", "")
+        if isinstance(prompt, list):
+            prompt = "".join(str(item) for item in prompt)
+        text = self.next_response_text()
+        return {
+            "id": f"cmpl-{uuid.uuid4().hex}",
+            "object": "text_completion",
+            "created": int(time.time()),
+            "model": request.get("model", self.config.model),
+            "choices": [{"index": 0, "text": text, "logprobs": None, "finish_reason": "stop"}],
+            "usage": self.build_usage(prompt, text),
+        }
+
+    def build_chat_completion(self, request: dict) -> dict:
+        messages = request.get("messages", [])
+        prompt = json.dumps(messages)
+        tools = request.get("tools")
+        # Without recorded responses, answer function-calling requests with a call to the first tool
+        if tools and self.recorded_responses is None:
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [_synthesize_tool_call(tools[0])],
+            }
+            completion_text = message["tool_calls"][0]["function"]["arguments"]
+            finish_reason = "tool_calls"
+        else:
+            completion_text = self.next_response_text()
+            message = {"role": "assistant", "content": completion_text}
+            finish_reason = "stop"
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", self.config.model),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": self.build_usage(prompt, completion_text),
+        }
+
+    #### Emulated Batch API ####
+
+    def create_file(self, file_name: str, purpose: str, content: bytes) -> dict:
+        file_object = {
+            "id": f"file-{uuid.uuid4().hex}",
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": file_name,
+            "purpose": purpose,
+            "status": "processed",
+        }
+        with self.batch_lock:
+            self.files[file_object["id"]] = (file_object, content)
+        return file_object
+
+    def create_batch(self, input_file_id: str, endpoint: str, completion_window: str) -> dict:
+        batch = {
+            "id": f"batch_{uuid.uuid4().hex}",
+            "object": "batch",
+            "endpoint": endpoint,
+            "errors": None,
+            "input_file_id": input_file_id,
+            "completion_window": completion_window,
+            "status": "in_progress",
+            "output_file_id": None,
+            "error_file_id": None,
+            "created_at": int(time.time()),
+            "in_progress_at": int(time.time()),
+            "request_counts": {"total": 0, "completed": 0, "failed": 0},
+        }
+        with self.batch_lock:
+            self.batches[batch["id"]] = batch
+            batch = dict(batch)
+        self.increment(batches=1)
+        timer = threading.Timer(
+            self.config.batch_latency_s, self._complete_batch, (batch["id"],)
+        )
+        timer.daemon = True
+        timer.start()
+        return batch
+
+    def cancel_batch(self, batch_id: str) -> dict:
+        with self.batch_lock:
+            batch = self.batches[batch_id]
+            if batch["status"] == "in_progress":
+                batch["status"] = "cancelled"
+                batch["cancelled_at"] = int(time.time())
+            return dict(batch)
+
+    def _complete_batch(self, batch_id: str) -> None:
+        with self.batch_lock:
+            batch = self.batches[batch_id]
+            if batch["status"] != "in_progress":
+                return
+            _, input_content = self.files[batch["input_file_id"]]
+
+        output_lines, error_lines = [], []
+        for line in input_content.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            _, should_fail = self.draw_request_outcome()
+            if should_fail:
+                self.increment(injected_errors=1)
+                error_lines.append(
+                    {
+                        "id": f"batch_req_{uuid.uuid4().hex}",
+                        "custom_id": item["custom_id"],
+                        "response": {
+                            "status_code": self.config.error_status_code,
+                            "body": {
+                                "error": {"message": "Injected mock server error", "type": "server_error"}
+                            },
+                        },
+                        "error": None,
+                    }
+                )
+                continue
+            if batch["endpoint"] == "/v1/completions":
+                body = self.build_completion(item["body"])
+            else:
+                body = self.build_chat_completion(item["body"])
+            self.increment(completed=1)
+            output_lines.append(
+                {
+                    "id": f"batch_req_{uuid.uuid4().hex}",
+                    "custom_id": item["custom_id"],
+                    "response": {"status_code": 200, "request_id": uuid.uuid4().hex, "body": body},
+                    "error": None,
+                }
+            )
+
+        output_file = self.create_file(
+            "batch_output.jsonl",
+            "batch_output",
+            "".join(json.dumps(line) + "\n" for line in output_lines).encode("utf-8"),
+        )
+        error_file = (
+            self.create_file(
+                "batch_errors.jsonl",
+                "batch_output",
+                "".join(json.dumps(line) + "\n" for line in error_lines).encode("utf-8"),
+            )
+            if error_lines
+            else None
+        )
+        with self.batch_lock:
+            batch.update(
+                status="completed",
+                completed_at=int(time.time()),
+                output_file_id=output_file["id"],
+                error_file_id=error_file["id"] if error_file else None,
+                request_counts={
+                    "total": len(output_lines) + len(error_lines),
+                    "completed": len(output_lines),
+                    "failed": len(error_lines),
+                },
+            )
+
+
+class _MockRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive connections, so that the client connection pools are exercised like with a real server
+    protocol_version = "HTTP/1.1"
+    server_version = "BFCLMockServer"
+
+    @property
+    def state(self) -> MockServerState:
+        return self.server.state
+
+    def log_message(self, format, *args):
+        # The default handler logs every request to stderr, which would dominate the cost at high request rates
+        pass
+
+    def _send_bytes(self, status_code: int, payload: bytes, content_type: str) -> None:
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_json(self, status_code: int, body: dict) -> None:
+        self._send_bytes(status_code, json.dumps(body).encode("utf-8"), "application/json")
+
+    def _send_error_json(self, status_code: int, message: str, error_type: str) -> None:
+        self._send_json(
+            status_code,
+            {"error": {"message": message, "type": error_type, "code": status_code}},
+        )
+
+    def do_GET(self):
+        path = self.path.rstrip("/")
+        if path in ("/v1/models", "/models"):
+            self._send_json(
+                200,
+                {
+                    "object": "list",
+                    "data": [{"id": self.state.config.model, "object": "model", "owned_by": "bfcl"}],
+                },
+            )
+        elif path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif path == "/stats":
+            self._send_json(200, self.state.get_stats())
+        elif path.startswith("/v1/batches/"):
+            batch_id = path.removeprefix("/v1/batches/")
+            with self.state.batch_lock:
+                batch = dict(self.state.batches[batch_id]) if batch_id in self.state.batches else None
+            if batch is None:
+                self._send_error_json(404, f"No batch with ID {batch_id}", "not_found_error")
+            else:
+                self._send_json(200, batch)
+        elif path.startswith("/v1/files/"):
+            file_id, _, suffix = path.removeprefix("/v1/files/").partition("/")
+            with self.state.batch_lock:
+                file_object, content = self.state.files.get(file_id, (None, None))
+            if file_object is None:
+                self._send_error_json(404, f"No file with ID {file_id}", "not_found_error")
+            elif suffix == "content":
+                self._send_bytes(200, content, "application/octet-stream")
+            else:
+                self._send_json(200, file_object)
+        else:
+            self._send_error_json(404, f"Unknown path {self.path}", "not_found_error")
+
+    def do_POST(self):
+        content_length = int(self.headers.get("Content-Length", 0))
+        raw_body = self.rfile.read(content_length) if content_length else b""
+        path = self.path.rstrip("/")
+        if path == "/v1/files":
+            self._handle_file_upload(raw_body)
+            return
+        if path == "/v1/batches" or path.startswith("/v1/batches/"):
+            self._handle_batch_request(path, raw_body)
+            return
+        if path not in ("/v1/completions", "/v1/chat/completions"):
+            self._send_error_json(404, f"Unknown path {self.path}", "not_found_error")
+            return
+        try:
+            request = json.loads(raw_body) if raw_body else {}
+        except json.JSONDecodeError as e:
+            self._send_error_json(400, f"Invalid JSON body: {e}", "invalid_request_error")
+            return
+
+        state = self.state
+        state.increment(requests=1)
+
+        if state.rate_limiter is not None:
+            if not state.rate_limiter.acquire(block=state.config.rate_limit_mode == "delay"):
+                state.increment(rate_limited=1)
+                self._send_error_json(429, "Rate limit exceeded", "rate_limit_error")
+                return
+
+        latency, should_fail = state.draw_request_outcome()
+        state.increment(in_flight=1)
+        try:
+            if latency > 0:
+                time.sleep(latency)
+        finally:
+            state.increment(in_flight=-1, total_latency_s=latency)
+
+        if should_fail:
+            state.increment(injected_errors=1)
+            self._send_error_json(
+                state.config.error_status_code, "Injected mock server error", "server_error"
+            )
+            return
+
+        if path == "/v1/completions":
+            body = state.build_completion(request)
+        else:
+            body = state.build_chat_completion(request)
+        state.increment(completed=1)
+        self._send_json(200, body)
+
+    def _handle_file_upload(self, raw_body: bytes) -> None:
+        # `multipart/form-data` body, with a `purpose` field and a `file` field
+        content_type = self.headers.get("Content-Type", "")
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + raw_body
+        )
+        if not message.is_multipart():
+            self._send_error_json(400, "Expected a multipart/form-data body", "invalid_request_error")
+            return
+        fields, file_name = {}, None
+        for part in message.iter_parts():
+            field_name = part.get_param("name", header="content-disposition")
+            fields[field_name] = part.get_payload(decode=True)
+            if field_name == "file":
+                file_name = part.get_filename()
+        if "file" not in fields:
+            self._send_error_json(400, "Missing the `file` field", "invalid_request_error")
+            return
+        purpose = (fields.get("purpose") or b"batch").decode("utf-8")
+        self._send_json(
+            200, self.state.create_file(file_name or "upload.jsonl", purpose, fields["file"])
+        )
+
+    def _handle_batch_request(self, path: str, raw_body: bytes) -> None:
+        if path.endswith("/cancel"):
+            batch_id = path.removeprefix("/v1/batches/").removesuffix("/cancel")
+            if batch_id not in self.state.batches:
+                self._send_error_json(404, f"No batch with ID {batch_id}", "not_found_error")
+            else:
+                self._send_json(200, self.state.cancel_batch(batch_id))
+            return
+        if path != "/v1/batches":
+            self._send_error_json(404, f"Unknown path {self.path}", "not_found_error")
+            return
+
+        try:
+            request = json.loads(raw_body) if raw_body else {}
+        except json.JSONDecodeError as e:
+            self._send_error_json(400, f"Invalid JSON body: {e}", "invalid_request_error")
+            return
+        if request.get("input_file_id") not in self.state.files:
+            self._send_error_json(
+                400, f"No file with ID {request.get('input_file_id')}", "invalid_request_error"
+            )
+            return
+        if request.get("endpoint") not in ("/v1/completions", "/v1/chat/completions"):
+            self._send_error_json(
+                400,
+                f"Unsupported batch endpoint {request.get('endpoint')}. Supported endpoints: /v1/completions, /v1/chat/completions.",
+                "invalid_request_error",
+            )
+            return
+        self._send_json(
+            200,
+            self.state.create_batch(
+                request["input_file_id"], request["endpoint"], request.get("completion_window", "24h")
+            ),
+        )
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections when hundreds of client threads connect at once
+    request_queue_size = 1024
+
+    def __init__(self, config: MockServerConfig):
+        self.state = MockServerState(config)
+        super().__init__((config.host, config.port), _MockRequestHandler)
+
+
+def main(args) -> None:
+    config = MockServerConfig(
+        host=args.host,
+        port=args.port,
+        model=args.model,
+        latency_distribution=args.latency_distribution,
+        latency_mean_ms=args.latency_mean_ms,
+        latency_stddev_ms=args.latency_stddev_ms,
+        error_rate=args.error_rate,
+        error_status_code=args.error_status_code,
+        max_requests_per_minute=args.max_requests_per_minute,
+        rate_limit_mode=args.rate_limit_mode,
+        replay_path=args.replay,
+        response_text=args.response_text,
+        seed=args.seed,
+        batch_latency_s=getattr(args, "batch_latency_s", 1.0),
+    )
+    server = MockServer(config)
+
+    if server.state.recorded_responses is not None:
+        print(f"📼 Replaying {len(server.state.recorded_responses)} recorded responses from {config.replay_path}")
+    print(
+        f"🚀 Mock server listening on http://{config.host}:{server.server_address[1]}/v1 "
+        f"(latency: {config.latency_distribution}, mean {config.latency_mean_ms} ms; "
+        f"error rate: {config.error_rate}; "
+        f"throughput cap: {config.max_requests_per_minute or 'none'} rpm)"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"🛑 Mock server stopped. Stats: {json.dumps(server.state.get_stats())}")
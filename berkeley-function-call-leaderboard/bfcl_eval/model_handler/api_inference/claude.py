@@ -3,7 +3,7 @@ import os
 import time
 from typing import Any
 
-from anthropic import Anthropic, RateLimitError
+from anthropic import Anthropic, DefaultHttpxClient, RateLimitError
 from anthropic.types import TextBlock, ToolUseBlock
 from bfcl_eval.constants.enums import ModelStyle
 from bfcl_eval.constants.type_mappings import GORILLA_TO_OPENAPI
@@ -15,6 +15,7 @@ from bfcl_eval.model_handler.utils import (
     default_decode_ast_prompting,
     default_decode_execute_prompting,
     extract_system_prompt,
+    extract_usage_details,
     format_execution_results_prompting,
     retry_with_backoff,
     system_prompt_pre_processing_chat_model,
@@ -33,7 +34,10 @@ class ClaudeHandler(BaseHandler):
     ) -> None:
         super().__init__(model_name, temperature, registry_name, is_fc_model, **kwargs)
         self.model_style = ModelStyle.ANTHROPIC
-        self.client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        self.client = Anthropic(
+            api_key=os.getenv("ANTHROPIC_API_KEY"),
+            http_client=self._build_http_client(DefaultHttpxClient),
+        )
 
     def decode_ast(self, result, language, has_tool_call_tag):
         if not self.is_fc_model:
@@ -63,6 +67,21 @@ class ClaudeHandler(BaseHandler):
 
         return api_response, end_time - start_time
 
+    @staticmethod
+    def _parse_usage(usage) -> dict:
+        """
+        Anthropic reports the prompt tokens read from and written to the prompt cache separately from `input_tokens`;
+        they are added back so that `input_token` counts the whole prompt, as for the other providers.
+        """
+        usage_details = extract_usage_details(usage)
+        return {
+            "input_token": usage.input_tokens
+            + usage_details["cached_input_token"]
+            + usage_details["cache_write_input_token"],
+            "output_token": usage.output_tokens,
+            **usage_details,
+        }
+
     def _get_max_tokens(self):
         """
         max_tokens is required to be set when querying, so we default to the model's max tokens
@@ -174,8 +193,7 @@ class ClaudeHandler(BaseHandler):
             "model_responses": model_responses,
             "model_responses_message_for_chat_history": model_responses_message_for_chat_history,
             "tool_call_ids": tool_call_ids,
-            "input_token": api_response.usage.input_tokens,
-            "output_token": api_response.usage.output_tokens,
+            **self._parse_usage(api_response.usage),
         }
 
     def add_first_turn_message_FC(
@@ -303,8 +321,7 @@ class ClaudeHandler(BaseHandler):
     def _parse_query_response_prompting(self, api_response: Any) -> dict:
         return {
             "model_responses": api_response.content[0].text,
-            "input_token": api_response.usage.input_tokens,
-            "output_token": api_response.usage.output_tokens,
+            **self._parse_usage(api_response.usage),
         }
 
     def add_first_turn_message_prompting(
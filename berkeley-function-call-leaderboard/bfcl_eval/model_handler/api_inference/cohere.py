@@ -30,7 +30,9 @@ class CohereHandler(BaseHandler):
         super().__init__(model_name, temperature, registry_name, is_fc_model, **kwargs)
         self.model_style = ModelStyle.COHERE
         self.is_fc_model = True
-        self.client = cohere.ClientV2(api_key=os.getenv("COHERE_API_KEY"))
+        self.client = cohere.ClientV2(
+            api_key=os.getenv("COHERE_API_KEY"), httpx_client=self._build_http_client()
+        )
 
     def decode_ast(self, result, language, has_tool_call_tag):
         decoded_output = []
@@ -10,7 +10,7 @@ from bfcl_eval.model_handler.utils import (
     retry_with_backoff,
     system_prompt_pre_processing_chat_model,
 )
-from openai import OpenAI, RateLimitError
+from openai import DefaultHttpxClient, OpenAI, RateLimitError
 from overrides import override
 
 
@@ -31,6 +31,7 @@ class DeepSeekAPIHandler(OpenAICompletionsHandler):
         self.client = OpenAI(
             base_url=base,
             api_key=os.getenv("DEEPSEEK_API_KEY"),
+            http_client=self._build_http_client(DefaultHttpxClient),
         )
 
     # The deepseek API is unstable at the moment, and will frequently give empty responses, so retry on JSONDecodeError is necessary
@@ -1,6 +1,6 @@
 import os
 from bfcl_eval.constants.enums import ModelStyle
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 from bfcl_eval.model_handler.api_inference.mining import MiningHandler
 
 class DMCitoHandler(MiningHandler):
@@ -17,4 +17,5 @@ class DMCitoHandler(MiningHandler):
         self.client = OpenAI(
             base_url= os.getenv("DMCITO_BASE_URL"),
             api_key=os.getenv("DMCITO_API_KEY"),
+            http_client=self._build_http_client(DefaultHttpxClient),
         )
\ No newline at end of file
@@ -6,7 +6,7 @@ from bfcl_eval.model_handler.api_inference.openai_completion import (
     OpenAICompletionsHandler,
 )
 from bfcl_eval.constants.enums import ModelStyle
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 
 
 class FireworksHandler(OpenAICompletionsHandler):
@@ -24,6 +24,7 @@ class FireworksHandler(OpenAICompletionsHandler):
         self.client = OpenAI(
             base_url="https://api.fireworks.ai/inference/v1",
             api_key=os.getenv("FIREWORKS_API_KEY"),
+            http_client=self._build_http_client(DefaultHttpxClient),
         )
 
     #### FC methods ####
@@ -1,6 +1,6 @@
 from bfcl_eval.model_handler.api_inference.openai_completion import OpenAICompletionsHandler
 from bfcl_eval.constants.enums import ModelStyle
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 
 
 # For setup instructions, please refer to https://github.com/MeetKai/functionary for setup details.
@@ -16,4 +16,8 @@ class FunctionaryHandler(OpenAICompletionsHandler):
         super().__init__(model_name, temperature, registry_name, is_fc_model, **kwargs)
         self.model_style = ModelStyle.OPENAI_COMPLETIONS
 
-        self.client = OpenAI(base_url="http://localhost:8000/v1", api_key="functionary")
+        self.client = OpenAI(
+            base_url="http://localhost:8000/v1",
+            api_key="functionary",
+            http_client=self._build_http_client(DefaultHttpxClient),
+        )
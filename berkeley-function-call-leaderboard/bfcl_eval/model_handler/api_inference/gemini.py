@@ -4,12 +4,17 @@ from typing import Any
 
 from bfcl_eval.constants.type_mappings import GORILLA_TO_OPENAPI
 from bfcl_eval.model_handler.base_handler import BaseHandler
+from bfcl_eval.model_handler.http_client import (
+    get_environment_proxy_mounts,
+    get_shared_transport,
+)
 from bfcl_eval.constants.enums import ModelStyle
 from bfcl_eval.model_handler.utils import (
     convert_to_tool,
     default_decode_ast_prompting,
     default_decode_execute_prompting,
     extract_system_prompt,
+    extract_usage_details,
     format_execution_results_prompting,
     retry_with_backoff,
     system_prompt_pre_processing_chat_model,
@@ -19,6 +24,7 @@ from google.genai.types import (
     AutomaticFunctionCallingConfig,
     Content,
     GenerateContentConfig,
+    HttpOptions,
     Part,
     ThinkingConfig,
     Tool,
@@ -41,7 +47,16 @@ class GeminiHandler(BaseHandler):
             raise ValueError(
                 "GOOGLE_API_KEY environment variable must be set for Gemini models"
             )
-        self.client = genai.Client(api_key=api_key)
+        # The SDK builds its own httpx client from `client_args`, so it is given the shared transport instead of a client
+        self.client = genai.Client(
+            api_key=api_key,
+            http_options=HttpOptions(
+                client_args={
+                    "transport": get_shared_transport(),
+                    "mounts": get_environment_proxy_mounts(),
+                }
+            ),
+        )
 
     @staticmethod
     def _substitute_prompt_role(prompts: list[dict]) -> list[dict]:
@@ -136,6 +151,20 @@ class GeminiHandler(BaseHandler):
 
         return inference_data
 
+    @staticmethod
+    def _parse_usage(usage_metadata) -> dict:
+        """
+        Gemini reports the thinking tokens separately from `candidates_token_count`; they are added back so that
+        `output_token` counts all the billed output tokens, as for the other providers.
+        """
+        usage_details = extract_usage_details(usage_metadata)
+        return {
+            "input_token": usage_metadata.prompt_token_count,
+            "output_token": (usage_metadata.candidates_token_count or 0)
+            + usage_details["reasoning_token"],
+            **usage_details,
+        }
+
     def _parse_query_response_FC(self, api_response: Any) -> dict:
         tool_call_func_names = []
         fc_parts = []
@@ -181,8 +210,7 @@ class GeminiHandler(BaseHandler):
             "model_responses_message_for_chat_history": response_function_call_content,
             "tool_call_func_names": tool_call_func_names,
             "reasoning_content": "\n".join(reasoning_content),
-            "input_token": api_response.usage_metadata.prompt_token_count,
-            "output_token": api_response.usage_metadata.candidates_token_count,
+            **self._parse_usage(api_response.usage_metadata),
         }
 
     def add_first_turn_message_FC(
@@ -307,8 +335,7 @@ class GeminiHandler(BaseHandler):
         return {
             "model_responses": model_responses,
             "reasoning_content": reasoning_content,
-            "input_token": api_response.usage_metadata.prompt_token_count,
-            "output_token": api_response.usage_metadata.candidates_token_count,
+            **self._parse_usage(api_response.usage_metadata),
         }
 
     def add_first_turn_message_prompting(
@@ -1,7 +1,7 @@
 import os
 
 from bfcl_eval.model_handler.api_inference.openai_completion import OpenAICompletionsHandler
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 import httpx
 
 
@@ -19,4 +19,5 @@ class GLMAPIHandler(OpenAICompletionsHandler):
             api_key=os.getenv("GLM_API_KEY"),
             base_url="https://open.bigmodel.cn/api/paas/v4/",
             timeout=httpx.Timeout(timeout=300.0, connect=8.0),
+            http_client=self._build_http_client(DefaultHttpxClient),
         )
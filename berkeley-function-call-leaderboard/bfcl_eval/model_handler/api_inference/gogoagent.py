@@ -1,7 +1,7 @@
 import os
 
 from bfcl_eval.model_handler.api_inference.openai_completion import OpenAICompletionsHandler
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 
 
 class GoGoAgentHandler(OpenAICompletionsHandler):
@@ -17,5 +17,6 @@ class GoGoAgentHandler(OpenAICompletionsHandler):
         self.is_fc_model = False
 
         self.client = OpenAI(
-            base_url="https://api.gogoagent.ai", api_key=os.getenv("GOGOAGENT_API_KEY")
+            base_url="https://api.gogoagent.ai", api_key=os.getenv("GOGOAGENT_API_KEY"),
+            http_client=self._build_http_client(DefaultHttpxClient),
         )
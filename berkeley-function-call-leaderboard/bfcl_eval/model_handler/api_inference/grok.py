@@ -4,7 +4,7 @@ from typing import Any
 from bfcl_eval.model_handler.api_inference.openai_completion import (
     OpenAICompletionsHandler,
 )
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 from overrides import override
 
 
@@ -21,6 +21,7 @@ class GrokHandler(OpenAICompletionsHandler):
         self.client = OpenAI(
             base_url="https://api.x.ai/v1",
             api_key=os.getenv("GROK_API_KEY"),
+            http_client=self._build_http_client(DefaultHttpxClient),
         )
 
     @override
@@ -1,6 +1,6 @@
 import os
 from bfcl_eval.model_handler.api_inference.openai_completion import OpenAICompletionsHandler
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 
 
 class KimiHandler(OpenAICompletionsHandler):
@@ -19,5 +19,6 @@ class KimiHandler(OpenAICompletionsHandler):
             # If API Key is from US platform, use the above URL
             # If API Key is from China platform, use the below URL
             # base_url="https://api.moonshot.cn/v1", 
-            api_key=os.getenv("KIMI_API_KEY")
+            api_key=os.getenv("KIMI_API_KEY"),
+            http_client=self._build_http_client(DefaultHttpxClient),
         )
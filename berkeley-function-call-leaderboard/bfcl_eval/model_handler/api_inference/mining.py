@@ -7,7 +7,7 @@ from bfcl_eval.model_handler.api_inference.openai_completion import (
     OpenAICompletionsHandler,
 )
 from bfcl_eval.constants.enums import ModelStyle
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 
 
 class MiningHandler(OpenAICompletionsHandler):
@@ -24,6 +24,7 @@ class MiningHandler(OpenAICompletionsHandler):
         self.client = OpenAI(
             base_url= os.getenv("MINING_BASE_URL"),
             api_key=os.getenv("MINING_API_KEY"),
+            http_client=self._build_http_client(DefaultHttpxClient),
         )
 
     def decode_ast(self, result, language, has_tool_call_tag):
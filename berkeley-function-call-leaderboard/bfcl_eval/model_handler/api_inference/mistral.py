@@ -30,7 +30,9 @@ class MistralHandler(BaseHandler):
         super().__init__(model_name, temperature, registry_name, is_fc_model, **kwargs)
         self.model_style = ModelStyle.MISTRAL
 
-        self.client = Mistral(api_key=os.getenv("MISTRAL_API_KEY"))
+        self.client = Mistral(
+            api_key=os.getenv("MISTRAL_API_KEY"), client=self._build_http_client()
+        )
 
     def decode_ast(self, result, language, has_tool_call_tag):
         if self.is_fc_model:
@@ -2,7 +2,7 @@ import os
 
 from bfcl_eval.model_handler.api_inference.openai_completion import OpenAICompletionsHandler
 from bfcl_eval.constants.enums import ModelStyle
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 
 
 class NovitaHandler(OpenAICompletionsHandler):
@@ -19,6 +19,7 @@ class NovitaHandler(OpenAICompletionsHandler):
         self.client = OpenAI(
             base_url="https://api.novita.ai/v3/openai",
             api_key=os.getenv("NOVITA_API_KEY"),
+            http_client=self._build_http_client(DefaultHttpxClient),
         )
 
     #### FC methods ####
@@ -10,7 +10,7 @@ from bfcl_eval.model_handler.utils import (
     default_decode_execute_prompting,
     system_prompt_pre_processing_chat_model,
 )
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 
 
 class NvidiaHandler(OpenAICompletionsHandler):
@@ -27,6 +27,7 @@ class NvidiaHandler(OpenAICompletionsHandler):
         self.client = OpenAI(
             base_url="https://integrate.api.nvidia.com/v1",
             api_key=os.getenv("NVIDIA_API_KEY"),
+            http_client=self._build_http_client(DefaultHttpxClient),
         )
 
     def decode_ast(self, result, language, has_tool_call_tag):
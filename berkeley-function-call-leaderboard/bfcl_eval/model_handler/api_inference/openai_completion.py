@@ -11,11 +11,12 @@ from bfcl_eval.model_handler.utils import (
     convert_to_tool,
     default_decode_ast_prompting,
     default_decode_execute_prompting,
+    extract_usage_details,
     format_execution_results_prompting,
     retry_with_backoff,
     system_prompt_pre_processing_chat_model,
 )
-from openai import OpenAI, RateLimitError
+from openai import DefaultHttpxClient, OpenAI, RateLimitError
 
 
 class OpenAICompletionsHandler(BaseHandler):
@@ -29,7 +30,10 @@ class OpenAICompletionsHandler(BaseHandler):
     ) -> None:
         super().__init__(model_name, temperature, registry_name, is_fc_model, **kwargs)
         self.model_style = ModelStyle.OPENAI_COMPLETIONS
-        self.client = OpenAI(**self._build_client_kwargs())
+        self.client = OpenAI(
+            http_client=self._build_http_client(DefaultHttpxClient),
+            **self._build_client_kwargs(),
+        )
         if 'gpt-oss-120b' in model_name:
             self.reasoning_effort = kwargs.get("reasoning_effort")
 
@@ -133,6 +137,7 @@ class OpenAICompletionsHandler(BaseHandler):
             "tool_call_ids": tool_call_ids,
             "input_token": api_response.usage.prompt_tokens,
             "output_token": api_response.usage.completion_tokens,
+            **extract_usage_details(api_response.usage),
         }
 
     def add_first_turn_message_FC(
@@ -247,6 +252,7 @@ class OpenAICompletionsHandler(BaseHandler):
             "model_responses_message_for_chat_history": api_response.choices[0].message,
             "input_token": api_response.usage.prompt_tokens,
             "output_token": api_response.usage.completion_tokens,
+            **extract_usage_details(api_response.usage),
         }
 
     def add_first_turn_message_prompting(
@@ -10,11 +10,12 @@ from bfcl_eval.model_handler.utils import (
     convert_to_tool,
     default_decode_ast_prompting,
     default_decode_execute_prompting,
+    extract_usage_details,
     format_execution_results_prompting,
     retry_with_backoff,
     system_prompt_pre_processing_chat_model,
 )
-from openai import OpenAI, RateLimitError
+from openai import DefaultHttpxClient, OpenAI, RateLimitError
 from openai.types.responses import Response
 
 
@@ -29,7 +30,10 @@ class OpenAIResponsesHandler(BaseHandler):
     ) -> None:
         super().__init__(model_name, temperature, registry_name, is_fc_model, **kwargs)
         self.model_style = ModelStyle.OPENAI_RESPONSES
-        self.client = OpenAI(**self._build_client_kwargs())
+        self.client = OpenAI(
+            http_client=self._build_http_client(DefaultHttpxClient),
+            **self._build_client_kwargs(),
+        )
 
     def _build_client_kwargs(self):
         """Collect OpenAI client keyword arguments from environment variables, but only
@@ -169,6 +173,7 @@ class OpenAIResponsesHandler(BaseHandler):
             "reasoning_content": reasoning_content,
             "input_token": api_response.usage.input_tokens,
             "output_token": api_response.usage.output_tokens,
+            **extract_usage_details(api_response.usage),
         }
 
     def add_first_turn_message_FC(
@@ -269,6 +274,7 @@ class OpenAIResponsesHandler(BaseHandler):
             "reasoning_content": reasoning_content,
             "input_token": api_response.usage.input_tokens,
             "output_token": api_response.usage.output_tokens,
+            **extract_usage_details(api_response.usage),
         }
 
     def add_first_turn_message_prompting(
@@ -3,7 +3,7 @@ from typing import Any
 
 from bfcl_eval.model_handler.api_inference.openai_completion import OpenAICompletionsHandler
 from bfcl_eval.constants.enums import ModelStyle
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 from overrides import override
 from qwen_agent.llm import get_chat_model
 import time
@@ -30,6 +30,7 @@ class QwenAPIHandler(OpenAICompletionsHandler):
         self.client = OpenAI(
             base_url="https://dashscope.aliyuncs.com/compatible-mode/v1",
             api_key=os.getenv("QWEN_API_KEY"),
+            http_client=self._build_http_client(DefaultHttpxClient),
         )
 
     #### FC methods ####
@@ -3,7 +3,7 @@ import time
 
 from bfcl_eval.constants.enums import ModelStyle
 from bfcl_eval.model_handler.api_inference.openai_completion import OpenAICompletionsHandler
-from writerai import Writer
+from writerai import DefaultHttpxClient, Writer
 
 
 class WriterHandler(OpenAICompletionsHandler):
@@ -17,7 +17,10 @@ class WriterHandler(OpenAICompletionsHandler):
     ) -> None:
         super().__init__(model_name, temperature, registry_name, is_fc_model, **kwargs)
         self.model_style = ModelStyle.WRITER
-        self.client = Writer(api_key=os.getenv("WRITER_API_KEY"))
+        self.client = Writer(
+            api_key=os.getenv("WRITER_API_KEY"),
+            http_client=self._build_http_client(DefaultHttpxClient),
+        )
 
     #### FC methods ####
 
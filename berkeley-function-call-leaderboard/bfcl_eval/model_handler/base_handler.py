@@ -1,7 +1,9 @@
 import json
+import time
 from copy import deepcopy
 from typing import TYPE_CHECKING, Any
 
+import httpx
 from bfcl_eval.constants.category_mapping import VERSION_PREFIX
 from bfcl_eval.constants.default_prompts import (
     DEFAULT_USER_PROMPT_FOR_ADDITIONAL_FUNCTION_FC,
@@ -18,7 +20,12 @@ from bfcl_eval.eval_checker.multi_turn_eval.multi_turn_utils import (
     execute_multi_turn_func_call,
     is_empty_execute_response,
 )
-from bfcl_eval.model_handler.utils import add_memory_instruction_system_prompt
+from bfcl_eval.model_handler.http_client import build_http_client, pop_pool_wait_time
+from bfcl_eval.model_handler.utils import (
+    add_memory_instruction_system_prompt,
+    build_usage_record,
+)
+from bfcl_eval.profiler import profile_counter, profile_span
 from bfcl_eval.utils import *
 from overrides import final
 
@@ -65,6 +72,13 @@ class BaseHandler:
         for _key, _value in kwargs.items():
             setattr(self, _key, _value)
 
+    def _build_http_client(self, client_class: type = httpx.Client):
+        """
+        Return an HTTP client for the SDK client of this handler, backed by the connection pool shared by all the
+        handlers (see `http_client.py`). Pass the SDK's own `DefaultHttpxClient` as `client_class` when it has one.
+        """
+        return build_http_client(client_class)
+
     def inference(
         self,
         test_entry: dict,
@@ -110,6 +124,7 @@ class BaseHandler:
         total_input_token_count: list[list[float]] = []
         total_output_token_count: list[list[float]] = []
         total_latency: list[list[float]] = []
+        total_usage: list[list[dict]] = []
         all_model_response: list[list] = (
             []
         )  # The model response that will be used for later evaluation
@@ -121,15 +136,16 @@ class BaseHandler:
         all_reasoning_content: list[list] = []
 
         # Execute no function call, but just to get a reference to all the instances to get the initial state for logging purpose
-        _, involved_instances = execute_multi_turn_func_call(
-            [],
-            initial_config,
-            involved_classes,
-            self.model_name_underline_replaced,
-            test_entry_id,
-            long_context=("long_context" in test_category or "composite" in test_category),
-            is_evaL_run=False,
-        )
+        with profile_span("execute"):
+            _, involved_instances = execute_multi_turn_func_call(
+                [],
+                initial_config,
+                involved_classes,
+                self.model_name_underline_replaced,
+                test_entry_id,
+                long_context=("long_context" in test_category or "composite" in test_category),
+                is_evaL_run=False,
+            )
 
         if is_memory(test_category):
             assert (
@@ -145,29 +161,32 @@ class BaseHandler:
             )
 
         if not exclude_state_log:
-            state_log = []
-            for class_name, class_instance in involved_instances.items():
-                if class_name in STATELESS_CLASSES or class_name in OMIT_STATE_INFO_CLASSES:
-                    continue
-                # Avoid modification in future turns
-                class_instance = deepcopy(class_instance)
-                state_log.append(
-                    {
-                        "role": "state_info",
-                        "class_name": class_name,
-                        "content": {
-                            key: value
-                            for key, value in vars(class_instance).items()
-                            if not key.startswith("_")
-                        },
-                    }
-                )
-            if len(state_log) > 0:
-                all_inference_log.append(state_log)
+            with profile_span("state_log"):
+                state_log = []
+                for class_name, class_instance in involved_instances.items():
+                    if class_name in STATELESS_CLASSES or class_name in OMIT_STATE_INFO_CLASSES:
+                        continue
+                    # Avoid modification in future turns
+                    class_instance = deepcopy(class_instance)
+                    state_log.append(
+                        {
+                            "role": "state_info",
+                            "class_name": class_name,
+                            "content": {
+                                key: value
+                                for key, value in vars(class_instance).items()
+                                if not key.startswith("_")
+                            },
+                        }
+                    )
+                if len(state_log) > 0:
+                    all_inference_log.append(state_log)
 
         inference_data: dict = {}
-        inference_data = self._pre_query_processing_FC(inference_data, test_entry)
-        inference_data = self._compile_tools(inference_data, test_entry)
+        with profile_span("pre_query_processing"):
+            inference_data = self._pre_query_processing_FC(inference_data, test_entry)
+        with profile_span("compile_tools"):
+            inference_data = self._compile_tools(inference_data, test_entry)
 
         all_multi_turn_messages: list[list[dict]] = test_entry["question"]
         for turn_idx, current_turn_message in enumerate(all_multi_turn_messages):
@@ -176,7 +195,8 @@ class BaseHandler:
             if str(turn_idx) in holdout_function:
                 test_entry["function"].extend(holdout_function[str(turn_idx)])
                 # Since we have added new functions, we need to recompile the tools
-                inference_data = self._compile_tools(inference_data, test_entry)
+                with profile_span("compile_tools"):
+                    inference_data = self._compile_tools(inference_data, test_entry)
                 assert (
                     len(current_turn_message) == 0
                 ), "Holdout turn should not have user message."
@@ -205,6 +225,7 @@ class BaseHandler:
             current_turn_input_token_count: list[float] = []
             current_turn_output_token_count: list[float] = []
             current_turn_latency: list[float] = []
+            current_turn_usage: list[dict] = []
             current_turn_reasoning_content = []
 
             count = 0
@@ -217,7 +238,12 @@ class BaseHandler:
                 # Add to the current_turn_inference_log at beginning of each step so that we don't need to bother dealing with the break statements
                 current_turn_inference_log[f"step_{count}"] = current_step_inference_log
 
-                api_response, query_latency = self._query_FC(inference_data)
+                with profile_span("query"):
+                    pop_pool_wait_time()
+                    query_start_time = time.time()
+                    api_response, query_latency = self._query_FC(inference_data)
+                    query_time = time.time() - query_start_time
+                    pool_wait_time = pop_pool_wait_time()
 
                 # This part of logging is disabled by default because it is too verbose and will make the result file extremely large
                 # It is only useful to see if the inference pipeline is working as expected (eg, does it convert all the inputs correctly)
@@ -230,7 +256,8 @@ class BaseHandler:
                     )
 
                 # Try parsing the model response
-                model_response_data = self._parse_query_response_FC(api_response)
+                with profile_span("parse_response"):
+                    model_response_data = self._parse_query_response_FC(api_response)
                 model_responses = model_response_data["model_responses"]
 
                 # Add the assistant message to the chat history
@@ -242,6 +269,11 @@ class BaseHandler:
                 current_turn_input_token_count.append(model_response_data["input_token"])
                 current_turn_output_token_count.append(model_response_data["output_token"])
                 current_turn_latency.append(query_latency)
+                current_turn_usage.append(
+                    build_usage_record(
+                        model_response_data, query_latency, query_time, pool_wait_time
+                    )
+                )
 
                 current_turn_response.append(model_responses)
 
@@ -259,9 +291,10 @@ class BaseHandler:
 
                 # Try decoding the model response
                 try:
-                    decoded_model_responses = self.decode_execute(
-                        model_responses, has_tool_call_tag=False
-                    )
+                    with profile_span("decode"):
+                        decoded_model_responses = self.decode_execute(
+                            model_responses, has_tool_call_tag=False
+                        )
                     current_step_inference_log.append(
                         {
                             "role": "handler_log",
@@ -282,6 +315,7 @@ class BaseHandler:
                         break
 
                 except Exception as e:
+                    profile_counter("decode_failure")
                     print("Failed to decode the model response. Proceed to next turn.")
                     current_step_inference_log.append(
                         {
@@ -293,17 +327,20 @@ class BaseHandler:
                     break
 
                 # Obtain the execution results
-                execution_results, involved_instances = execute_multi_turn_func_call(
-                    decoded_model_responses,
-                    initial_config,
-                    involved_classes,
-                    self.model_name_underline_replaced,
-                    test_entry_id,
-                    long_context=(
-                        "long_context" in test_category or "composite" in test_category
-                    ),
-                    is_evaL_run=False,
-                )
+                with profile_span("execute"):
+                    execution_results, involved_instances = execute_multi_turn_func_call(
+                        decoded_model_responses,
+                        initial_config,
+                        involved_classes,
+                        self.model_name_underline_replaced,
+                        test_entry_id,
+                        long_context=(
+                            "long_context" in test_category or "composite" in test_category
+                        ),
+                        is_evaL_run=False,
+                    )
+
+                profile_counter("executed_function_call", len(decoded_model_responses))
 
                 # Add the execution results to the chat history for the next turn
                 inference_data = self._add_execution_results_FC(
@@ -338,30 +375,32 @@ class BaseHandler:
             total_input_token_count.append(current_turn_input_token_count)
             total_output_token_count.append(current_turn_output_token_count)
             total_latency.append(current_turn_latency)
+            total_usage.append(current_turn_usage)
 
             if not exclude_state_log:
-                state_log = []
-                for class_name, class_instance in involved_instances.items():
-                    if (
-                        class_name in STATELESS_CLASSES
-                        or class_name in OMIT_STATE_INFO_CLASSES
-                    ):
-                        continue
-                    # Avoid modification in future turns
-                    class_instance = deepcopy(class_instance)
-                    state_log.append(
-                        {
-                            "role": "state_info",
-                            "class_name": class_name,
-                            "content": {
-                                key: value
-                                for key, value in vars(class_instance).items()
-                                if not key.startswith("_")
-                            },
-                        }
-                    )
-                if len(state_log) > 0:
-                    all_inference_log.append(state_log)
+                with profile_span("state_log"):
+                    state_log = []
+                    for class_name, class_instance in involved_instances.items():
+                        if (
+                            class_name in STATELESS_CLASSES
+                            or class_name in OMIT_STATE_INFO_CLASSES
+                        ):
+                            continue
+                        # Avoid modification in future turns
+                        class_instance = deepcopy(class_instance)
+                        state_log.append(
+                            {
+                                "role": "state_info",
+                                "class_name": class_name,
+                                "content": {
+                                    key: value
+                                    for key, value in vars(class_instance).items()
+                                    if not key.startswith("_")
+                                },
+                            }
+                        )
+                    if len(state_log) > 0:
+                        all_inference_log.append(state_log)
 
             if force_quit:
                 break
@@ -379,6 +418,7 @@ class BaseHandler:
             "input_token_count": total_input_token_count,
             "output_token_count": total_output_token_count,
             "latency": total_latency,
+            "usage": total_usage,
             "inference_log": all_inference_log,
         }
 
@@ -409,6 +449,7 @@ class BaseHandler:
         total_input_token_count: list[list[float]] = []
         total_output_token_count: list[list[float]] = []
         total_latency: list[list[float]] = []
+        total_usage: list[list[dict]] = []
         # The model response that will be used for later evaluation
         all_model_response: list[list] = []
         # Only for reasoning models, reasoning content will be stored as part of metadata and in inference log
@@ -418,15 +459,16 @@ class BaseHandler:
         force_quit = False  # Whether the model has been forced to quit. If True, this whole entry will be failed.
 
         # Execute no function call, but just to get a reference to all the instances to get the initial state for logging purpose
-        _, involved_instances = execute_multi_turn_func_call(
-            [],
-            initial_config,
-            involved_classes,
-            self.model_name_underline_replaced,
-            test_entry_id,
-            long_context=("long_context" in test_category or "composite" in test_category),
-            is_evaL_run=False,
-        )
+        with profile_span("execute"):
+            _, involved_instances = execute_multi_turn_func_call(
+                [],
+                initial_config,
+                involved_classes,
+                self.model_name_underline_replaced,
+                test_entry_id,
+                long_context=("long_context" in test_category or "composite" in test_category),
+                is_evaL_run=False,
+            )
 
         if is_memory(test_category):
             assert (
@@ -442,27 +484,29 @@ class BaseHandler:
             )
 
         if not exclude_state_log:
-            state_log = []
-            for class_name, class_instance in involved_instances.items():
-                if class_name in STATELESS_CLASSES or class_name in OMIT_STATE_INFO_CLASSES:
-                    continue
-                # Avoid modification in future turns
-                class_instance = deepcopy(class_instance)
-                state_log.append(
-                    {
-                        "role": "state_info",
-                        "class_name": class_name,
-                        "content": {
-                            key: value
-                            for key, value in vars(class_instance).items()
-                            if not key.startswith("_")
-                        },
-                    }
-                )
-            if len(state_log) > 0:
-                all_inference_log.append(state_log)
+            with profile_span("state_log"):
+                state_log = []
+                for class_name, class_instance in involved_instances.items():
+                    if class_name in STATELESS_CLASSES or class_name in OMIT_STATE_INFO_CLASSES:
+                        continue
+                    # Avoid modification in future turns
+                    class_instance = deepcopy(class_instance)
+                    state_log.append(
+                        {
+                            "role": "state_info",
+                            "class_name": class_name,
+                            "content": {
+                                key: value
+                                for key, value in vars(class_instance).items()
+                                if not key.startswith("_")
+                            },
+                        }
+                    )
+                if len(state_log) > 0:
+                    all_inference_log.append(state_log)
 
-        inference_data: dict = self._pre_query_processing_prompting(test_entry)
+        with profile_span("pre_query_processing"):
+            inference_data: dict = self._pre_query_processing_prompting(test_entry)
 
         all_multi_turn_messages: list[list[dict]] = test_entry["question"]
         for turn_idx, current_turn_message in enumerate(all_multi_turn_messages):
@@ -498,6 +542,7 @@ class BaseHandler:
             current_turn_input_token_count: list[float] = []
             current_turn_output_token_count: list[float] = []
             current_turn_latency: list[float] = []
+            current_turn_usage: list[dict] = []
 
             count = 0
             while True:
@@ -509,7 +554,12 @@ class BaseHandler:
                 # Add to the current_turn_inference_log at beginning of each step so that we don't need to bother dealing with the break statements
                 current_turn_inference_log[f"step_{count}"] = current_step_inference_log
 
-                api_response, query_latency = self._query_prompting(inference_data)
+                with profile_span("query"):
+                    pop_pool_wait_time()
+                    query_start_time = time.time()
+                    api_response, query_latency = self._query_prompting(inference_data)
+                    query_time = time.time() - query_start_time
+                    pool_wait_time = pop_pool_wait_time()
 
                 # This part of logging is disabled by default because it is too verbose and will make the result file extremely large
                 # It is only useful to see if the inference pipeline is working as expected (eg, does it convert all the inputs correctly)
@@ -522,7 +572,8 @@ class BaseHandler:
                     )
 
                 # Try parsing the model response
-                model_response_data = self._parse_query_response_prompting(api_response)
+                with profile_span("parse_response"):
+                    model_response_data = self._parse_query_response_prompting(api_response)
                 model_responses = model_response_data["model_responses"]
 
                 # Add the assistant message to the chat history
@@ -534,6 +585,11 @@ class BaseHandler:
                 current_turn_input_token_count.append(model_response_data["input_token"])
                 current_turn_output_token_count.append(model_response_data["output_token"])
                 current_turn_latency.append(query_latency)
+                current_turn_usage.append(
+                    build_usage_record(
+                        model_response_data, query_latency, query_time, pool_wait_time
+                    )
+                )
 
                 current_turn_response.append(model_responses)
                 reasoning_content = model_response_data.get("reasoning_content", "")
@@ -550,9 +606,10 @@ class BaseHandler:
 
                 # Try decoding the model response
                 try:
-                    decoded_model_responses = self.decode_execute(
-                        model_responses, has_tool_call_tag=False
-                    )
+                    with profile_span("decode"):
+                        decoded_model_responses = self.decode_execute(
+                            model_responses, has_tool_call_tag=False
+                        )
                     current_step_inference_log.append(
                         {
                             "role": "handler_log",
@@ -574,6 +631,7 @@ class BaseHandler:
                         break
 
                 except Exception as e:
+                    profile_counter("decode_failure")
                     print("Failed to decode the model response. Proceed to next turn.")
                     current_step_inference_log.append(
                         {
@@ -585,17 +643,20 @@ class BaseHandler:
                     break
 
                 # Obtain the execution results
-                execution_results, involved_instances = execute_multi_turn_func_call(
-                    decoded_model_responses,
-                    initial_config,
-                    involved_classes,
-                    self.model_name_underline_replaced,
-                    test_entry_id,
-                    long_context=(
-                        "long_context" in test_category or "composite" in test_category
-                    ),
-                    is_evaL_run=False,
-                )
+                with profile_span("execute"):
+                    execution_results, involved_instances = execute_multi_turn_func_call(
+                        decoded_model_responses,
+                        initial_config,
+                        involved_classes,
+                        self.model_name_underline_replaced,
+                        test_entry_id,
+                        long_context=(
+                            "long_context" in test_category or "composite" in test_category
+                        ),
+                        is_evaL_run=False,
+                    )
+
+                profile_counter("executed_function_call", len(decoded_model_responses))
 
                 # Add the execution results to the chat history for the next turn
                 inference_data = self._add_execution_results_prompting(
@@ -629,30 +690,32 @@ class BaseHandler:
             total_input_token_count.append(current_turn_input_token_count)
             total_output_token_count.append(current_turn_output_token_count)
             total_latency.append(current_turn_latency)
+            total_usage.append(current_turn_usage)
 
             if not exclude_state_log:
-                state_log = []
-                for class_name, class_instance in involved_instances.items():
-                    if (
-                        class_name in STATELESS_CLASSES
-                        or class_name in OMIT_STATE_INFO_CLASSES
-                    ):
-                        continue
-                    # Avoid modification in future turns
-                    class_instance = deepcopy(class_instance)
-                    state_log.append(
-                        {
-                            "role": "state_info",
-                            "class_name": class_name,
-                            "content": {
-                                key: value
-                                for key, value in vars(class_instance).items()
-                                if not key.startswith("_")
-                            },
-                        }
-                    )
-                if len(state_log) > 0:
-                    all_inference_log.append(state_log)
+                with profile_span("state_log"):
+                    state_log = []
+                    for class_name, class_instance in involved_instances.items():
+                        if (
+                            class_name in STATELESS_CLASSES
+                            or class_name in OMIT_STATE_INFO_CLASSES
+                        ):
+                            continue
+                        # Avoid modification in future turns
+                        class_instance = deepcopy(class_instance)
+                        state_log.append(
+                            {
+                                "role": "state_info",
+                                "class_name": class_name,
+                                "content": {
+                                    key: value
+                                    for key, value in vars(class_instance).items()
+                                    if not key.startswith("_")
+                                },
+                            }
+                        )
+                    if len(state_log) > 0:
+                        all_inference_log.append(state_log)
 
             if force_quit:
                 break
@@ -670,6 +733,7 @@ class BaseHandler:
             "input_token_count": total_input_token_count,
             "output_token_count": total_output_token_count,
             "latency": total_latency,
+            "usage": total_usage,
             "inference_log": all_inference_log,
         }
         # We only include reasoning content if it exists and is not empty
@@ -686,15 +750,23 @@ class BaseHandler:
         self, test_entry: dict, include_input_log: bool
     ) -> tuple[any, dict]:
         inference_data: dict = {}
-        inference_data = self._pre_query_processing_FC(inference_data, test_entry)
-        inference_data = self._compile_tools(inference_data, test_entry)
+        with profile_span("pre_query_processing"):
+            inference_data = self._pre_query_processing_FC(inference_data, test_entry)
+        with profile_span("compile_tools"):
+            inference_data = self._compile_tools(inference_data, test_entry)
         inference_data = self.add_first_turn_message_FC(
             inference_data, test_entry["question"][0]
         )
-        api_response, query_latency = self._query_FC(inference_data)
+        with profile_span("query"):
+            pop_pool_wait_time()
+            query_start_time = time.time()
+            api_response, query_latency = self._query_FC(inference_data)
+            query_time = time.time() - query_start_time
+            pool_wait_time = pop_pool_wait_time()
 
         # Try parsing the model response
-        model_response_data = self._parse_query_response_FC(api_response)
+        with profile_span("parse_response"):
+            model_response_data = self._parse_query_response_FC(api_response)
 
         # Process the metadata
         metadata = {}
@@ -708,6 +780,9 @@ class BaseHandler:
         metadata["input_token_count"] = model_response_data["input_token"]
         metadata["output_token_count"] = model_response_data["output_token"]
         metadata["latency"] = query_latency
+        metadata["usage"] = build_usage_record(
+            model_response_data, query_latency, query_time, pool_wait_time
+        )
 
         if (
             "reasoning_content" in model_response_data
@@ -721,15 +796,22 @@ class BaseHandler:
     def inference_single_turn_prompting(
         self, test_entry: dict, include_input_log: bool
     ) -> tuple[any, dict]:
-        inference_data: dict = self._pre_query_processing_prompting(test_entry)
+        with profile_span("pre_query_processing"):
+            inference_data: dict = self._pre_query_processing_prompting(test_entry)
         inference_data = self.add_first_turn_message_prompting(
             inference_data, test_entry["question"][0]
         )
 
-        api_response, query_latency = self._query_prompting(inference_data)
+        with profile_span("query"):
+            pop_pool_wait_time()
+            query_start_time = time.time()
+            api_response, query_latency = self._query_prompting(inference_data)
+            query_time = time.time() - query_start_time
+            pool_wait_time = pop_pool_wait_time()
 
         # Try parsing the model response
-        model_response_data = self._parse_query_response_prompting(api_response)
+        with profile_span("parse_response"):
+            model_response_data = self._parse_query_response_prompting(api_response)
 
         # Process the metadata
         metadata = {}
@@ -743,6 +825,9 @@ class BaseHandler:
         metadata["input_token_count"] = model_response_data["input_token"]
         metadata["output_token_count"] = model_response_data["output_token"]
         metadata["latency"] = query_latency
+        metadata["usage"] = build_usage_record(
+            model_response_data, query_latency, query_time, pool_wait_time
+        )
 
         if (
             "reasoning_content" in model_response_data
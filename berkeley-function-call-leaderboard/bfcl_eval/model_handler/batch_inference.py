@@ -0,0 +1,476 @@
+"""
+Offline batch submission of the single-turn model queries, for the providers that offer a batch API (OpenAI Chat
+Completions and Responses, Anthropic Messages and Gemini).
+
+The single-turn test entries of a category are still run through the usual `BaseHandler.inference` path, but the first
+query of each entry is not sent right away: each entry first runs up to that query, whose keyword arguments to
+`generate_with_backoff` are recorded. The recorded queries of the chunk are packaged into one provider batch job, the job
+is polled until it ends, and each entry runs again with its own response returned in place of the query, parsed into the
+same SDK object as a direct query would have returned. The rest of the entry (`_parse_query_response_*`, the metadata,
+the result writer) is unchanged.
+
+Each entry only submits its first query to the batch; any later query of the same entry, and the queries that failed in
+the batch job (or whose whole job failed), are sent directly. The latency recorded for a batched query is the turnaround
+time of its batch job. The token counts are the ones reported by the provider; the batch discount is not applied to the
+cost.
+
+The batch jobs are configured with the following environment variables:
+    BFCL_BATCH_MAX_SIZE: Maximum number of queries per batch job (default 1000). Larger categories are split.
+    BFCL_BATCH_POLL_INTERVAL: Seconds between two status checks of a batch job (default 30).
+    BFCL_BATCH_TIMEOUT: Seconds after which a batch job that hasn't ended is cancelled (default 86400, ie. 24 hours).
+    BFCL_BATCH_OPENAI_COMPATIBLE: Also batch the handlers of the OpenAI-compatible providers (default off), for an
+        endpoint that implements the OpenAI Files and Batch APIs.
+"""
+
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from copy import deepcopy
+from functools import partial
+from typing import Callable, Optional
+
+from bfcl_eval.constants.enums import ModelStyle
+from tqdm import tqdm
+
+BATCH_MAX_SIZE = int(os.getenv("BFCL_BATCH_MAX_SIZE", 1000))
+BATCH_POLL_INTERVAL_SECONDS = float(os.getenv("BFCL_BATCH_POLL_INTERVAL", 30))
+BATCH_TIMEOUT_SECONDS = float(os.getenv("BFCL_BATCH_TIMEOUT", 24 * 60 * 60))
+BATCH_OPENAI_COMPATIBLE = os.getenv("BFCL_BATCH_OPENAI_COMPATIBLE", "").lower() in ("1", "true", "yes")
+# Per-request options of the SDKs, which are not part of the request body
+_REQUEST_OPTION_KWARGS = ("timeout", "extra_headers", "extra_query")
+
+_batch_context = threading.local()
+
+
+class BatchJobError(Exception):
+    """
+    A batch job failed, expired or timed out, or one of its requests did.
+    """
+
+
+def _to_request_body(kwargs: dict) -> dict:
+    body = {key: value for key, value in kwargs.items() if key not in _REQUEST_OPTION_KWARGS}
+    body.update(body.pop("extra_body", None) or {})
+    return body
+
+
+def _wait_for_job(retrieve: Callable, is_ended: Callable, cancel: Callable, job_name: str):
+    """
+    Poll a batch job with `retrieve()` until `is_ended(job)`, and cancel it after `BATCH_TIMEOUT_SECONDS`.
+    """
+    deadline = time.monotonic() + BATCH_TIMEOUT_SECONDS
+    while True:
+        job = retrieve()
+        if is_ended(job):
+            return job
+        if time.monotonic() > deadline:
+            cancel()
+            raise BatchJobError(
+                f"Batch job {job_name} didn't end within {BATCH_TIMEOUT_SECONDS} seconds and was cancelled."
+            )
+        time.sleep(BATCH_POLL_INTERVAL_SECONDS)
+
+
+#### Provider batch APIs ####
+
+
+class _OpenAIBatchBackend:
+    """
+    OpenAI Batch API: the requests are uploaded as a JSONL file, and the responses are downloaded from the output and
+    error files of the batch.
+    """
+
+    _ENDED_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+    def __init__(self, client, endpoint: str, response_class: type):
+        self.client = client
+        self.endpoint = endpoint
+        self.response_class = response_class
+
+    def run(self, requests: list[dict]) -> list:
+        input_lines = [
+            json.dumps(
+                {
+                    "custom_id": f"request-{index}",
+                    "method": "POST",
+                    "url": self.endpoint,
+                    "body": _to_request_body(kwargs),
+                }
+            )
+            for index, kwargs in enumerate(requests)
+        ]
+        input_file = self.client.files.create(
+            file=("batch_input.jsonl", io.BytesIO("\n".join(input_lines).encode("utf-8"))),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=input_file.id, endpoint=self.endpoint, completion_window="24h"
+        )
+        batch = _wait_for_job(
+            retrieve=lambda: self.client.batches.retrieve(batch.id),
+            is_ended=lambda job: job.status in self._ENDED_STATUSES,
+            cancel=lambda: self.client.batches.cancel(batch.id),
+            job_name=batch.id,
+        )
+
+        # Expired and cancelled batches still return the requests that completed in time
+        results = [
+            BatchJobError(f"No result for this request in batch {batch.id} (status: {batch.status}).")
+            for _ in requests
+        ]
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                index = int(item["custom_id"].removeprefix("request-"))
+                response = item.get("response") or {}
+                if item.get("error") or response.get("status_code") != 200:
+                    results[index] = BatchJobError(
+                        f"Batch request failed: {item.get('error') or response.get('body')}"
+                    )
+                else:
+                    results[index] = self.response_class.model_validate(response["body"])
+        return results
+
+
+class _AnthropicBatchBackend:
+    """
+    Anthropic Message Batches API.
+    """
+
+    def __init__(self, client):
+        self.client = client
+
+    def run(self, requests: list[dict]) -> list:
+        batch = self.client.messages.batches.create(
+            requests=[
+                {"custom_id": f"request-{index}", "params": _to_request_body(kwargs)}
+                for index, kwargs in enumerate(requests)
+            ]
+        )
+        _wait_for_job(
+            retrieve=lambda: self.client.messages.batches.retrieve(batch.id),
+            is_ended=lambda job: job.processing_status == "ended",
+            cancel=lambda: self.client.messages.batches.cancel(batch.id),
+            job_name=batch.id,
+        )
+
+        results = [
+            BatchJobError(f"No result for this request in batch {batch.id}.") for _ in requests
+        ]
+        for item in self.client.messages.batches.results(batch.id):
+            index = int(item.custom_id.removeprefix("request-"))
+            if item.result.type == "succeeded":
+                results[index] = item.result.message
+            else:
+                results[index] = BatchJobError(
+                    f"Batch request {item.result.type}: {getattr(item.result, 'error', '')}"
+                )
+        return results
+
+
+class _GeminiBatchBackend:
+    """
+    Gemini Batch Mode, with the requests inlined in the batch job.
+    """
+
+    _ENDED_STATES = (
+        "JOB_STATE_SUCCEEDED",
+        "JOB_STATE_PARTIALLY_SUCCEEDED",
+        "JOB_STATE_FAILED",
+        "JOB_STATE_CANCELLED",
+        "JOB_STATE_EXPIRED",
+    )
+
+    def __init__(self, client):
+        self.client = client
+
+    def run(self, requests: list[dict]) -> list:
+        from google.genai.types import InlinedRequest
+
+        # All the queries of a handler are sent to the same model
+        batch = self.client.batches.create(
+            model=requests[0]["model"],
+            src=[
+                InlinedRequest(
+                    model=kwargs["model"], contents=kwargs["contents"], config=kwargs.get("config")
+                )
+                for kwargs in requests
+            ],
+        )
+        batch = _wait_for_job(
+            retrieve=lambda: self.client.batches.get(name=batch.name),
+            is_ended=lambda job: job.state is not None and job.state.value in self._ENDED_STATES,
+            cancel=lambda: self.client.batches.cancel(name=batch.name),
+            job_name=batch.name,
+        )
+
+        inlined_responses = (batch.dest.inlined_responses if batch.dest else None) or []
+        if len(inlined_responses) != len(requests):
+            raise BatchJobError(
+                f"Batch job {batch.name} ended in state {batch.state.value} with {len(inlined_responses)} responses for {len(requests)} requests."
+            )
+        return [
+            item.response
+            if item.error is None
+            else BatchJobError(f"Batch request failed: {item.error}")
+            for item in inlined_responses
+        ]
+
+
+def get_batch_backend(handler) -> Optional[object]:
+    """
+    Return the batch API of the handler's provider, or None if the handler doesn't query a provider with a batch API.
+
+    Only the OpenAI, Claude and Gemini handlers themselves are batched: the handlers of the other OpenAI-compatible
+    providers reuse the OpenAI client for endpoints that usually have no batch API. Set `BFCL_BATCH_OPENAI_COMPATIBLE`
+    to batch them as well, for a compatible endpoint that implements the OpenAI Files and Batch APIs.
+    """
+    client = getattr(handler, "client", None)
+    if client is None:
+        return None
+
+    if handler.model_style in (ModelStyle.OPENAI_COMPLETIONS, ModelStyle.OPENAI_RESPONSES):
+        from bfcl_eval.model_handler.api_inference.openai_completion import (
+            OpenAICompletionsHandler,
+        )
+        from bfcl_eval.model_handler.api_inference.openai_response import (
+            OpenAIResponsesHandler,
+        )
+        from openai import OpenAI
+
+        if not isinstance(client, OpenAI):
+            return None
+        if (
+            type(handler) not in (OpenAICompletionsHandler, OpenAIResponsesHandler)
+            and not BATCH_OPENAI_COMPATIBLE
+        ):
+            return None
+        if handler.model_style == ModelStyle.OPENAI_COMPLETIONS:
+            from openai.types.chat import ChatCompletion
+
+            return _OpenAIBatchBackend(client, "/v1/chat/completions", ChatCompletion)
+        from openai.types.responses import Response
+
+        return _OpenAIBatchBackend(client, "/v1/responses", Response)
+
+    if handler.model_style == ModelStyle.ANTHROPIC:
+        from anthropic import Anthropic
+        from bfcl_eval.model_handler.api_inference.claude import ClaudeHandler
+
+        if type(handler) is not ClaudeHandler or not isinstance(client, Anthropic):
+            return None
+        return _AnthropicBatchBackend(client)
+
+    if handler.model_style == ModelStyle.GOOGLE:
+        from bfcl_eval.model_handler.api_inference.gemini import GeminiHandler
+        from google import genai
+
+        if type(handler) is not GeminiHandler or not isinstance(client, genai.Client):
+            return None
+        return _GeminiBatchBackend(client)
+
+    return None
+
+
+#### Running a chunk of test entries through a batch job ####
+
+
+# Phases of a test entry run by `BatchInferenceRunner`
+_CAPTURE = "capture"
+_REPLAY = "replay"
+# Batched response of the queries that are to be sent directly instead
+_SEND_DIRECTLY = object()
+
+
+class _QueryCaptured(BaseException):
+    """
+    Raised in place of the first query of a test entry in the capture phase, to stop the entry until its batch job has
+    ended. It derives from BaseException so that the inference error handling doesn't record it as a failed entry.
+    """
+
+    def __init__(self, kwargs: dict):
+        super().__init__()
+        self.kwargs = kwargs
+
+
+class _BatchingGenerate:
+    """
+    Replacement of a handler's `generate_with_backoff`. For the test entries run by `BatchInferenceRunner`, the first
+    query is captured (capture phase) or answered with the entry's batched response (replay phase); every other query
+    is sent directly.
+    """
+
+    def __init__(self, generate_with_backoff: Callable):
+        self._generate_with_backoff = generate_with_backoff
+
+    def __call__(self, **kwargs):
+        phase = getattr(_batch_context, "phase", None)
+        if phase is None or _batch_context.has_queried:
+            return self._generate_with_backoff(**kwargs)
+
+        _batch_context.has_queried = True
+        if phase == _CAPTURE:
+            raise _QueryCaptured(kwargs)
+        api_response, latency = _batch_context.batched_response
+        if api_response is _SEND_DIRECTLY:
+            return self._generate_with_backoff(**kwargs)
+        return api_response, latency
+
+
+def _copy_outcome(source: Future, target: Future) -> None:
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class BatchInferenceRunner:
+    """
+    Run the single-turn test entries of a handler through its provider's batch API, one batch job per category (or per
+    `BATCH_MAX_SIZE` entries of a category).
+
+    Each chunk of entries goes through three phases:
+    1. capture: every entry runs on a copy of itself up to its first query, which is recorded instead of being sent.
+       The entries that finish without querying (eg. a pre-processing error) are done.
+    2. the recorded queries are sent as one batch job, and the job is polled until it ends.
+    3. replay: the waiting entries run again, and their first query returns their batched response. The queries that
+       failed in the batch job are sent directly, through the handler's usual retries.
+    The entries run on `entry_pool`, the pool that also runs the entries sent directly, so the two never exceed its
+    number of threads in concurrent queries between them. Each batch job is polled by its own thread, so no thread of
+    `entry_pool` is kept waiting for a batch job on behalf of a single entry.
+    """
+
+    def __init__(self, handler, backend, entry_pool: ThreadPoolExecutor):
+        self.handler = handler
+        self.backend = backend
+        self.entry_pool = entry_pool
+        if not isinstance(handler.generate_with_backoff, _BatchingGenerate):
+            handler.generate_with_backoff = _BatchingGenerate(handler.generate_with_backoff)
+
+    @staticmethod
+    def _run_entry(phase: str, batched_response, inference_function: Callable, *args):
+        _batch_context.phase = phase
+        _batch_context.batched_response = batched_response
+        _batch_context.has_queried = False
+        try:
+            return inference_function(*args)
+        finally:
+            _batch_context.phase = None
+            _batch_context.batched_response = None
+
+    def _capture(self, inference_function: Callable, test_case: dict, *args):
+        # The handler modifies the test entry in place, so the capture runs on a copy and the replay on the original
+        try:
+            result = self._run_entry(
+                _CAPTURE, None, inference_function, self.handler, deepcopy(test_case), *args
+            )
+        except _QueryCaptured as query:
+            return None, query.kwargs
+        return result, None
+
+    def _run_batch_job(self, requests: list[dict], description: str) -> list:
+        tqdm.write(f"📦 Submitting a batch job of {len(requests)} queries for {description}")
+        try:
+            results = self.backend.run(requests)
+        except Exception as e:
+            tqdm.write(
+                f"⚠️ Warning: The batch job for {description} failed ({type(e).__name__}: {e}). Sending its queries directly instead."
+            )
+            return [_SEND_DIRECTLY] * len(requests)
+
+        num_failed = sum(isinstance(result, Exception) for result in results)
+        if num_failed:
+            tqdm.write(
+                f"⚠️ Warning: {num_failed} queries of the batch job for {description} failed. Sending them directly instead."
+            )
+        tqdm.write(f"📬 Batch job for {description} ended")
+        return [_SEND_DIRECTLY if isinstance(result, Exception) else result for result in results]
+
+    def _run_chunk(
+        self,
+        test_cases: list[dict],
+        entry_futures: list[Future],
+        description: str,
+        inference_function: Callable,
+        *args,
+    ) -> None:
+        # The entries whose result is still to be set by this thread, rather than by a replay
+        unresolved = dict(zip(map(id, entry_futures), entry_futures))
+        try:
+            captures = [
+                self.entry_pool.submit(self._capture, inference_function, test_case, *args)
+                for test_case in test_cases
+            ]
+            waiting_entries = []
+            for test_case, entry_future, capture in zip(test_cases, entry_futures, captures):
+                result, kwargs = capture.result()
+                if kwargs is None:
+                    entry_future.set_result(result)
+                    del unresolved[id(entry_future)]
+                else:
+                    waiting_entries.append((test_case, entry_future, kwargs))
+            if not waiting_entries:
+                return
+
+            start_time = time.time()
+            responses = self._run_batch_job(
+                [kwargs for _, _, kwargs in waiting_entries], description
+            )
+            latency = time.time() - start_time
+
+            for (test_case, entry_future, _), response in zip(waiting_entries, responses):
+                replay = self.entry_pool.submit(
+                    self._run_entry,
+                    _REPLAY,
+                    (response, latency),
+                    inference_function,
+                    self.handler,
+                    test_case,
+                    *args,
+                )
+                del unresolved[id(entry_future)]
+                replay.add_done_callback(partial(_copy_outcome, target=entry_future))
+        except BaseException as e:
+            # Never leave an entry waiting forever
+            for entry_future in unresolved.values():
+                entry_future.set_exception(e)
+            raise
+
+    def submit(
+        self, test_cases_by_category: dict[str, list[dict]], inference_function: Callable, *args
+    ) -> dict[Future, str]:
+        """
+        Start running `inference_function(handler, test_case, *args)` for every test entry, and return the future of
+        each entry's result, mapped to its test entry ID.
+        """
+        chunks = [
+            (test_category, test_cases[chunk_start : chunk_start + BATCH_MAX_SIZE])
+            for test_category, test_cases in test_cases_by_category.items()
+            for chunk_start in range(0, len(test_cases), BATCH_MAX_SIZE)
+        ]
+        if not chunks:
+            return {}
+
+        futures = {}
+        job_pool = ThreadPoolExecutor(max_workers=len(chunks), thread_name_prefix="batch-job")
+        for test_category, chunk in chunks:
+            entry_futures = [Future() for _ in chunk]
+            for test_case, entry_future in zip(chunk, entry_futures):
+                futures[entry_future] = test_case["id"]
+            job_pool.submit(
+                self._run_chunk,
+                chunk,
+                entry_futures,
+                test_category,
+                inference_function,
+                *args,
+            )
+        job_pool.shutdown(wait=False)
+        return futures
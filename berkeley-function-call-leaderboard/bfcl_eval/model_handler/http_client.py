@@ -0,0 +1,175 @@
+"""
+Process-wide HTTP connection pool shared by the API handlers.
+
+Every handler builds its own HTTP client for its SDK (see `BaseHandler._build_http_client`), but all these clients send
+their requests through a single pooled transport, so the generation threads reuse the same keep-alive connections (and
+TLS sessions) instead of each SDK client keeping a small pool of its own. HTTP/2 is used for HTTPS endpoints when the
+optional `h2` package is installed (`pip install httpx[http2]`).
+
+Clients given a transport ignore the proxy environment variables (`HTTP_PROXY`, `HTTPS_PROXY`, `ALL_PROXY`, `NO_PROXY`),
+so they are applied through `get_environment_proxy_mounts`: the requests to proxied URLs go through a shared pooled transport per proxy.
+
+Some SDK versions are built on `httpx2` (a fork of `httpx`) instead of `httpx`; their clients only accept transports of
+their own package, so there is one shared pool per package.
+
+The pool is configured with the following environment variables:
+    BFCL_HTTP_MAX_CONNECTIONS: Maximum number of open connections (default 1000).
+    BFCL_HTTP_MAX_KEEPALIVE_CONNECTIONS: Maximum number of idle connections kept alive (default: the maximum number of
+        connections, so that every generation thread keeps its connection warm).
+    BFCL_HTTP_KEEPALIVE_EXPIRY: Seconds after which an idle connection is closed (default 60).
+    BFCL_HTTP2: Set to `false` to disable HTTP/2.
+
+The time each request waits for a free connection of the pool is accumulated per thread, and stored by `BaseHandler` as
+the `pool_wait_time` of the usage record of each model query.
+"""
+
+import importlib
+import os
+import threading
+import time
+from types import ModuleType
+from typing import Optional
+
+import httpx
+from bfcl_eval.profiler import profile_counter
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("BFCL_HTTP_MAX_CONNECTIONS", 1000))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("BFCL_HTTP_MAX_KEEPALIVE_CONNECTIONS", HTTP_MAX_CONNECTIONS)
+)
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("BFCL_HTTP_KEEPALIVE_EXPIRY", 60))
+HTTP2_ENABLED = os.getenv("BFCL_HTTP2", "true").lower() not in ("false", "0", "no")
+# The SDKs pass their own timeout with every request; this one only applies to requests sent without one
+DEFAULT_HTTP_TIMEOUT_SECONDS = 600.0
+DEFAULT_HTTP_CONNECT_TIMEOUT_SECONDS = 10.0
+
+# Shared transports, keyed by the name of the HTTP package (`httpx` or `httpx2`) and the proxy URL (None if direct)
+_shared_transports = {}
+_shared_transports_lock = threading.Lock()
+_pool_wait = threading.local()
+
+
+def _is_http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _get_http_package(client_class: type) -> ModuleType:
+    # The HTTP package is the one defining the `Client` base class, eg. `httpx.Client` for `openai.DefaultHttpxClient`
+    for base_class in client_class.__mro__:
+        if base_class.__name__ == "Client":
+            return importlib.import_module(base_class.__module__.split(".")[0])
+    raise ValueError(f"{client_class.__name__} is not an httpx client class.")
+
+
+def _record_pool_wait(wait_time: float) -> None:
+    _pool_wait.total = getattr(_pool_wait, "total", 0.0) + wait_time
+    profile_counter("pool_wait_time", wait_time)
+
+
+def pop_pool_wait_time() -> float:
+    """
+    Return the time the requests of the current thread spent waiting for a free connection since the last call, in
+    seconds, and reset it.
+    """
+    wait_time = getattr(_pool_wait, "total", 0.0)
+    _pool_wait.total = 0.0
+    return wait_time
+
+
+class _SharedPoolTransport:
+    """
+    Wrap a pooled `HTTPTransport` to measure the pool wait time of each request, and to keep the pool open when one of
+    the clients using it is closed.
+    """
+
+    def __init__(self, transport):
+        self._transport = transport
+
+    def handle_request(self, request):
+        request_start_time = time.perf_counter()
+        connection_acquired = False
+        outer_trace = request.extensions.get("trace")
+
+        def trace(event_name, info):
+            nonlocal connection_acquired
+            # The first event of a request is either the connection of a new socket (`connection.connect_tcp`) or,
+            # on a kept-alive connection, the request itself (`http11.send_request_headers`); both happen once the pool
+            # has handed out a connection
+            if not connection_acquired and event_name.endswith(".started"):
+                connection_acquired = True
+                _record_pool_wait(time.perf_counter() - request_start_time)
+            if outer_trace is not None:
+                outer_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        return self._transport.handle_request(request)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        # Shared by all the clients for the lifetime of the process
+        pass
+
+
+def get_shared_transport(
+    http_package: ModuleType = httpx, proxy_url: Optional[str] = None
+) -> _SharedPoolTransport:
+    """
+    Return the shared pooled transport for clients of `http_package`, sending its requests through `proxy_url` if given.
+    """
+    transport_key = (http_package.__name__, proxy_url)
+    with _shared_transports_lock:
+        if transport_key not in _shared_transports:
+            _shared_transports[transport_key] = _SharedPoolTransport(
+                http_package.HTTPTransport(
+                    proxy=proxy_url,
+                    http2=HTTP2_ENABLED and _is_http2_available(),
+                    limits=http_package.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                    ),
+                )
+            )
+        return _shared_transports[transport_key]
+
+
+def get_environment_proxy_mounts(http_package: ModuleType = httpx) -> dict:
+    """
+    Return the transport mounts applying the proxy environment variables, as a client without a transport would.
+    The URLs excluded by `NO_PROXY` are mounted to None, which sends them through the client's own (shared) transport.
+    """
+    environment_proxies = importlib.import_module(
+        f"{http_package.__name__}._utils"
+    ).get_environment_proxies()
+    return {
+        url_pattern: (
+            None if proxy_url is None else get_shared_transport(http_package, proxy_url)
+        )
+        for url_pattern, proxy_url in environment_proxies.items()
+    }
+
+
+def build_http_client(client_class: type = httpx.Client):
+    """
+    Return a new client of `client_class` that sends its requests through the shared connection pool.
+    `client_class` is `httpx.Client` or a subclass of it, such as the `DefaultHttpxClient` of the OpenAI and Anthropic
+    SDKs (which carries the SDK's own defaults).
+    """
+    http_package = _get_http_package(client_class)
+    return client_class(
+        transport=get_shared_transport(http_package),
+        mounts=get_environment_proxy_mounts(http_package),
+        timeout=http_package.Timeout(
+            DEFAULT_HTTP_TIMEOUT_SECONDS, connect=DEFAULT_HTTP_CONNECT_TIMEOUT_SECONDS
+        ),
+        follow_redirects=True,
+    )
@@ -1,23 +1,66 @@
+import hashlib
 import os
-import subprocess
 import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Optional
 
-import requests
 from bfcl_eval.constants.enums import ModelStyle
 from bfcl_eval.constants.eval_config import LOCAL_SERVER_PORT
 from bfcl_eval.model_handler.base_handler import BaseHandler
+from bfcl_eval.model_handler.local_inference.server_manager import (
+    LocalServerSpec,
+    acquire_local_server,
+    release_local_server,
+    wait_for_existing_server,
+)
 from bfcl_eval.model_handler.utils import (
     default_decode_ast_prompting,
     default_decode_execute_prompting,
+    extract_usage_details,
     system_prompt_pre_processing_chat_model,
 )
 from bfcl_eval.utils import contain_multi_turn_interaction
-from openai import OpenAI
+from openai import DefaultHttpxClient, OpenAI
 from overrides import EnforceOverrides, final, override
 
+# Maximum number of formatted prompts whose token count is remembered
+PROMPT_TOKEN_COUNT_CACHE_MAX_SIZE = 8192
+# When a prompt is counted incrementally (cached prefix + newly appended text), tokens may merge across the boundary.
+# The error is small and in practice an over-estimate; reserve a few extra tokens to stay on the safe side. The slack is
+# added once to an incremental count, not once per appended text.
+INCREMENTAL_TOKEN_COUNT_SLACK = 2
+
+# Tokenizers and model configs are shared by all handler instances of the same model in this process
+_TOKENIZER_CACHE: dict[tuple, tuple[Any, Any]] = {}
+_TOKENIZER_CACHE_LOCK = threading.Lock()
+
+# Token count of recently seen formatted prompts, and whether it is exact (rather than incremental), keyed by
+# (model path or id, prompt digest)
+_PROMPT_TOKEN_COUNT_CACHE: OrderedDict[tuple[str, str], tuple[int, bool]] = OrderedDict()
+_PROMPT_TOKEN_COUNT_CACHE_LOCK = threading.Lock()
+
+
+def _load_tokenizer_and_config(load_kwargs: dict) -> tuple[Any, Any]:
+    """
+    Load the tokenizer and model config, reusing the ones already loaded in this process if possible.
+    """
+    from transformers import AutoConfig, AutoTokenizer
+
+    cache_key = tuple(sorted(load_kwargs.items()))
+    with _TOKENIZER_CACHE_LOCK:
+        if cache_key not in _TOKENIZER_CACHE:
+            # The Rust-backed fast tokenizer is much faster than the pure-Python one for token counting
+            tokenizer = AutoTokenizer.from_pretrained(**load_kwargs, use_fast=True)
+            if not tokenizer.is_fast:
+                print(
+                    f"⚠️ Warning: No fast tokenizer is available for {load_kwargs['pretrained_model_name_or_path']}. Falling back to the slow tokenizer; client-side token counting will be slower."
+                )
+            config = AutoConfig.from_pretrained(**load_kwargs)
+            _TOKENIZER_CACHE[cache_key] = (tokenizer, config)
+        return _TOKENIZER_CACHE[cache_key]
+
 
 class OSSHandler(BaseHandler, EnforceOverrides):
     def __init__(
@@ -43,7 +86,11 @@ class OSSHandler(BaseHandler, EnforceOverrides):
         self.local_server_port = os.getenv("LOCAL_SERVER_PORT", LOCAL_SERVER_PORT)
 
         self.base_url = f"http://{self.local_server_endpoint}:{self.local_server_port}/v1"
-        self.client = OpenAI(base_url=self.base_url, api_key="EMPTY")
+        self.client = OpenAI(
+            base_url=self.base_url,
+            api_key="EMPTY",
+            http_client=self._build_http_client(DefaultHttpxClient),
+        )
 
     @override
     def inference(
@@ -76,13 +123,14 @@ class OSSHandler(BaseHandler, EnforceOverrides):
         backend: str,
         skip_server_setup: bool,
         local_model_path: Optional[str],
+        server_idle_timeout: Optional[float] = None,
     ):
         """
         Spin up a local server for the model.
-        If the server is already running, skip the setup.
+        If a server registered for the same model and settings is already running, attach to it instead.
+        With a `server_idle_timeout` (in seconds), a newly launched server is kept alive for reuse by later runs, and
+        shut down after that much inactivity.
         """
-        from transformers import AutoConfig, AutoTokenizer
-
         # Determine the model source
         if local_model_path is not None:
             # Validate the local_model_path
@@ -111,8 +159,7 @@ class OSSHandler(BaseHandler, EnforceOverrides):
                 "trust_remote_code": True,
             }
 
-        self.tokenizer = AutoTokenizer.from_pretrained(**load_kwargs)
-        config = AutoConfig.from_pretrained(**load_kwargs)
+        self.tokenizer, config = _load_tokenizer_and_config(load_kwargs)
 
         if hasattr(config, "max_position_embeddings"):
             self.max_context_length = config.max_position_embeddings
@@ -125,146 +172,30 @@ class OSSHandler(BaseHandler, EnforceOverrides):
                 )
         print(f"Max context length: {self.max_context_length}")
 
-        self._server_process = process = None
-        self._stdout_thread = stdout_thread = None
-        self._stderr_thread = stderr_thread = None
-        # Event to signal threads to stop; no need to see logs after server is ready
-        # declare early so it always exists
-        self._stop_event = threading.Event()
-        try:
-            if not skip_server_setup:
-                if backend == "vllm":
-                    process = subprocess.Popen(
-                        [
-                            "vllm",
-                            "serve",
-                            str(self.model_path_or_id),
-                            "--port",
-                            str(self.local_server_port),
-                            "--dtype",
-                            str(self.dtype),
-                            "--tensor-parallel-size",
-                            str(num_gpus),
-                            "--gpu-memory-utilization",
-                            str(gpu_memory_utilization),
-                            "--trust-remote-code",
-                        ],
-                        stdout=subprocess.PIPE,  # Capture stdout
-                        stderr=subprocess.PIPE,  # Capture stderr
-                        text=True,  # To get the output as text instead of bytes
-                    )
-                elif backend == "sglang":
-
-                    process = subprocess.Popen(
-                        [
-                            "python",
-                            "-m",
-                            "sglang.launch_server",
-                            "--model-path",
-                            str(self.model_path_or_id),
-                            "--port",
-                            str(self.local_server_port),
-                            "--dtype",
-                            str(self.dtype),
-                            "--tp",
-                            str(num_gpus),
-                            "--mem-fraction-static",
-                            str(gpu_memory_utilization),
-                            "--trust-remote-code",
-                        ],
-                        stdout=subprocess.PIPE,  # Capture stdout
-                        stderr=subprocess.PIPE,  # Capture stderr
-                        text=True,  # To get the output as text instead of bytes
-                    )
-                else:
-                    raise ValueError(f"Backend {backend} is not supported.")
-
-                def log_subprocess_output(pipe, stop_event):
-                    # Read lines until stop event is set
-                    while not stop_event.is_set():
-                        line = pipe.readline()
-                        if line:
-                            print(line, end="")
-                        else:
-                            break
-                    pipe.close()
-                    print("server log tracking thread stopped successfully.")
-
-                # Start threads to read and print stdout and stderr
-                stdout_thread = threading.Thread(
-                    target=log_subprocess_output, args=(process.stdout, self._stop_event)
-                )
-                stderr_thread = threading.Thread(
-                    target=log_subprocess_output, args=(process.stderr, self._stop_event)
-                )
-                stdout_thread.setDaemon(True)
-                stderr_thread.setDaemon(True)
-                stdout_thread.start()
-                stderr_thread.start()
-
-            self._server_process = process
-            self._stdout_thread = stdout_thread
-            self._stderr_thread = stderr_thread
-
-            # Wait for the server to be ready
-            server_ready = False
-            while not server_ready:
-                # Check if the process has terminated unexpectedly
-                if not skip_server_setup and process.poll() is not None:
-                    # Output the captured logs
-                    stdout, stderr = process.communicate()
-                    print(stdout)
-                    print(stderr)
-                    raise Exception(
-                        f"Subprocess terminated unexpectedly with code {process.returncode}"
-                    )
-                try:
-                    # Make a simple request to check if the server is up
-                    response = requests.get(f"{self.base_url}/models")
-                    if response.status_code == 200:
-                        server_ready = True
-                        print("server is ready!")
-                except requests.exceptions.ConnectionError:
-                    # If the connection is not ready, wait and try again
-                    time.sleep(1)
-
-            # Signal threads to stop reading output
-            self._stop_event.set()
-
-        except Exception as e:
-            # Clean-up everything we already started, then re-raise
-            if self._server_process and self._server_process.poll() is None:
-                self._server_process.terminate()
-            if self._stop_event:
-                self._stop_event.set()
-            if self._stdout_thread:
-                self._stdout_thread.join(timeout=2)
-            if self._stderr_thread:
-                self._stderr_thread.join(timeout=2)
-            raise e
+        self._server_lease = None
+        if skip_server_setup:
+            wait_for_existing_server(self.base_url)
+        else:
+            spec = LocalServerSpec(
+                backend=backend,
+                model_path_or_id=str(self.model_path_or_id),
+                dtype=str(self.dtype),
+                num_gpus=num_gpus,
+                gpu_memory_utilization=gpu_memory_utilization,
+                port=int(self.local_server_port),
+            )
+            self._server_lease = acquire_local_server(
+                spec, self.base_url, idle_timeout=server_idle_timeout
+            )
 
     def shutdown_local_server(self):
-        """Terminate the locally launched OSS model server if it is still running."""
-        # Ensure the server process is terminated properly
-        process = getattr(self, "_server_process", None)
-        if process and process.poll() is None:
-            process.terminate()
-            try:
-                # Wait for the process to terminate fully
-                process.wait(timeout=15)
-                print("Process terminated successfully.")
-            except subprocess.TimeoutExpired:
-                process.kill()
-                process.wait()  # Wait again to ensure it's fully terminated
-                print("Process killed.")
-
-        # Tell the log-reader threads to stop and wait for them
-        if getattr(self, "_stop_event", None):
-            self._stop_event.set()
-        if getattr(self, "_stdout_thread", None):
-            self._stdout_thread.join(timeout=2)
-        if getattr(self, "_stderr_thread", None):
-            self._stderr_thread.join(timeout=2)
+        """
+        Release the local OSS model server. It is terminated, unless it is a persistent server kept alive for reuse.
+        """
+        lease = getattr(self, "_server_lease", None)
+        if lease is not None:
+            release_local_server(lease)
+            self._server_lease = None
 
     #### Prompting methods ####
 
@@ -287,7 +218,7 @@ class OSSHandler(BaseHandler, EnforceOverrides):
         inference_data["inference_input_log"] = {"formatted_prompt": formatted_prompt}
 
         # Tokenize the formatted prompt to get token count
-        input_token_count = len(self.tokenizer.tokenize(formatted_prompt))
+        input_token_count = self._count_prompt_tokens(inference_data, formatted_prompt)
 
         # Determine the number of tokens to request. Cap it at 4096 if the model has a larger limit.
         if self.max_context_length < input_token_count + 2:
@@ -329,6 +260,53 @@ class OSSHandler(BaseHandler, EnforceOverrides):
 
         return api_response, end_time - start_time
 
+    @final
+    def _count_prompt_tokens(self, inference_data: dict, formatted_prompt: str) -> int:
+        """
+        Count the number of tokens in the formatted prompt.
+
+        In multi-turn entries, the prompt of each step is usually the prompt of the previous step with new messages appended.
+        So instead of re-tokenizing the whole (ever-growing) prompt, we only tokenize the newly appended text and add it to the count of the previous prompt, which is remembered in `inference_data`.
+        Counts are also cached across entries, keyed by model and prompt.
+        An incremental count gets `INCREMENTAL_TOKEN_COUNT_SLACK` extra tokens, added once whatever the number of steps.
+        The count is only used to decide how many tokens to request; the reported input token count comes from the server.
+        """
+        cache_key = (
+            str(self.model_path_or_id),
+            hashlib.sha1(formatted_prompt.encode("utf-8")).hexdigest(),
+        )
+        with _PROMPT_TOKEN_COUNT_CACHE_LOCK:
+            cached_count = _PROMPT_TOKEN_COUNT_CACHE.get(cache_key)
+            if cached_count is not None:
+                _PROMPT_TOKEN_COUNT_CACHE.move_to_end(cache_key)
+
+        if cached_count is not None:
+            token_count, is_exact = cached_count
+        else:
+            previous_prompt, previous_token_count, _ = inference_data.get(
+                "prompt_token_count", ("", 0, True)
+            )
+            if previous_prompt and formatted_prompt.startswith(previous_prompt):
+                appended_text = formatted_prompt[len(previous_prompt) :]
+                token_count = previous_token_count + len(
+                    self.tokenizer.tokenize(appended_text)
+                )
+                is_exact = False
+            else:
+                token_count = len(self.tokenizer.tokenize(formatted_prompt))
+                is_exact = True
+
+            with _PROMPT_TOKEN_COUNT_CACHE_LOCK:
+                _PROMPT_TOKEN_COUNT_CACHE[cache_key] = (token_count, is_exact)
+                while len(_PROMPT_TOKEN_COUNT_CACHE) > PROMPT_TOKEN_COUNT_CACHE_MAX_SIZE:
+                    _PROMPT_TOKEN_COUNT_CACHE.popitem(last=False)
+
+        # The next step continues from the count without the slack
+        inference_data["prompt_token_count"] = (formatted_prompt, token_count, is_exact)
+        if is_exact:
+            return token_count
+        return token_count + INCREMENTAL_TOKEN_COUNT_SLACK
+
     @override
     def _pre_query_processing_prompting(self, test_entry: dict) -> dict:
         functions: list = test_entry["function"]
@@ -346,6 +324,7 @@ class OSSHandler(BaseHandler, EnforceOverrides):
             "model_responses": api_response.choices[0].text,
             "input_token": api_response.usage.prompt_tokens,
             "output_token": api_response.usage.completion_tokens,
+            **extract_usage_details(api_response.usage),
         }
 
     @override
@@ -0,0 +1,429 @@
+"""
+Launch, register and reuse the vLLM/SGLang servers behind the OSS model handlers.
+
+A server launched with an idle timeout is persistent: it runs in its own session, logs to a file, and is registered in
+a state file (one entry per port) together with the launch spec and the PIDs of the `bfcl generate` processes using
+it. Later invocations asking for the same spec on the same port attach to it after a health check instead of loading
+the model again. A detached watchdog process shuts it down once nobody has used it for the idle timeout.
+
+Without an idle timeout, the server lives only as long as the invocation that launched it, as before.
+
+In both cases, readiness is detected from the server's log stream: the health check runs as soon as the server logs
+that it is up, with a slow periodic health check as a fallback in case the log format changes.
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional
+
+import requests
+from bfcl_eval.constants.eval_config import (
+    LOCAL_SERVER_LOG_PATH,
+    LOCAL_SERVER_STATE_PATH,
+)
+from filelock import FileLock
+
+# Log lines that announce the server is (about to be) ready to serve requests
+READY_LOG_MARKERS = (
+    "Application startup complete",  # vLLM and SGLang (uvicorn)
+    "The server is fired up and ready to roll",  # SGLang, after warmup
+    "Uvicorn running on",
+)
+# Seconds between two health checks when the server hasn't logged any of the ready markers
+HEALTH_CHECK_FALLBACK_INTERVAL = 5
+HEALTH_CHECK_TIMEOUT = 5
+# Seconds between two reads when there is no new output in the log file
+LOG_TAIL_INTERVAL = 0.1
+# Seconds given to the server to exit after SIGTERM, before SIGKILL
+SHUTDOWN_TIMEOUT = 15
+# Seconds between two checks of the watchdog
+WATCHDOG_INTERVAL = 30
+
+_STATE_LOCK = FileLock(str(LOCAL_SERVER_STATE_PATH) + ".lock")
+
+
+def _get_state_lock() -> FileLock:
+    LOCAL_SERVER_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    return _STATE_LOCK
+
+
+@dataclass(frozen=True)
+class LocalServerSpec:
+    """
+    Everything that determines what a launched server serves. A registered server is only reused for the same spec.
+    """
+
+    backend: str
+    model_path_or_id: str
+    dtype: str
+    num_gpus: int
+    gpu_memory_utilization: float
+    port: int
+
+    def build_command(self) -> list[str]:
+        if self.backend == "vllm":
+            return [
+                "vllm",
+                "serve",
+                str(self.model_path_or_id),
+                "--port",
+                str(self.port),
+                "--dtype",
+                str(self.dtype),
+                "--tensor-parallel-size",
+                str(self.num_gpus),
+                "--gpu-memory-utilization",
+                str(self.gpu_memory_utilization),
+                "--trust-remote-code",
+            ]
+        elif self.backend == "sglang":
+            return [
+                "python",
+                "-m",
+                "sglang.launch_server",
+                "--model-path",
+                str(self.model_path_or_id),
+                "--port",
+                str(self.port),
+                "--dtype",
+                str(self.dtype),
+                "--tp",
+                str(self.num_gpus),
+                "--mem-fraction-static",
+                str(self.gpu_memory_utilization),
+                "--trust-remote-code",
+            ]
+        else:
+            raise ValueError(f"Backend {self.backend} is not supported.")
+
+
+@dataclass
+class LocalServerLease:
+    """
+    A handle on a server used by this process. Release it with `release_local_server`.
+    """
+
+    spec: LocalServerSpec
+    pid: int
+    persistent: bool
+    # Only set for the servers launched by this process
+    process: Optional[subprocess.Popen] = None
+
+
+#### State file ####
+
+
+def _read_state() -> dict:
+    if not LOCAL_SERVER_STATE_PATH.exists():
+        return {}
+    try:
+        with open(LOCAL_SERVER_STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        print(f"⚠️ Warning: Ignoring the corrupted server state file {LOCAL_SERVER_STATE_PATH}.")
+        return {}
+
+
+def _write_state(state: dict) -> None:
+    LOCAL_SERVER_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = LOCAL_SERVER_STATE_PATH.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(temp_path, LOCAL_SERVER_STATE_PATH)
+
+
+def _is_process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    # A zombie (exited, but not yet reaped by its parent) still accepts signals
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except (FileNotFoundError, IndexError):
+        return True
+
+
+def _is_server_healthy(base_url: str) -> bool:
+    try:
+        return requests.get(f"{base_url}/models", timeout=HEALTH_CHECK_TIMEOUT).status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+
+def _terminate_process_group(pid: int) -> None:
+    """
+    Stop a persistent server and its workers (it is the leader of its own session).
+    """
+    try:
+        os.killpg(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return
+    deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+    while time.monotonic() < deadline:
+        if not _is_process_alive(pid):
+            return
+        time.sleep(0.5)
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def list_local_servers() -> dict:
+    """
+    Return the registered persistent servers, by port, dropping the ones that are no longer running.
+    """
+    with _get_state_lock():
+        state = _read_state()
+        live_state = {
+            port: entry for port, entry in state.items() if _is_process_alive(entry["pid"])
+        }
+        if live_state != state:
+            _write_state(live_state)
+    return live_state
+
+
+def stop_local_server(port: int) -> bool:
+    """
+    Shut down the persistent server registered on `port`. Return whether there was one.
+    """
+    with _get_state_lock():
+        state = _read_state()
+        entry = state.pop(str(port), None)
+        if entry is None:
+            return False
+        _terminate_process_group(entry["pid"])
+        _write_state(state)
+    return True
+
+
+#### Readiness ####
+
+
+def _wait_until_ready(process: subprocess.Popen, log_path, base_url: str) -> None:
+    """
+    Echo the server log until the server answers the health check.
+    The health check runs whenever a ready marker is logged, and every `HEALTH_CHECK_FALLBACK_INTERVAL` seconds.
+    """
+    next_health_check = time.monotonic() + HEALTH_CHECK_FALLBACK_INTERVAL
+    with open(log_path, "r", encoding="utf-8", errors="replace") as log_file:
+        while True:
+            line = log_file.readline()
+            if line:
+                print(line, end="")
+                is_ready_marker = any(marker in line for marker in READY_LOG_MARKERS)
+            elif process.poll() is not None:
+                raise Exception(
+                    f"Subprocess terminated unexpectedly with code {process.returncode}. See the server log at {log_path}."
+                )
+            else:
+                is_ready_marker = False
+                time.sleep(LOG_TAIL_INTERVAL)
+
+            if not is_ready_marker and time.monotonic() < next_health_check:
+                continue
+
+            if _is_server_healthy(base_url):
+                print("server is ready!")
+                return
+            next_health_check = time.monotonic() + HEALTH_CHECK_FALLBACK_INTERVAL
+
+
+def wait_for_existing_server(base_url: str) -> None:
+    """
+    Wait for a server that we didn't launch (eg. with `--skip-server-setup`) to answer the health check.
+    """
+    while not _is_server_healthy(base_url):
+        time.sleep(1)
+    print("server is ready!")
+
+
+#### Lifecycle ####
+
+
+def _launch(spec: LocalServerSpec, persistent: bool) -> tuple[subprocess.Popen, str]:
+    LOCAL_SERVER_LOG_PATH.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_path = LOCAL_SERVER_LOG_PATH / f"port_{spec.port}_{timestamp}.log"
+    with open(log_path, "w", encoding="utf-8") as log_file:
+        process = subprocess.Popen(
+            spec.build_command(),
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL,
+            text=True,
+            # A persistent server must survive this process (and its Ctrl-C)
+            start_new_session=persistent,
+        )
+    return process, str(log_path)
+
+
+def _start_watchdog(port: int) -> None:
+    subprocess.Popen(
+        [sys.executable, "-m", __name__, "watchdog", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        stdin=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def acquire_local_server(
+    spec: LocalServerSpec, base_url: str, idle_timeout: Optional[float] = None
+) -> LocalServerLease:
+    """
+    Attach to the healthy server registered for `spec`, or launch a new one and wait until it is ready.
+    With an `idle_timeout` (in seconds), a newly launched server is persistent and registered for reuse.
+    """
+    port_key = str(spec.port)
+    persistent = idle_timeout is not None and idle_timeout > 0
+
+    # Held during the launch, so that concurrent invocations wait for the server instead of launching their own
+    with _get_state_lock():
+        state = _read_state()
+        entry = state.get(port_key)
+        if entry is not None:
+            if not _is_process_alive(entry["pid"]):
+                del state[port_key]
+                entry = None
+            elif LocalServerSpec(**entry["spec"]) == spec and _is_server_healthy(base_url):
+                entry["clients"] = [
+                    pid for pid in entry["clients"] if _is_process_alive(pid)
+                ] + [os.getpid()]
+                entry["last_used_at"] = time.time()
+                if persistent:
+                    entry["idle_timeout"] = idle_timeout
+                _write_state(state)
+                print(
+                    f"♻️  Reusing the {spec.backend} server already serving {spec.model_path_or_id} on port {spec.port} (PID {entry['pid']})."
+                )
+                return LocalServerLease(spec=spec, pid=entry["pid"], persistent=True)
+            elif any(pid != os.getpid() and _is_process_alive(pid) for pid in entry["clients"]):
+                raise RuntimeError(
+                    f"Port {spec.port} is used by a {entry['spec']['backend']} server for {entry['spec']['model_path_or_id']} that is still in use by another process. Use a different LOCAL_SERVER_PORT, or wait for it to finish."
+                )
+            else:
+                print(
+                    f"Shutting down the idle server on port {spec.port} (serving {entry['spec']['model_path_or_id']}) to launch {spec.model_path_or_id}."
+                )
+                _terminate_process_group(entry["pid"])
+                del state[port_key]
+                entry = None
+            _write_state(state)
+
+        process, log_path = _launch(spec, persistent)
+        try:
+            _wait_until_ready(process, log_path, base_url)
+        except BaseException:
+            # Clean-up the server we just started, then re-raise
+            if process.poll() is None:
+                if persistent:
+                    _terminate_process_group(process.pid)
+                else:
+                    process.terminate()
+            raise
+
+        if persistent:
+            state[port_key] = {
+                "pid": process.pid,
+                "spec": asdict(spec),
+                "log_path": log_path,
+                "started_at": time.time(),
+                "last_used_at": time.time(),
+                "idle_timeout": idle_timeout,
+                "clients": [os.getpid()],
+            }
+            _write_state(state)
+
+    if persistent:
+        _start_watchdog(spec.port)
+        print(
+            f"The server will be kept alive for reuse, and shut down after {idle_timeout:g} seconds of inactivity. Log: {log_path}"
+        )
+    return LocalServerLease(spec=spec, pid=process.pid, persistent=persistent, process=process)
+
+
+def release_local_server(lease: LocalServerLease) -> None:
+    """
+    Stop using the server. A non-persistent server is shut down; a persistent one is left to its watchdog.
+    """
+    if lease.persistent:
+        with _get_state_lock():
+            state = _read_state()
+            entry = state.get(str(lease.spec.port))
+            if entry is not None and entry["pid"] == lease.pid:
+                entry["clients"] = [pid for pid in entry["clients"] if pid != os.getpid()]
+                entry["last_used_at"] = time.time()
+                _write_state(state)
+        return
+
+    process = lease.process
+    if process and process.poll() is None:
+        process.terminate()
+        try:
+            # Wait for the process to terminate fully
+            process.wait(timeout=SHUTDOWN_TIMEOUT)
+            print("Process terminated successfully.")
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()  # Wait again to ensure it's fully terminated
+            print("Process killed.")
+
+
+def run_watchdog(port: int) -> None:
+    """
+    Shut down the persistent server on `port` once it has no live clients and has been idle for its idle timeout.
+    Exits when the server is gone or replaced.
+    """
+    port_key = str(port)
+    with _get_state_lock():
+        entry = _read_state().get(port_key)
+    if entry is None:
+        return
+    server_pid = entry["pid"]
+
+    while True:
+        time.sleep(WATCHDOG_INTERVAL)
+        with _get_state_lock():
+            state = _read_state()
+            entry = state.get(port_key)
+            if entry is None or entry["pid"] != server_pid:
+                return
+            if not _is_process_alive(server_pid):
+                del state[port_key]
+                _write_state(state)
+                return
+
+            live_clients = [pid for pid in entry["clients"] if _is_process_alive(pid)]
+            if live_clients != entry["clients"]:
+                # A client that died without releasing the server last used it now at the latest
+                entry["clients"] = live_clients
+                entry["last_used_at"] = time.time()
+                _write_state(state)
+            elif not live_clients and time.time() - entry["last_used_at"] > entry["idle_timeout"]:
+                _terminate_process_group(server_pid)
+                del state[port_key]
+                _write_state(state)
+                return
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    watchdog_parser = subparsers.add_parser("watchdog")
+    watchdog_parser.add_argument("--port", type=int, required=True)
+    args = parser.parse_args()
+
+    if args.command == "watchdog":
+        run_watchdog(args.port)
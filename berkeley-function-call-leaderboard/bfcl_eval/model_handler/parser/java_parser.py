@@ -1,18 +1,23 @@
-from tree_sitter import Language, Parser
+from tree_sitter import Language
 import tree_sitter_java
 
+from bfcl_eval.model_handler.parser.tree_sitter_utils import (
+    ThreadLocalParser,
+    cache_parse_result,
+    contains_error_node,
+)
+
 JAVA_LANGUAGE = Language(tree_sitter_java.language(), "java")
 
-parser = Parser()
-parser.set_language(JAVA_LANGUAGE)
+parser = ThreadLocalParser(JAVA_LANGUAGE)
 
 
+@cache_parse_result
 def parse_java_function_call(source_code):
-    tree = parser.parse(bytes(source_code, "utf8"))
+    tree = parser.parse(source_code)
     root_node = tree.root_node
-    sexp_result = root_node.sexp()
 
-    if "ERROR" in sexp_result:
+    if contains_error_node(root_node):
         raise SyntaxError("Error parsing java the source code.")
 
     def get_text(node):
@@ -1,18 +1,23 @@
-from tree_sitter import Language, Parser
+from tree_sitter import Language
 import tree_sitter_javascript
 
+from bfcl_eval.model_handler.parser.tree_sitter_utils import (
+    ThreadLocalParser,
+    cache_parse_result,
+    contains_error_node,
+)
+
 JS_LANGUAGE = Language(tree_sitter_javascript.language(), "javascript")
 
-parser = Parser()
-parser.set_language(JS_LANGUAGE)
+parser = ThreadLocalParser(JS_LANGUAGE)
 
 
+@cache_parse_result
 def parse_javascript_function_call(source_code):
     # Parse the source code
-    tree = parser.parse(bytes(source_code, "utf8"))
+    tree = parser.parse(source_code)
     root_node = tree.root_node
-    sexp_result = root_node.sexp()
-    if "ERROR" in sexp_result:
+    if contains_error_node(root_node):
         raise SyntaxError("Error js parsing the source code.")
 
     # Function to recursively extract argument details
@@ -0,0 +1,58 @@
+import copy
+import threading
+from functools import lru_cache, wraps
+from typing import Callable
+
+from tree_sitter import Language, Node, Parser
+
+# Many models emit the exact same function call for a given entry, so parse results are shared across models
+PARSE_RESULT_CACHE_MAX_SIZE = 8192
+
+
+class ThreadLocalParser(threading.local):
+    """
+    A tree-sitter parser per thread. A `Parser` object is not safe to share between the evaluation threads.
+    """
+
+    def __init__(self, language: Language):
+        self.parser = Parser()
+        self.parser.set_language(language)
+
+    def parse(self, source_code: str):
+        return self.parser.parse(bytes(source_code, "utf8"))
+
+
+def contains_error_node(node: Node) -> bool:
+    """
+    Check if the syntax tree contains an ERROR node.
+    `has_error` is also set for MISSING nodes (eg. an omitted trailing `;`), which are tolerated,
+    so only the subtrees flagged by `has_error` are searched for an actual ERROR node.
+    """
+    if not node.has_error:
+        return False
+    if node.type == "ERROR":
+        return True
+    return any(contains_error_node(child) for child in node.children)
+
+
+def cache_parse_result(parse_function: Callable) -> Callable:
+    """
+    Memoize a parse function by its source code. Both the result and the raised exception are cached.
+    A fresh copy is returned (or raised) every time, since the caller may modify the decoded output.
+    """
+
+    @lru_cache(maxsize=PARSE_RESULT_CACHE_MAX_SIZE)
+    def _cached_parse(source_code: str):
+        try:
+            return parse_function(source_code), None
+        except Exception as e:
+            return None, e
+
+    @wraps(parse_function)
+    def wrapper(source_code: str):
+        result, error = _cached_parse(source_code)
+        if error is not None:
+            raise copy.copy(error)
+        return copy.deepcopy(result)
+
+    return wrapper
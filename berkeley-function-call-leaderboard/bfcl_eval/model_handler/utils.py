@@ -1,9 +1,12 @@
 import ast
 import builtins
 import copy
+import hashlib
 import json
 import operator
 import re
+import threading
+from collections import OrderedDict
 from functools import reduce
 from typing import TYPE_CHECKING, Callable, List, Optional, Type, Union
 
@@ -30,6 +33,36 @@ if TYPE_CHECKING:
         MemoryAPI,
     )
 
+# System prompts are keyed by the content hash of the function docs,
+# so the many entries (and multi-turn steps) that share the same function docs reuse one compilation.
+COMPILATION_CACHE_MAX_SIZE = 4096
+
+_SYSTEM_PROMPT_CACHE: OrderedDict[tuple[str, str], str] = OrderedDict()
+_SYSTEM_PROMPT_CACHE_LOCK = threading.Lock()
+
+
+def _compute_content_hash(*contents) -> str:
+    """
+    Hash JSON-serializable content. Key order is kept, as the formatted function docs depend on it.
+    """
+    serialized = json.dumps(contents, ensure_ascii=False, default=str)
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
+
+def _lookup_compilation_cache(cache: OrderedDict, lock: threading.Lock, key):
+    with lock:
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+    return value
+
+
+def _store_compilation_cache(cache: OrderedDict, lock: threading.Lock, key, value) -> None:
+    with lock:
+        cache[key] = value
+        while len(cache) > COMPILATION_CACHE_MAX_SIZE:
+            cache.popitem(last=False)
+
 
 def _cast_to_openai_type(properties, mapping):
     for key, value in properties.items():
@@ -604,6 +637,83 @@ def retry_with_backoff(
     return decorator
 
 
+#### utils for usage accounting ####
+
+# Token fields of the uniform usage record, see `build_usage_record`
+USAGE_TOKEN_FIELDS = (
+    "input_token",
+    "cached_input_token",
+    "cache_write_input_token",
+    "output_token",
+    "reasoning_token",
+)
+# Time fields of the uniform usage record, in seconds
+USAGE_TIME_FIELDS = ("generation_time", "queue_time", "pool_wait_time")
+
+# Where each provider reports the prompt-cache and reasoning token counts in its usage object.
+# The first non-zero field wins.
+_CACHED_INPUT_TOKEN_FIELDS = (
+    ("prompt_tokens_details", "cached_tokens"),  # OpenAI Chat Completions, vLLM, SGLang
+    ("input_tokens_details", "cached_tokens"),  # OpenAI Responses
+    ("cache_read_input_tokens",),  # Anthropic
+    ("cached_content_token_count",),  # Gemini
+    ("prompt_cache_hit_tokens",),  # DeepSeek
+)
+_CACHE_WRITE_INPUT_TOKEN_FIELDS = (("cache_creation_input_tokens",),)  # Anthropic
+_REASONING_TOKEN_FIELDS = (
+    ("completion_tokens_details", "reasoning_tokens"),  # OpenAI Chat Completions
+    ("output_tokens_details", "reasoning_tokens"),  # OpenAI Responses
+    ("thoughts_token_count",),  # Gemini
+)
+
+
+def _read_usage_field(usage, field_paths: tuple[tuple[str, ...], ...]) -> int:
+    for field_path in field_paths:
+        value = usage
+        for field in field_path:
+            if value is None:
+                break
+            value = value.get(field) if isinstance(value, dict) else getattr(value, field, None)
+        if isinstance(value, (int, float)) and value:
+            return value
+    return 0
+
+
+def extract_usage_details(usage) -> dict:
+    """
+    Read the prompt-cache and reasoning token counts from a provider usage object (or dict).
+    The returned keys are the optional usage keys of the `_parse_query_response_xxx` output; missing fields count as 0.
+    """
+    return {
+        "cached_input_token": _read_usage_field(usage, _CACHED_INPUT_TOKEN_FIELDS),
+        "cache_write_input_token": _read_usage_field(usage, _CACHE_WRITE_INPUT_TOKEN_FIELDS),
+        "reasoning_token": _read_usage_field(usage, _REASONING_TOKEN_FIELDS),
+    }
+
+
+def build_usage_record(
+    model_response_data: dict,
+    generation_time: float,
+    query_time: float,
+    pool_wait_time: float = 0.0,
+) -> dict:
+    """
+    Build the usage record of one model query, stored in the result file next to the token counts and latency.
+
+    `input_token` counts all the prompt tokens, including `cached_input_token` (read from the prompt cache) and
+    `cache_write_input_token` (written to the prompt cache). `output_token` counts all the generated tokens, including
+    `reasoning_token`. `generation_time` is the latency reported by `_query_xxx`, ie. the successful request itself;
+    `queue_time` is the rest of the time spent in `_query_xxx`, ie. retries, rate-limit backoff and client-side prompt
+    preparation. `pool_wait_time` is the time the requests spent waiting for a free connection of the shared HTTP
+    connection pool (see `http_client.py`), over all the attempts.
+    """
+    record = {field: model_response_data.get(field) or 0 for field in USAGE_TOKEN_FIELDS}
+    record["generation_time"] = generation_time
+    record["queue_time"] = max(query_time - generation_time, 0.0)
+    record["pool_wait_time"] = pool_wait_time
+    return record
+
+
 #### utils for memory category ####
 
 
@@ -656,7 +766,22 @@ def add_memory_instruction_system_prompt(
 def formulate_system_prompt(format_sensitivity_config: str, functions: list[dict]) -> str:
     """
     Formulate the default system prompt based on the provided parameters.
+    The prompt is cached by the content hash of the function docs, so entries that share the same function docs
+    and prompt format also share byte-identical system prompts.
     """
+    cache_key = (_compute_content_hash(functions), format_sensitivity_config)
+    system_prompt = _lookup_compilation_cache(
+        _SYSTEM_PROMPT_CACHE, _SYSTEM_PROMPT_CACHE_LOCK, cache_key
+    )
+    if system_prompt is None:
+        system_prompt = _formulate_system_prompt(format_sensitivity_config, functions)
+        _store_compilation_cache(
+            _SYSTEM_PROMPT_CACHE, _SYSTEM_PROMPT_CACHE_LOCK, cache_key, system_prompt
+        )
+    return system_prompt
+
+
+def _formulate_system_prompt(format_sensitivity_config: str, functions: list[dict]) -> str:
     (
         return_format,
         has_tool_call_tag,
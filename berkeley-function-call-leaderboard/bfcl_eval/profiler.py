@@ -0,0 +1,302 @@
+"""
+Lightweight span/counter instrumentation for the generation and evaluation pipelines.
+
+Profiling is off by default. While it is off, `profile_span` returns a shared no-op context manager and
+`profile_counter` returns immediately, so the instrumented call sites cost one global lookup and one function call.
+Once enabled (`bfcl generate --profile` / `bfcl evaluate --profile`), every span and counter increment is recorded
+in memory, and can be exported as a Chrome trace (open it in `chrome://tracing` or https://ui.perfetto.dev) and as
+per-stage percentiles aggregated by test category.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from bfcl_eval.constants.eval_config import PROJECT_ROOT
+from tabulate import tabulate
+
+PROFILE_PATH = PROJECT_ROOT / "profile"
+# Percentiles reported in the summary
+SUMMARY_PERCENTILES = (50, 90, 99)
+# Category used for spans outside of any test entry (eg. writing a result file with entries of several categories)
+NO_CATEGORY = "-"
+
+_enabled = False
+_start_ns = 0
+_records_lock = threading.Lock()
+# (name, test_category, start_ns, duration_ns, thread_id, args)
+_span_records: list[tuple] = []
+# (name, test_category, timestamp_ns, thread_id, value)
+_counter_records: list[tuple] = []
+_thread_context = threading.local()
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def enable_profiling() -> None:
+    """
+    Start recording spans and counters. Previously recorded data is discarded.
+    """
+    global _enabled, _start_ns
+    with _records_lock:
+        _span_records.clear()
+        _counter_records.clear()
+        _start_ns = time.perf_counter_ns()
+        _enabled = True
+
+
+def disable_profiling() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_profiling_enabled() -> bool:
+    return _enabled
+
+
+def _current_test_category() -> str:
+    return getattr(_thread_context, "test_category", NO_CATEGORY)
+
+
+class _Span:
+    __slots__ = ("name", "test_category", "args", "start_ns", "previous_test_category")
+
+    def __init__(self, name: str, test_category: Optional[str], args: dict):
+        self.name = name
+        self.test_category = test_category
+        self.args = args
+
+    def __enter__(self):
+        self.previous_test_category = _current_test_category()
+        if self.test_category is None:
+            self.test_category = self.previous_test_category
+        else:
+            # Nested spans in this thread inherit the test category
+            _thread_context.test_category = self.test_category
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        _thread_context.test_category = self.previous_test_category
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        # list.append is atomic, no lock needed
+        _span_records.append(
+            (
+                self.name,
+                self.test_category,
+                self.start_ns,
+                duration_ns,
+                threading.get_ident(),
+                self.args,
+            )
+        )
+        return False
+
+
+def profile_span(name: str, test_category: Optional[str] = None, **args):
+    """
+    Return a context manager that records the wall time of its body as a span named `name`.
+
+    Args:
+        name: The pipeline stage, eg. `query` or `decode`.
+        test_category: The test category to attribute this span (and the spans nested in it, on the same thread) to.
+            If not given, the category of the enclosing span is used.
+        **args: Extra attributes shown in the Chrome trace, eg. the test entry ID.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, test_category, args)
+
+
+def profile_counter(name: str, value: float = 1) -> None:
+    """
+    Add `value` to the counter `name`, attributed to the test category of the enclosing span.
+    """
+    if not _enabled:
+        return
+    _counter_records.append(
+        (
+            name,
+            _current_test_category(),
+            time.perf_counter_ns(),
+            threading.get_ident(),
+            value,
+        )
+    )
+
+
+#### Export ####
+
+
+def _compute_stats(durations_ns: list[int]) -> dict:
+    durations_ms = np.asarray(durations_ns, dtype=np.float64) / 1e6
+    stats = {
+        "count": len(durations_ms),
+        "total_ms": float(durations_ms.sum()),
+        "mean_ms": float(durations_ms.mean()),
+        "max_ms": float(durations_ms.max()),
+    }
+    for percentile, value in zip(
+        SUMMARY_PERCENTILES, np.percentile(durations_ms, SUMMARY_PERCENTILES)
+    ):
+        stats[f"p{percentile}_ms"] = float(value)
+    return stats
+
+
+def get_profile_summary() -> dict:
+    """
+    Aggregate the recorded spans into per-stage statistics (overall and per test category), and sum the counters.
+    """
+    with _records_lock:
+        span_records = list(_span_records)
+        counter_records = list(_counter_records)
+
+    durations = defaultdict(lambda: defaultdict(list))
+    for name, test_category, _, duration_ns, _, _ in span_records:
+        durations[name][test_category].append(duration_ns)
+
+    stages = {}
+    for name, durations_by_category in durations.items():
+        stages[name] = {
+            "overall": _compute_stats(
+                [
+                    duration
+                    for category_durations in durations_by_category.values()
+                    for duration in category_durations
+                ]
+            ),
+            "by_category": {
+                test_category: _compute_stats(category_durations)
+                for test_category, category_durations in sorted(
+                    durations_by_category.items()
+                )
+            },
+        }
+
+    counters = defaultdict(lambda: {"overall": 0, "by_category": defaultdict(float)})
+    for name, test_category, _, _, value in counter_records:
+        counters[name]["overall"] += value
+        counters[name]["by_category"][test_category] += value
+
+    return {
+        "wall_time_ms": (time.perf_counter_ns() - _start_ns) / 1e6,
+        "stages": stages,
+        "counters": {
+            name: {"overall": counter["overall"], "by_category": dict(counter["by_category"])}
+            for name, counter in counters.items()
+        },
+    }
+
+
+def get_chrome_trace() -> dict:
+    """
+    Return the recorded spans and counters in the Chrome trace event format.
+    """
+    with _records_lock:
+        span_records = list(_span_records)
+        counter_records = list(_counter_records)
+
+    pid = os.getpid()
+    trace_events = [
+        {
+            "name": name,
+            "cat": test_category,
+            "ph": "X",
+            "ts": (start_ns - _start_ns) / 1000,
+            "dur": duration_ns / 1000,
+            "pid": pid,
+            "tid": thread_id,
+            "args": args,
+        }
+        for name, test_category, start_ns, duration_ns, thread_id, args in span_records
+    ]
+
+    # Counter events carry the running total, so that the trace viewer can plot them
+    running_totals = defaultdict(float)
+    for name, test_category, timestamp_ns, thread_id, value in sorted(
+        counter_records, key=lambda record: record[2]
+    ):
+        running_totals[name] += value
+        trace_events.append(
+            {
+                "name": name,
+                "cat": test_category,
+                "ph": "C",
+                "ts": (timestamp_ns - _start_ns) / 1000,
+                "pid": pid,
+                "tid": thread_id,
+                "args": {name: running_totals[name]},
+            }
+        )
+
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+def export_profile(prefix: str, output_dir: Optional[Path] = None) -> tuple[Path, Path]:
+    """
+    Write the Chrome trace and the summary of the recorded profile, and print the per-stage summary.
+    Return the paths of the trace file and the summary file.
+    """
+    if output_dir is None:
+        output_dir = PROFILE_PATH
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    trace_path = output_dir / f"{prefix}_{timestamp}_trace.json"
+    summary_path = output_dir / f"{prefix}_{timestamp}_summary.json"
+
+    summary = get_profile_summary()
+    with open(trace_path, "w", encoding="utf-8") as f:
+        json.dump(get_chrome_trace(), f)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    rows = [
+        (
+            name,
+            stage["overall"]["count"],
+            f"{stage['overall']['total_ms'] / 1000:.2f}",
+            *(
+                f"{stage['overall'][f'p{percentile}_ms']:.2f}"
+                for percentile in SUMMARY_PERCENTILES
+            ),
+            f"{stage['overall']['max_ms']:.2f}",
+        )
+        for name, stage in sorted(
+            summary["stages"].items(),
+            key=lambda item: item[1]["overall"]["total_ms"],
+            reverse=True,
+        )
+    ]
+    print(
+        tabulate(
+            rows,
+            headers=[
+                "Stage",
+                "Count",
+                "Total (s)",
+                *(f"p{percentile} (ms)" for percentile in SUMMARY_PERCENTILES),
+                "Max (ms)",
+            ],
+            tablefmt="github",
+        )
+    )
+    if summary["counters"]:
+        print(
+            tabulate(
+                [(name, counter["overall"]) for name, counter in summary["counters"].items()],
+                headers=["Counter", "Total"],
+                tablefmt="github",
+            )
+        )
+    print(f"⏱️  Profile saved to {trace_path} (Chrome trace) and {summary_path} (summary)")
+
+    return trace_path, summary_path
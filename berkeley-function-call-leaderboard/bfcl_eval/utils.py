@@ -1,4 +1,5 @@
 import json
+import mmap
 import os
 import hashlib
 import re
@@ -6,7 +7,7 @@ from copy import deepcopy
 from pathlib import Path
 from threading import Lock
 from filelock import FileLock
-from typing import Union
+from typing import Iterator, Union
 
 from bfcl_eval.constants.category_mapping import *
 from bfcl_eval.constants.default_prompts import (
@@ -18,6 +19,20 @@ from bfcl_eval.constants.executable_backend_config import (
     MULTI_TURN_FUNC_DOC_FILE_MAPPING,
 )
 
+try:
+    # orjson is much faster than the standard library json, but it is not a hard dependency
+    from orjson import loads as _fast_json_loads
+except ImportError:
+    _fast_json_loads = json.loads
+
+_JSON_WHITESPACE_PATTERN = re.compile(r"\s*")
+# Maps every digit to b"0" and everything else to b" ", so that a run of 19+ digits can be found with a plain substring search
+_DIGIT_MASK_TABLE = bytes(
+    ord("0") if ord("0") <= i <= ord("9") else ord(" ") for i in range(256)
+)
+_LONG_DIGIT_RUN = b"0" * 19
+_READ_ONLY_DATA_ROOT = PROMPT_PATH.resolve()
+
 _FILE_LOCK_REGISTRY: dict[str, FileLock] = {}
 _FILE_LOCK_REGISTRY_LOCK = Lock()
 
@@ -183,6 +198,7 @@ def load_test_entries_from_id_file(id_file_path: Path) -> tuple[list[str], list[
         if not test_ids:
             continue
         # Extend the entries list with only those whose id is present in the ID list
+        test_ids = set(test_ids)
         entries.extend(
             [entry for entry in load_dataset_entry(category) if entry["id"] in test_ids]
         )
@@ -352,61 +368,79 @@ def get_directory_structure_by_category(test_category: str) -> str:
 #### Helper functions to load/write the dataset files ####
 
 
-def load_file(file_path, sort_by_id: bool = False, use_lock: bool = True) -> list[dict]:
-    result = []
-
-    def _load_entries(input_path: str) -> None:
-        with open(input_path) as f:
-            lines = f.readlines()
-
-        i = 0
-        n = len(lines)
-
-        while i < n:
-            line = lines[i]
-            s = line.strip()
-            if not s:
-                i += 1
-                continue
-
-            try:
-                # Fast path: JSONL-style, one object per line
-                obj = json.loads(s)
-                result.append(obj)
-                i += 1
-                continue
-            except json.JSONDecodeError:
-                # Fallback: this line is the start of a multi-line JSON object
-                buffer = line
-                j = i + 1
-
-                while True:
-                    if j >= n:
-                        # We ran out of lines but still can't parse -> malformed JSON
-                        raise json.JSONDecodeError(
-                            f"Could not parse multi-line JSON object starting at line {i+1}",
-                            buffer,
-                            pos=0,
-                        )
-
-                    buffer += lines[j]
-                    try:
-                        obj = json.loads(buffer)
-                        result.append(obj)
-                        i = j + 1  # continue after the end of this object
-                        break
-                    except json.JSONDecodeError:
-                        j += 1
-                        continue
-        
-        return result
-            
+def _loads_json_line(line: bytes):
+    # orjson silently turns integers beyond 64 bits into floats, so leave lines with long digit runs to the standard library
+    if _LONG_DIGIT_RUN in line.translate(_DIGIT_MASK_TABLE):
+        return json.loads(line)
+    try:
+        return _fast_json_loads(line)
+    except ValueError:
+        # orjson is also stricter than the standard library (eg. NaN)
+        return json.loads(line)
 
-    if use_lock:
+
+def _iter_concatenated_json_entries(text: str) -> Iterator:
+    """
+    Yield the JSON values in `text`, which may be any mix of single-line and multi-line (pretty-printed) values separated by whitespace.
+    """
+    decoder = json.JSONDecoder()
+    pos = 0
+    while True:
+        pos = _JSON_WHITESPACE_PATTERN.match(text, pos).end()
+        if pos >= len(text):
+            return
+        obj, pos = decoder.raw_decode(text, pos)
+        yield obj
+
+
+def iter_file_entries(file_path) -> Iterator:
+    """
+    Lazily yield the entries of a file in a single pass. The file is memory-mapped instead of read into memory at once.
+    Both JSONL files (one object per line) and files with multi-line (pretty-printed) objects are supported;
+    the format is detected from the first entry. If a JSONL file turns out to contain multi-line objects further down,
+    the rest of the file is decoded as a stream of concatenated JSON values.
+    """
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            size = len(buffer)
+            pos = 0
+            while pos < size:
+                end = buffer.find(b"\n", pos)
+                if end == -1:
+                    end = size
+                line = buffer[pos:end].strip()
+                if not line:
+                    pos = end + 1
+                    continue
+
+                try:
+                    # Fast path: JSONL-style, one object per line
+                    obj = _loads_json_line(line)
+                except ValueError:
+                    # This line is the start of a multi-line JSON object
+                    yield from _iter_concatenated_json_entries(buffer[pos:].decode("utf-8"))
+                    return
+
+                yield obj
+                pos = end + 1
+
+
+def _is_read_only_path(file_path) -> bool:
+    """
+    Dataset files shipped with the package are never written to during generation or evaluation.
+    """
+    return Path(file_path).resolve().is_relative_to(_READ_ONLY_DATA_ROOT)
+
+
+def load_file(file_path, sort_by_id: bool = False, use_lock: bool = True) -> list[dict]:
+    # Read-only dataset files don't need the cross-process file lock
+    if use_lock and not _is_read_only_path(file_path):
         with _get_file_lock(file_path):
-            _load_entries(file_path)
+            result = list(iter_file_entries(file_path))
     else:
-        _load_entries(file_path)
+        result = list(iter_file_entries(file_path))
 
     if sort_by_id:
         result.sort(key=sort_key)
@@ -731,12 +765,18 @@ def add_language_specific_hint_to_function_doc(test_cases: list[dict]) -> list[d
     """
     This function adds language-specific hints to the function description and processes the parameters accordingly.
     """
+    # Format sensitivity entries share the same function doc list across all prompt variations of a base entry,
+    # so each shared list must only be processed once (the processing is done in place).
+    processed_function_docs: dict[tuple[int, str], list[dict]] = {}
     for entry in test_cases:
         assert "function" in entry
         test_category = extract_test_category_from_id(entry["id"])
-        entry["function"] = _func_doc_language_specific_pre_processing(
-            entry["function"], test_category
-        )
+        cache_key = (id(entry["function"]), test_category)
+        if cache_key not in processed_function_docs:
+            processed_function_docs[cache_key] = _func_doc_language_specific_pre_processing(
+                entry["function"], test_category
+            )
+        entry["function"] = processed_function_docs[cache_key]
 
     return test_cases
 
@@ -921,6 +961,10 @@ def populate_initial_settings_for_web_search_test_cases(
 def load_format_sensitivity_test_cases() -> list[dict]:
     """
     Loads all the format sensitivity test cases. 26 configs x 200 test cases = 5200 test cases.
+
+    The entries are lightweight views: only the id differs between the prompt variations of the same base entry,
+    and all nested fields (question, function docs, etc.) are shared by reference with the base entry.
+    Use `materialize_test_entry` to get a private copy before modifying an entry in place.
     """
     _, all_test_entries_involved = load_test_entries_from_id_file(
         FORMAT_SENSITIVITY_IDS_PATH
@@ -931,10 +975,9 @@ def load_format_sensitivity_test_cases() -> list[dict]:
     index = 0
     for entry in all_test_entries_involved:
         for config in all_configs:
-            entry_copy = deepcopy(entry)
-            entry_copy["id"] = f"format_sensitivity_{index}:{config}:{entry_copy['id']}"
-
-            all_format_sensitivity_test_cases.append(entry_copy)
+            all_format_sensitivity_test_cases.append(
+                {**entry, "id": f"format_sensitivity_{index}:{config}:{entry['id']}"}
+            )
             index += 1
 
     return all_format_sensitivity_test_cases
@@ -955,14 +998,25 @@ def load_format_sensitivity_ground_truth_entry() -> list[dict]:
         candidate_entries=ground_truth_entries,
     )
 
+    # The ground truth is read-only during evaluation, so all prompt variations share the same entry
     all_ground_truth_entries = []
     for entry in ground_truth_entries:
-        for _ in all_configs:
-            all_ground_truth_entries.append(deepcopy(entry))
+        all_ground_truth_entries.extend([entry] * len(all_configs))
 
     return all_ground_truth_entries
 
 
+def materialize_test_entry(test_entry: dict) -> dict:
+    """
+    Return a test entry that is safe to modify in place.
+    Format sensitivity entries share their nested fields with the other prompt variations of the same base entry
+    (see `load_format_sensitivity_test_cases`), so they are deep-copied here; all other entries are returned as is.
+    """
+    if is_format_sensitivity(test_entry["id"]):
+        return deepcopy(test_entry)
+    return test_entry
+
+
 def get_all_format_sensitivity_configs() -> list[str]:
     """
     Get all the format sensitivity configs.
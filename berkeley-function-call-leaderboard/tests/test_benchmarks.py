@@ -0,0 +1,35 @@
+"""
+pytest-benchmark suite of the pipeline hot paths, with the same benchmarks and fixture model results as `bfcl bench`.
+
+    pip install -e ".[bench]"
+    pytest tests/test_benchmarks.py --benchmark-autosave
+    pytest tests/test_benchmarks.py --benchmark-compare --benchmark-compare-fail=median:10%
+
+Set `BFCL_BENCH_MAX_ENTRIES` to only use the first N entries of each test category, and `BFCL_BENCH_ROUNDS` to change
+the number of timed rounds (5 by default, after one untimed warmup round).
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from bfcl_eval._benchmark import BENCHMARKS, build_fixtures
+
+MAX_ENTRIES = int(os.environ["BFCL_BENCH_MAX_ENTRIES"]) if os.getenv("BFCL_BENCH_MAX_ENTRIES") else None
+ROUNDS = int(os.getenv("BFCL_BENCH_ROUNDS", 5))
+
+
+def _collect_benchmark_cases() -> list:
+    fixtures = build_fixtures(MAX_ENTRIES)
+    return [
+        pytest.param(function, id=name, marks=pytest.mark.benchmark(group=group))
+        for make_cases in BENCHMARKS.values()
+        for name, group, function, _ in make_cases(fixtures)
+    ]
+
+
+@pytest.mark.parametrize("function", _collect_benchmark_cases())
+def test_benchmark(benchmark, function):
+    benchmark.pedantic(function, rounds=ROUNDS, warmup_rounds=1, iterations=1)
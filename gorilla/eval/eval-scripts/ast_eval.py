@@ -0,0 +1,277 @@
+# Copyright 2023 https://github.com/ShishirPatil/gorilla
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# AST-matching evaluation of the APIBench responses, shared by ast_eval_{hf,tf,th}.py
+
+import argparse
+import json
+from collections import defaultdict
+from functools import partial
+
+from ast_parsing import (
+    DEFAULT_CACHE_DIR,
+    ast_parse,
+    get_all_sub_trees,
+    load_reference_trees,
+    map_in_chunks,
+)
+
+
+# Get all the arguments in the ast tree, for the Hugging Face APIs
+def get_args_hf(node):
+    if node.child_count == 0:
+        return []
+    args_list = []
+    for child in node.children[0].children[0].children[1].children:
+        if "=" in child.text.decode():
+            args_list.append(child.children[2].text)
+        elif child.text.decode() != "(" and child.text.decode() != ")" and child.text.decode() != ",":
+            args_list.append(child.text)
+    return args_list
+
+# Get all the arguments in the ast tree, for the TensorFlow Hub APIs
+def get_args_tf(node):
+    if node.child_count == 0:
+        return []
+    args_list = []
+    for child in node.children[0].children[0].children[1].children:
+        if 'model=' in child.text.decode() or 'model =' in child.text.decode():
+            args_list.append(child.children[2].text)
+        elif child.text.decode() != "(" and child.text.decode() != ")" and child.text.decode() != ",":
+            args_list.append(child.text)
+    return args_list
+
+# Get all the arguments in the ast tree, for the Torch Hub APIs
+def get_args_th(node):
+    if node.child_count == 0:
+        return []
+    args_list = []
+    for child in node.children[0].children[0].children[1].children:
+        if "repo_or_dir" in child.text.decode() or "model" in child.text.decode():
+            args_list.append(child.children[2].text)
+    return args_list
+
+# How the responses of each API hub are evaluated: the arguments that identify an API, and whether a response without
+# an "api_call" field is skipped (neither correct nor a hallucination) instead of being parsed whole
+API_HUB_CONFIGS = {
+    "huggingface": {"get_args": get_args_hf, "require_api_call_field": False},
+    "tensorflowhub": {"get_args": get_args_tf, "require_api_call_field": False},
+    "torchhub": {"get_args": get_args_th, "require_api_call_field": True},
+}
+
+
+class APIIndex:
+    """
+    Index of the reference API calls by callee name (the API name of the reference tree), with their arguments
+    decoded once, so that matching a response only looks at the APIs called in the response.
+    """
+
+    def __init__(self, reference_tree_list):
+        # callee -> [(index of the API, arguments)], in the order of the API database
+        self.apis_by_callee = defaultdict(list)
+        # [(index of the API, callee, arguments, longest argument)], in the order of the API database
+        self.apis = []
+        for idx, reference_tree in enumerate(reference_tree_list):
+            if reference_tree is None:
+                continue
+            api_name, args_list = reference_tree
+            if len(args_list) == 0:
+                continue
+            args = tuple(arg.decode().lstrip("'").rstrip("'") for arg in args_list)
+            self.apis_by_callee[api_name].append((idx, args))
+            self.apis.append((idx, api_name, args, max(args, key=len)))
+        # text -> result of find_apis_in_text, since many responses end with the same subtree
+        self._apis_in_text = {}
+
+    def find_apis_in_text(self, text):
+        """
+        Return the (index of the API, callee) of the APIs whose arguments all appear in the text, in the order of the
+        API database.
+        """
+        if text not in self._apis_in_text:
+            self._apis_in_text[text] = [
+                (idx, callee)
+                for idx, callee, args, longest_arg in self.apis
+                if longest_arg in text and all(arg in text for arg in args)
+            ]
+        return self._apis_in_text[text]
+
+
+# Check if there is an api match
+def ast_check(candidate_subtree_list, api_index):
+    """
+    Check if there is an API match between candidate subtrees and the indexed reference trees.
+
+    An API matches when all its arguments appear in the first candidate subtree calling the same callee. For the APIs
+    whose callee is not called by any candidate subtree, the arguments are looked up in the last candidate subtree
+    instead, as the original linear scan over the API database did.
+
+    Args:
+        candidate_subtree_list (list): A list of candidate subtrees with their depths and text contents.
+        api_index (APIIndex): The index of the reference trees to compare against.
+
+    Returns:
+        int: The index of the first matching API in the API database if a match is found, -1 otherwise.
+    """
+    # callee -> text of the first candidate subtree calling it
+    candidate_texts = {}
+    for candidate_tree in candidate_subtree_list:
+        if candidate_tree[3] is not None and candidate_tree[3] not in candidate_texts:
+            candidate_texts[candidate_tree[3]] = candidate_tree[2]
+    for callee, candidate_tree in candidate_texts.items():
+        candidate_texts[callee] = candidate_tree.text.decode()
+
+    match_idx = -1
+    for callee, candidate_text in candidate_texts.items():
+        for idx, args in api_index.apis_by_callee.get(callee, ()):
+            if match_idx != -1 and idx > match_idx:
+                break
+            if all(arg in candidate_text for arg in args):
+                match_idx = idx
+                break
+
+    fallback_text = candidate_subtree_list[-1][2].text.decode()
+    for idx, callee in api_index.find_apis_in_text(fallback_text):
+        if match_idx != -1 and idx > match_idx:
+            break
+        if callee not in candidate_texts:
+            match_idx = idx
+            break
+    return match_idx
+
+# Parse the dataset
+def parse_dataset(args, api_hub):
+    # Read the api datasest
+    api_database = []
+    with open(args.api_dataset, 'r') as f:
+        for line in f:
+            api_database.append(json.loads(line))
+
+    # Read the question answer pair datasest
+    qa_pairs = []
+    with open(args.apibench, 'r') as f:
+        for line in f:
+            qa_pairs.append(json.loads(line)["api_data"])
+
+    # Read the language model response datasest
+    llm_responses = []
+    with open(args.llm_responses, 'r') as f:
+        for line in f:
+            llm_responses.append(json.loads(line))
+
+    # Parse all apis to ast trees, or load them from the cache of a previous run, and index them
+    cache_dir = None if args.no_cache else args.cache_dir
+    reference_database = load_reference_trees(api_database, API_HUB_CONFIGS[api_hub]["get_args"], cache_dir)
+    api_index = APIIndex(reference_database)
+
+    return api_database, qa_pairs, llm_responses, api_index
+
+# Evaluate one response, returns whether it is correct and whether it is a hallucination
+def process_response(indexed_response, api_database, qa_pairs, api_index, require_api_call_field):
+    idx, response = indexed_response
+    try:
+        output = response['text']
+    except:
+        print('Error: cannot parse line ', idx)
+        return False, False
+
+    # Index the "api_call" domain
+    output = output.split("api_call")
+    if len(output) == 1:
+        if require_api_call_field:
+            return False, False
+        api_call = output[0]
+    else:
+        # Parse the output
+        output = output[1].split("api_provider")[0]
+        if ":" not in output:
+            start = 0
+        else:
+            start = output.index(":")
+        if ")" not in output:
+            end = -2
+        else:
+            end = output.rindex(")")
+        api_call = output[start+2:end+1]
+
+    # Parse the api_call into AST tree
+    ast_tree = ast_parse(api_call)
+    # Search for a subtree
+    ast_subtree_list = get_all_sub_trees(ast_tree)
+    # Check which ast tree is matching
+    database_index = ast_check(ast_subtree_list, api_index)
+    # We cannot index this ast in our database
+    if database_index == -1:
+        return False, True
+    # We index our reference api_call
+    ref_api_call = api_database[database_index]
+    # Check for functionality
+    if ref_api_call['domain'] == qa_pairs[response['question_id'] - 1]['domain']:
+        return True, False
+    else:
+        return False, False
+
+def main(args, api_hub=None):
+    api_hub = api_hub or args.api_hub
+    # Read datsets
+    api_database, qa_pairs, llm_responses, api_index = parse_dataset(args, api_hub)
+
+    # Check correctness, in parallel chunks of responses
+    results = map_in_chunks(
+        partial(
+            process_response,
+            api_database=api_database,
+            qa_pairs=qa_pairs,
+            api_index=api_index,
+            require_api_call_field=API_HUB_CONFIGS[api_hub]["require_api_call_field"],
+        ),
+        list(enumerate(llm_responses)),
+        num_workers=args.num_workers,
+    )
+    total_correct = sum(correct for correct, _ in results)
+    total_hallucination = sum(hallucination for _, hallucination in results)
+
+    if args.use_wandb:
+        import wandb
+        if args.wandb_run_id is not None:
+            wandb.init(project=args.wandb_project, entity=args.wandb_entity, id=args.wandb_run_id, resume="must")
+        else:
+            wandb.init(project=args.wandb_project, entity=args.wandb_entity)
+
+        wandb.summary['final_functionality_accuracy'] = total_correct / len(llm_responses)
+        wandb.summary['final_hallucination'] = total_hallucination/len(llm_responses)
+
+    print('Final Functionality accuracy: ', total_correct / len(llm_responses))
+    print('Final hallucination: ', total_hallucination/len(llm_responses))
+
+# The command line arguments, with --api_hub only needed when running this script directly
+def build_arg_parser(with_api_hub=True):
+    parser = argparse.ArgumentParser()
+    if with_api_hub:
+        parser.add_argument("--api_hub", type=str, required=True, choices=list(API_HUB_CONFIGS), help="the API hub of the api dataset")
+    parser.add_argument("--api_dataset", type=str, default=None, help="path to your api dataset")
+    parser.add_argument("--apibench", type=str, default=None, help="path to your apibench dataset including the question and answer pairs")
+    parser.add_argument("--llm_responses", type=str, default=None, help="path to the language model responses")
+    parser.add_argument("--num_workers", type=int, default=None, help="number of processes evaluating the responses, defaults to the number of CPUs")
+    parser.add_argument("--cache_dir", type=str, default=DEFAULT_CACHE_DIR, help="directory of the cache of the parsed api dataset")
+    parser.add_argument("--no_cache", action='store_true', help="pass this argument to parse the api dataset without the cache")
+    parser.add_argument("--use_wandb", action='store_true', help="pass this argument to turn on Weights & Biases logging of the LLM responses")
+    parser.add_argument("--wandb_project", type=str, default="gorilla-api", help="Weights & Biases project name")
+    parser.add_argument("--wandb_entity", type=str, default=None, help="Weights & Biases entity name")
+    parser.add_argument("--wandb_run_id", type=str, default=None, help="pass W&B run id to append results to that run, otherwise a new W&B run is logged")
+    return parser
+
+if __name__ == "__main__":
+    args = build_arg_parser().parse_args()
+    main(args)
@@ -0,0 +1,162 @@
+# Copyright 2023 https://github.com/ShishirPatil/gorilla
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Parsing helpers shared by the ast_eval_{hf,tf,th}.py scripts
+
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from tree_sitter import Language, Parser
+
+# Built by codebleu/parser/build.sh
+LANGUAGE_LIBRARY_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "codebleu", "parser", "my-languages.so"
+)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "gorilla", "ast_eval")
+# Number of responses evaluated per task of the worker processes
+DEFAULT_CHUNK_SIZE = 64
+
+# Parsers are not thread-safe, so each thread gets its own (in practice, one per worker process)
+_parsers = threading.local()
+
+
+# Get the parser of a language, built once per thread
+def get_parser(lang="python"):
+    cached_parsers = getattr(_parsers, "by_language", None)
+    if cached_parsers is None:
+        cached_parsers = _parsers.by_language = {}
+    if lang not in cached_parsers:
+        parser = Parser()
+        parser.set_language(Language(LANGUAGE_LIBRARY_PATH, lang))
+        cached_parsers[lang] = parser
+    return cached_parsers[lang]
+
+
+# Parse the program into AST trees
+def ast_parse(candidate, lang="python"):
+    return get_parser(lang).parse(bytes(candidate, "utf8")).root_node
+
+
+# Get all the subtrees given a root_node
+def get_all_sub_trees(root_node):
+    node_stack = []
+    sub_tree_sexp_list = []
+    depth = 1
+    node_stack.append([root_node, depth])
+    while len(node_stack) != 0:
+        cur_node, cur_depth = node_stack.pop()
+        if cur_node.child_count > 0:
+            sub_tree_sexp_list.append([cur_node.sexp(), cur_depth, cur_node, cur_node.children[0].text])
+        else:
+            sub_tree_sexp_list.append([cur_node.sexp(), cur_depth, cur_node, None])
+        for child_node in cur_node.children:
+            if len(child_node.children) != 0:
+                depth = cur_depth + 1
+                node_stack.append([child_node, depth])
+    return sub_tree_sexp_list
+
+
+# Reduce a parsed API call to what the matching needs: its API name and its arguments
+def get_reference_tree(base_tree, get_args):
+    if base_tree.children[0].children[0].child_count == 0:
+        return None
+    api_name = base_tree.children[0].children[0].children[0].text
+    return api_name, get_args(base_tree)
+
+
+def _get_cache_key(api_calls, get_args, lang):
+    # The cache is invalidated when the API calls, the argument extraction or the language library change
+    digest = hashlib.sha256()
+    digest.update(lang.encode("utf8"))
+    digest.update(inspect.getsource(get_args).encode("utf8"))
+    library_stat = os.stat(LANGUAGE_LIBRARY_PATH)
+    digest.update(f"{library_stat.st_size}:{library_stat.st_mtime_ns}".encode("utf8"))
+    for api_call in api_calls:
+        digest.update(api_call.encode("utf8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_reference_trees(api_database, get_args, cache_dir=DEFAULT_CACHE_DIR, lang="python"):
+    """
+    Parse the API calls of the API database into reference trees, reusing the ones cached by a previous run.
+
+    Args:
+        api_database (list): The rows of the API dataset, each with an "api_call" field.
+        get_args (function): The script's extraction of the arguments of a parsed API call.
+        cache_dir (str): The directory of the on-disk cache, or None to disable the cache.
+        lang (str): The language of the API calls.
+
+    Returns:
+        list: For each API, a tuple of its API name and its arguments, or None if the API call is not a call.
+    """
+    api_calls = [data["api_call"] for data in api_database]
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(cache_dir, _get_cache_key(api_calls, get_args, lang) + ".pkl")
+        if os.path.exists(cache_path):
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+
+    reference_trees = [get_reference_tree(ast_parse(api_call, lang), get_args) for api_call in api_calls]
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first, so that concurrent runs never read a partial cache
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(reference_trees, f)
+        os.replace(tmp_path, cache_path)
+    return reference_trees
+
+
+_worker_function = None
+
+
+def _init_worker(function):
+    global _worker_function
+    _worker_function = function
+
+
+def _run_chunk(chunk):
+    return [_worker_function(item) for item in chunk]
+
+
+def map_in_chunks(function, items, num_workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Apply a function to every item, in chunks spread over a pool of worker processes.
+    The function is sent once to each worker, so it can carry the (large) shared state of the evaluation.
+
+    Args:
+        function (function): A picklable function of one item, such as a functools.partial of a module-level function.
+        items (list): The items to apply the function to.
+        num_workers (int): The number of worker processes, defaults to the number of CPUs. 1 runs in this process.
+        chunk_size (int): The number of items per task.
+
+    Returns:
+        list: The results, in the order of the items.
+    """
+    num_workers = num_workers or os.cpu_count() or 1
+    if num_workers == 1 or len(items) <= chunk_size:
+        return [function(item) for item in items]
+
+    chunks = [items[start : start + chunk_size] for start in range(0, len(items), chunk_size)]
+    with ProcessPoolExecutor(
+        max_workers=min(num_workers, len(chunks)), initializer=_init_worker, initargs=(function,)
+    ) as executor:
+        return [result for chunk_results in executor.map(_run_chunk, chunks) for result in chunk_results]
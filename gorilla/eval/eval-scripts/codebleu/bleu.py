@@ -147,6 +147,8 @@ def corpus_bleu(
     p_numerators = Counter()  # Key = ngram order, and value = no. of ngram matches.
     p_denominators = Counter()  # Key = ngram order, and value = no. of ngram in ref.
     hyp_lengths, ref_lengths = 0, 0
+    # The last hypothesis and its references, for the smoothing function.
+    references, hypothesis = None, None
 
     assert len(list_of_references) == len(hypotheses), (
         "The number of hypotheses and their reference(s) should be the " "same "
@@ -167,6 +169,53 @@ def corpus_bleu(
         hyp_lengths += hyp_len
         ref_lengths += closest_ref_length(references, hyp_len)
 
+    return bleu_from_counts(
+        p_numerators,
+        p_denominators,
+        hyp_lengths,
+        ref_lengths,
+        weights,
+        smoothing_function,
+        auto_reweigh,
+        references,
+        hypothesis,
+    )
+
+
+def bleu_from_counts(
+    p_numerators,
+    p_denominators,
+    hyp_lengths,
+    ref_lengths,
+    weights=(0.25, 0.25, 0.25, 0.25),
+    smoothing_function=None,
+    auto_reweigh=False,
+    references=None,
+    hypothesis=None,
+):
+    """
+    Calculate the corpus-level BLEU score from the ngram counts accumulated
+    over a corpus, as corpus_bleu() does once it has iterated through the
+    hypotheses. This lets callers accumulate the counts themselves.
+    :param p_numerators: no. of ngram matches, by ngram order
+    :type p_numerators: Counter
+    :param p_denominators: no. of ngrams, by ngram order
+    :type p_denominators: Counter
+    :param hyp_lengths: the total length of the hypotheses
+    :type hyp_lengths: int
+    :param ref_lengths: the total length of the closest references
+    :type ref_lengths: int
+    :param weights: weights for unigrams, bigrams, trigrams and so on
+    :type weights: list(float)
+    :param smoothing_function:
+    :type smoothing_function: SmoothingFunction
+    :param auto_reweigh: Option to re-normalize the weights uniformly.
+    :type auto_reweigh: bool
+    :param references: the references of the last hypothesis, for the smoothing function
+    :param hypothesis: the last hypothesis, for the smoothing function
+    :return: The corpus-level BLEU score.
+    :rtype: float
+    """
     # Calculate corpus-level brevity penalty.
     bp = brevity_penalty(ref_lengths, hyp_lengths)
 
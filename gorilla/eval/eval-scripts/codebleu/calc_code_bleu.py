@@ -0,0 +1,346 @@
+# Copyright 2023 https://github.com/ShishirPatil/gorilla
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# CodeBLEU of candidate code against reference code, with the same scores as the corpus_bleu, corpus_syntax_match and
+# corpus_dataflow_match functions of this package. Each snippet is parsed once for both the syntax match and the
+# dataflow match, the n-gram counts of the references are computed once, and the statistics of the samples are
+# computed by a pool of worker processes. Run from the eval-scripts directory:
+#   python -m codebleu.calc_code_bleu --refs reference_files --hyp candidate_file --lang python
+
+import argparse
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial, reduce
+from operator import or_
+
+from codebleu import bleu, weighted_ngram_match
+from codebleu.dataflow_match import dfg_function, get_data_flow, normalize_dataflow
+from codebleu.parser import get_parser, remove_comments_and_docstrings
+from codebleu.syntax_match import get_all_sub_trees
+
+KEYWORDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "keywords")
+# Weights of the ngram match, the weighted ngram match, the syntax match and the dataflow match
+DEFAULT_PARAMS = (0.25, 0.25, 0.25, 0.25)
+# The n-gram orders of the (weighted) ngram match, BLEU-4
+NGRAM_ORDERS = (1, 2, 3, 4)
+# Number of snippets, and of token sequences, whose statistics are kept by each process; references are usually shared
+# by many candidates
+CACHE_SIZE = 16384
+# Number of parsed trees kept by each process, so that the syntax match and the dataflow match of a snippet share a parse
+TREE_CACHE_SIZE = 64
+# Number of samples scored per task of the worker processes
+CHUNK_SIZE = 64
+
+
+# Load the keywords of a language, weighted higher than the other tokens in the weighted ngram match
+def load_keywords(lang):
+    with open(os.path.join(KEYWORDS_DIR, lang + ".txt"), "r", encoding="utf-8") as f:
+        return frozenset(x.strip() for x in f.readlines())
+
+
+# Strip the comments of a snippet, as the syntax and dataflow matches do (with the rules of Java)
+@lru_cache(maxsize=CACHE_SIZE)
+def _strip(code):
+    try:
+        return remove_comments_and_docstrings(code, "java")
+    except Exception:
+        return code
+
+
+@lru_cache(maxsize=TREE_CACHE_SIZE)
+def _parse(code, lang):
+    return get_parser(lang).parse(bytes(code, "utf8"))
+
+
+# The subtrees of a stripped snippet, for the syntax match
+@lru_cache(maxsize=CACHE_SIZE)
+def _sub_tree_sexps(code, lang):
+    sexps = [sexp for sexp, _ in get_all_sub_trees(_parse(code, lang).root_node)]
+    return sexps, frozenset(sexps)
+
+
+# The normalized dataflow of a stripped snippet, for the dataflow match
+@lru_cache(maxsize=CACHE_SIZE)
+def _dataflow_counts(code, lang):
+    dataflow = normalize_dataflow(get_data_flow(code, [get_parser(lang), dfg_function[lang]], _parse(code, lang)))
+    # Matching a reference dataflow item removes it from the candidate dataflow, so the number of matches of two
+    # dataflows is the size of the intersection of their multisets
+    return Counter(
+        (var_name, relationship, tuple(par_vars_name_list))
+        for var_name, relationship, par_vars_name_list in dataflow
+    )
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _ngram_counts(tokens, n):
+    # The same n-grams, in the same order, as codebleu.utils.ngrams. Shared between the calls, never modified
+    return Counter(zip(*[tokens[i:] for i in range(n)])) if len(tokens) >= n else Counter()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _reference_weights(tokens, keywords):
+    return {token: 1 if token in keywords else 0.2 for token in tokens}
+
+
+# Same as the weighted_sum of weighted_ngram_match.modified_recall, in the same order so that the float sums are the same
+def _weighted_sum(weights, counts):
+    sum_counts = 0
+    for ngram, count in counts.items():
+        sum_counts += count * (weights[ngram[0]] if ngram[0] in weights else 1)
+    return sum_counts
+
+
+def _sample_statistics(sample, lang, keywords):
+    """
+    Compute the statistics of one candidate and its references that the four corpus-level metrics accumulate.
+
+    Args:
+        sample (tuple): The references and the candidate code.
+        lang (str): The programming language of the code samples.
+        keywords (frozenset): The keywords of the language.
+
+    Returns:
+        tuple: The (numerator, denominator) by n-gram order of the ngram match and of the weighted ngram match, the
+            hypothesis length, the closest reference lengths of both ngram matches, and the (match count, total count)
+            of the syntax match and of the dataflow match.
+    """
+    references, candidate = sample
+    hypothesis = tuple(candidate.split())
+    reference_tokens = [tuple(reference.split()) for reference in references]
+    reference_weights = [_reference_weights(tokens, keywords) for tokens in reference_tokens]
+
+    ngram_match = []
+    weighted_ngram_match_counts = []
+    for n in NGRAM_ORDERS:
+        counts = _ngram_counts(hypothesis, n)
+        reference_counts_list = [_ngram_counts(tokens, n) for tokens in reference_tokens]
+
+        # bleu.modified_precision, clipping the counts of the (usually shorter) references instead of the hypothesis
+        if len(reference_counts_list) == 1:
+            max_counts = reference_counts_list[0]
+        else:
+            max_counts = reduce(or_, reference_counts_list, Counter())
+        ngram_match.append(
+            (
+                sum(min(count, counts[ngram]) for ngram, count in max_counts.items()),
+                max(1, sum(counts.values())),
+            )
+        )
+
+        # weighted_ngram_match.modified_recall
+        numerator = 0
+        denominator = 0
+        for weights, reference_counts in zip(reference_weights, reference_counts_list):
+            clipped_counts = {ngram: min(count, counts[ngram]) for ngram, count in reference_counts.items()}
+            if n == 1 and len(weights) == len(reference_counts):
+                numerator += _weighted_sum(weights, clipped_counts)
+                denominator += max(1, _weighted_sum(weights, reference_counts))
+            else:
+                numerator += sum(clipped_counts.values())
+                denominator += max(1, sum(reference_counts.values()))
+        weighted_ngram_match_counts.append((numerator, denominator))
+
+    hyp_len = len(hypothesis)
+    ref_len = bleu.closest_ref_length(reference_tokens, hyp_len)
+    # weighted_ngram_match.corpus_bleu measures the [tokens, weights] pairs of the references, not their tokens
+    weighted_ref_len = weighted_ngram_match.closest_ref_length(
+        [[tokens, weights] for tokens, weights in zip(reference_tokens, reference_weights)], hyp_len
+    )
+
+    syntax_match_count = syntax_total_count = 0
+    dataflow_match_count = dataflow_total_count = 0
+    stripped_candidate = candidate
+    for reference in references:
+        # The syntax and dataflow matches strip the candidate again for every reference
+        stripped_candidate = _strip(stripped_candidate)
+        stripped_reference = _strip(reference)
+
+        _, candidate_sexp_set = _sub_tree_sexps(stripped_candidate, lang)
+        reference_sexps, _ = _sub_tree_sexps(stripped_reference, lang)
+        syntax_match_count += sum(sexp in candidate_sexp_set for sexp in reference_sexps)
+        syntax_total_count += len(reference_sexps)
+
+        # The dataflow of the candidate is only needed against a reference with a dataflow
+        reference_dataflow_counts = _dataflow_counts(stripped_reference, lang)
+        if reference_dataflow_counts:
+            candidate_dataflow_counts = _dataflow_counts(stripped_candidate, lang)
+            dataflow_match_count += sum((reference_dataflow_counts & candidate_dataflow_counts).values())
+            dataflow_total_count += sum(reference_dataflow_counts.values())
+
+    return (
+        ngram_match,
+        weighted_ngram_match_counts,
+        hyp_len,
+        ref_len,
+        weighted_ref_len,
+        (syntax_match_count, syntax_total_count),
+        (dataflow_match_count, dataflow_total_count),
+    )
+
+
+_worker_function = None
+
+
+def _init_worker(function):
+    global _worker_function
+    _worker_function = function
+
+
+def _run_chunk(chunk):
+    return [_worker_function(item) for item in chunk]
+
+
+def map_in_chunks(function, items, num_workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Apply a function to every item, in chunks spread over a pool of worker processes.
+    The function is sent once to each worker, and each worker keeps its own caches across the chunks it scores.
+
+    Args:
+        function (function): A picklable function of one item, such as a functools.partial of a module-level function.
+        items (list): The items to apply the function to.
+        num_workers (int): The number of worker processes, defaults to the number of CPUs. 1 runs in this process.
+        chunk_size (int): The number of items per task.
+
+    Returns:
+        list: The results, in the order of the items.
+    """
+    num_workers = num_workers or os.cpu_count() or 1
+    if num_workers == 1 or len(items) <= chunk_size:
+        return [function(item) for item in items]
+
+    chunks = [items[start : start + chunk_size] for start in range(0, len(items), chunk_size)]
+    with ProcessPoolExecutor(
+        max_workers=min(num_workers, len(chunks)), initializer=_init_worker, initargs=(function,)
+    ) as executor:
+        return [result for chunk_results in executor.map(_run_chunk, chunks) for result in chunk_results]
+
+
+def corpus_code_bleu(references, candidates, lang="python", params=DEFAULT_PARAMS, num_workers=None):
+    """
+    Calculate the corpus-level CodeBLEU score of the candidates against their references, and its four components.
+
+    Args:
+        references (list): A list of lists of reference code samples.
+        candidates (list): A list of candidate code samples.
+        lang (str): The programming language of the code samples.
+        params (tuple): The weights of the ngram match, the weighted ngram match, the syntax match and the dataflow match.
+        num_workers (int): The number of worker processes, defaults to the number of CPUs. 1 runs in this process.
+
+    Returns:
+        dict: The ngram_match, weighted_ngram_match, syntax_match, dataflow_match and code_bleu scores.
+    """
+    assert len(references) == len(candidates), (
+        "The number of candidates and their reference(s) should be the same"
+    )
+    alpha, beta, gamma, theta = params
+    keywords = load_keywords(lang)
+    statistics = map_in_chunks(
+        partial(_sample_statistics, lang=lang, keywords=keywords),
+        list(zip(references, candidates)),
+        num_workers=num_workers,
+    )
+
+    # Accumulated in the order of the samples, as corpus_bleu does, so that the float sums are the same
+    p_numerators, p_denominators = Counter(), Counter()
+    weighted_p_numerators, weighted_p_denominators = Counter(), Counter()
+    hyp_lengths = ref_lengths = weighted_ref_lengths = 0
+    syntax_match_count = syntax_total_count = 0
+    dataflow_match_count = dataflow_total_count = 0
+    for ngram_match, weighted_ngram_match_counts, hyp_len, ref_len, weighted_ref_len, syntax, dataflow in statistics:
+        for i, (numerator, denominator) in enumerate(ngram_match, start=1):
+            p_numerators[i] += numerator
+            p_denominators[i] += denominator
+        for i, (numerator, denominator) in enumerate(weighted_ngram_match_counts, start=1):
+            weighted_p_numerators[i] += numerator
+            weighted_p_denominators[i] += denominator
+        hyp_lengths += hyp_len
+        ref_lengths += ref_len
+        weighted_ref_lengths += weighted_ref_len
+        syntax_match_count += syntax[0]
+        syntax_total_count += syntax[1]
+        dataflow_match_count += dataflow[0]
+        dataflow_total_count += dataflow[1]
+
+    # The smoothing functions are given the last sample
+    last_references = last_weighted_references = last_hypothesis = None
+    if candidates:
+        last_references = [reference.split() for reference in references[-1]]
+        last_weighted_references = [
+            [tokens, _reference_weights(tuple(tokens), keywords)] for tokens in last_references
+        ]
+        last_hypothesis = candidates[-1].split()
+    ngram_match_score = bleu.bleu_from_counts(
+        p_numerators,
+        p_denominators,
+        hyp_lengths,
+        ref_lengths,
+        references=last_references,
+        hypothesis=last_hypothesis,
+    )
+    weighted_ngram_match_score = weighted_ngram_match.bleu_from_counts(
+        weighted_p_numerators,
+        weighted_p_denominators,
+        hyp_lengths,
+        weighted_ref_lengths,
+        references=last_weighted_references,
+        hypothesis=last_hypothesis,
+    )
+    syntax_match_score = syntax_match_count / syntax_total_count if syntax_total_count else 0
+    dataflow_match_score = dataflow_match_count / dataflow_total_count if dataflow_total_count else 0
+
+    return {
+        "ngram_match": ngram_match_score,
+        "weighted_ngram_match": weighted_ngram_match_score,
+        "syntax_match": syntax_match_score,
+        "dataflow_match": dataflow_match_score,
+        "code_bleu": alpha * ngram_match_score
+        + beta * weighted_ngram_match_score
+        + gamma * syntax_match_score
+        + theta * dataflow_match_score,
+    }
+
+
+def main(args):
+    params = tuple(float(x) for x in args.params.split(","))
+
+    # One reference file per reference of the candidates, with one snippet per line
+    pre_references = []
+    for file in args.refs:
+        with open(file, "r", encoding="utf-8") as f:
+            pre_references.append([x.strip() for x in f.readlines()])
+    with open(args.hyp, "r", encoding="utf-8") as f:
+        hypothesis = [x.strip() for x in f.readlines()]
+    for pre_reference in pre_references:
+        assert len(hypothesis) == len(pre_reference)
+    references = [list(references_for_instance) for references_for_instance in zip(*pre_references)]
+
+    scores = corpus_code_bleu(references, hypothesis, args.lang, params, num_workers=args.num_workers)
+    print(
+        "ngram match: {0}, weighted ngram match: {1}, syntax_match: {2}, dataflow_match: {3}".format(
+            scores["ngram_match"], scores["weighted_ngram_match"], scores["syntax_match"], scores["dataflow_match"]
+        )
+    )
+    print("CodeBLEU score: ", scores["code_bleu"])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--refs", type=str, nargs="+", required=True, help="reference files")
+    parser.add_argument("--hyp", type=str, required=True, help="hypothesis file")
+    parser.add_argument("--lang", type=str, default="python", help="programming language of the code")
+    parser.add_argument("--params", type=str, default="0.25,0.25,0.25,0.25", help="alpha, beta, gamma and theta")
+    parser.add_argument("--num_workers", type=int, default=None, help="number of processes scoring the samples, defaults to the number of CPUs")
+    args = parser.parse_args()
+    main(args)
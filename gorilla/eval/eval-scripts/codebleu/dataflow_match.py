@@ -2,11 +2,11 @@
 # Licensed under the MIT license.
 
 from codebleu.parser import DFG_python
-from codebleu.parser import (remove_comments_and_docstrings,
+from codebleu.parser import (get_parser,
+                   remove_comments_and_docstrings,
                    tree_to_token_index,
                    index_to_code_token,
                    tree_to_variable_index)
-from tree_sitter import Language, Parser
 import pdb
 
 dfg_function={
@@ -39,10 +39,7 @@ def corpus_dataflow_match(references, candidates, lang):
     Returns:
         float: The corpus-level dataflow match score.
     """
-    LANGUAGE = Language('codebleu/parser/my-languages.so', lang)
-    parser = Parser()
-    parser.set_language(LANGUAGE)
-    parser = [parser,dfg_function[lang]]
+    parser = [get_parser(lang),dfg_function[lang]]
     match_count = 0
     total_count = 0
 
@@ -78,19 +75,21 @@ def corpus_dataflow_match(references, candidates, lang):
     score = match_count / total_count
     return score
 
-def get_data_flow(code, parser):
+def get_data_flow(code, parser, tree=None):
     """
     Extract the dataflow graph (DFG) from the given code using the parser.
 
     Args:
         code (str): The code from which to extract the DFG.
         parser (list): A list containing the language parser and DFG function.
+        tree (Tree): The tree of the code if it is already parsed, so that it is not parsed again.
 
     Returns:
         list: The extracted dataflow graph.
     """
     try:
-        tree = parser[0].parse(bytes(code,'utf8'))    
+        if tree is None:
+            tree = parser[0].parse(bytes(code,'utf8'))
         root_node = tree.root_node  
         tokens_index=tree_to_token_index(root_node)     
         code=code.split('\n')
@@ -1,7 +1,8 @@
 # Copyright (c) Microsoft Corporation. 
 # Licensed under the MIT license.
 
-from .utils import (remove_comments_and_docstrings,
+from .utils import (get_parser,
+                   remove_comments_and_docstrings,
                    tree_to_token_index,
                    index_to_code_token,
                    tree_to_variable_index)
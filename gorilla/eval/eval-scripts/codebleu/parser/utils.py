@@ -1,10 +1,33 @@
 # Copyright (c) Microsoft Corporation. 
 # Licensed under the MIT license.
 
+import os
 import re
+import threading
 from io import StringIO
 import  tokenize
 
+from tree_sitter import Language, Parser
+
+# Built by build.sh, next to this file
+LANGUAGE_LIBRARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'my-languages.so')
+
+# Parsers are not thread-safe, so each thread gets its own
+_parsers = threading.local()
+
+def get_parser(lang):
+    """
+    Returns the tree-sitter parser of 'lang', built once per thread.
+    """
+    cached_parsers = getattr(_parsers, 'by_language', None)
+    if cached_parsers is None:
+        cached_parsers = _parsers.by_language = {}
+    if lang not in cached_parsers:
+        parser = Parser()
+        parser.set_language(Language(LANGUAGE_LIBRARY_PATH, lang))
+        cached_parsers[lang] = parser
+    return cached_parsers[lang]
+
 def remove_comments_and_docstrings(source,lang):
     if lang in ['python']:
         """
@@ -2,11 +2,11 @@
 # Licensed under the MIT license.
 
 from codebleu.parser import DFG_python,DFG_java,DFG_ruby,DFG_go,DFG_php,DFG_javascript,DFG_csharp
-from codebleu.parser import (remove_comments_and_docstrings,
+from codebleu.parser import (get_parser,
+                   remove_comments_and_docstrings,
                    tree_to_token_index,
                    index_to_code_token,
                    tree_to_variable_index)
-from tree_sitter import Language, Parser
 
 dfg_function={
     'python':DFG_python,
@@ -32,6 +32,29 @@ def calc_syntax_match(references, candidate, lang):
     """
     return corpus_syntax_match([references], [candidate], lang)
 
+def get_all_sub_trees(root_node):
+    """
+    Get all sub-trees of a given root node.
+
+    Args:
+        root_node: The root node of the syntax tree.
+
+    Returns:
+        list: List of sub-tree sexps and their depths.
+    """
+    node_stack = []
+    sub_tree_sexp_list = []
+    depth = 1
+    node_stack.append([root_node, depth])
+    while len(node_stack) != 0:
+        cur_node, cur_depth = node_stack.pop()
+        sub_tree_sexp_list.append([cur_node.sexp(), cur_depth])
+        for child_node in cur_node.children:
+            if len(child_node.children) != 0:
+                depth = cur_depth + 1
+                node_stack.append([child_node, depth])
+    return sub_tree_sexp_list
+
 def corpus_syntax_match(references, candidates, lang):   
     """
     Calculate the corpus-level syntax match score for candidates against references.
@@ -49,10 +72,7 @@ def corpus_syntax_match(references, candidates, lang):
         'build/my-languages.so',
         'vendor/tree-sitter-python')
     '''
-    # LANGUAGE = Language('codebleu/parser/my-languages.so', lang)
-    LANGUAGE = Language('./build/my-languages.so', lang)
-    parser = Parser()
-    parser.set_language(LANGUAGE)
+    parser = get_parser(lang)
     match_count = 0
     total_count = 0
 
@@ -88,28 +108,6 @@ def corpus_syntax_match(references, candidates, lang):
             '''
             total_match = 0
 
-            def get_all_sub_trees(root_node):
-                """
-                Get all sub-trees of a given root node.
-                
-                Args:
-                    root_node: The root node of the syntax tree.
-
-                Returns:
-                    list: List of sub-tree sexps and their depths.
-                """
-                node_stack = []
-                sub_tree_sexp_list = []
-                depth = 1
-                node_stack.append([root_node, depth])
-                while len(node_stack) != 0:
-                    cur_node, cur_depth = node_stack.pop()
-                    sub_tree_sexp_list.append([cur_node.sexp(), cur_depth])
-                    for child_node in cur_node.children:
-                        if len(child_node.children) != 0:
-                            depth = cur_depth + 1
-                            node_stack.append([child_node, depth])
-                return sub_tree_sexp_list
             cand_sexps = [x[0] for x in get_all_sub_trees(candidate_tree)]
             ref_sexps = get_all_sub_trees(reference_tree)
 
@@ -19,10 +19,16 @@ import sys
 import json
 import openai
 import anthropic
-import multiprocessing as mp
 import time
 import wandb
-from tenacity import retry, wait_exponential
+from functools import partial
+from response_collection import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_NUM_THREADS,
+    DEFAULT_WRITE_BATCH_SIZE,
+    collect_responses,
+    load_completed_question_ids,
+)
 
 def encode_question(question, api_name):
     """Encode multiple prompt instructions into a single string."""
@@ -51,35 +57,31 @@ def encode_question(question, api_name):
     prompts.append({"role": "user", "content": prompt})
     return prompts
 
-@retry(wait=wait_exponential(multiplier=1, min=10, max=120), reraise=True)
 def get_response(get_response_input, api_key):
     question, question_id, api_name, model = get_response_input
     question = encode_question(question, api_name)
     
-    try:
-        if "gpt" in model:
-            openai.api_key = api_key
-            responses = openai.ChatCompletion.create(
-                model=model,
-                messages=question,
-                n=1,
-                temperature=0,
-            )
-            response = responses['choices'][0]['message']['content']
-        elif "claude" in model:
-            client = anthropic.Anthropic(api_key=api_key)
-            responses = client.completions.create(
-                prompt=f"{anthropic.HUMAN_PROMPT} {question[0]['content']}{question[1]['content']}{anthropic.AI_PROMPT}",
-                stop_sequences=[anthropic.HUMAN_PROMPT],
-                model="claude-v1",
-                max_tokens_to_sample=2048,
-            )
-            response = responses.completion.strip()
-        else:
-            print("Error: Model is not supported.")
-    except Exception as e:
-        print("Error:", e)
-        return None
+    # Errors are raised, for the collector to retry the query
+    if "gpt" in model:
+        openai.api_key = api_key
+        responses = openai.ChatCompletion.create(
+            model=model,
+            messages=question,
+            n=1,
+            temperature=0,
+        )
+        response = responses['choices'][0]['message']['content']
+    elif "claude" in model:
+        client = anthropic.Anthropic(api_key=api_key)
+        responses = client.completions.create(
+            prompt=f"{anthropic.HUMAN_PROMPT} {question[0]['content']}{question[1]['content']}{anthropic.AI_PROMPT}",
+            stop_sequences=[anthropic.HUMAN_PROMPT],
+            model="claude-v1",
+            max_tokens_to_sample=2048,
+        )
+        response = responses.completion.strip()
+    else:
+        raise ValueError("Model is not supported.")
         
     print("=>",)
     return {'text': response, "question_id": question_id, "answer_id": "None", "model_id": model, "metadata": {}}
@@ -87,20 +89,8 @@ def get_response(get_response_input, api_key):
 def process_entry(entry, api_key):
     question, question_id, api_name, model = entry
     result = get_response((question, question_id, api_name, model), api_key)
-    wandb.log({"question_id_completed":question_id})
     return result
 
-def write_result_to_file(result, output_file):
-    global file_write_lock
-    with file_write_lock:
-        with open(output_file, "a") as outfile:
-            json.dump(result, outfile)
-            outfile.write("\n")
-
-def callback_with_lock(result, output_file):
-    global file_write_lock
-    write_result_to_file(result, output_file, file_write_lock)
-
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("--model", type=str, default=None, help="which model you want to use for eval, only support ['gpt*', 'claude*'] now")
@@ -108,6 +98,10 @@ if __name__ == '__main__':
     parser.add_argument("--output_file", type=str, default=None, help="the output file this script writes to")
     parser.add_argument("--question_data", type=str, default=None, help="path to the questions data file")
     parser.add_argument("--api_name", type=str, default=None, help="this will be the api dataset name you are testing, only support ['torchhub', 'tensorhun', 'huggingface'] now")
+    parser.add_argument("--num_threads", type=int, default=DEFAULT_NUM_THREADS, help="maximum number of concurrent queries to the model")
+    parser.add_argument("--max_retries", type=int, default=DEFAULT_MAX_RETRIES, help="number of attempts of each query, with exponential backoff")
+    parser.add_argument("--write_batch_size", type=int, default=DEFAULT_WRITE_BATCH_SIZE, help="number of responses appended to the output file at once")
+    parser.add_argument("--overwrite", action='store_true', help="pass this argument to delete an existing output file instead of resuming it")
     parser.add_argument("--use_wandb", action='store_true', help="pass this argument to turn on Weights & Biases logging of the LLM responses")
     parser.add_argument("--wandb_project", type=str, default="gorilla-api", help="Weights & Biases project name")
     parser.add_argument("--wandb_entity", type=str, default=None, help="Weights & Biases entity name")
@@ -134,22 +128,30 @@ if __name__ == '__main__':
             questions.append(json.loads(line)["text"])
             question_ids.append(json.loads(line)["question_id"])
 
-    if os.path.exists(args.output_file):
+    if args.overwrite and os.path.exists(args.output_file):
         print(f"\nExisting responses file found at: {args.output_file}, deleting it ...\n")
         os.remove(args.output_file)
-
-    file_write_lock = mp.Lock()
-    with mp.Pool(1) as pool:
-        results = []
-        for idx, (question, question_id) in enumerate(zip(questions, question_ids)):
-            result = pool.apply_async(
-                process_entry,
-                args=((question, question_id, args.api_name, args.model), args.api_key),
-                callback=lambda result: write_result_to_file(result, args.output_file),
-            )
-            results.append(result)
-        pool.close()
-        pool.join()
+    # Resume a previous run: the questions already answered in the output file are skipped
+    completed_question_ids = load_completed_question_ids(args.output_file)
+    if completed_question_ids:
+        print(f"\nExisting responses file found at: {args.output_file}, skipping its {len(completed_question_ids)} answered questions ...\n")
+
+    entries = [
+        (question, question_id, args.api_name, args.model)
+        for question, question_id in zip(questions, question_ids)
+        if question_id not in completed_question_ids
+    ]
+    num_written, num_failed = collect_responses(
+        entries,
+        partial(process_entry, api_key=args.api_key),
+        args.output_file,
+        num_threads=args.num_threads,
+        max_retries=args.max_retries,
+        write_batch_size=args.write_batch_size,
+        on_response=(lambda result: wandb.log({"question_id_completed": result["question_id"]})) if args.use_wandb else None,
+    )
+    if num_failed:
+        print(f"{num_failed} queries failed, run the same command again to retry them")
 
     end_time = time.time()
     elapsed_time = end_time - start_time
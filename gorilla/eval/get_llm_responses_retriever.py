@@ -17,11 +17,19 @@ import sys
 import json
 import openai
 import anthropic
-import multiprocessing as mp
 import os
 import time
+from functools import partial
 from retrievers import *
-from retrievers.build_json_index import JSONLReader
+from retrievers.bm25_index import BM25Index
+from retrievers.build_json_index import JSONLReader, build_bm25_index, get_bm25_index_path
+from response_collection import (
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_NUM_THREADS,
+    DEFAULT_WRITE_BATCH_SIZE,
+    collect_responses,
+    load_completed_question_ids,
+)
 
 def encode_question(question, api_name):
     """Encode multiple prompt instructions into a single string."""
@@ -57,51 +65,36 @@ def get_response(get_response_input, api_key):
     for i, doc in enumerate(retrieved_doc): 
         question[-1]["content"] = question[-1]["content"] + "\nAPI " + str(i) + ": " + str(doc)
     
-    try:
-        if "gpt" in model:
-            openai.api_key = api_key
-            responses = openai.ChatCompletion.create(
-                model=model,
-                messages=question,
-                n=1,
-                temperature=0,
-            )
-            response = responses['choices'][0]['message']['content']
-        elif "claude" in model:
-            client = anthropic.Anthropic(api_key=api_key)
-            responses = client.completions.create(
-                prompt=f"{anthropic.HUMAN_PROMPT} {question[0]['content']}{question[1]['content']}{anthropic.AI_PROMPT}",
-                stop_sequences=[anthropic.HUMAN_PROMPT],
-                model="claude-v1",
-                max_tokens_to_sample=2048,
-            )
-            response = responses.completion.strip()
-        else:
-            print("Error: Model is not supported.")
-    except Exception as e:
-        print("Error:", e)
-        return None
+    # Errors are raised, for the collector to retry the query
+    if "gpt" in model:
+        openai.api_key = api_key
+        responses = openai.ChatCompletion.create(
+            model=model,
+            messages=question,
+            n=1,
+            temperature=0,
+        )
+        response = responses['choices'][0]['message']['content']
+    elif "claude" in model:
+        client = anthropic.Anthropic(api_key=api_key)
+        responses = client.completions.create(
+            prompt=f"{anthropic.HUMAN_PROMPT} {question[0]['content']}{question[1]['content']}{anthropic.AI_PROMPT}",
+            stop_sequences=[anthropic.HUMAN_PROMPT],
+            model="claude-v1",
+            max_tokens_to_sample=2048,
+        )
+        response = responses.completion.strip()
+    else:
+        raise ValueError("Model is not supported.")
         
     print("=>",)
     return {'text': response, "question_id": question_id, "answer_id": "None", "model_id": model, "metadata": {}}
 
 def process_entry(entry, api_key):
-    question, question_id, api_name, model, retriever = entry
-    retrieved_doc = retriever.get_relevant_documents(question)
+    question, question_id, api_name, model, retrieved_doc = entry
     result = get_response((question, question_id, api_name, model, retrieved_doc), api_key)
     return result
 
-def write_result_to_file(result, output_file):
-    global file_write_lock
-    with file_write_lock:
-        with open(output_file, "a") as outfile:
-            json.dump(result, outfile)
-            outfile.write("\n")
-
-def callback_with_lock(result, output_file):
-    global file_write_lock
-    write_result_to_file(result, output_file, file_write_lock)
-
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument("--model", type=str, default=None, help="which model you want to use for eval, only support ['gpt*', 'claude*'] now")
@@ -112,30 +105,42 @@ if __name__ == '__main__':
     parser.add_argument("--retriever", type=str, default="bm25", help="which retriever to use")
     parser.add_argument("--num_doc", type=int, default=1, help="top k docs to use")
     parser.add_argument("--api_dataset", type=str, default=None, help="path to the api data")
+    parser.add_argument("--bm25_index", type=str, default=None, help="path to the bm25 index built by retrievers/build_json_index.py, defaults to <api dataset name>_bm25_index.npz (built if missing)")
+    parser.add_argument("--num_threads", type=int, default=DEFAULT_NUM_THREADS, help="maximum number of concurrent queries to the model")
+    parser.add_argument("--max_retries", type=int, default=DEFAULT_MAX_RETRIES, help="number of attempts of each query, with exponential backoff")
+    parser.add_argument("--write_batch_size", type=int, default=DEFAULT_WRITE_BATCH_SIZE, help="number of responses appended to the output file at once")
+    parser.add_argument("--overwrite", action='store_true', help="pass this argument to delete an existing output file instead of resuming it")
+    parser.add_argument("--ann_backend", type=str, default=None, choices=["faiss"], help="approximate nearest neighbor search for the gpt retriever, for large api datasets")
     args = parser.parse_args()
 
     assert args.retriever in ["bm25", "gpt"]
     if args.retriever == "gpt":
-        retriever = GPTRetriever(query_kwargs={"similarity_top_k": args.num_doc})
-        if os.path.exists(args.retriever + '_dataset_index.json'):
+        retriever = GPTRetriever(query_kwargs={"similarity_top_k": args.num_doc}, ann_backend=args.ann_backend)
+        index_path = args.retriever + '_dataset_index.npy'
+        # The JSON index saved by earlier versions is converted once
+        legacy_index_path = args.retriever + '_dataset_index.json'
+        os.environ["OPENAI_API_KEY"] = args.api_key
+        if os.path.exists(index_path):
             print('data index already saved')
-            os.environ["OPENAI_API_KEY"] = args.api_key
-            index = retriever.load_from_disk(args.retriever + '_dataset_index.json')
+            index = retriever.load_from_disk(index_path)
+        elif os.path.exists(legacy_index_path):
+            print('data index being converted')
+            index = retriever.load_from_disk(legacy_index_path)
+            retriever.save_to_disk(index, index_path)
         else:
             print('data index being created')
-            os.environ["OPENAI_API_KEY"] = args.api_key
             documents = JSONLReader().load_data(args.api_dataset)
             index = retriever.from_documents(documents)
-            retriever.save_to_disk(index, args.retriever + '_dataset_index.json')
+            retriever.save_to_disk(index, index_path)
     elif args.retriever == "bm25":
-        from rank_bm25 import BM25Okapi
-        corpus = []
-        with open(args.api_dataset, 'r') as f:
-            for line in f:
-                corpus.append(json.loads(line))
-        tokenized_corpus = [str(doc).split(" ") for doc in corpus]
-        bm25 = BM25Okapi(tokenized_corpus)
-        retriever = BM25Retriever(index=bm25, corpus=corpus, query_kwargs={"similarity_top_k": args.num_doc})
+        index_path = args.bm25_index or get_bm25_index_path(args.api_dataset)
+        if os.path.exists(index_path):
+            print('data index already saved')
+            bm25 = BM25Index.load(index_path)
+        else:
+            print('data index being created')
+            bm25 = build_bm25_index(args.api_dataset, index_path)
+        retriever = BM25Retriever(index=bm25, query_kwargs={"similarity_top_k": args.num_doc})
     else:
         assert False
 
@@ -148,18 +153,35 @@ if __name__ == '__main__':
             questions.append(json.loads(line)["text"])
             question_ids.append(json.loads(line)["question_id"])
 
-    file_write_lock = mp.Lock()
-    with mp.Pool(1) as pool:
-        results = []
-        for idx, (question, question_id) in enumerate(zip(questions, question_ids)):
-            result = pool.apply_async(
-                process_entry,
-                args=((question, question_id, args.api_name, args.model, retriever), args.api_key),
-                callback=lambda result: write_result_to_file(result, args.output_file),
-            )
-            results.append(result)
-        pool.close()
-        pool.join()
+    if args.overwrite and os.path.exists(args.output_file):
+        print(f"\nExisting responses file found at: {args.output_file}, deleting it ...\n")
+        os.remove(args.output_file)
+    # Resume a previous run: the questions already answered in the output file are skipped
+    completed_question_ids = load_completed_question_ids(args.output_file)
+    if completed_question_ids:
+        print(f"\nExisting responses file found at: {args.output_file}, skipping its {len(completed_question_ids)} answered questions ...\n")
+    pending = [
+        (question, question_id)
+        for question, question_id in zip(questions, question_ids)
+        if question_id not in completed_question_ids
+    ]
+
+    # Retrieve the docs of all the questions at once, here rather than in the threads querying the model
+    retrieved_docs = retriever.get_relevant_documents_batch([question for question, _ in pending])
+    entries = [
+        (question, question_id, args.api_name, args.model, retrieved_doc)
+        for (question, question_id), retrieved_doc in zip(pending, retrieved_docs)
+    ]
+    num_written, num_failed = collect_responses(
+        entries,
+        partial(process_entry, api_key=args.api_key),
+        args.output_file,
+        num_threads=args.num_threads,
+        max_retries=args.max_retries,
+        write_batch_size=args.write_batch_size,
+    )
+    if num_failed:
+        print(f"{num_failed} queries failed, run the same command again to retry them")
 
     end_time = time.time()
     print("Total time used: ", end_time - start_time)
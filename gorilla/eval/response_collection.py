@@ -0,0 +1,140 @@
+# Copyright 2023 https://github.com/ShishirPatil/gorilla
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Concurrent, resumable collection of the LLM responses, shared by get_llm_responses.py and get_llm_responses_retriever.py
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from tenacity import retry, retry_if_not_exception_type, stop_after_attempt, wait_random_exponential
+
+# Number of queries sent to the model API at the same time
+DEFAULT_NUM_THREADS = 8
+# Number of attempts of each query, with exponential backoff between them
+DEFAULT_MAX_RETRIES = 6
+# Number of responses appended to the output file at once
+DEFAULT_WRITE_BATCH_SIZE = 16
+
+
+def load_completed_question_ids(output_file):
+    """
+    Return the ids of the questions already answered in the output file of a previous run.
+
+    The last line of a run interrupted while writing may be incomplete: it is removed, so that the question is asked
+    again and the file stays one JSON response per line.
+    """
+    completed_question_ids = set()
+    if not os.path.exists(output_file):
+        return completed_question_ids
+
+    with open(output_file, "rb") as f:
+        lines = f.readlines()
+    for line in lines:
+        try:
+            result = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        # Earlier versions wrote `null` for the questions whose query failed
+        if isinstance(result, dict) and "question_id" in result:
+            completed_question_ids.add(result["question_id"])
+
+    if lines and not lines[-1].endswith(b"\n"):
+        with open(output_file, "rb+") as f:
+            try:
+                json.loads(lines[-1])
+                f.seek(0, os.SEEK_END)
+                f.write(b"\n")
+            except json.JSONDecodeError:
+                f.truncate(sum(len(line) for line in lines[:-1]))
+    return completed_question_ids
+
+
+class ResponseWriter:
+    """Append responses to the output file in batches, one JSON response per line."""
+
+    def __init__(self, output_file, batch_size=DEFAULT_WRITE_BATCH_SIZE):
+        self.output_file = output_file
+        self.batch_size = batch_size
+        self._buffer = []
+
+    def write(self, result):
+        self._buffer.append(result)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        with open(self.output_file, "a") as outfile:
+            outfile.write("".join(json.dumps(result) + "\n" for result in self._buffer))
+        self._buffer = []
+
+
+def collect_responses(
+    entries,
+    get_response,
+    output_file,
+    num_threads=DEFAULT_NUM_THREADS,
+    max_retries=DEFAULT_MAX_RETRIES,
+    write_batch_size=DEFAULT_WRITE_BATCH_SIZE,
+    on_response=None,
+):
+    """
+    Query the model for every entry over a pool of threads, and append the responses to the output file in batches.
+
+    Failed queries are retried with exponential backoff, except on a ValueError (such as an unsupported model). The
+    queries that still fail are not written, so that a later run with the same output file asks them again.
+
+    Args:
+        entries (list): The entries to query the model for.
+        get_response (function): Returns the response (a dict with a "question_id") to an entry, raises on failure.
+        output_file (str): The file the responses are appended to.
+        num_threads (int): The maximum number of queries in flight.
+        max_retries (int): The number of attempts of each query.
+        write_batch_size (int): The number of responses appended to the output file at once.
+        on_response (function): Called with each response, in the main thread.
+
+    Returns:
+        tuple: The number of responses written and the number of failed queries.
+    """
+    get_response_with_retry = retry(
+        wait=wait_random_exponential(min=1, max=60),
+        stop=stop_after_attempt(max_retries),
+        retry=retry_if_not_exception_type(ValueError),
+        reraise=True,
+    )(get_response)
+
+    writer = ResponseWriter(output_file, write_batch_size)
+    num_written = num_failed = 0
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        futures = [executor.submit(get_response_with_retry, entry) for entry in entries]
+        try:
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print("Error:", e)
+                    num_failed += 1
+                    continue
+                writer.write(result)
+                num_written += 1
+                if on_response is not None:
+                    on_response(result)
+        finally:
+            # Keep the responses received so far when interrupted, the next run resumes after them
+            for future in futures:
+                future.cancel()
+            writer.flush()
+    return num_written, num_failed
@@ -3,28 +3,24 @@ Thanks to llama-index for the template of this code.
 """
 from pydantic import BaseModel, Field
 from retrievers.schema import BaseRetriever, Document
-from rank_bm25 import BM25Okapi
 from typing import Any, Dict, List, cast
 
 
 class BM25Retriever(BaseRetriever, BaseModel):
 
+    # retrievers.bm25_index.BM25Index, built by retrievers/build_json_index.py
     index: Any
-    corpus: Any
     query_kwargs: Dict = dict(similarity_top_k = 5)
 
     def get_relevant_documents(self, query: str) -> List[Document]:
+        return self.get_relevant_documents_batch([query])[0]
 
-        tokenized_query = query.split(" ")
-        bm25_docs = self.index.get_top_n(tokenized_query, self.corpus, n=self.query_kwargs["similarity_top_k"])
-        docs = []
-        for source_node in bm25_docs:
-            metadata = {}
-            docs.append(
-                Document(page_content=str(source_node), metadata=metadata)
-            )
-        return docs
+    def get_relevant_documents_batch(self, queries: List[str]) -> List[List[Document]]:
+        top_k = self.index.search(queries, self.query_kwargs["similarity_top_k"])
+        return [
+            [Document(page_content=self.index.texts[i], metadata={}) for i in top_k_doc_ids]
+            for top_k_doc_ids in top_k
+        ]
 
     async def aget_relevant_documents(self, query: str) -> List[Document]:
         raise NotImplementedError("Does not support async")
-
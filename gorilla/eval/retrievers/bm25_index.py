@@ -0,0 +1,141 @@
+# Copyright 2023 https://github.com/ShishirPatil/gorilla
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import itertools
+import json
+import os
+import re
+from collections import Counter
+from typing import List
+
+import numpy as np
+import scipy.sparse
+
+# Lowercased runs of letters and digits, so that "model='facebook/bart-large'" matches the words of a question
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into lowercase alphanumeric tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def get_metadata_path(index_path: str) -> str:
+    """Path of the side table of the vocabulary and the texts of an index saved at `index_path`."""
+    return os.path.splitext(index_path)[0] + ".meta.json"
+
+
+class BM25Index:
+    """Inverted BM25 (Okapi) index, stored as a sparse matrix of the BM25 weight of each term in each document.
+
+    The weights are the ones of `rank_bm25.BM25Okapi`, so that the score of a document for a query is the sum of the
+    weights of the query tokens in it, and a batch of queries is scored by one sparse matrix product.
+    """
+
+    def __init__(self, term_weights: scipy.sparse.csr_matrix, vocabulary: List[str], texts: List[str]) -> None:
+        """Initialize with the (terms x documents) weight matrix, the terms of its rows and the documents' texts."""
+        assert term_weights.shape == (len(vocabulary), len(texts)), "The weights should be terms x documents"
+        self.term_weights = term_weights
+        self.vocabulary = vocabulary
+        self.texts = texts
+        self._term_ids = {term: term_id for term_id, term in enumerate(vocabulary)}
+
+    @classmethod
+    def build(cls, texts: List[str], k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25) -> "BM25Index":
+        """Index the texts, with the parameters of `rank_bm25.BM25Okapi`."""
+        term_ids = {}
+        term_rows, doc_columns, frequencies = [], [], []
+        doc_len = np.zeros(len(texts))
+        for doc_id, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_len[doc_id] = len(tokens)
+            for term, frequency in Counter(tokens).items():
+                term_rows.append(term_ids.setdefault(term, len(term_ids)))
+                doc_columns.append(doc_id)
+                frequencies.append(frequency)
+        term_weights = scipy.sparse.csr_matrix(
+            (np.array(frequencies, dtype=np.float64), (term_rows, doc_columns)), shape=(len(term_ids), len(texts))
+        )
+
+        # Inverse document frequencies, with the negative ones floored to epsilon times the average
+        num_docs = len(texts)
+        doc_frequencies = np.diff(term_weights.indptr)
+        idf = np.log(num_docs - doc_frequencies + 0.5) - np.log(doc_frequencies + 0.5)
+        idf[idf < 0] = epsilon * idf.mean()
+
+        # Saturated term frequencies, normalized by the length of each document
+        frequencies = term_weights.data
+        entry_doc_len = doc_len[term_weights.indices]
+        entry_idf = np.repeat(idf, doc_frequencies)
+        avgdl = doc_len.sum() / num_docs
+        term_weights.data = entry_idf * (
+            frequencies * (k1 + 1) / (frequencies + k1 * (1 - b + b * entry_doc_len / avgdl))
+        )
+        return cls(term_weights, list(term_ids), list(texts))
+
+    @classmethod
+    def load(cls, load_path: str) -> "BM25Index":
+        """Load an index saved by `save`."""
+        term_weights = scipy.sparse.load_npz(load_path).tocsr()
+        with open(get_metadata_path(load_path), "r") as f:
+            metadata = json.load(f)
+        return cls(term_weights, metadata["vocabulary"], metadata["texts"])
+
+    def save(self, save_path: str) -> None:
+        """Save the weights to `save_path` (a .npz file) and the vocabulary and texts to the side table next to it."""
+        scipy.sparse.save_npz(save_path, self.term_weights)
+        with open(get_metadata_path(save_path), "w") as f:
+            json.dump({"vocabulary": self.vocabulary, "texts": self.texts}, f)
+
+    def get_scores(self, queries: List[str]) -> scipy.sparse.csr_matrix:
+        """Score every document for each query, as a sparse (queries x documents) matrix."""
+        query_rows, term_columns = [], []
+        for query_id, query in enumerate(queries):
+            for token in tokenize(query):
+                term_id = self._term_ids.get(token)
+                if term_id is not None:
+                    query_rows.append(query_id)
+                    term_columns.append(term_id)
+        # Repeated tokens are summed, as they count once per occurrence in BM25Okapi
+        query_terms = scipy.sparse.csr_matrix(
+            (np.ones(len(query_rows)), (query_rows, term_columns)), shape=(len(queries), len(self.vocabulary))
+        )
+        return (query_terms @ self.term_weights).tocsr()
+
+    def search(self, queries: List[str], top_k: int) -> List[List[int]]:
+        """Find the best scoring documents for each query.
+
+        Args:
+            queries: the texts of the queries
+            top_k: the number of documents to return per query
+
+        Returns:
+            The ids of the documents for each query, by decreasing score (and increasing id for equal scores). Queries
+            matching fewer than `top_k` documents are completed with the first other documents.
+        """
+        scores = self.get_scores(queries)
+        top_k = min(top_k, len(self.texts))
+        results = []
+        for query_id in range(len(queries)):
+            start, end = scores.indptr[query_id], scores.indptr[query_id + 1]
+            # Only the documents sharing a token with the query have a score
+            hits = heapq.nlargest(top_k, zip(scores.data[start:end], -scores.indices[start:end]))
+            doc_ids = [int(-negative_doc_id) for _, negative_doc_id in hits]
+            if len(doc_ids) < top_k:
+                matched = set(doc_ids)
+                unmatched = (doc_id for doc_id in range(len(self.texts)) if doc_id not in matched)
+                doc_ids.extend(itertools.islice(unmatched, top_k - len(doc_ids)))
+            results.append(doc_ids)
+        return results
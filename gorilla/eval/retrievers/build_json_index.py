@@ -12,11 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import argparse
 import json
+import os
 import re
 from typing import Any, Generator, List, Optional
 import abc
 
+from retrievers.bm25_index import BM25Index
 from retrievers.schema import Document
 
 class JSONLReader(abc.ABC):
@@ -43,3 +46,27 @@ class JSONLReader(abc.ABC):
                 )
             ]
             return [Document(page_content="\n".join(lines))]
+
+
+def get_bm25_index_path(api_dataset: str) -> str:
+    """Default path of the BM25 index of an API dataset, eg. torchhub_api_bm25_index.npz for torchhub_api.jsonl."""
+    return os.path.splitext(os.path.basename(api_dataset))[0] + "_bm25_index.npz"
+
+
+def build_bm25_index(api_dataset: str, index_path: str) -> BM25Index:
+    """Index the documents of an API dataset with BM25, and save the index to `index_path`."""
+    documents = JSONLReader().load_data(api_dataset)
+    index = BM25Index.build([document.page_content for document in documents])
+    index.save(index_path)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--api_dataset", type=str, required=True, help="path to the api data")
+    parser.add_argument("--index_path", type=str, default=None, help="path of the bm25 index this script writes, defaults to <api dataset name>_bm25_index.npz")
+    args = parser.parse_args()
+
+    index_path = args.index_path or get_bm25_index_path(args.api_dataset)
+    index = build_bm25_index(args.api_dataset, index_path)
+    print(f"BM25 index of {len(index.texts)} documents and {len(index.vocabulary)} terms saved to {index_path}")
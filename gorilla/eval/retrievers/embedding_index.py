@@ -0,0 +1,127 @@
+# Copyright 2023 https://github.com/ShishirPatil/gorilla
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# Backends of the approximate nearest neighbor search, for API zoos too large for the exact search
+ANN_BACKENDS = ["faiss"]
+# Parameters of the HNSW graph of the faiss backend: neighbors per node, and candidates explored per search
+HNSW_M = 32
+HNSW_EF_SEARCH = 128
+
+
+def normalize(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize the rows of a matrix of embeddings, as float32."""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    return embeddings / np.linalg.norm(embeddings, axis=-1, keepdims=True)
+
+
+def get_texts_path(index_path: str) -> str:
+    """Path of the side table of the texts of an index saved at `index_path`."""
+    return os.path.splitext(index_path)[0] + ".texts.json"
+
+
+class EmbeddingIndex:
+    """Embeddings of documents stored as a matrix of L2-normalized float32 rows.
+
+    The texts of the documents are kept in a side table, so that the cosine similarities of a batch of queries to all
+    the documents are a single matrix product.
+    """
+
+    def __init__(
+        self,
+        embeddings: np.ndarray,
+        texts: List[str],
+        ann_backend: Optional[str] = None,
+    ) -> None:
+        """Initialize with the normalized embeddings, which may be memory-mapped."""
+        assert len(embeddings) == len(texts), "There should be one text per embedding"
+        assert ann_backend is None or ann_backend in ANN_BACKENDS, f"ann_backend should be one of {ANN_BACKENDS}"
+        self.embeddings = embeddings
+        self.texts = texts
+        self.ann_backend = ann_backend
+        self._ann_index = self._build_ann_index() if ann_backend is not None else None
+
+    @classmethod
+    def from_embeddings(
+        cls,
+        embeddings: Sequence[Sequence[float]],
+        texts: List[str],
+        ann_backend: Optional[str] = None,
+    ) -> "EmbeddingIndex":
+        """Build an index from raw embeddings, one per text."""
+        return cls(normalize(embeddings), list(texts), ann_backend)
+
+    @classmethod
+    def load(cls, load_path: str, mmap: bool = True, ann_backend: Optional[str] = None) -> "EmbeddingIndex":
+        """Load an index saved by `save`, memory-mapping its embeddings unless `mmap` is False."""
+        embeddings = np.load(load_path, mmap_mode="r" if mmap else None)
+        with open(get_texts_path(load_path), "r") as f:
+            texts = json.load(f)
+        return cls(embeddings, texts, ann_backend)
+
+    @classmethod
+    def load_json(cls, load_path: str, ann_backend: Optional[str] = None) -> "EmbeddingIndex":
+        """Load an index saved as a JSON list of {"embedding", "text"} nodes, the format of earlier versions."""
+        with open(load_path, "r") as f:
+            nodes = json.load(f)
+        return cls.from_embeddings(
+            [node["embedding"] for node in nodes], [node["text"] for node in nodes], ann_backend
+        )
+
+    def save(self, save_path: str) -> None:
+        """Save the embeddings to `save_path` (a .npy file) and the texts to the side table next to it."""
+        np.save(save_path, np.asarray(self.embeddings, dtype=np.float32))
+        with open(get_texts_path(save_path), "w") as f:
+            json.dump(self.texts, f)
+
+    def _build_ann_index(self):
+        try:
+            import faiss
+        except ImportError:
+            raise ImportError("The faiss ANN backend requires faiss, please install it with `pip install faiss-cpu`.")
+        # On normalized embeddings, the inner product is the cosine similarity
+        ann_index = faiss.IndexHNSWFlat(self.embeddings.shape[1], HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        ann_index.hnsw.efSearch = HNSW_EF_SEARCH
+        ann_index.add(np.ascontiguousarray(self.embeddings, dtype=np.float32))
+        return ann_index
+
+    def search(self, query_embeddings: Sequence[Sequence[float]], top_k: int) -> np.ndarray:
+        """Find the documents most similar to each query.
+
+        Args:
+            query_embeddings: the raw embeddings of the queries, one row per query
+            top_k: the number of documents to return per query
+
+        Returns:
+            The indices of the documents, one row per query, by decreasing cosine similarity
+        """
+        query_embeddings = normalize(np.atleast_2d(query_embeddings))
+        top_k = min(top_k, len(self.texts))
+        if self._ann_index is not None:
+            _, top_k_indices = self._ann_index.search(np.ascontiguousarray(query_embeddings), top_k)
+            return top_k_indices
+
+        scores = query_embeddings @ self.embeddings.T
+        if top_k < scores.shape[1]:
+            # Only the top k scores are sorted
+            top_k_indices = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        else:
+            top_k_indices = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        order = np.argsort(-np.take_along_axis(scores, top_k_indices, axis=1), axis=1, kind="stable")
+        return np.take_along_axis(top_k_indices, order, axis=1)
@@ -16,17 +16,20 @@ from typing import Any, Dict, List, cast, Optional
 
 from pydantic import BaseModel, Field
 from tenacity import retry, stop_after_attempt, wait_random_exponential
+from retrievers.embedding_index import EmbeddingIndex
 from retrievers.schema import BaseRetriever, Document
 import openai
-import numpy as np
 import os
-import copy
-import json
+
+# Maximum number of texts per request to the embeddings API
+EMBEDDING_BATCH_SIZE = 2048
 
 class GPTRetriever(BaseRetriever, BaseModel):
 
     index: Any
     query_kwargs: Dict = dict(similarity_top_k = 5)
+    # Approximate nearest neighbor backend for large API zoos (see retrievers.embedding_index), exact search if None
+    ann_backend: Optional[str] = None
 
     @retry(wait=wait_random_exponential(min=1, max=20), stop=stop_after_attempt(6))
     def get_embeddings(
@@ -34,51 +37,51 @@ class GPTRetriever(BaseRetriever, BaseModel):
 	list_of_text: List[str],
 	engine: Optional[str] = None,
     ) -> List[List[float]]:
-        assert len(list_of_text) <= 2048, "The number of docs should be <= 2048"
+        assert len(list_of_text) <= EMBEDDING_BATCH_SIZE, "The number of docs should be <= 2048"
         list_of_text = [text.replace("\n", " ") for text in list_of_text]
         openai.api_key = os.environ["OPENAI_API_KEY"]
         data = openai.Embedding.create(input=list_of_text, engine="text-embedding-ada-002").data
         data = sorted(data, key=lambda x: x["index"])  # maintain the same order as input.
         return [d["embedding"] for d in data]
+
+    def get_embeddings_batch(self, list_of_text: List[str]) -> List[List[float]]:
+        embeddings = []
+        for start in range(0, len(list_of_text), EMBEDDING_BATCH_SIZE):
+            embeddings.extend(self.get_embeddings(list_of_text[start:start + EMBEDDING_BATCH_SIZE]))
+        return embeddings
   
     def from_documents(self, documents: List):
         contents = [document.page_content for document in documents]
-        embeddings = self.get_embeddings(list_of_text=contents)
-        self.index = []
-        for i, (embedding, document) in enumerate(zip(embeddings, documents)):
-            new_node = {}
-            new_node["embedding"] = embedding
-            new_node["text"] = document.page_content
-            self.index.append(new_node)
+        embeddings = self.get_embeddings_batch(contents)
+        self.index = EmbeddingIndex.from_embeddings(embeddings, contents, self.ann_backend)
         return self.index
 
     def save_to_disk(self, index, save_path):
-        with open(save_path, "w") as outfile:
-            json.dump(self.index, outfile)
+        # The normalized embeddings in `save_path` (.npy), and their texts in a side table next to it
+        self.index.save(save_path)
 
     def load_from_disk(self, load_path):
-        with open(load_path, "r") as loadfile:
-            self.index = json.load(loadfile)
+        if load_path.endswith(".json"):
+            self.index = EmbeddingIndex.load_json(load_path, self.ann_backend)
+        else:
+            self.index = EmbeddingIndex.load(load_path, ann_backend=self.ann_backend)
+        return self.index
         
     def get_relevant_documents(self, query: str) -> List[Document]:
-        docs_embeddings = np.array([doc["embedding"] for doc in self.index])
-
-        query_embedding = np.array(self.get_embeddings([query])[0])
+        return self.get_relevant_documents_batch([query])[0]
 
-        # get cos similarity
-        docs_embeddings = docs_embeddings / np.linalg.norm(docs_embeddings, axis=-1, keepdims=True)
-        query_embedding = query_embedding / np.linalg.norm(query_embedding, axis=-1, keepdims=True)
-        logits = np.sum(query_embedding[None, :] * docs_embeddings, axis=-1)
-        top_k = logits.argsort()[-self.query_kwargs["similarity_top_k"]:][::-1]
-        top_k_docs = [self.index[i]["text"] for i in top_k]
+    def get_relevant_documents_batch(self, queries: List[str]) -> List[List[Document]]:
+        if not queries:
+            return []
+        query_embeddings = self.get_embeddings_batch(queries)
+        # top k by cos similarity
+        top_k = self.index.search(query_embeddings, self.query_kwargs["similarity_top_k"])
 
         # parse source nodes
-        docs = []
-        for source_node in top_k_docs:
-            docs.append(
-                Document(page_content=source_node, metadata="")
-            )
-        return docs
+        return [
+            [Document(page_content=self.index.texts[i], metadata="") for i in top_k_indices]
+            for top_k_indices in top_k
+        ]
 
     async def aget_relevant_documents(self, query: str) -> List[Document]:
         raise NotImplementedError("LlamaIndexRetriever does not support async")
@@ -323,6 +323,17 @@ class BaseRetriever(ABC):
             List of relevant documents
         """
 
+    def get_relevant_documents_batch(self, queries: List[str]) -> List[List[Document]]:
+        """Get documents relevant for each query of a batch.
+
+        Args:
+            queries: strings to find relevant documents for
+
+        Returns:
+            List of relevant documents, for each query
+        """
+        return [self.get_relevant_documents(query) for query in queries]
+
 
 # For backwards compatibility
 